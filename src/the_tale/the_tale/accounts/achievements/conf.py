@@ -5,4 +5,5 @@ smart_imports.all()
 
 
 settings = utils_app_settings.app_settings('ACHIEVEMENTS',
-                                           LAST_ACHIEVEMENTS_NUMBER=5)
+                                           LAST_ACHIEVEMENTS_NUMBER=5,
+                                           SPREADING_BATCH_SIZE=1000)
@@ -14,3 +14,7 @@ class AchievementsManagerError(AchievementsError):
 
 class SaveNotRegisteredAchievementError(AchievementsError):
     MSG = 'try to save achievement %(achievement)r not from storage'
+
+
+class UnknownSpreadingAchievementTypeError(AchievementsError):
+    MSG = 'achievement type %(achievement_type)r can not be spread'
@@ -0,0 +1,185 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+# spreading of achievement to all accounts
+# values of achievements types are calculated by database from columns of source tables,
+# so heroes and accounts are not loaded, and qualifying accounts are found by single query
+
+
+def hero_statistics(*fields):
+    expression = django_models.F('stat_%s' % fields[0])
+
+    for field in fields[1:]:
+        expression += django_models.F('stat_%s' % field)
+
+    return expression
+
+
+def hero_pvp_victories_percents():
+    # the same calculation, as in Hero.get_achievement_type_value
+    percents = django_functions.Floor(django_functions.Cast('stat_pvp_battles_1x1_victories', django_models.FloatField()) /
+                                      django_models.F('stat_pvp_battles_1x1_number') *
+                                      100)
+
+    return django_models.Case(django_models.When(stat_pvp_battles_1x1_number__gte=heroes_conf.settings.MIN_PVP_BATTLES,
+                                                 then=percents),
+                              default=django_models.Value(0.0),
+                              output_field=django_models.FloatField())
+
+
+def heroes_values(expression):
+    return heroes_models.Hero.objects.annotate(value=expression), 'account_id'
+
+
+def votes_values(**kwargs):
+    query = bills_models.Vote.objects.filter(**kwargs).order_by().values('owner_id').annotate(value=django_models.Count('id'))
+    return query, 'owner_id'
+
+
+# achievement type -> function, which returns (query with "value" annotation, name of account id field)
+VALUES_QUERIES = {
+    relations.ACHIEVEMENT_TYPE.TIME: lambda: heroes_values(django_models.F('last_rare_operation_at_turn') - django_models.F('created_at_turn')),
+    relations.ACHIEVEMENT_TYPE.MONEY: lambda: heroes_values(hero_statistics('money_earned_from_loot',
+                                                                            'money_earned_from_artifacts',
+                                                                            'money_earned_from_quests',
+                                                                            'money_earned_from_help',
+                                                                            'money_earned_from_habits',
+                                                                            'money_earned_from_companions',
+                                                                            'money_earned_from_masters')),
+    relations.ACHIEVEMENT_TYPE.MOBS: lambda: heroes_values(hero_statistics('pve_kills')),
+    relations.ACHIEVEMENT_TYPE.ARTIFACTS: lambda: heroes_values(hero_statistics('artifacts_had')),
+    relations.ACHIEVEMENT_TYPE.QUESTS: lambda: heroes_values(hero_statistics('quests_done')),
+    relations.ACHIEVEMENT_TYPE.DEATHS: lambda: heroes_values(hero_statistics('pve_deaths')),
+    relations.ACHIEVEMENT_TYPE.PVP_BATTLES_1X1: lambda: heroes_values(hero_statistics('pvp_battles_1x1_number')),
+    relations.ACHIEVEMENT_TYPE.PVP_VICTORIES_1X1: lambda: heroes_values(hero_pvp_victories_percents()),
+    relations.ACHIEVEMENT_TYPE.HABITS_HONOR: lambda: heroes_values(django_models.F('habit_honor')),
+    relations.ACHIEVEMENT_TYPE.HABITS_PEACEFULNESS: lambda: heroes_values(django_models.F('habit_peacefulness')),
+    relations.ACHIEVEMENT_TYPE.KEEPER_CARDS_USED: lambda: heroes_values(hero_statistics('cards_used')),
+    relations.ACHIEVEMENT_TYPE.KEEPER_CARDS_COMBINED: lambda: heroes_values(hero_statistics('cards_combined')),
+
+    relations.ACHIEVEMENT_TYPE.POLITICS_ACCEPTED_BILLS: lambda: (bills_models.Bill.objects.filter(state=bills_relations.BILL_STATE.ACCEPTED)
+                                                                                          .order_by()
+                                                                                          .values('owner_id')
+                                                                                          .annotate(value=django_models.Count('id')),
+                                                                 'owner_id'),
+    relations.ACHIEVEMENT_TYPE.POLITICS_VOTES_TOTAL: lambda: votes_values(),
+    relations.ACHIEVEMENT_TYPE.POLITICS_VOTES_FOR: lambda: votes_values(type=bills_relations.VOTE_TYPE.FOR),
+    relations.ACHIEVEMENT_TYPE.POLITICS_VOTES_AGAINST: lambda: votes_values(type=bills_relations.VOTE_TYPE.AGAINST),
+    relations.ACHIEVEMENT_TYPE.KEEPER_MIGHT: lambda: (accounts_models.Account.objects.annotate(value=django_models.F('might')), 'id')}
+
+
+def turns_for_years(years):
+    '''
+    minimum number of turns, for which hero age is not less, than years
+    '''
+    if years <= 0:
+        return 0
+
+    upper = 1
+
+    while game_turn.game_datetime(upper).year < years:
+        upper *= 2
+
+    lower = upper // 2
+
+    while lower < upper:
+        middle = (lower + upper) // 2
+
+        if game_turn.game_datetime(middle).year < years:
+            lower = middle + 1
+        else:
+            upper = middle
+
+    return upper
+
+
+def barrier_filter(achievement):
+    '''
+    filter of values, for which achievement.check(old_value=0, new_value=value) is True
+    '''
+    barrier = achievement.barrier
+
+    if achievement.type.is_TIME:
+        # value is age of hero in turns, and years are monotonic by turns
+        if barrier > 0:
+            return django_models.Q(value__gte=turns_for_years(barrier))
+
+        if barrier < 0:
+            return django_models.Q(value__lt=turns_for_years(barrier + 1))
+
+        return None
+
+    if barrier > 0:
+        return django_models.Q(value__gte=barrier)
+
+    if barrier < 0:
+        return django_models.Q(value__lte=barrier)
+
+    return None
+
+
+def qualifying_accounts_ids(achievement):
+    if achievement.type not in VALUES_QUERIES:
+        raise exceptions.UnknownSpreadingAchievementTypeError(achievement_type=achievement.type)
+
+    condition = barrier_filter(achievement)
+
+    if condition is None:
+        return set()
+
+    query, account_field = VALUES_QUERIES[achievement.type]()
+
+    return {account_id
+            for account_id in query.filter(condition).values_list(account_field, flat=True)
+            if account_id is not None}
+
+
+def give_achievement(achievement, accounts_ids):
+    '''
+    add achievement to accounts without notifications, returns number of accounts, which have got achievement
+
+    like AccountAchievementsPrototype.add_achievement, rewards are given even to accounts, which already have had achievement
+    '''
+    accounts_ids = sorted(accounts_ids)
+
+    rewards = achievement.rewards
+
+    given = 0
+
+    for i in range(0, len(accounts_ids), conf.settings.SPREADING_BATCH_SIZE):
+        batch = accounts_ids[i:i + conf.settings.SPREADING_BATCH_SIZE]
+
+        with django_transaction.atomic():
+            query = models.AccountAchievements.objects.select_for_update().filter(account_id__in=batch).order_by('account_id')
+
+            accounts_achievements = prototypes.AccountAchievementsPrototype.from_query(query)
+
+            updated = []
+
+            for account_achievements in accounts_achievements:
+                if account_achievements.has_achievement(achievement):
+                    continue
+
+                account_achievements.achievements.add_achievement(achievement)
+                account_achievements.achievements.serialize()
+                account_achievements._model.points = account_achievements.achievements.get_points()
+
+                updated.append(account_achievements._model)
+
+            models.AccountAchievements.objects.bulk_update(updated, ['achievements', 'points'])
+
+            collections_models.GiveItemTask.objects.bulk_create([collections_models.GiveItemTask(account_id=account_achievements.account_id,
+                                                                                                 item_id=item.id)
+                                                                 for account_achievements in accounts_achievements
+                                                                 for item in rewards])
+
+        given += len(updated)
+
+    return given
+
+
+def spread_achievement(achievement):
+    return give_achievement(achievement, qualifying_accounts_ids(achievement))
@@ -0,0 +1,156 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class SpreadingTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        self.account_1 = self.accounts_factory.create_account()
+        self.account_2 = self.accounts_factory.create_account()
+        self.account_3 = self.accounts_factory.create_account()
+
+        self.collection_1 = collections_prototypes.CollectionPrototype.create(caption='collection_1', description='description_1', approved=True)
+        self.kit_1 = collections_prototypes.KitPrototype.create(collection=self.collection_1, caption='kit_1', description='description_1', approved=True)
+        self.item_1_1 = collections_prototypes.ItemPrototype.create(kit=self.kit_1, caption='item_1_1', text='text_1_1', approved=True)
+
+    def create_achievement(self, type, barrier, **kwargs):
+        return prototypes.AchievementPrototype.create(group=relations.ACHIEVEMENT_GROUP.MONEY,
+                                                      type=type,
+                                                      barrier=barrier,
+                                                      points=10,
+                                                      caption='achievement',
+                                                      description='description',
+                                                      approved=True,
+                                                      **kwargs)
+
+    def change_hero(self, account, callback):
+        hero = heroes_logic.load_hero(account_id=account.id)
+        callback(hero)
+        heroes_logic.save_hero(hero)
+        return hero
+
+    def test_turns_for_years(self):
+        self.assertEqual(spreading.turns_for_years(0), 0)
+        self.assertEqual(spreading.turns_for_years(-1), 0)
+
+        for years in (1, 2, 5):
+            turns = spreading.turns_for_years(years)
+
+            self.assertEqual(game_turn.game_datetime(turns).year, years)
+            self.assertEqual(game_turn.game_datetime(turns - 1).year, years - 1)
+
+    def test_barrier_filter__zero_barrier(self):
+        self.assertEqual(spreading.barrier_filter(self.create_achievement(relations.ACHIEVEMENT_TYPE.MONEY, barrier=0)), None)
+        self.assertEqual(spreading.barrier_filter(self.create_achievement(relations.ACHIEVEMENT_TYPE.TIME, barrier=0)), None)
+
+    def test_all_types_supported(self):
+        for achievement_type in relations.ACHIEVEMENT_TYPE.records:
+            if achievement_type.source.is_NONE:
+                continue
+
+            self.assertIn(achievement_type, spreading.VALUES_QUERIES)
+
+    def test_qualifying_accounts_ids__unknown_type(self):
+        achievement = self.create_achievement(relations.ACHIEVEMENT_TYPE.LEGENDS, barrier=1)
+
+        with self.assertRaises(exceptions.UnknownSpreadingAchievementTypeError):
+            spreading.qualifying_accounts_ids(achievement)
+
+    def test_qualifying_accounts_ids(self):
+        self.change_hero(self.account_1, lambda hero: hero.statistics.change_pve_deaths(4))
+        self.change_hero(self.account_2, lambda hero: hero.statistics.change_pve_deaths(3))
+
+        achievement = self.create_achievement(relations.ACHIEVEMENT_TYPE.DEATHS, barrier=4)
+
+        self.assertEqual(spreading.qualifying_accounts_ids(achievement), {self.account_1.id})
+
+    def test_qualifying_accounts_ids__negative_barrier(self):
+        self.change_hero(self.account_1, lambda hero: hero.habit_honor.change(-200))
+        self.change_hero(self.account_2, lambda hero: hero.habit_honor.change(-100))
+
+        achievement = self.create_achievement(relations.ACHIEVEMENT_TYPE.HABITS_HONOR, barrier=-150)
+
+        self.assertEqual(spreading.qualifying_accounts_ids(achievement), {self.account_1.id})
+
+    def test_qualifying_accounts_ids__time(self):
+        turns = spreading.turns_for_years(2)
+
+        self.change_hero(self.account_1, lambda hero: setattr(hero, 'last_rare_operation_at_turn', hero.created_at_turn + turns))
+        self.change_hero(self.account_2, lambda hero: setattr(hero, 'last_rare_operation_at_turn', hero.created_at_turn + turns - 1))
+
+        achievement = self.create_achievement(relations.ACHIEVEMENT_TYPE.TIME, barrier=2)
+
+        self.assertEqual(spreading.qualifying_accounts_ids(achievement), {self.account_1.id})
+
+    def test_qualifying_accounts_ids__account_source(self):
+        accounts_prototypes.AccountPrototype.get_by_id(self.account_2.id).set_might(100)
+
+        achievement = self.create_achievement(relations.ACHIEVEMENT_TYPE.KEEPER_MIGHT, barrier=50)
+
+        self.assertEqual(spreading.qualifying_accounts_ids(achievement), {self.account_2.id})
+
+    def test_values_equal_to_hero_values(self):
+
+        def change(hero):
+            hero.statistics.change_pve_deaths(3)
+            hero.statistics.change_pve_kills(5)
+            hero.statistics.change_money(heroes_relations.MONEY_SOURCE.EARNED_FROM_LOOT, 7)
+            hero.statistics.change_money(heroes_relations.MONEY_SOURCE.EARNED_FROM_QUESTS, 11)
+            hero.statistics.change_artifacts_had(13)
+            hero.statistics.change_quests_done(17)
+            hero.statistics.change_cards_used(19)
+            hero.statistics.change_cards_combined(23)
+            hero.statistics.pvp_battles_1x1_number = heroes_conf.settings.MIN_PVP_BATTLES + 4
+            hero.statistics.pvp_battles_1x1_victories = 17
+            hero.habit_honor.change(29)
+            hero.habit_peacefulness.change(-31)
+            hero.last_rare_operation_at_turn = hero.created_at_turn + 100500
+
+        hero = self.change_hero(self.account_1, change)
+
+        for achievement_type in relations.ACHIEVEMENT_TYPE.records:
+            if not achievement_type.source.is_GAME_OBJECT or achievement_type.is_TIME:
+                continue
+
+            query, account_field = spreading.VALUES_QUERIES[achievement_type]()
+
+            value = query.filter(**{account_field: self.account_1.id}).values_list('value', flat=True)[0]
+
+            self.assertEqual(value, hero.get_achievement_type_value(achievement_type))
+
+    def test_give_achievement(self):
+        achievement = self.create_achievement(relations.ACHIEVEMENT_TYPE.DEATHS, barrier=4, item_1=self.item_1_1)
+
+        account_achievements_1 = prototypes.AccountAchievementsPrototype.get_by_account_id(self.account_1.id)
+        account_achievements_1.add_achievement(achievement, notify=False)
+        account_achievements_1.save()
+
+        with self.check_delta(collections_prototypes.GiveItemTaskPrototype._db_count, 2):
+            given = spreading.give_achievement(achievement, [self.account_1.id, self.account_2.id])
+
+        self.assertEqual(given, 1)
+
+        account_achievements_2 = prototypes.AccountAchievementsPrototype.get_by_account_id(self.account_2.id)
+        account_achievements_3 = prototypes.AccountAchievementsPrototype.get_by_account_id(self.account_3.id)
+
+        self.assertTrue(account_achievements_2.has_achievement(achievement))
+        self.assertEqual(account_achievements_2.points, achievement.points)
+
+        self.assertFalse(account_achievements_3.has_achievement(achievement))
+
+    @mock.patch('the_tale.accounts.achievements.conf.settings.SPREADING_BATCH_SIZE', 2)
+    def test_give_achievement__batches(self):
+        achievement = self.create_achievement(relations.ACHIEVEMENT_TYPE.DEATHS, barrier=4)
+
+        given = spreading.give_achievement(achievement, [self.account_1.id, self.account_2.id, self.account_3.id])
+
+        self.assertEqual(given, 3)
+
+        for account in (self.account_1, self.account_2, self.account_3):
+            self.assertTrue(prototypes.AccountAchievementsPrototype.get_by_account_id(account.id).has_achievement(achievement))
@@ -42,20 +42,12 @@ class Worker(utils_workers.BaseWorker):
 
             task.remove()
 
-    def get_achievements_source_iterator(self, achievement):
-        if achievement.type.source.is_ACCOUNT:
-            return (accounts_prototypes.AccountPrototype(model=account_model) for account_model in accounts_prototypes.AccountPrototype._db_all())
-
-        if achievement.type.source.is_GAME_OBJECT:
-            return (heroes_logic.load_hero(hero_model=hero_model) for hero_model in heroes_models.Hero.objects.all().iterator())
-
     def spread_achievement(self, achievement):
         self.logger.info('spread achievement %d' % achievement.id)
 
         if achievement.type.source.is_NONE:
             return
 
-        for source in self.get_achievements_source_iterator(achievement):
-            if not achievement.check(old_value=0, new_value=source.get_achievement_type_value(achievement.type)):
-                continue
-            self.add_achievement(achievement, source.account_id, notify=False)
+        given = spreading.spread_achievement(achievement)
+
+        self.logger.info('achievement %d spread to %d accounts' % (achievement.id, given))
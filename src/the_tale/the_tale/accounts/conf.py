@@ -73,4 +73,7 @@ settings = utils_app_settings.app_settings('ACCOUNTS',
                                            TT_PLAYERS_PROPERTIES_ENTRY_POINT='http://tt-players-properties:80/',
                                            TT_DATA_PROTECTOR_ENTRY_POINT='http://tt-data-protector:80/',
 
-                                           FREE_CARDS_FOR_REGISTRATION=10)
+                                           FREE_CARDS_FOR_REGISTRATION=10,
+
+                                           MIGHT_RECALCULATION_BATCH_SIZE=1000,
+                                           SETTINGS_MIGHT_RECALCULATED_AT_KEY='accounts might recalculated at timestamp')
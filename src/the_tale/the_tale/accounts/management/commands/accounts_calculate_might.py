@@ -10,5 +10,9 @@ class Command(utilities_base.Command):
 
     LOCKS = ['portal_commands']
 
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('-i', '--incremental', action='store_true', dest='incremental', help='recalculate mights only of accounts, changed since last recalculation')
+
     def _handle(self, *args, **options):
-        might.recalculate_accounts_might()
+        might.recalculate_accounts_might(full=not options['incremental'])
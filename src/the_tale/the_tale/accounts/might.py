@@ -4,41 +4,81 @@ import smart_imports
 smart_imports.all()
 
 
-def get_linguistic_entity_info(entity_id, contribution_type, source):
-    contributors = linguistics_prototypes.ContributionPrototype._db_filter(entity_id=entity_id,
+MIGHT_FROM_REFERRAL = 0.1
+
+
+def get_linguistic_entities_infos(entities_ids, contribution_type, source):
+    contributors = linguistics_prototypes.ContributionPrototype._db_filter(entity_id__in=entities_ids,
                                                                            source=source,
-                                                                           state=linguistics_relations.CONTRIBUTION_STATE.IN_GAME).order_by('created_at').values_list('type', 'account_id')
+                                                                           state=linguistics_relations.CONTRIBUTION_STATE.IN_GAME).order_by('created_at').values_list('entity_id', 'type', 'account_id')
 
-    author_type, author_id = contributors[0]
+    entities_contributors = {}
 
-    contributors_count = sum(1 for type, a_id in contributors if type == contribution_type)
+    for entity_id, type, account_id in contributors:
+        entities_contributors.setdefault(entity_id, []).append((type, account_id))
 
-    if author_type == contribution_type:
-        contributors_count -= 1
+    infos = {}
 
-    return author_id, contributors_count
+    for entity_id, entity_contributors in entities_contributors.items():
+        author_type, author_id = entity_contributors[0]
 
+        contributors_count = sum(1 for type, a_id in entity_contributors if type == contribution_type)
 
-def calculate_linguistics_migth(account_id, contribution_type, might_per_added_entity, might_per_edited_entity, source):
+        if author_type == contribution_type:
+            contributors_count -= 1
+
+        infos[entity_id] = (author_id, contributors_count)
+
+    return infos
+
+
+def get_linguistic_entity_info(entity_id, contribution_type, source):
+    return get_linguistic_entities_infos([entity_id], contribution_type, source)[entity_id]
+
+
+def calculate_linguistics_mights(accounts_ids, contribution_type, might_per_added_entity, might_per_edited_entity, source):
 
     state = linguistics_relations.CONTRIBUTION_STATE.IN_GAME
 
-    entities_ids = set(linguistics_prototypes.ContributionPrototype._db_filter(account_id=account_id,
-                                                                               type=contribution_type,
-                                                                               state=state,
-                                                                               source=source).values_list('entity_id', flat=True))
+    contributions = linguistics_prototypes.ContributionPrototype._db_filter(account_id__in=accounts_ids,
+                                                                            type=contribution_type,
+                                                                            state=state,
+                                                                            source=source).values_list('account_id', 'entity_id')
 
-    might = 0
+    accounts_entities = {}
 
-    for entity_id in entities_ids:
-        author_id, contributors_count = get_linguistic_entity_info(entity_id, contribution_type, source)
+    for account_id, entity_id in contributions:
+        accounts_entities.setdefault(account_id, set()).add(entity_id)
 
-        if author_id == account_id:
-            might += might_per_added_entity
-        else:
-            might += might_per_edited_entity / contributors_count
+    # infos of all entities are requested by single query instead of query per entity
+    infos = get_linguistic_entities_infos({entity_id for entities_ids in accounts_entities.values() for entity_id in entities_ids},
+                                          contribution_type,
+                                          source)
 
-    return might
+    mights = {}
+
+    for account_id, entities_ids in accounts_entities.items():
+        might = 0
+
+        for entity_id in entities_ids:
+            author_id, contributors_count = infos[entity_id]
+
+            if author_id == account_id:
+                might += might_per_added_entity
+            else:
+                might += might_per_edited_entity / contributors_count
+
+        mights[account_id] = might
+
+    return mights
+
+
+def calculate_linguistics_migth(account_id, contribution_type, might_per_added_entity, might_per_edited_entity, source):
+    return calculate_linguistics_mights([account_id],
+                                        contribution_type=contribution_type,
+                                        might_per_added_entity=might_per_added_entity,
+                                        might_per_edited_entity=might_per_edited_entity,
+                                        source=source).get(account_id, 0)
 
 
 def folclor_post_might(characters_count):
@@ -58,86 +98,228 @@ def folclor_post_might(characters_count):
     return might
 
 
-def calculate_might(account):  # pylint: disable=R0914
+def _add_counts(mights, counts, amount):
+    for account_id, count in counts:
+        mights[account_id] += count * amount
+
+
+def calculate_mights(accounts_ids):  # pylint: disable=R0914
+    '''
+    calculate mights of accounts by few grouping queries for all of them,
+    components are summed in the same order for every account, so result does not depend on size of accounts group
+    '''
 
-    MIGHT_FROM_REFERRAL = 0.1
+    accounts_ids = list(accounts_ids)
 
-    might = 0
+    mights = collections.defaultdict(int)
 
     forum_posts_query = forum_models.Post.objects.filter(thread__subcategory__restricted=False,
-                                                         author_id=account.id,
+                                                         author_id__in=accounts_ids,
                                                          state=forum_relations.POST_STATE.DEFAULT)
     forum_posts_query = forum_posts_query.exclude(thread__subcategory__uid=portal_conf.settings.FORUM_GAMES_SUBCATEGORY)
 
-    might += forum_posts_query.count() * relations.MIGHT_AMOUNT.FOR_FORUM_POST.amount
+    _add_counts(mights,
+                forum_posts_query.order_by().values('author_id').annotate(django_models.Count('id')).values_list('author_id', 'id__count'),
+                relations.MIGHT_AMOUNT.FOR_FORUM_POST.amount)
 
     forum_threads_query = forum_models.Thread.objects.filter(subcategory__restricted=False,
-                                                             author_id=account.id)
+                                                             author_id__in=accounts_ids)
     forum_threads_query = forum_threads_query.exclude(subcategory__uid=portal_conf.settings.FORUM_GAMES_SUBCATEGORY)
 
-    might += forum_threads_query.count() * relations.MIGHT_AMOUNT.FOR_FORUM_THREAD.amount
+    _add_counts(mights,
+                forum_threads_query.order_by().values('author_id').annotate(django_models.Count('id')).values_list('author_id', 'id__count'),
+                relations.MIGHT_AMOUNT.FOR_FORUM_THREAD.amount)
 
-    might += bills_models.Vote.objects.filter(owner_id=account.id).exclude(type=bills_relations.VOTE_TYPE.REFRAINED).count() * relations.MIGHT_AMOUNT.FOR_BILL_VOTE.amount
+    votes_query = bills_models.Vote.objects.filter(owner_id__in=accounts_ids).exclude(type=bills_relations.VOTE_TYPE.REFRAINED)
 
-    might += bills_models.Bill.objects.filter(owner_id=account.id, state=bills_relations.BILL_STATE.ACCEPTED).count() * relations.MIGHT_AMOUNT.FOR_BILL_ACCEPTED.amount
+    _add_counts(mights,
+                votes_query.order_by().values('owner_id').annotate(django_models.Count('id')).values_list('owner_id', 'id__count'),
+                relations.MIGHT_AMOUNT.FOR_BILL_VOTE.amount)
 
-    might += bills_models.Moderation.objects.filter(moderator_id=account.id).order_by('bill_id').distinct('bill_id').count() * relations.MIGHT_AMOUNT.FOR_BILL_MODERATION.amount
+    bills_query = bills_models.Bill.objects.filter(owner_id__in=accounts_ids, state=bills_relations.BILL_STATE.ACCEPTED)
 
-    might += calculate_linguistics_migth(account.id,
-                                         contribution_type=linguistics_relations.CONTRIBUTION_TYPE.WORD,
-                                         might_per_added_entity=relations.MIGHT_AMOUNT.FOR_ADDED_WORD_FOR_PLAYER.amount,
-                                         might_per_edited_entity=relations.MIGHT_AMOUNT.FOR_EDITED_WORD_FOR_PLAYER.amount,
-                                         source=linguistics_relations.CONTRIBUTION_SOURCE.PLAYER)
-    might += calculate_linguistics_migth(account.id,
-                                         contribution_type=linguistics_relations.CONTRIBUTION_TYPE.WORD,
-                                         might_per_added_entity=relations.MIGHT_AMOUNT.FOR_ADDED_WORD_FOR_MODERATOR.amount,
-                                         might_per_edited_entity=relations.MIGHT_AMOUNT.FOR_EDITED_WORD_FOR_MODERATOR.amount,
-                                         source=linguistics_relations.CONTRIBUTION_SOURCE.MODERATOR)
-    might += calculate_linguistics_migth(account.id,
-                                         contribution_type=linguistics_relations.CONTRIBUTION_TYPE.TEMPLATE,
-                                         might_per_added_entity=relations.MIGHT_AMOUNT.FOR_ADDED_TEMPLATE_FOR_PLAYER.amount,
-                                         might_per_edited_entity=relations.MIGHT_AMOUNT.FOR_EDITED_TEMPLATE_FOR_PLAYER.amount,
-                                         source=linguistics_relations.CONTRIBUTION_SOURCE.PLAYER)
-    might += calculate_linguistics_migth(account.id,
-                                         contribution_type=linguistics_relations.CONTRIBUTION_TYPE.TEMPLATE,
-                                         might_per_added_entity=relations.MIGHT_AMOUNT.FOR_ADDED_TEMPLATE_FOR_MODERATOR.amount,
-                                         might_per_edited_entity=relations.MIGHT_AMOUNT.FOR_EDITED_TEMPLATE_FOR_MODERATOR.amount,
-                                         source=linguistics_relations.CONTRIBUTION_SOURCE.MODERATOR)
+    _add_counts(mights,
+                bills_query.order_by().values('owner_id').annotate(django_models.Count('id')).values_list('owner_id', 'id__count'),
+                relations.MIGHT_AMOUNT.FOR_BILL_ACCEPTED.amount)
 
-    folclor_posts = blogs_prototypes.PostPrototype.from_query(blogs_prototypes.PostPrototype._db_filter(author_id=account.id, state=blogs_relations.POST_STATE.ACCEPTED))
-    folclor_texts = (django_html.strip_tags(post.text_html) for post in folclor_posts)
+    moderations_query = bills_models.Moderation.objects.filter(moderator_id__in=accounts_ids)
 
-    for text in folclor_texts:
-        characters_count = len(text)
-        might += folclor_post_might(characters_count)
+    _add_counts(mights,
+                moderations_query.order_by().values('moderator_id').annotate(django_models.Count('bill_id', distinct=True)).values_list('moderator_id', 'bill_id__count'),
+                relations.MIGHT_AMOUNT.FOR_BILL_MODERATION.amount)
 
-    referrals_mights = prototypes.AccountPrototype._model_class.objects.filter(referral_of=account.id).aggregate(django_models.Sum('might'))['might__sum']
+    for contribution_type, source, added_might, edited_might in ((linguistics_relations.CONTRIBUTION_TYPE.WORD,
+                                                                  linguistics_relations.CONTRIBUTION_SOURCE.PLAYER,
+                                                                  relations.MIGHT_AMOUNT.FOR_ADDED_WORD_FOR_PLAYER,
+                                                                  relations.MIGHT_AMOUNT.FOR_EDITED_WORD_FOR_PLAYER),
+                                                                 (linguistics_relations.CONTRIBUTION_TYPE.WORD,
+                                                                  linguistics_relations.CONTRIBUTION_SOURCE.MODERATOR,
+                                                                  relations.MIGHT_AMOUNT.FOR_ADDED_WORD_FOR_MODERATOR,
+                                                                  relations.MIGHT_AMOUNT.FOR_EDITED_WORD_FOR_MODERATOR),
+                                                                 (linguistics_relations.CONTRIBUTION_TYPE.TEMPLATE,
+                                                                  linguistics_relations.CONTRIBUTION_SOURCE.PLAYER,
+                                                                  relations.MIGHT_AMOUNT.FOR_ADDED_TEMPLATE_FOR_PLAYER,
+                                                                  relations.MIGHT_AMOUNT.FOR_EDITED_TEMPLATE_FOR_PLAYER),
+                                                                 (linguistics_relations.CONTRIBUTION_TYPE.TEMPLATE,
+                                                                  linguistics_relations.CONTRIBUTION_SOURCE.MODERATOR,
+                                                                  relations.MIGHT_AMOUNT.FOR_ADDED_TEMPLATE_FOR_MODERATOR,
+                                                                  relations.MIGHT_AMOUNT.FOR_EDITED_TEMPLATE_FOR_MODERATOR)):
+        linguistics_mights = calculate_linguistics_mights(accounts_ids,
+                                                          contribution_type=contribution_type,
+                                                          might_per_added_entity=added_might.amount,
+                                                          might_per_edited_entity=edited_might.amount,
+                                                          source=source)
 
-    might += referrals_mights * MIGHT_FROM_REFERRAL if referrals_mights else 0
+        for account_id, might in linguistics_mights.items():
+            mights[account_id] += might
 
-    for award_type in relations.AWARD_TYPE.records:
-        might += models.Award.objects.filter(account_id=account.id, type=award_type).count() * relations.MIGHT_AMOUNT.index_award[award_type][0].amount
+    folclor_posts = blogs_prototypes.PostPrototype.from_query(blogs_prototypes.PostPrototype._db_filter(author_id__in=accounts_ids,
+                                                                                                        state=blogs_relations.POST_STATE.ACCEPTED))
 
-    return might
+    for post in folclor_posts:
+        characters_count = len(django_html.strip_tags(post.text_html))
+        mights[post._model.author_id] += folclor_post_might(characters_count)
 
+    referrals_query = prototypes.AccountPrototype._model_class.objects.filter(referral_of_id__in=accounts_ids)
 
-def recalculate_account_might(account):
-    new_might = calculate_might(account)
+    for account_id, referrals_mights in referrals_query.order_by().values('referral_of_id').annotate(django_models.Sum('might')).values_list('referral_of_id', 'might__sum'):
+        mights[account_id] += referrals_mights * MIGHT_FROM_REFERRAL if referrals_mights else 0
+
+    awards_counts = collections.Counter()
+
+    awards_query = models.Award.objects.filter(account_id__in=accounts_ids)
 
+    for account_id, award_type, count in awards_query.order_by().values('account_id', 'type').annotate(django_models.Count('id')).values_list('account_id', 'type', 'id__count'):
+        awards_counts[(account_id, award_type)] = count
+
+    for account_id in accounts_ids:
+        for award_type in relations.AWARD_TYPE.records:
+            mights[account_id] += awards_counts[(account_id, award_type)] * relations.MIGHT_AMOUNT.index_award[award_type][0].amount
+
+    return {account_id: mights[account_id] for account_id in accounts_ids}
+
+
+def calculate_might(account):
+    return calculate_mights([account.id])[account.id]
+
+
+def update_account_might(account, new_might):
     if account.might == new_might:
-        return
+        return False
 
     account.set_might(new_might)
     account.cmd_update_hero()
 
     portal_logic.sync_with_discord(account)
 
+    return True
+
+
+def recalculate_account_might(account):
+    update_account_might(account, calculate_might(account))
+
+
+def recalculate_mights(accounts_ids):
+    '''
+    recalculate mights of live accounts by batches,
+    might of account depends on mights of its referrals, so referrers of changed accounts are recalculated after them
+    '''
+
+    accounts_ids = sorted(set(accounts_ids))
+
+    changed_number = 0
+
+    while accounts_ids:
+        changed_ids = []
+
+        for i in range(0, len(accounts_ids), conf.settings.MIGHT_RECALCULATION_BATCH_SIZE):
+            batch_ids = accounts_ids[i:i + conf.settings.MIGHT_RECALCULATION_BATCH_SIZE]
+
+            accounts_models = prototypes.AccountPrototype.live_query().filter(id__in=batch_ids)
+
+            accounts = [prototypes.AccountPrototype(model=account_model) for account_model in accounts_models]
+
+            mights = calculate_mights([account.id for account in accounts])
+
+            for account in accounts:
+                if update_account_might(account, mights[account.id]):
+                    changed_ids.append(account.id)
+
+        changed_number += len(changed_ids)
+
+        referrers_query = prototypes.AccountPrototype._model_class.objects.filter(id__in=changed_ids, referral_of_id__isnull=False)
+
+        accounts_ids = sorted(set(referrers_query.values_list('referral_of_id', flat=True)))
+
+    return changed_number
+
+
+def touched_accounts_ids(since):
+    '''
+    accounts, which might components could change after specified time
+
+    deleted records and changes of records without modification time are not tracked,
+    they are processed by full recalculation
+    '''
+
+    accounts_ids = set()
+
+    accounts_ids.update(forum_models.Post.objects.filter(django_models.Q(created_at__gte=since) |
+                                                         django_models.Q(updated_at__gte=since)).values_list('author_id', flat=True))
+    accounts_ids.update(forum_models.Thread.objects.filter(created_at__gte=since).values_list('author_id', flat=True))
+
+    accounts_ids.update(bills_models.Vote.objects.filter(created_at__gte=since).values_list('owner_id', flat=True))
+    accounts_ids.update(bills_models.Bill.objects.filter(updated_at__gte=since).values_list('owner_id', flat=True))
+    accounts_ids.update(bills_models.Moderation.objects.filter(created_at__gte=since).values_list('moderator_id', flat=True))
+
+    # new contribution changes might of all contributors of entity
+    entities = linguistics_prototypes.ContributionPrototype._db_filter(created_at__gte=since).values_list('entity_id', 'source')
+
+    for source in linguistics_relations.CONTRIBUTION_SOURCE.records:
+        entities_ids = {entity_id for entity_id, entity_source in entities if entity_source == source}
+
+        if not entities_ids:
+            continue
+
+        accounts_ids.update(linguistics_prototypes.ContributionPrototype._db_filter(entity_id__in=entities_ids,
+                                                                                    source=source).values_list('account_id', flat=True))
+
+    # state of contributions is changed by update without modification time, when word or template is changed,
+    # so all contributors of changed entities are processed
+    for contribution_type, entities_query in ((linguistics_relations.CONTRIBUTION_TYPE.WORD, linguistics_models.Word.objects),
+                                              (linguistics_relations.CONTRIBUTION_TYPE.TEMPLATE, linguistics_models.Template.objects)):
+        entities_ids = entities_query.filter(updated_at__gte=since).values('id')
+
+        accounts_ids.update(linguistics_prototypes.ContributionPrototype._db_filter(type=contribution_type,
+                                                                                    entity_id__in=entities_ids).values_list('account_id', flat=True))
+
+    accounts_ids.update(blogs_models.Post.objects.filter(updated_at__gte=since).values_list('author_id', flat=True))
+
+    accounts_ids.update(models.Award.objects.filter(updated_at__gte=since).values_list('account_id', flat=True))
+
+    accounts_ids.discard(None)
+
+    return accounts_ids
+
+
+def recalculate_accounts_might(full=True):
+    '''
+    full recalculation processes all live accounts,
+    incremental one processes only accounts, touched since previous recalculation
+    '''
+
+    started_at = time.time()
+
+    recalculated_at = global_settings.get(conf.settings.SETTINGS_MIGHT_RECALCULATED_AT_KEY)
+
+    if full or recalculated_at is None:
+        accounts_ids = prototypes.AccountPrototype.live_query().values_list('id', flat=True)
+    else:
+        accounts_ids = touched_accounts_ids(since=datetime.datetime.fromtimestamp(float(recalculated_at)))
 
-def recalculate_accounts_might():
+    recalculate_mights(accounts_ids)
 
-    for account_model in prototypes.AccountPrototype.live_query():
-        account = prototypes.AccountPrototype(model=account_model)
-        recalculate_account_might(account)
+    global_settings[conf.settings.SETTINGS_MIGHT_RECALCULATED_AT_KEY] = str(started_at)
 
     recalculate_folclor_rating()
 
@@ -405,6 +405,95 @@ class RecalculateAccountMight(utils_testcase.TestCase):
         self.assertFalse(sync_with_discord.called)
 
 
+class RecalculateMightsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        self.account_1 = self.accounts_factory.create_account()
+        self.account_2 = self.accounts_factory.create_account(referral_of_id=self.account_1.id)
+        self.account_3 = self.accounts_factory.create_account()
+
+    def test_calculate_mights(self):
+        models.Award.objects.create(account=self.account_1._model, type=relations.AWARD_TYPE.BUG_MINOR)
+        models.Award.objects.create(account=self.account_2._model, type=relations.AWARD_TYPE.BUG_MINOR)
+        models.Award.objects.create(account=self.account_2._model, type=relations.AWARD_TYPE.BUG_MINOR)
+
+        mights = might.calculate_mights([self.account_1.id, self.account_2.id, self.account_3.id])
+
+        self.assertEqual(mights, {self.account_1.id: might.calculate_might(self.account_1),
+                                  self.account_2.id: might.calculate_might(self.account_2),
+                                  self.account_3.id: 0})
+
+        self.assertEqual(mights[self.account_2.id], mights[self.account_1.id] * 2)
+
+    @mock.patch('the_tale.portal.logic.sync_with_discord', mock.Mock())
+    @mock.patch('the_tale.accounts.conf.settings.MIGHT_RECALCULATION_BATCH_SIZE', 1)
+    def test_recalculate_mights__referrers(self):
+        models.Award.objects.create(account=self.account_2._model, type=relations.AWARD_TYPE.BUG_MINOR)
+
+        changed_number = might.recalculate_mights([self.account_2.id])
+
+        self.assertEqual(changed_number, 2)
+
+        account_2_might = models.Account.objects.get(id=self.account_2.id).might
+
+        self.assertTrue(account_2_might > 0)
+        self.assertEqual(models.Account.objects.get(id=self.account_1.id).might, account_2_might * might.MIGHT_FROM_REFERRAL)
+        self.assertEqual(models.Account.objects.get(id=self.account_3.id).might, 0)
+
+    def test_touched_accounts_ids(self):
+        since = datetime.datetime.now()
+
+        self.assertEqual(might.touched_accounts_ids(since), set())
+
+        models.Award.objects.create(account=self.account_3._model, type=relations.AWARD_TYPE.BUG_MINOR)
+
+        self.assertEqual(might.touched_accounts_ids(since), {self.account_3.id})
+
+        self.assertEqual(might.touched_accounts_ids(datetime.datetime.now()), set())
+
+    def test_touched_accounts_ids__changed_word(self):
+        word = linguistics_prototypes.WordPrototype.create(utg_words.Word.create_test_word(type=utg_relations.WORD_TYPE.NOUN, prefix='w-1-', only_required=True))
+
+        linguistics_prototypes.ContributionPrototype.create(type=linguistics_relations.CONTRIBUTION_TYPE.WORD,
+                                                            account_id=self.account_3.id,
+                                                            entity_id=word.id,
+                                                            source=linguistics_relations.CONTRIBUTION_SOURCE.PLAYER,
+                                                            state=linguistics_relations.CONTRIBUTION_STATE.ON_REVIEW)
+
+        since = datetime.datetime.now()
+
+        self.assertEqual(might.touched_accounts_ids(since), set())
+
+        # contributions state is changed without changing of their modification time
+        word.state = linguistics_relations.WORD_STATE.IN_GAME
+        word.save()
+
+        linguistics_prototypes.ContributionPrototype._db_filter(type=linguistics_relations.CONTRIBUTION_TYPE.WORD,
+                                                                entity_id=word.id).update(state=linguistics_relations.CONTRIBUTION_STATE.IN_GAME)
+
+        self.assertEqual(might.touched_accounts_ids(since), {self.account_3.id})
+
+    @mock.patch('the_tale.portal.logic.sync_with_discord', mock.Mock())
+    def test_recalculate_accounts_might__incremental(self):
+        might.recalculate_accounts_might(full=False)
+
+        models.Award.objects.create(account=self.account_3._model, type=relations.AWARD_TYPE.BUG_MINOR)
+
+        with mock.patch('the_tale.accounts.might.recalculate_mights') as recalculate_mights:
+            might.recalculate_accounts_might(full=False)
+
+        self.assertEqual(set(recalculate_mights.call_args[0][0]), {self.account_3.id})
+
+        with mock.patch('the_tale.accounts.might.recalculate_mights') as recalculate_mights:
+            might.recalculate_accounts_might(full=True)
+
+        self.assertEqual(set(recalculate_mights.call_args[0][0]), {self.account_1.id, self.account_2.id, self.account_3.id})
+
+
 class CalculateMightHelpersTests(utils_testcase.TestCase):
 
     def setUp(self):
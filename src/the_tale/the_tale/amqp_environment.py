@@ -28,8 +28,10 @@ class Environment(BaseEnvironment):
         self.workers.linguistics_manager = linguistics_manager.Worker(name='linguistics_manager')
 
         self.workers.supervisor = supervisor.Worker(name='supervisor')
-        self.workers.logic_1 = logic.Worker(name='logic_1')
-        self.workers.logic_2 = logic.Worker(name='logic_2')
+
+        for logic_worker_name in logic.workers_names():
+            setattr(self.workers, logic_worker_name, logic.Worker(name=logic_worker_name))
+
         self.workers.turns_loop = turns_loop.Worker(name='turns_loop')
         self.workers.quests_generator = quests_generator.Worker(name='quests_generator')
 
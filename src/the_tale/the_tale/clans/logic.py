@@ -136,19 +136,8 @@ def create_clan(owner, abbr, name, motto, description):
                                         message='Гильдия {guild} создана Хранителем {keeper}'.format(guild=clan.name,
                                                                                                      keeper=owner.nick_verbose))
 
-    tt_services.currencies.cmd_change_balance(account_id=clan.id,
-                                              type='initial',
-                                              amount=tt_clans_constants.INITIAL_POINTS,
-                                              asynchronous=False,
-                                              autocommit=True,
-                                              currency=relations.CURRENCY.ACTION_POINTS)
-
-    tt_services.currencies.cmd_change_balance(account_id=clan.id,
-                                              type='initial',
-                                              amount=tt_clans_constants.INITIAL_FREE_QUESTS,
-                                              asynchronous=False,
-                                              autocommit=True,
-                                              currency=relations.CURRENCY.FREE_QUESTS)
+    tt_services.currencies.cmd_change_balances([(clan.id, 'initial', tt_clans_constants.INITIAL_POINTS, relations.CURRENCY.ACTION_POINTS),
+                                                (clan.id, 'initial', tt_clans_constants.INITIAL_FREE_QUESTS, relations.CURRENCY.FREE_QUESTS)])
 
     return clan
 
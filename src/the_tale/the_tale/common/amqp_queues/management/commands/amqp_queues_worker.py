@@ -33,6 +33,8 @@ class Command(utilities_base.Command):
         self._handle_worker(worker)
 
     def _handle_worker(self, worker):
+        amqp_queues_workers.mark_worker_process()
+
         try:
             signal.signal(signal.SIGTERM, worker.on_sigterm)
 
@@ -6,6 +6,32 @@ smart_imports.all()
 
 _NEXT_WORKER_NUMBER = 0
 
+# process is marked, when worker is started in it
+# unlike processes of web server, processes of workers can be forked
+_WORKER_PROCESS = False
+
+
+def mark_worker_process():
+    global _WORKER_PROCESS
+    _WORKER_PROCESS = True
+
+
+def is_worker_process():
+    return _WORKER_PROCESS
+
+
+# children of pools, forked by workers, are daemonic and can not fork their own children
+_POOL_CHILD_PROCESS = False
+
+
+def mark_pool_child_process():
+    global _POOL_CHILD_PROCESS
+    _POOL_CHILD_PROCESS = True
+
+
+def is_pool_child_process():
+    return _POOL_CHILD_PROCESS
+
 
 class BaseWorker(object):
     STOP_SIGNAL_REQUIRED = True
@@ -54,7 +80,6 @@ class BaseWorker(object):
                 self.logger.info('do not set stop_required flag: worker does not process stop signals')
 
     def run(self):
-        from the_tale.common.settings import settings
 
         while not self.exception_raised and not self.stop_required:
             try:
@@ -63,11 +88,11 @@ class BaseWorker(object):
                 cmd = self.command_queue.get(block=True, timeout=self.GET_CMD_TIMEOUT)
 
                 if self.REFRESH_SETTINGS:
-                    settings.refresh()
+                    utils_storage.sync_all()
                 self.process_cmd(cmd.payload)
             except queue.Empty:
                 if self.REFRESH_SETTINGS:
-                    settings.refresh()
+                    utils_storage.sync_all()
                 self.process_no_cmd()
                 if self.NO_CMD_TIMEOUT:
                     time.sleep(self.NO_CMD_TIMEOUT)
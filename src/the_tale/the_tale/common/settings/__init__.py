@@ -10,6 +10,9 @@ class Settings(object):
         self.data = {}
         self.initialized = False
 
+        # changed on every change of data, allows to skip versions checks (see utils.storage.BaseStorage.sync)
+        self.generation = 0
+
     def _load_data(self):
         from . import models
         return dict(models.Setting.objects.all().values_list('key', 'value'))
@@ -17,6 +20,7 @@ class Settings(object):
     def refresh(self, force=False):
         self.initialized = True
         self.data = self._load_data()
+        self.generation += 1
 
     def __getitem__(self, key):
         if not isinstance(key, str):
@@ -52,6 +56,7 @@ class Settings(object):
                 models.Setting.objects.create(key=key, value=value)
 
         self.data[key] = value
+        self.generation += 1
 
     def __delitem__(self, key):
         from . import models
@@ -68,6 +73,7 @@ class Settings(object):
             raise exceptions.KeyNotInSettings(key=key)
 
         del self.data[key]
+        self.generation += 1
 
     def __contains__(self, key):
 
@@ -9,8 +9,6 @@ class SettingsMiddleware(object):
         self.get_response = get_response
 
     def __call__(self, request):
-        from . import settings
-
-        settings.refresh()
-
-        return self.get_response(request)
+        # settings are loaded by one query and storages versions are checked once per request
+        with utils_storage.synchronized():
+            return self.get_response(request)
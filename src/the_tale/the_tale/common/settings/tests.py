@@ -82,3 +82,18 @@ class SettingsTest(utils_testcase.TestCase):
         del self.settings['key']
         self.assertEqual(models.Setting.objects.all().count(), 0)
         self.assertEqual(self.settings.get('key'), None)
+
+    def test_generation(self):
+        generation = self.settings.generation
+
+        self.settings.refresh()
+        self.assertEqual(self.settings.generation, generation + 1)
+
+        self.settings['key'] = 'value'
+        self.assertEqual(self.settings.generation, generation + 2)
+
+        del self.settings['key']
+        self.assertEqual(self.settings.generation, generation + 3)
+
+        self.settings.get('key')
+        self.assertEqual(self.settings.generation, generation + 3)
@@ -30,6 +30,16 @@ class Restrictions:
         return not self.__eq__(other)
 
 
+def currency_value(currency):
+    if isinstance(currency, int):
+        return currency
+
+    if currency is None:
+        return 0
+
+    return currency.value
+
+
 class Client(client.Client):
     __slots__ = ('transaction_lifetime',)
 
@@ -50,12 +60,7 @@ class Client(client.Client):
         return result
 
     def cmd_balance(self, account_id, currency=None):
-        if isinstance(currency, int):
-            pass
-        elif currency is None:
-            currency = 0
-        else:
-            currency = currency.value
+        currency = currency_value(currency)
 
         return self.cmd_balances(accounts_ids=(account_id,))[account_id].get(currency, 0)
 
@@ -72,12 +77,7 @@ class Client(client.Client):
         if transaction_lifetime is None:
             transaction_lifetime = self.transaction_lifetime
 
-        if isinstance(currency, int):
-            pass
-        elif currency is None:
-            currency = 0
-        else:
-            currency = currency.value
+        currency = currency_value(currency)
 
         if asynchronous and not autocommit:
             raise exceptions.AutocommitRequiredForAsyncTransaction
@@ -110,6 +110,33 @@ class Client(client.Client):
 
         return True, None
 
+    def cmd_change_balances(self, changes, restrictions=Restrictions()):
+        '''
+        changes: [(account_id, type, amount, currency)]
+
+        all changes are applied in single request and single committed transaction,
+        restrictions are checked for resulting balances of every (account_id, currency) pair
+        '''
+
+        applied_operations = [tt_protocol_bank_pb2.Operation(account_id=account_id,
+                                                             currency=currency_value(currency),
+                                                             amount=amount,
+                                                             type=type)
+                              for account_id, type, amount, currency in changes]
+
+        if not applied_operations:
+            return True, None
+
+        try:
+            answer = operations.sync_request(url=self.url('accounts/change-balances'),
+                                             data=tt_protocol_bank_pb2.ChangeBalancesRequest(operations=applied_operations,
+                                                                                             restrictions=s11n.to_json(restrictions.serialize())),
+                                             AnswerType=tt_protocol_bank_pb2.ChangeBalancesResponse)
+        except exceptions.TTAPIUnexpectedAPIStatus:
+            return False, None
+
+        return True, answer.transaction_id
+
     def cmd_commit_transaction(self, transaction_id):
         operations.async_request(url=self.url('transactions/commit'),
                                  data=tt_protocol_bank_pb2.CommitTransactionRequest(transaction_id=transaction_id))
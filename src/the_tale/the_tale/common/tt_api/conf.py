@@ -0,0 +1,10 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+settings = utils_app_settings.app_settings('TT_API',
+                                           SENDER_THREADS=4,
+                                           MAX_BATCH_SIZE=100,
+                                           METRICS_REPORT_PERIOD=60)
@@ -26,6 +26,12 @@ class Client(client.Client):
 
         return answer.version
 
+    def cmd_request_version(self, account_id, callback):
+        operations.async_request(url=self.url('version'),
+                                 data=tt_protocol_diary_pb2.VersionRequest(account_id=account_id),
+                                 AnswerType=tt_protocol_diary_pb2.VersionResponse,
+                                 callback=lambda answer: callback(answer.version))
+
     def cmd_diary(self, account_id):
         answer = operations.sync_request(url=self.url('diary'),
                                          data=tt_protocol_diary_pb2.DiaryRequest(account_id=account_id),
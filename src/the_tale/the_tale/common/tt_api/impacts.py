@@ -40,6 +40,9 @@ class Impact:
         raise NotImplementedError
 
 
+operations.register_batched_request(tt_protocol_impacts_pb2.AddImpactsRequest, 'impacts')
+
+
 class Client(client.Client):
     __slots__ = ('impact_type', 'impact_class')
 
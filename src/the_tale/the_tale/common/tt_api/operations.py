@@ -4,9 +4,18 @@ import smart_imports
 smart_imports.all()
 
 
-THREAD = None
+# async requests are sent by pool of sender threads
+# every service is served by single thread (with its own queue), so requests to service are sent in order of creation
+THREADS = []
 
-QUEUE = queue.Queue()
+SERVICES_THREADS = {}
+
+THREADS_LOCK = threading.Lock()
+
+# request class -> name of repeated field, by which requests to the same url can be merged
+BATCHED_REQUESTS = {}
+
+SESSIONS = threading.local()
 
 
 @dataclasses.dataclass
@@ -19,20 +28,120 @@ class PendingReuqest:
     callback: Callable
 
 
+class ServiceMetrics:
+    __slots__ = ('requests', 'errors', 'batched', 'latency_total', 'latency_max')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.batched = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def register_request(self, latency, success):
+        self.requests += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+        if not success:
+            self.errors += 1
+
+
+METRICS = {}
+
+METRICS_LOCK = threading.Lock()
+
+
+def service_for_url(url):
+    parts = urllib.parse.urlsplit(url)
+    return '%s://%s' % (parts.scheme, parts.netloc)
+
+
+def get_session(service):
+    # requests.Session is not thread safe, so every thread has its own sessions
+    if not hasattr(SESSIONS, 'sessions'):
+        SESSIONS.sessions = {}
+
+    if service not in SESSIONS.sessions:
+        session = requests.Session()
+        session.mount(service, requests.adapters.HTTPAdapter(pool_connections=1,
+                                                             pool_maxsize=1))
+        SESSIONS.sessions[service] = session
+
+    return SESSIONS.sessions[service]
+
+
+def register_metrics(service, latency, success, batched=0):
+    with METRICS_LOCK:
+        if service not in METRICS:
+            METRICS[service] = ServiceMetrics()
+
+        metrics = METRICS[service]
+
+        metrics.register_request(latency, success)
+        metrics.batched += batched
+
+
+def pop_metrics():
+    global METRICS
+
+    with METRICS_LOCK:
+        metrics = METRICS
+        METRICS = {}
+
+    return metrics
+
+
+def queues_depths():
+    with THREADS_LOCK:
+        return {thread.name: thread.queue.qsize() for thread in THREADS}
+
+
+def report_metrics(logger):
+    for service, metrics in sorted(pop_metrics().items()):
+        logger.info('[tt_api] %s: requests: %d, errors: %d, batched: %d, latency mean: %.3f, max: %.3f',
+                    service,
+                    metrics.requests,
+                    metrics.errors,
+                    metrics.batched,
+                    metrics.latency_total / metrics.requests if metrics.requests else 0,
+                    metrics.latency_max)
+
+    for name, depth in sorted(queues_depths().items()):
+        logger.info('[tt_api] %s queue: %d', name, depth)
+
+
 def sync_request(url, data, AnswerType=None):
-    response = requests.post(url, data=data.SerializeToString())
+    with utils_profiler.phase('tt_api'):
+        return _sync_request(url, data, AnswerType=AnswerType)
+
+
+def _sync_request(url, data, AnswerType=None, batched=0):
+    service = service_for_url(url)
+
+    started_at = time.time()
+
+    success = False
+
+    try:
+        response = get_session(service).post(url, data=data.SerializeToString())
+
+        if response.status_code != 200:
+            raise exceptions.TTAPIUnexpectedHTTPStatus(url=url, status=response.status_code)
 
-    if response.status_code != 200:
-        raise exceptions.TTAPIUnexpectedHTTPStatus(url=url, status=response.status_code)
+        response_data = tt_protocol_base_pb2.ApiResponse.FromString(response.content)
 
-    response_data = tt_protocol_base_pb2.ApiResponse.FromString(response.content)
+        if response_data.status != tt_protocol_base_pb2.ApiResponse.SUCCESS:
+            raise exceptions.TTAPIUnexpectedAPIStatus(url=url,
+                                                      status=response_data.status,
+                                                      code=response_data.error.code,
+                                                      message=response_data.error.message,
+                                                      details=response_data.error.details)
 
-    if response_data.status != tt_protocol_base_pb2.ApiResponse.SUCCESS:
-        raise exceptions.TTAPIUnexpectedAPIStatus(url=url,
-                                                  status=response_data.status,
-                                                  code=response_data.error.code,
-                                                  message=response_data.error.message,
-                                                  details=response_data.error.details)
+        success = True
+
+    finally:
+        register_metrics(service, time.time() - started_at, success=success, batched=batched)
 
     if AnswerType is None:
         return None
@@ -43,39 +152,147 @@ def sync_request(url, data, AnswerType=None):
     return answer
 
 
-def async_request(url, data, AnswerType=None, callback=lambda answer: None):
-    global THREAD
+def register_batched_request(request_class, field):
+    BATCHED_REQUESTS[request_class] = field
+
 
+def async_request(url, data, AnswerType=None, callback=lambda answer: None):
     if django_settings.TESTS_RUNNING:
         answer = sync_request(url, data, AnswerType=AnswerType)
         callback(answer)
         return
 
-    if THREAD is None:
-        THREAD = SenderThread()
-        THREAD.start()
+    get_sender_thread(service_for_url(url)).queue.put(PendingReuqest(url, data, AnswerType, callback))
+
+
+def get_sender_thread(service):
+    with THREADS_LOCK:
+        if service not in SERVICES_THREADS:
+            if len(THREADS) < conf.settings.SENDER_THREADS:
+                thread = SenderThread(number=len(THREADS))
+                thread.start()
+                THREADS.append(thread)
+
+            # services are distributed between threads in order of first request
+            SERVICES_THREADS[service] = THREADS[len(SERVICES_THREADS) % len(THREADS)]
+
+        return SERVICES_THREADS[service]
+
+
+def wait_async_requests():
+    with THREADS_LOCK:
+        threads = list(THREADS)
+
+    for thread in threads:
+        thread.queue.join()
+
+
+def reset_after_fork():
+    # sender threads do not exist in forked process
+    # and their requests must be sent only by parent process
+    # connections of sessions are inherited from parent process and can not be shared
+    global THREADS
+    global SERVICES_THREADS
+    global THREADS_LOCK
+    global SESSIONS
+    global METRICS
+    global METRICS_LOCK
+
+    THREADS = []
+    SERVICES_THREADS = {}
+    THREADS_LOCK = threading.Lock()
+    SESSIONS = threading.local()
+    METRICS = {}
+    METRICS_LOCK = threading.Lock()
+
+
+os.register_at_fork(after_in_child=reset_after_fork)
+
+
+def merge_requests(requests_batch):
+    first_request = requests_batch[0]
 
-    QUEUE.put(PendingReuqest(url, data, AnswerType, callback))
+    if len(requests_batch) == 1:
+        return first_request.data
+
+    field = BATCHED_REQUESTS[first_request.data.__class__]
+
+    data = first_request.data.__class__()
+
+    for request in requests_batch:
+        getattr(data, field).extend(getattr(request.data, field))
+
+    return data
+
+
+def can_be_batched(request, next_request):
+    return (request.data.__class__ in BATCHED_REQUESTS and
+            request.answer_type is None and
+            next_request.answer_type is None and
+            request.url == next_request.url and
+            request.data.__class__ is next_request.data.__class__)
 
 
 class SenderThread(threading.Thread):
 
-    def __init__(self):
-        super().__init__(name='tt_api_sender', daemon=True)
+    def __init__(self, number):
+        super().__init__(name='tt_api_sender_%d' % number, daemon=True)
         self.logger = logging.getLogger(__name__)
+        self.queue = queue.Queue()
+        self.next_request = None
+        self.metrics_reported_at = time.time()
+
+    def get_requests_batch(self):
+        if self.next_request is not None:
+            request = self.next_request
+            self.next_request = None
+        else:
+            request = self.queue.get()
+
+        batch = [request]
+
+        if request.data.__class__ not in BATCHED_REQUESTS:
+            return batch
+
+        while len(batch) < conf.settings.MAX_BATCH_SIZE:
+            try:
+                next_request = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if not can_be_batched(request, next_request):
+                # request will be processed on the next iteration, so order of requests is not changed
+                self.next_request = next_request
+                break
+
+            batch.append(next_request)
+
+        return batch
 
     def run(self):
         while True:
+            batch = self.get_requests_batch()
+
             try:
-                request = QUEUE.get()
+                self.logger.info('send to url %(url)s (requests: %(number)d)', {'url': batch[0].url, 'number': len(batch)})
 
-                self.logger.info('send to url %(url)s', {'url': request.url})
+                answer = _sync_request(batch[0].url,
+                                       merge_requests(batch),
+                                       batch[0].answer_type,
+                                       batched=len(batch) - 1)
+
+                for request in batch:
+                    request.callback(answer)
 
-                answer = sync_request(request.url,
-                                      request.data,
-                                      request.answer_type)
-                request.callback(answer)
             except Exception:
                 self.logger.error('Exception tt_api_sender',
                                   exc_info=sys.exc_info(),
                                   extra={})
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+            # metrics are common for all threads, so only the first thread reports them
+            if self.name == 'tt_api_sender_0' and self.metrics_reported_at + conf.settings.METRICS_REPORT_PERIOD < time.time():
+                report_metrics(self.logger)
+                self.metrics_reported_at = time.time()
@@ -61,6 +61,48 @@ class TTBankAPiTests(utils_testcase.TestCase):
         self.assertEqual(status, True)
         self.assertNotEqual(transaction_id, None)
 
+    def test_change_balances(self):
+        bank_client.cmd_change_balance(account_id=666, type='test', amount=10, asynchronous=False, autocommit=True)
+
+        status, transaction_id = bank_client.cmd_change_balances([(666, 'test', -3, None),
+                                                                  (777, 'test', 4, None),
+                                                                  (666, 'test', 5, 1),
+                                                                  (666, 'test', 1, None)])
+
+        self.assertEqual(status, True)
+        self.assertNotEqual(transaction_id, None)
+
+        self.assertEqual(bank_client.cmd_balances(accounts_ids=(666, 777)),
+                         {666: {0: 8, 1: 5},
+                          777: {0: 4}})
+
+    def test_change_balances__no_changes(self):
+        self.assertEqual(bank_client.cmd_change_balances([]), (True, None))
+
+    def test_change_balances__no_amount(self):
+        bank_client.cmd_change_balance(account_id=666, type='test', amount=10, asynchronous=False, autocommit=True)
+
+        status, transaction_id = bank_client.cmd_change_balances([(666, 'test', -3, None),
+                                                                  (777, 'test', -4, None)])
+
+        self.assertEqual(status, False)
+        self.assertEqual(transaction_id, None)
+
+        self.assertEqual(bank_client.cmd_balances(accounts_ids=(666, 777)),
+                         {666: {0: 10},
+                          777: {}})
+
+    def test_change_balances__restrictions(self):
+        status, transaction_id = bank_client.cmd_change_balances([(666, 'test', 200, None),
+                                                                  (777, 'test', 50, None)],
+                                                                 restrictions=bank_client.Restrictions(soft_maximum=103))
+
+        self.assertEqual(status, True)
+
+        self.assertEqual(bank_client.cmd_balances(accounts_ids=(666, 777)),
+                         {666: {0: 103},
+                          777: {0: 50}})
+
     def test_balance__no_balance(self):
         self.assertEqual(bank_client.cmd_balance(account_id=666), 0)
 
@@ -0,0 +1,136 @@
+import smart_imports
+
+smart_imports.all()
+
+
+def impacts_request(url, *amounts, answer_type=None):
+    return operations.PendingReuqest(url=url,
+                                     data=tt_protocol_impacts_pb2.AddImpactsRequest(impacts=[tt_protocol_impacts_pb2.Impact(amount=amount)
+                                                                                             for amount in amounts]),
+                                     answer_type=answer_type,
+                                     callback=mock.Mock())
+
+
+def other_request(url):
+    return operations.PendingReuqest(url=url,
+                                     data=tt_protocol_impacts_pb2.GetTargetsImpactsRequest(),
+                                     answer_type=None,
+                                     callback=mock.Mock())
+
+
+class ServiceForUrlTests(utils_testcase.TestCase):
+
+    def test_service_for_url(self):
+        self.assertEqual(operations.service_for_url('http://localhost:10001/impacts/add-impacts'), 'http://localhost:10001')
+        self.assertEqual(operations.service_for_url('https://example.com/bank/'), 'https://example.com')
+
+
+class MergeRequestsTests(utils_testcase.TestCase):
+
+    def test_single_request(self):
+        request = impacts_request('http://a/x', 1)
+        self.assertIs(operations.merge_requests([request]), request.data)
+
+    def test_merge(self):
+        data = operations.merge_requests([impacts_request('http://a/x', 1, 2),
+                                          impacts_request('http://a/x', 3)])
+
+        self.assertEqual([impact.amount for impact in data.impacts], [1, 2, 3])
+
+    def test_can_be_batched(self):
+        self.assertTrue(operations.can_be_batched(impacts_request('http://a/x', 1), impacts_request('http://a/x', 2)))
+        self.assertFalse(operations.can_be_batched(impacts_request('http://a/x', 1), impacts_request('http://a/y', 2)))
+        self.assertFalse(operations.can_be_batched(impacts_request('http://a/x', 1),
+                                                   impacts_request('http://a/x', 2, answer_type=tt_protocol_impacts_pb2.AddImpactsResponse)))
+        self.assertFalse(operations.can_be_batched(other_request('http://a/x'), other_request('http://a/x')))
+
+
+class SenderThreadTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.thread = operations.SenderThread(number=0)
+
+    def test_get_requests_batch__not_batched(self):
+        requests = [other_request('http://a/x'), other_request('http://a/x')]
+
+        for request in requests:
+            self.thread.queue.put(request)
+
+        self.assertEqual(self.thread.get_requests_batch(), requests[:1])
+        self.assertEqual(self.thread.get_requests_batch(), requests[1:])
+
+    def test_get_requests_batch__order_preserved(self):
+        requests = [impacts_request('http://a/x', 1),
+                    impacts_request('http://a/x', 2),
+                    other_request('http://a/x'),
+                    impacts_request('http://a/x', 3)]
+
+        for request in requests:
+            self.thread.queue.put(request)
+
+        self.assertEqual(self.thread.get_requests_batch(), requests[:2])
+        self.assertEqual(self.thread.get_requests_batch(), requests[2:3])
+        self.assertEqual(self.thread.get_requests_batch(), requests[3:])
+
+    @mock.patch('the_tale.common.tt_api.conf.settings.MAX_BATCH_SIZE', 2)
+    def test_get_requests_batch__max_size(self):
+        requests = [impacts_request('http://a/x', i) for i in range(3)]
+
+        for request in requests:
+            self.thread.queue.put(request)
+
+        self.assertEqual(self.thread.get_requests_batch(), requests[:2])
+        self.assertEqual(self.thread.get_requests_batch(), requests[2:])
+
+
+class GetSenderThreadTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        operations.reset_after_fork()
+
+    def tearDown(self):
+        operations.reset_after_fork()
+        super().tearDown()
+
+    @mock.patch('the_tale.common.tt_api.conf.settings.SENDER_THREADS', 2)
+    @mock.patch('the_tale.common.tt_api.operations.SenderThread.start', mock.Mock())
+    def test_distribution(self):
+        thread_1 = operations.get_sender_thread('http://a')
+        thread_2 = operations.get_sender_thread('http://b')
+        thread_3 = operations.get_sender_thread('http://c')
+
+        self.assertEqual(len(operations.THREADS), 2)
+
+        self.assertIsNot(thread_1, thread_2)
+        self.assertIs(thread_3, thread_1)
+        self.assertIs(operations.get_sender_thread('http://b'), thread_2)
+
+
+class MetricsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        operations.pop_metrics()
+
+    def test_register_and_pop(self):
+        operations.register_metrics('http://a', 0.5, success=True)
+        operations.register_metrics('http://a', 1.5, success=False, batched=3)
+
+        metrics = operations.pop_metrics()
+
+        self.assertEqual(metrics['http://a'].requests, 2)
+        self.assertEqual(metrics['http://a'].errors, 1)
+        self.assertEqual(metrics['http://a'].batched, 3)
+        self.assertEqual(metrics['http://a'].latency_total, 2.0)
+        self.assertEqual(metrics['http://a'].latency_max, 1.5)
+
+        self.assertEqual(operations.pop_metrics(), {})
+
+    def test_sync_request__error(self):
+        with mock.patch('requests.Session.post', mock.Mock(return_value=mock.Mock(status_code=500))):
+            with self.assertRaises(exceptions.TTAPIUnexpectedHTTPStatus):
+                operations.sync_request('http://a/x', tt_protocol_impacts_pb2.AddImpactsRequest())
+
+        self.assertEqual(operations.pop_metrics()['http://a'].errors, 1)
@@ -15,10 +15,18 @@ def set_many(cache_dict, timeout):
     django_cache.cache.set_many(cache_dict, timeout)
 
 
+def get_many(keys):
+    return django_cache.cache.get_many(keys)
+
+
 def delete(key):
     django_cache.cache.delete(key)
 
 
+def delete_many(keys):
+    django_cache.cache.delete_many(keys)
+
+
 def memoize(key, timeout):
 
     @functools.wraps(memoize)
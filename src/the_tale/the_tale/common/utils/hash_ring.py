@@ -0,0 +1,54 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+def key_hash(key):
+    # builtin hash is randomized between processes, so use stable one
+    return int.from_bytes(hashlib.md5(str(key).encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing(object):
+    __slots__ = ('replicas', '_hashes', '_nodes')
+
+    def __init__(self, nodes=(), replicas=64):
+        self.replicas = replicas
+
+        self._hashes = []
+        self._nodes = []
+
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node):
+        for replica in range(self.replicas):
+            point = key_hash('%s:%d' % (node, replica))
+            index = bisect.bisect(self._hashes, point)
+            self._hashes.insert(index, point)
+            self._nodes.insert(index, node)
+
+    def remove_node(self, node):
+        points = [(point, other_node)
+                  for point, other_node in zip(self._hashes, self._nodes)
+                  if other_node != node]
+
+        self._hashes = [point for point, _ in points]
+        self._nodes = [other_node for _, other_node in points]
+
+    def nodes(self):
+        return set(self._nodes)
+
+    def get_node(self, key):
+        if not self._nodes:
+            return None
+
+        index = bisect.bisect(self._hashes, key_hash(key))
+
+        if index == len(self._hashes):
+            index = 0
+
+        return self._nodes[index]
+
+    def __len__(self):
+        return len(self.nodes())
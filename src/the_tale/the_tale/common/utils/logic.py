@@ -27,6 +27,50 @@ def random_value_by_priority(values):
     raise Exception('unknown error in random_value_by_priority')
 
 
+class LeveledChoices:
+    '''
+    values sorted by levels with cumulative priorities,
+    random value by priority with level not greater than required is choosen by binary search
+    '''
+    __slots__ = ('levels', 'values', 'cumulative_priorities')
+
+    def __init__(self, values):
+        '''
+        values: iterable of (value, level, priority)
+        '''
+        self.levels = []
+        self.values = []
+        self.cumulative_priorities = []
+
+        domain = 0
+
+        for value, level, priority in sorted(values, key=lambda item: item[1]):
+            if priority <= 0:
+                continue
+
+            domain += priority
+
+            self.levels.append(level)
+            self.values.append(value)
+            self.cumulative_priorities.append(domain)
+
+    def count(self, max_level):
+        return bisect.bisect_right(self.levels, max_level)
+
+    def random_value(self, max_level):
+        number = self.count(max_level)
+
+        if number == 0:
+            return None
+
+        choice_value = random.uniform(0, self.cumulative_priorities[number - 1])
+
+        index = bisect.bisect_left(self.cumulative_priorities, choice_value, 0, number)
+
+        # protection from float rounding errors
+        return self.values[min(index, number - 1)]
+
+
 def shuffle_values_by_priority(values):
 
     result = []
@@ -188,3 +232,26 @@ def normalize_dict(values):
 
 def to_timestamp(time_):
     return time.mktime(time_.timetuple()) + time_.microsecond / 1000000
+
+
+def remove_old_files(directory, pattern, keep):
+    '''
+    remove files, matched by pattern, except keep newest of them
+
+    files can be removed concurrently by other processes, so missed files are ignored
+    '''
+    paths = []
+
+    for path in glob.glob(os.path.join(directory, pattern)):
+        try:
+            paths.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            continue
+
+    paths.sort(reverse=True)
+
+    for modified_at, path in paths[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
@@ -0,0 +1,205 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+# low overhead profiler of turns of workers
+# worker activates profiler, and code, which can be called from anywhere (for example, requests to tt services),
+# registers its time in active profiler by phase context manager
+
+_ACTIVE = None
+
+
+def activate(profiler):
+    global _ACTIVE
+    _ACTIVE = profiler
+
+
+def deactivate():
+    global _ACTIVE
+    _ACTIVE = None
+
+
+def active():
+    return _ACTIVE
+
+
+@contextlib.contextmanager
+def phase(name):
+    profiler = _ACTIVE
+
+    if profiler is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        profiler.register_phase(name, time.perf_counter() - started_at)
+
+
+class TimeStatistics:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def register(self, duration):
+        self.count += 1
+        self.total += duration
+
+        if self.max < duration:
+            self.max = duration
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+
+def register_time(statistics, name, duration):
+    if name not in statistics:
+        statistics[name] = TimeStatistics()
+
+    statistics[name].register(duration)
+
+
+def merge_statistics(statistics, other):
+    for name, other_statistics in other.items():
+        if name not in statistics:
+            statistics[name] = TimeStatistics()
+
+        statistics[name].merge(other_statistics)
+
+
+class TurnRecord:
+    '''
+    timings of single turn, can be sent from forked process to parent one
+    '''
+    __slots__ = ('turn_number', 'phases', 'actions', 'bundles', 'slowest_heroes')
+
+    def __init__(self, turn_number):
+        self.turn_number = turn_number
+        self.phases = {}
+        self.actions = {}
+        self.bundles = {}
+        # min heap of (cost, hero_id)
+        self.slowest_heroes = []
+
+    def merge(self, other):
+        merge_statistics(self.phases, other.phases)
+        merge_statistics(self.actions, other.actions)
+
+        for bundle_id, cost in other.bundles.items():
+            self.bundles[bundle_id] = self.bundles.get(bundle_id, 0) + cost
+
+        self.slowest_heroes.extend(other.slowest_heroes)
+        heapq.heapify(self.slowest_heroes)
+
+    def total_time(self, phase_name):
+        if phase_name not in self.phases:
+            return 0
+
+        return self.phases[phase_name].total
+
+
+class Profiler:
+    __slots__ = ('slowest_heroes_number', 'histogram_borders', 'turn', 'phases', 'actions', 'histogram', 'slowest_turn', 'turns')
+
+    def __init__(self, slowest_heroes_number=10, histogram_borders=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)):
+        self.slowest_heroes_number = slowest_heroes_number
+        self.histogram_borders = histogram_borders
+
+        self.turn = None
+
+        self.reset()
+
+    def reset(self):
+        self.phases = {}
+        self.actions = {}
+        # the last bucket contains bundles, which are slower, than the last border
+        self.histogram = [0] * (len(self.histogram_borders) + 1)
+        self.slowest_turn = None
+        self.turns = 0
+
+    def start_turn(self, turn_number):
+        self.turn = TurnRecord(turn_number)
+
+    def finish_turn(self, main_phase):
+        turn = self.turn
+        self.turn = None
+
+        if turn is None:
+            return None
+
+        merge_statistics(self.phases, turn.phases)
+        merge_statistics(self.actions, turn.actions)
+
+        for cost in turn.bundles.values():
+            self.histogram[bisect.bisect_right(self.histogram_borders, cost)] += 1
+
+        if self.slowest_turn is None or self.slowest_turn.total_time(main_phase) < turn.total_time(main_phase):
+            self.slowest_turn = turn
+
+        self.turns += 1
+
+        return turn
+
+    def merge_turn(self, turn):
+        if self.turn is not None:
+            self.turn.merge(turn)
+
+    def register_phase(self, name, duration):
+        if self.turn is not None:
+            register_time(self.turn.phases, name, duration)
+
+    def register_action(self, action_type, duration):
+        if self.turn is not None:
+            register_time(self.turn.actions, action_type, duration)
+
+    def register_hero(self, hero_id, bundle_id, duration):
+        if self.turn is None:
+            return
+
+        self.turn.bundles[bundle_id] = self.turn.bundles.get(bundle_id, 0) + duration
+
+        if len(self.turn.slowest_heroes) < self.slowest_heroes_number:
+            heapq.heappush(self.turn.slowest_heroes, (duration, hero_id))
+        else:
+            heapq.heappushpop(self.turn.slowest_heroes, (duration, hero_id))
+
+    def log_statistics(self, logger, prefix, statistics):
+        for name, data in sorted(statistics.items(), key=lambda item: item[1].total, reverse=True):
+            logger.info('[profiler] %s %s: calls: %d, total: %.3f, mean: %.5f, max: %.5f',
+                        prefix, name, data.count, data.total, data.mean, data.max)
+
+    def log_turn(self, logger, turn):
+        logger.info('[profiler] turn %d slowest heroes: %s',
+                    turn.turn_number,
+                    ', '.join('%s: %.3f' % (hero_id, cost)
+                              for cost, hero_id in heapq.nlargest(self.slowest_heroes_number, turn.slowest_heroes)))
+
+    def report(self, logger):
+        logger.info('[profiler] turns: %d', self.turns)
+
+        self.log_statistics(logger, 'phase', self.phases)
+        self.log_statistics(logger, 'action', self.actions)
+
+        buckets = ['<%s' % border for border in self.histogram_borders] + ['>=%s' % self.histogram_borders[-1]]
+
+        logger.info('[profiler] bundles costs: %s',
+                    ', '.join('%s: %d' % (bucket, number) for bucket, number in zip(buckets, self.histogram)))
+
+        if self.slowest_turn is not None:
+            self.log_turn(logger, self.slowest_turn)
+
+        self.reset()
@@ -4,8 +4,45 @@ import smart_imports
 smart_imports.all()
 
 
+# storages, which can be synced by sync_all
+_STORAGES = weakref.WeakSet()
+
+_SYNCHRONIZED_NESTING = 0
+
+
+def sync_all():
+    '''
+    load all settings by one query and check versions of all loaded storages
+
+    after that storages do not check versions until settings changed
+    '''
+    global_settings.refresh()
+
+    for storage in list(_STORAGES):
+        if storage._version is not None:
+            storage.sync()
+
+
+@contextlib.contextmanager
+def synchronized():
+    '''
+    sync all storages once on enter of outer context (once per turn or request)
+    '''
+    global _SYNCHRONIZED_NESTING
+
+    if _SYNCHRONIZED_NESTING == 0:
+        sync_all()
+
+    _SYNCHRONIZED_NESTING += 1
+
+    try:
+        yield
+    finally:
+        _SYNCHRONIZED_NESTING -= 1
+
+
 class BaseStorage(object):
-    __slots__ = ('_postpone_version_update_nesting', '_update_version_requested', '_version')
+    __slots__ = ('_postpone_version_update_nesting', '_update_version_requested', '_version', '_synced_generation', '__weakref__')
 
     SETTINGS_KEY = NotImplemented
     EXCEPTION = NotImplemented
@@ -21,19 +58,22 @@ class BaseStorage(object):
         self._postpone_version_update_nesting = 0
         self._update_version_requested = False
 
+        _STORAGES.add(self)
+
     @property
     def version(self):
         self.sync()
         return self._version
 
     def sync(self, force=False):
-        if self._version != global_settings.get(self.SETTINGS_KEY):
-            self.refresh()
+        # settings are not changed since last check, so version is actual
+        if not force and self._synced_generation == global_settings.generation:
             return
 
-        if force:
+        if force or self._version != global_settings.get(self.SETTINGS_KEY):
             self.refresh()
-            return
+
+        self._synced_generation = global_settings.generation
 
     def _get_next_version(self):
         return uuid.uuid4().hex
@@ -138,6 +178,7 @@ class Storage(BaseStorage):
     def clear(self):
         self._data = {}
         self._version = None
+        self._synced_generation = None
         self._update_version_requested = False
 
     def save_all(self):
@@ -197,6 +238,7 @@ class SingleStorage(BaseStorage):
     def clear(self):
         self._item = self._construct_zero_item()
         self._version = None
+        self._synced_generation = None
         self._update_version_requested = False
 
 
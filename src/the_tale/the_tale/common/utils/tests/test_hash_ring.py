@@ -0,0 +1,46 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class HashRingTests(testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ring = hash_ring.HashRing(nodes=('node_1', 'node_2', 'node_3'), replicas=16)
+
+    def test_initialize(self):
+        self.assertEqual(self.ring.nodes(), {'node_1', 'node_2', 'node_3'})
+        self.assertEqual(len(self.ring), 3)
+
+    def test_empty(self):
+        self.assertEqual(hash_ring.HashRing().get_node(1), None)
+
+    def test_get_node__stable(self):
+        other_ring = hash_ring.HashRing(nodes=('node_3', 'node_1', 'node_2'), replicas=16)
+
+        for key in range(100):
+            self.assertEqual(self.ring.get_node(key), other_ring.get_node(key))
+
+    def test_get_node__all_nodes_used(self):
+        self.assertEqual({self.ring.get_node(key) for key in range(1000)}, {'node_1', 'node_2', 'node_3'})
+
+    def test_add_node__minimal_moves(self):
+        old_nodes = {key: self.ring.get_node(key) for key in range(1000)}
+
+        self.ring.add_node('node_4')
+
+        for key, old_node in old_nodes.items():
+            self.assertIn(self.ring.get_node(key), (old_node, 'node_4'))
+
+    def test_remove_node(self):
+        old_nodes = {key: self.ring.get_node(key) for key in range(1000)}
+
+        self.ring.remove_node('node_2')
+
+        self.assertEqual(self.ring.nodes(), {'node_1', 'node_3'})
+
+        for key, old_node in old_nodes.items():
+            if old_node != 'node_2':
+                self.assertEqual(self.ring.get_node(key), old_node)
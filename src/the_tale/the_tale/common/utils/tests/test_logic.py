@@ -26,6 +26,42 @@ class LogicTests(testcase.TestCase):
 
         self.assertTrue(counter['0'] < counter['a'] < counter['b'] < counter['c'])
 
+    def test_leveled_choices(self):
+        choices = logic.LeveledChoices([('a', 3, 1),
+                                        ('b', 1, 10),
+                                        ('0', 2, 0),
+                                        ('c', 2, 100)])
+
+        self.assertEqual(choices.values, ['b', 'c', 'a'])
+        self.assertEqual(choices.levels, [1, 2, 3])
+        self.assertEqual(choices.cumulative_priorities, [10, 110, 111])
+
+        self.assertEqual(choices.count(0), 0)
+        self.assertEqual(choices.count(2), 2)
+        self.assertEqual(choices.count(100), 3)
+
+    def test_leveled_choices__random_value(self):
+        choices = logic.LeveledChoices([('a', 3, 1),
+                                        ('b', 1, 10),
+                                        ('0', 2, 0),
+                                        ('c', 2, 100)])
+
+        self.assertEqual(choices.random_value(0), None)
+        self.assertEqual({choices.random_value(1) for i in range(100)}, {'b'})
+
+        counter = collections.Counter(choices.random_value(2) for i in range(10000))
+
+        self.assertEqual(set(counter), {'b', 'c'})
+        self.assertTrue(counter['b'] < counter['c'])
+
+        counter = collections.Counter(choices.random_value(3) for i in range(10000))
+
+        self.assertEqual(set(counter), {'a', 'b', 'c'})
+        self.assertTrue(counter['a'] < counter['b'] < counter['c'])
+
+    def test_leveled_choices__empty(self):
+        self.assertEqual(logic.LeveledChoices([]).random_value(100), None)
+
     def test_shuffle_values_by_priority(self):
         counter = collections.Counter()
 
@@ -180,3 +216,17 @@ class LogicTests(testcase.TestCase):
         self.assertEqual(distribute(number=6, min=2, max=5), [2, 3, 3, 4, 4, 5])
         self.assertEqual(distribute(number=7, min=2, max=5), [2, 2, 3, 3, 4, 4, 5])
         self.assertEqual(distribute(number=8, min=2, max=5), [2, 2, 3, 3, 4, 4, 5, 5])
+
+    def test_remove_old_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for i, name in enumerate(('a_1.bin', 'a_2.bin', 'a_3.bin', 'b_1.bin')):
+                path = os.path.join(directory, name)
+
+                with open(path, 'w') as f:
+                    f.write(name)
+
+                os.utime(path, (i, i))
+
+            logic.remove_old_files(directory, 'a_*.bin', keep=2)
+
+            self.assertCountEqual(os.listdir(directory), ['a_2.bin', 'a_3.bin', 'b_1.bin'])
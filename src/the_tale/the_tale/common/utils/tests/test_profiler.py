@@ -0,0 +1,108 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class ProfilerTests(testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profiler = profiler.Profiler(slowest_heroes_number=2, histogram_borders=(0.1, 1.0))
+
+    def tearDown(self):
+        super().tearDown()
+        profiler.deactivate()
+
+    def test_phase__not_active(self):
+        with profiler.phase('test'):
+            pass
+
+        self.assertEqual(self.profiler.phases, {})
+
+    def test_phase(self):
+        profiler.activate(self.profiler)
+
+        self.profiler.start_turn(1)
+
+        with profiler.phase('test'):
+            pass
+
+        with profiler.phase('test'):
+            pass
+
+        turn = self.profiler.finish_turn(main_phase='test')
+
+        self.assertEqual(turn.phases['test'].count, 2)
+        self.assertEqual(self.profiler.phases['test'].count, 2)
+        self.assertEqual(self.profiler.turns, 1)
+        self.assertIs(self.profiler.slowest_turn, turn)
+
+    def test_register__no_turn(self):
+        self.profiler.register_phase('test', 1)
+        self.profiler.register_action('test', 1)
+        self.profiler.register_hero(1, 1, 1)
+
+        self.assertEqual(self.profiler.finish_turn(main_phase='test'), None)
+        self.assertEqual(self.profiler.turns, 0)
+
+    def test_slowest_heroes(self):
+        self.profiler.start_turn(1)
+
+        self.profiler.register_hero(1, 10, 0.5)
+        self.profiler.register_hero(2, 20, 0.1)
+        self.profiler.register_hero(3, 30, 2.0)
+
+        turn = self.profiler.finish_turn(main_phase='test')
+
+        self.assertEqual(sorted(turn.slowest_heroes), [(0.5, 1), (2.0, 3)])
+
+    def test_bundles_histogram(self):
+        self.profiler.start_turn(1)
+
+        self.profiler.register_hero(1, 10, 0.05)
+        self.profiler.register_hero(2, 10, 0.07)
+        self.profiler.register_hero(3, 30, 0.01)
+        self.profiler.register_hero(4, 40, 1.5)
+
+        self.profiler.finish_turn(main_phase='test')
+
+        self.assertEqual(self.profiler.histogram, [1, 1, 1])
+
+    def test_merge_turn(self):
+        self.profiler.start_turn(1)
+
+        self.profiler.register_action('IDLENESS', 0.5)
+        self.profiler.register_hero(1, 10, 0.5)
+
+        shard_turn = profiler.TurnRecord(1)
+        profiler.register_time(shard_turn.actions, 'IDLENESS', 1.0)
+        shard_turn.bundles[20] = 1.0
+        shard_turn.slowest_heroes.append((1.0, 2))
+
+        self.profiler.merge_turn(shard_turn)
+
+        turn = self.profiler.finish_turn(main_phase='test')
+
+        self.assertEqual(turn.actions['IDLENESS'].count, 2)
+        self.assertEqual(turn.actions['IDLENESS'].total, 1.5)
+        self.assertEqual(turn.actions['IDLENESS'].max, 1.0)
+        self.assertEqual(turn.bundles, {10: 0.5, 20: 1.0})
+        self.assertEqual(sorted(turn.slowest_heroes), [(0.5, 1), (1.0, 2)])
+
+    def test_report(self):
+        self.profiler.start_turn(1)
+        self.profiler.register_phase('test', 0.5)
+        self.profiler.register_hero(1, 10, 0.5)
+        self.profiler.finish_turn(main_phase='test')
+
+        logger = mock.Mock()
+
+        self.profiler.report(logger)
+
+        self.assertTrue(logger.info.called)
+
+        self.assertEqual(self.profiler.phases, {})
+        self.assertEqual(self.profiler.histogram, [0, 0, 0])
+        self.assertEqual(self.profiler.turns, 0)
+        self.assertEqual(self.profiler.slowest_turn, None)
@@ -0,0 +1,97 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class FakeStorage(storage.SingleStorage):
+    __slots__ = ('refreshes_number',)
+
+    SETTINGS_KEY = 'fake storage version'
+
+    def __init__(self):
+        self.refreshes_number = 0
+        super().__init__()
+
+    def _construct_zero_item(self):
+        return None
+
+    def refresh(self):
+        self.clear()
+        self.refreshes_number += 1
+        self._version = global_settings.get(self.SETTINGS_KEY)
+
+
+class StorageSyncTests(testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = FakeStorage()
+
+    def test_sync__no_settings_changes(self):
+        self.storage.sync()
+        self.assertEqual(self.storage.refreshes_number, 1)
+
+        with mock.patch('the_tale.common.settings.Settings.get') as get:
+            self.storage.item
+            self.storage.version
+
+        self.assertEqual(get.call_count, 0)
+        self.assertEqual(self.storage.refreshes_number, 1)
+
+    def test_sync__settings_changed(self):
+        self.storage.sync()
+
+        global_settings[FakeStorage.SETTINGS_KEY] = 'new version'
+
+        self.storage.sync()
+        self.assertEqual(self.storage.refreshes_number, 2)
+
+        global_settings['other key'] = 'value'
+
+        self.storage.sync()
+        self.assertEqual(self.storage.refreshes_number, 2)
+
+    def test_sync__own_version_update(self):
+        self.storage.sync()
+
+        self.storage.update_version()
+
+        self.storage.sync()
+        self.assertEqual(self.storage.refreshes_number, 1)
+
+    def test_sync__force(self):
+        self.storage.sync()
+        self.storage.sync(force=True)
+
+        self.assertEqual(self.storage.refreshes_number, 2)
+
+    def test_sync__after_clear(self):
+        self.storage.sync()
+        self.storage.clear()
+        self.storage.sync()
+
+        self.assertEqual(self.storage.refreshes_number, 2)
+
+    def test_sync_all(self):
+        self.storage.sync()
+
+        not_loaded_storage = FakeStorage()
+
+        with mock.patch('the_tale.common.settings.Settings._load_data', mock.Mock(return_value={FakeStorage.SETTINGS_KEY: 'new version'})):
+            storage.sync_all()
+
+        self.assertEqual(self.storage.refreshes_number, 2)
+        self.assertEqual(self.storage._version, 'new version')
+        self.assertEqual(not_loaded_storage.refreshes_number, 0)
+
+    def test_synchronized(self):
+        with mock.patch('the_tale.common.utils.storage.sync_all') as sync_all:
+            with storage.synchronized():
+                with storage.synchronized():
+                    pass
+
+            with storage.synchronized():
+                pass
+
+        self.assertEqual(sync_all.call_count, 2)
@@ -232,7 +232,7 @@ def try_companion_block(attacker, defender, messenger):
         return True
 
     if defender.keep_dead_companion():
-        defender.actor.reset_accessors_cache()
+        defender.actor.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.COMPANION)
         return True
 
     messenger.add_message('companions_killed', diary=True, attacker=attacker, companion_owner=defender, companion=defender.companion)
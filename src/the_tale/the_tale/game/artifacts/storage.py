@@ -21,6 +21,7 @@ class ArtifactsStorage(utils_storage.CachedStorage):
         self._artifacts_by_types = {artifact_type: [] for artifact_type in relations.ARTIFACT_TYPE.records}
         self._mob_artifacts = {}
         self._mob_loot = {}
+        self._choices_tables = {}
 
     def _update_cached_data(self, item):
 
@@ -38,6 +39,7 @@ class ArtifactsStorage(utils_storage.CachedStorage):
 
         self._mob_artifacts = {}
         self._mob_loot = {}
+        self._choices_tables = {}
 
     def get_by_uuid(self, uuid):
         self.sync()
@@ -61,8 +63,25 @@ class ArtifactsStorage(utils_storage.CachedStorage):
         if not artifact_choices:
             return None
 
-        artifact_record = random.choice(artifact_choices)
+        return self._create_artifact(random.choice(artifact_choices), level=level, rarity=rarity)
 
+    def _get_choices_table(self, key, artifacts_list):
+        # lists of storage are choosen from very often, so their choices are prepared once
+        if key not in self._choices_tables:
+            self._choices_tables[key] = utils_logic.LeveledChoices((artifact_record, artifact_record.level, 1)
+                                                                   for artifact_record in artifacts_list
+                                                                   if artifact_record.state.is_ENABLED)
+        return self._choices_tables[key]
+
+    def generate_artifact_from_table(self, key, artifacts_list, level, rarity):
+        artifact_record = self._get_choices_table(key, artifacts_list).random_value(max_level=level)
+
+        if artifact_record is None:
+            return None
+
+        return self._create_artifact(artifact_record, level=level, rarity=rarity)
+
+    def _create_artifact(self, artifact_record, level, rarity):
         if artifact_record.is_useless:
             artifact_power = power.Power(0, 0)
         else:
@@ -96,21 +115,28 @@ class ArtifactsStorage(utils_storage.CachedStorage):
     def generate_loot(self, hero, mob):
 
         if random.uniform(0, 1) < hero.artifacts_probability(mob):
-            return self.generate_artifact_from_list(self.get_mob_artifacts(mob.record.id), mob.level, rarity=self.get_rarity_type(hero))
+            return self.generate_artifact_from_table(('mob_artifacts', mob.record.id),
+                                                     self.get_mob_artifacts(mob.record.id),
+                                                     mob.level,
+                                                     rarity=self.get_rarity_type(hero))
 
         if random.uniform(0, 1) < hero.loot_probability(mob):
-            return self.generate_artifact_from_list(self.get_mob_loot(mob.record.id), mob.record.level, rarity=relations.RARITY.NORMAL)
+            return self.generate_artifact_from_table(('mob_loot', mob.record.id),
+                                                     self.get_mob_loot(mob.record.id),
+                                                     mob.record.level,
+                                                     rarity=relations.RARITY.NORMAL)
 
         return None
 
     def generate_any_artifact(self, hero, artifact_probability_multiplier=1.0):
+        self.sync()
 
         artifact_level = random.randint(1, hero.level)
 
         if random.uniform(0, 1) < hero.artifacts_probability(None) * artifact_probability_multiplier:
-            return self.generate_artifact_from_list(self.artifacts, artifact_level, rarity=self.get_rarity_type(hero))
+            return self.generate_artifact_from_table(('artifacts',), self.artifacts, artifact_level, rarity=self.get_rarity_type(hero))
 
-        return self.generate_artifact_from_list(self.loot, artifact_level, rarity=relations.RARITY.NORMAL)
+        return self.generate_artifact_from_table(('loot',), self.loot, artifact_level, rarity=relations.RARITY.NORMAL)
 
 
 artifacts = ArtifactsStorage()
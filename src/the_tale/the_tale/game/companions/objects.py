@@ -110,7 +110,7 @@ class Companion(object):
         self.health = int(min(self.health + delta, self.max_health))
 
         if old_health == 0:
-            self._hero.reset_accessors_cache()
+            self._hero.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.COMPANION)
 
         return self.health - old_health
 
@@ -185,7 +185,7 @@ class Companion(object):
             self.experience -= self.experience_to_next_level
             self.coherence += 1
 
-            self._hero.reset_accessors_cache()
+            self._hero.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.COMPANION)
 
     def has_full_experience(self):
         return (self.coherence == c.COMPANIONS_MAX_COHERENCE and
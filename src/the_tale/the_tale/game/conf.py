@@ -17,10 +17,29 @@ settings = utils_app_settings.app_settings('GAME',
 
                                            PROCESS_TURN_WAIT_LOGIC_TIMEOUT=5 * 60,
 
+                                           LOGIC_WORKERS_NUMBER=2,
+                                           LOGIC_WORKERS_RING_REPLICAS=64,
+                                           LOGIC_BUNDLES_COSTS_REPORT_PERIOD=60,
+                                           LOGIC_REBALANCE_COSTS_RATIO=1.25,
+                                           LOGIC_REBALANCE_MAX_MOVED_BUNDLES=100,
+
+                                           # timings of turns phases, actions and heroes, logged by logic workers
+                                           LOGIC_PROFILER_ENABLED=True,
+                                           LOGIC_PROFILER_REPORT_PERIOD=60,
+                                           LOGIC_PROFILER_SLOWEST_HEROES_NUMBER=10,
+
+                                           # accounts, registered in logic workers by one command on supervisor initialization
+                                           SUPERVISOR_REGISTER_ACCOUNTS_BATCH_SIZE=1000,
+
                                            STOP_WAIT_TIMEOUT=20 * 60,
 
                                            SAVED_UNCACHED_HEROES_FRACTION=0.00025,
 
+                                           # number of forked processes, which process bundles of logic worker every turn
+                                           # 1 — process all bundles in worker process
+                                           PROCESS_TURN_PROCESSES=1,
+                                           PROCESS_TURN_MIN_BUNDLES_FOR_PARALLEL=100,
+
                                            JS_CONSTNATS_FILE_LOCATION=os.path.join(APP_DIR, '../static/game/data/constants.js'),
 
                                            COLLECT_GARBAGE=True,
@@ -30,6 +49,11 @@ settings = utils_app_settings.app_settings('GAME',
                                            GAME_STATE_KEY='game state',
 
                                            INFO_API_VERSION='1.10',
+
+                                           # encoded responses of game info, see logic.game_info_cache_key
+                                           INFO_CACHE_KEY='game_info_%s',
+                                           INFO_CACHE_TIMEOUT=60,
+
                                            DIARY_API_VERSION='1.0',
                                            NAMES_API_VERSION='1.0',
                                            HERO_HISTORY_API_VERSION='1.0',
@@ -654,15 +654,14 @@ def emissaries_monitoring():
 
 
 def add_clan_experience():
+    changes = []
+
     for event in storage.events.all():
         experience = int(math.ceil(tt_clans_constants.EXPERIENCE_PER_EVENT * event.emissary.attrs.clan_experience))
 
-        clans_tt_services.currencies.cmd_change_balance(account_id=event.emissary.clan_id,
-                                                        type='event_experience',
-                                                        amount=experience,
-                                                        asynchronous=False,
-                                                        autocommit=True,
-                                                        currency=clans_relations.CURRENCY.EXPERIENCE)
+        changes.append((event.emissary.clan_id, 'event_experience', experience, clans_relations.CURRENCY.EXPERIENCE))
+
+    clans_tt_services.currencies.cmd_change_balances(changes)
 
 
 def add_emissaries_experience():
@@ -55,7 +55,7 @@ class AbilitiesPrototype(object):
         self.initialize()
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.ABILITIES)
 
     def is_initial_state(self):
         return self.current_ability_points_number == 2
@@ -91,14 +91,14 @@ class AbilitiesPrototype(object):
         self.destiny_points_spend += 1
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.ABILITIES)
 
     def increment_level(self, ability_id):
         self.abilities[ability_id].level += 1
         self.destiny_points_spend += 1
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.ABILITIES)
 
     def _get_candidates(self):
 
@@ -177,7 +177,7 @@ class AbilitiesPrototype(object):
             ability.level += 1
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.ABILITIES)
 
         return 0
 
@@ -229,7 +229,7 @@ class AbilitiesPrototype(object):
             new_choices = set(ability.get_id() for ability in self.get_for_choose())
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source=heroes_relations.MODIFIERS_SOURCE.ABILITIES)
 
         return True
 
@@ -26,9 +26,16 @@ settings = utils_app_settings.app_settings('HEROES',
                                            # cache livetime
                                            UI_CACHING_TIMEOUT=60,
 
+                                           # full ui info is cached once in period (in turns), every turn only changes are cached
+                                           UI_CACHING_SNAPSHOT_KEY='hero_ui_snapshot_%d',
+                                           UI_CACHING_SNAPSHOT_PERIOD=10,
+
                                            # should we dump cached heroes to database
                                            DUMP_CACHED_HEROES=False,
 
+                                           # max number of heroes, saved by one UPDATE statement
+                                           BULK_SAVE_BATCH_SIZE=500,
+
                                            START_ENERGY_BONUS=10,
                                            MAX_HELPS_IN_TURN=10,
 
@@ -46,4 +53,7 @@ settings = utils_app_settings.app_settings('HEROES',
 
                                            MAX_HERO_DESCRIPTION_LENGTH=10000,
 
+                                           # max number of attributes modifiers of abilities, shared between heroes
+                                           ABILITIES_MODIFIERS_CACHE_SIZE=10000,
+
                                            REMOVE_HERO_DELAY=10*60)
@@ -269,14 +269,14 @@ class EquipmentMethodsMixin(object):
             self.bag.pop_artifact(equipped)
             self.equipment.equip(slot, equipped)
 
-        self.reset_accessors_cache()
+        self.reset_accessors_cache(source=relations.MODIFIERS_SOURCE.EQUIPMENT)
 
     def increment_equipment_rarity(self, artifact):
         artifact.rarity = artifacts_relations.RARITY(artifact.rarity.value + 1)
         artifact.power = power.Power.artifact_power_randomized(distribution=artifact.record.power_type.distribution,
                                                                level=self.level)
         artifact.max_integrity = int(artifact.rarity.max_integrity * random.uniform(1 - c.ARTIFACT_MAX_INTEGRITY_DELTA, 1 + c.ARTIFACT_MAX_INTEGRITY_DELTA))
-        self.reset_accessors_cache()
+        self.reset_accessors_cache(source=relations.MODIFIERS_SOURCE.EQUIPMENT)
 
     def randomize_equip(self):
         for slot in relations.EQUIPMENT_SLOT.records:
@@ -7,6 +7,8 @@ smart_imports.all()
 class Habit(game_habits.HabitBase):
     __slots__ = ()
 
+    MODIFIERS_SOURCE = None
+
     @property
     def _real_interval(self):
         if self.owner.clouded_mind:
@@ -22,7 +24,7 @@ class Habit(game_habits.HabitBase):
         return self.interval.neuter_text
 
     def reset_accessors_cache(self):
-        self.owner.reset_accessors_cache()
+        self.owner.reset_accessors_cache(source=self.MODIFIERS_SOURCE)
 
     @property
     def increase_modifier(self):
@@ -37,6 +39,7 @@ class Honor(Habit):
     __slots__ = ()
 
     TYPE = game_relations.HABIT_TYPE.HONOR
+    MODIFIERS_SOURCE = relations.MODIFIERS_SOURCE.HABIT_HONOR
 
     def change(self, delta):
         with achievements_storage.achievements.verify(type=achievements_relations.ACHIEVEMENT_TYPE.HABITS_HONOR, object=self.owner):
@@ -90,6 +93,7 @@ class Peacefulness(Habit):
     __slots__ = ()
 
     TYPE = game_relations.HABIT_TYPE.PEACEFULNESS
+    MODIFIERS_SOURCE = relations.MODIFIERS_SOURCE.HABIT_PEACEFULNESS
 
     def change(self, delta):
         with achievements_storage.achievements.verify(type=achievements_relations.ACHIEVEMENT_TYPE.HABITS_PEACEFULNESS, object=self.owner):
@@ -66,8 +66,27 @@ def hero_statistics_from_model(hero_model):
 
 
 def load_heroes_by_account_ids(account_ids):
-    heroes_models = models.Hero.objects.filter(account_id__in=account_ids)
-    return [load_hero(hero_model=model) for model in heroes_models]
+    heroes = [hero_from_model(model) for model in models.Hero.objects.filter(account_id__in=account_ids)]
+
+    sync_heroes_external_data(heroes)
+
+    return heroes
+
+
+def load_heroes_bundles_ids(accounts_ids):
+    heroes_actions = models.Hero.objects.filter(account_id__in=accounts_ids).values_list('account_id', 'actions')
+
+    return {account_id: s11n.from_json(actions)['actions'][-1]['bundle_id']
+            for account_id, actions in heroes_actions}
+
+
+def load_hero_bundle_id(account_id):
+    actions = models.Hero.objects.filter(account_id=account_id).values_list('actions', flat=True).first()
+
+    if actions is None:
+        return None
+
+    return s11n.from_json(actions)['actions'][-1]['bundle_id']
 
 
 def load_hero(hero_id=None, account_id=None, hero_model=None):
@@ -82,6 +101,14 @@ def load_hero(hero_id=None, account_id=None, hero_model=None):
     except models.Hero.DoesNotExist:
         return None
 
+    hero = hero_from_model(hero_model)
+
+    sync_hero_external_data(hero)
+
+    return hero
+
+
+def hero_from_model(hero_model):
     data = hero_model.data
 
     companion_data = data.get('companion')
@@ -127,12 +154,10 @@ def load_hero(hero_id=None, account_id=None, hero_model=None):
                         first_death=tt_beings_relations.FIRST_DEATH(data.get('first_death', tt_beings_relations.FIRST_DEATH.FROM_THE_MONSTER_FANGS.value)),
                         utg_name=utg_words.Word.deserialize(data['name']))
 
-    sync_hero_external_data(hero)
-
     return hero
 
 
-def save_hero(hero, new=False):
+def hero_model_arguments(hero, saved_at_turn, saved_at):
     data = {'companion': hero.companion.serialize() if hero.companion else None,
             'name': hero.utg_name.serialize(),
             'quests': hero.quests.serialize(),
@@ -145,81 +170,278 @@ def save_hero(hero, new=False):
             'abilities': hero.abilities.serialize(),
             'last_religion_action_at_turn': hero.last_religion_action_at_turn}
 
-    arguments = dict(saved_at_turn=game_turn.number(),
-                     saved_at=datetime.datetime.now(),
-                     clan_id=hero.clan_id,
-                     data=data,
-                     actions=s11n.to_json(hero.actions.serialize()),
-                     raw_power_physic=hero.power.physic,
-                     raw_power_magic=hero.power.magic,
-                     quest_created_time=hero.quests.min_quest_created_time,
-                     preferences=s11n.to_json(hero.preferences.serialize()),
-                     stat_politics_multiplier=hero.politic_power_bonus() if hero.participate_in_power_rating() else 0,
-
-                     stat_pve_deaths=hero.statistics.pve_deaths,
-                     stat_pve_kills=hero.statistics.pve_kills,
-
-                     stat_money_earned_from_loot=hero.statistics.money_earned_from_loot,
-                     stat_money_earned_from_artifacts=hero.statistics.money_earned_from_artifacts,
-                     stat_money_earned_from_quests=hero.statistics.money_earned_from_quests,
-                     stat_money_earned_from_help=hero.statistics.money_earned_from_help,
-                     stat_money_earned_from_habits=hero.statistics.money_earned_from_habits,
-                     stat_money_earned_from_companions=hero.statistics.money_earned_from_companions,
-                     stat_money_earned_from_masters=hero.statistics.money_earned_from_masters,
-
-                     stat_money_spend_for_heal=hero.statistics.money_spend_for_heal,
-                     stat_money_spend_for_artifacts=hero.statistics.money_spend_for_artifacts,
-                     stat_money_spend_for_sharpening=hero.statistics.money_spend_for_sharpening,
-                     stat_money_spend_for_useless=hero.statistics.money_spend_for_useless,
-                     stat_money_spend_for_impact=hero.statistics.money_spend_for_impact,
-                     stat_money_spend_for_experience=hero.statistics.money_spend_for_experience,
-                     stat_money_spend_for_repairing=hero.statistics.money_spend_for_repairing,
-                     stat_money_spend_for_tax=hero.statistics.money_spend_for_tax,
-                     stat_money_spend_for_companions=hero.statistics.money_spend_for_companions,
-
-                     stat_artifacts_had=hero.statistics.artifacts_had,
-                     stat_loot_had=hero.statistics.loot_had,
-
-                     stat_quests_done=hero.statistics.quests_done,
-
-                     stat_companions_count=hero.statistics.companions_count,
-
-                     stat_pvp_battles_1x1_number=hero.statistics.pvp_battles_1x1_number,
-                     stat_pvp_battles_1x1_victories=hero.statistics.pvp_battles_1x1_victories,
-                     stat_pvp_battles_1x1_draws=hero.statistics.pvp_battles_1x1_draws,
-
-                     stat_cards_used=hero.statistics.cards_used,
-                     stat_cards_combined=hero.statistics.cards_combined,
-
-                     health=hero.health,
-                     level=hero.level,
-                     experience=hero.experience,
-                     money=hero.money,
-                     next_spending=hero.next_spending,
-                     habit_honor=hero.habit_honor.raw_value,
-                     habit_peacefulness=hero.habit_peacefulness.raw_value,
-                     created_at_turn=hero.created_at_turn,
-                     is_bot=hero.is_bot,
-                     is_alive=hero.is_alive,
-                     is_fast=hero.is_fast,
-                     gender=hero.gender,
-                     race=hero.race,
-                     might=hero.might,
-                     ui_caching_started_at=hero.ui_caching_started_at,
-                     active_state_end_at=hero.active_state_end_at,
-                     premium_state_end_at=hero.premium_state_end_at,
-                     ban_state_end_at=hero.ban_state_end_at,
-                     last_rare_operation_at_turn=hero.last_rare_operation_at_turn)
+    return dict(saved_at_turn=saved_at_turn,
+                saved_at=saved_at,
+                clan_id=hero.clan_id,
+                data=data,
+                actions=s11n.to_json(hero.actions.serialize()),
+                raw_power_physic=hero.power.physic,
+                raw_power_magic=hero.power.magic,
+                quest_created_time=hero.quests.min_quest_created_time,
+                preferences=s11n.to_json(hero.preferences.serialize()),
+                stat_politics_multiplier=hero.politic_power_bonus() if hero.participate_in_power_rating() else 0,
+
+                stat_pve_deaths=hero.statistics.pve_deaths,
+                stat_pve_kills=hero.statistics.pve_kills,
+
+                stat_money_earned_from_loot=hero.statistics.money_earned_from_loot,
+                stat_money_earned_from_artifacts=hero.statistics.money_earned_from_artifacts,
+                stat_money_earned_from_quests=hero.statistics.money_earned_from_quests,
+                stat_money_earned_from_help=hero.statistics.money_earned_from_help,
+                stat_money_earned_from_habits=hero.statistics.money_earned_from_habits,
+                stat_money_earned_from_companions=hero.statistics.money_earned_from_companions,
+                stat_money_earned_from_masters=hero.statistics.money_earned_from_masters,
+
+                stat_money_spend_for_heal=hero.statistics.money_spend_for_heal,
+                stat_money_spend_for_artifacts=hero.statistics.money_spend_for_artifacts,
+                stat_money_spend_for_sharpening=hero.statistics.money_spend_for_sharpening,
+                stat_money_spend_for_useless=hero.statistics.money_spend_for_useless,
+                stat_money_spend_for_impact=hero.statistics.money_spend_for_impact,
+                stat_money_spend_for_experience=hero.statistics.money_spend_for_experience,
+                stat_money_spend_for_repairing=hero.statistics.money_spend_for_repairing,
+                stat_money_spend_for_tax=hero.statistics.money_spend_for_tax,
+                stat_money_spend_for_companions=hero.statistics.money_spend_for_companions,
+
+                stat_artifacts_had=hero.statistics.artifacts_had,
+                stat_loot_had=hero.statistics.loot_had,
+
+                stat_quests_done=hero.statistics.quests_done,
+
+                stat_companions_count=hero.statistics.companions_count,
+
+                stat_pvp_battles_1x1_number=hero.statistics.pvp_battles_1x1_number,
+                stat_pvp_battles_1x1_victories=hero.statistics.pvp_battles_1x1_victories,
+                stat_pvp_battles_1x1_draws=hero.statistics.pvp_battles_1x1_draws,
+
+                stat_cards_used=hero.statistics.cards_used,
+                stat_cards_combined=hero.statistics.cards_combined,
+
+                health=hero.health,
+                level=hero.level,
+                experience=hero.experience,
+                money=hero.money,
+                next_spending=hero.next_spending,
+                habit_honor=hero.habit_honor.raw_value,
+                habit_peacefulness=hero.habit_peacefulness.raw_value,
+                created_at_turn=hero.created_at_turn,
+                is_bot=hero.is_bot,
+                is_alive=hero.is_alive,
+                is_fast=hero.is_fast,
+                gender=hero.gender,
+                race=hero.race,
+                might=hero.might,
+                ui_caching_started_at=hero.ui_caching_started_at,
+                active_state_end_at=hero.active_state_end_at,
+                premium_state_end_at=hero.premium_state_end_at,
+                ban_state_end_at=hero.ban_state_end_at,
+                last_rare_operation_at_turn=hero.last_rare_operation_at_turn)
+
+
+# enums are stored in dump and saved state by their values
+ENUM_COLUMNS = ('gender', 'race', 'next_spending')
+
+
+def saved_state_digest(text):
+    return hashlib.md5(text.encode('utf-8')).digest()
+
+
+def hero_saved_state(arguments):
+    # all components are serialized on every save to find changed ones, so it does not save CPU,
+    # and postgres rewrites the whole row (with TOASTed data json) on every update, so it does not reduce WAL;
+    # only volume of data, sent to database, is decreased
+    state = {}
+
+    for name, value in arguments.items():
+        if name == 'data':
+            for key, data_value in value.items():
+                state[('data', key)] = saved_state_digest(s11n.to_json(data_value))
+        elif isinstance(value, str):
+            state[name] = saved_state_digest(value)
+        elif name in ENUM_COLUMNS:
+            state[name] = value.value
+        else:
+            state[name] = value
+
+    return state
+
+
+def changed_hero_columns(arguments, state, saved_state):
+    if saved_state is None:
+        return {name: value for name, value in arguments.items() if name != 'data'}, arguments['data']
+
+    changed_arguments = {name: value
+                         for name, value in arguments.items()
+                         if name != 'data' and state[name] != saved_state.get(name)}
+
+    changed_data = {key: data_value
+                    for key, data_value in arguments['data'].items()
+                    if state[('data', key)] != saved_state.get(('data', key))}
+
+    return changed_arguments, changed_data
+
+
+def changed_hero_model_arguments(arguments, state, saved_state):
+    changed_arguments, changed_data = changed_hero_columns(arguments, state, saved_state)
+
+    if changed_data:
+        # merge changed sub-documents into stored json instead of rewriting it completely
+        changed_arguments['data'] = django_models.Func(django_models.F('data'),
+                                                       django_models.Value(changed_data, output_field=django_models.JSONField()),
+                                                       template='%(expressions)s',
+                                                       arg_joiner=' || ',
+                                                       output_field=django_models.JSONField())
+
+    return changed_arguments
+
+
+def save_hero(hero, new=False):
+    arguments = hero_model_arguments(hero,
+                                     saved_at_turn=game_turn.number(),
+                                     saved_at=datetime.datetime.now())
+
+    state = hero_saved_state(arguments)
 
     if new:
         models.Hero.objects.create(id=hero.id,
                                    account_id=hero.account_id,
                                    **arguments)
-    else:
+    elif hero.saved_state is None:
         models.Hero.objects.filter(id=hero.id).update(**arguments)
+    else:
+        models.Hero.objects.filter(id=hero.id).update(**changed_hero_model_arguments(arguments, state, hero.saved_state))
 
     hero.saved_at_turn = arguments['saved_at_turn']
     hero.saved_at = arguments['saved_at']
+    hero.saved_state = state
+
+
+# dump & restore used to move full in-memory hero state between processes
+# (including data, that does not stored in database, like journal)
+def dump_hero(hero):
+    arguments = hero_model_arguments(hero,
+                                     saved_at_turn=hero.saved_at_turn,
+                                     saved_at=hero.saved_at)
+
+    for field_name in ENUM_COLUMNS:
+        arguments[field_name] = arguments[field_name].value
+
+    return {'id': hero.id,
+            'account_id': hero.account_id,
+            'model': arguments,
+            'journal': hero.journal.serialize(),
+            'force_save_required': hero.force_save_required,
+            'last_help_on_turn': hero.last_help_on_turn,
+            'helps_in_turn': hero.helps_in_turn,
+            'diary_version': hero.diary_version,
+            'saved_state': hero.saved_state}
+
+
+def restore_hero(dump):
+    arguments = {name: models.Hero._meta.get_field(name).to_python(value)
+                 for name, value in dump['model'].items()}
+
+    hero = hero_from_model(models.Hero(id=dump['id'],
+                                       account_id=dump['account_id'],
+                                       **arguments))
+
+    hero.journal = messages.JournalContainer.deserialize(dump['journal'])
+    hero.force_save_required = dump['force_save_required']
+    hero.last_help_on_turn = dump['last_help_on_turn']
+    hero.helps_in_turn = dump['helps_in_turn']
+    hero.diary_version = dump['diary_version']
+    hero.saved_state = dump['saved_state']
+
+    return hero
+
+
+def _bulk_update_heroes_sql(columns, rows_number):
+    connection = django_db.connections[models.Hero.objects.db]
+
+    fields = [models.Hero._meta.get_field(name) for name in columns]
+
+    assignments = ['"{column}" = v."{column}"::{type}'.format(column=field.column, type=field.db_type(connection))
+                   for field in fields]
+    assignments.append('"data" = h."data" || v."data"::jsonb')
+
+    names = ['"id"'] + ['"{}"'.format(field.column) for field in fields] + ['"data"']
+
+    row = '({})'.format(', '.join(['%s'] * len(names)))
+
+    return 'UPDATE "{table}" AS h SET {assignments} FROM (VALUES {rows}) AS v({names}) WHERE h."id" = v."id"'.format(table=models.Hero._meta.db_table,
+                                                                                                                   assignments=', '.join(assignments),
+                                                                                                                   rows=', '.join([row] * rows_number),
+                                                                                                                   names=', '.join(names))
+
+
+def _lock_heroes(heroes_ids):
+    # UPDATE ... FROM (VALUES ...) locks rows in order, chosen by planner, so rows are locked explicitly in order of ids
+    return list(models.Hero.objects.select_for_update().filter(id__in=heroes_ids).order_by('id').values_list('id', flat=True))
+
+
+def save_heroes(heroes):
+    '''
+    save many heroes with UPDATE ... FROM (VALUES ...) statements in one transaction
+
+    only changed columns and data sub-documents are written (see save_hero)
+    rows are locked in order of ids, so concurrent saves do not deadlock
+    '''
+
+    if not heroes:
+        return 0
+
+    heroes = sorted(heroes, key=lambda hero: hero.id)
+
+    connection = django_db.connections[models.Hero.objects.db]
+
+    saved_at_turn = game_turn.number()
+    saved_at = datetime.datetime.now()
+
+    prepared_heroes = []
+    columns = set()
+
+    for hero in heroes:
+        arguments = hero_model_arguments(hero, saved_at_turn=saved_at_turn, saved_at=saved_at)
+        state = hero_saved_state(arguments)
+        changed_arguments, changed_data = changed_hero_columns(arguments, state, hero.saved_state)
+
+        columns.update(changed_arguments)
+
+        prepared_heroes.append((hero, arguments, state, changed_data))
+
+    columns = sorted(columns)
+
+    fields = [models.Hero._meta.get_field(name) for name in columns]
+    data_field = models.Hero._meta.get_field('data')
+
+    batch_size = conf.settings.BULK_SAVE_BATCH_SIZE
+
+    saved_heroes_number = 0
+
+    with django_transaction.atomic():
+        with connection.cursor() as cursor:
+            for i in range(0, len(prepared_heroes), batch_size):
+                batch = prepared_heroes[i:i + batch_size]
+
+                _lock_heroes([hero.id for hero, arguments, state, changed_data in batch])
+
+                parameters = []
+
+                for hero, arguments, state, changed_data in batch:
+                    parameters.append(hero.id)
+                    parameters.extend(field.get_db_prep_save(arguments[name], connection=connection)
+                                      for name, field in zip(columns, fields))
+                    parameters.append(data_field.get_db_prep_save(changed_data, connection=connection))
+
+                cursor.execute(_bulk_update_heroes_sql(columns, len(batch)), parameters)
+
+                saved_heroes_number += cursor.rowcount
+
+    for hero, arguments, state, changed_data in prepared_heroes:
+        hero.saved_at_turn = saved_at_turn
+        hero.saved_at = saved_at
+        hero.saved_state = state
+
+    return saved_heroes_number
 
 
 def dress_new_hero(hero):
@@ -461,6 +683,20 @@ def get_place_path_modifiers_info(hero, place):
 def sync_hero_external_data(hero):
     account = accounts_prototypes.AccountPrototype.get_by_id(hero.id)
 
+    sync_hero_with_account(hero, account)
+
+
+def sync_heroes_external_data(heroes):
+    accounts_models = accounts_prototypes.AccountPrototype._db_filter(id__in=[hero.id for hero in heroes])
+
+    accounts = {account_model.id: accounts_prototypes.AccountPrototype(model=account_model)
+                for account_model in accounts_models}
+
+    for hero in heroes:
+        sync_hero_with_account(hero, accounts[hero.id])
+
+
+def sync_hero_with_account(hero, account):
     hero.is_fast = account.is_fast
     hero.active_state_end_at = account.active_end_at
     hero.premium_state_end_at = account.premium_end_at
@@ -4,14 +4,67 @@ import smart_imports
 smart_imports.all()
 
 
+# abilities modify attributes only according to their levels,
+# so modifiers of abilities are shared between heroes with the same abilities
+# values of containers are not shared, since they can be changed by next sources
+ABILITIES_MODIFIERS = {}
+
+SHARED_MODIFIERS_TYPES = (bool, int, float)
+
+
+def copy_modifier_value(value):
+    # sources change containers in place, so cached values of previous sources are copied before changing
+    if isinstance(value, (dict, list, set)):
+        return copy.copy(value)
+
+    return value
+
+
+def abilities_modifier(abilities, modifier):
+    key = (tuple((ability_id, ability.level) for ability_id, ability in abilities.abilities.items()), modifier)
+
+    if key in ABILITIES_MODIFIERS:
+        return ABILITIES_MODIFIERS[key]
+
+    value = abilities.modify_attribute(modifier, modifier.default())
+
+    if isinstance(value, SHARED_MODIFIERS_TYPES):
+        if len(ABILITIES_MODIFIERS) >= conf.settings.ABILITIES_MODIFIERS_CACHE_SIZE:
+            ABILITIES_MODIFIERS.clear()
+
+        ABILITIES_MODIFIERS[key] = value
+
+    return value
+
+
 class LogicAccessorsMixin(object):
     __slots__ = ('_cached_modifiers',)
 
-    def reset_accessors_cache(self):
+    def reset_accessors_cache(self, source=None):
+        '''
+        source: changed source of modifiers (MODIFIERS_SOURCE), None if all sources can be changed
+
+        for every modifier, values after every source are cached,
+        so only changed source and sources, applied after it, are recalculated
+        '''
         if not hasattr(self, '_cached_modifiers'):
             self._cached_modifiers = {}
-        else:
+        elif source is None:
             self._cached_modifiers.clear()
+        else:
+            # linguistics restrictions are not cached by sources, so they are always recalculated
+            self._cached_modifiers.pop('#linguistics_restrictions', None)
+
+            clouded_mind = self._cached_clouded_mind()
+
+            self._truncate_cached_modifiers(source.value)
+
+            # habits stages depend on clouded mind, which can be changed by sources, applied after habits,
+            # so habits stages are recalculated only when clouded mind is changed
+            if (clouded_mind is not None and
+                source.value > relations.MODIFIERS_SOURCE.HABIT_HONOR.value and
+                    self.attribute_modifier(relations.MODIFIERS.CLOUDED_MIND) != clouded_mind):
+                self._truncate_cached_modifiers(relations.MODIFIERS_SOURCE.HABIT_HONOR.value)
 
         # sync some parameters
         self.health = min(self.health, self.max_health)
@@ -19,28 +72,58 @@ class LogicAccessorsMixin(object):
         if self.companion:
             self.companion.on_accessors_cache_changed()
 
+    def _cached_clouded_mind(self):
+        values = self._cached_modifiers.get(relations.MODIFIERS.CLOUDED_MIND)
+
+        if values is None or len(values) < len(relations.MODIFIERS_SOURCE.records):
+            return None
+
+        return values[-1]
+
+    def _truncate_cached_modifiers(self, first_source_value):
+        for values in self._cached_modifiers.values():
+            del values[first_source_value:]
+
     def attribute_modifier(self, modifier):
 
         if not hasattr(self, '_cached_modifiers'):
             self._cached_modifiers = {}
 
-        if not django_settings.TESTS_RUNNING and modifier in self._cached_modifiers:
-            return self._cached_modifiers[modifier]
+        values = self._cached_modifiers.get(modifier)
 
-        result = self.modify_attribute(modifier, modifier.default())
+        if values is None or django_settings.TESTS_RUNNING:
+            values = []
+            self._cached_modifiers[modifier] = values
 
-        self._cached_modifiers[modifier] = result
+        for source in relations.MODIFIERS_SOURCE.records[len(values):]:
+            if source.is_ABILITIES:
+                values.append(abilities_modifier(self.abilities, modifier))
+            else:
+                values.append(self.modify_attribute_by_source(source, modifier, copy_modifier_value(values[-1])))
 
-        return result
+        return values[-1]
 
-    def modify_attribute(self, modifier, value):
-        value = self.abilities.modify_attribute(modifier, value)
-        value = self.habit_honor.modify_attribute(modifier, value)
-        value = self.habit_peacefulness.modify_attribute(modifier, value)
-        value = self.equipment.modify_attribute(modifier, value)
+    def modify_attribute_by_source(self, source, modifier, value):
+        if source.is_ABILITIES:
+            return self.abilities.modify_attribute(modifier, value)
 
-        if self.companion and not modifier.is_ADDITIONAL_ABILITIES:
-            value = self.companion.modify_attribute(modifier, value)
+        if source.is_HABIT_HONOR:
+            return self.habit_honor.modify_attribute(modifier, value)
+
+        if source.is_HABIT_PEACEFULNESS:
+            return self.habit_peacefulness.modify_attribute(modifier, value)
+
+        if source.is_EQUIPMENT:
+            return self.equipment.modify_attribute(modifier, value)
+
+        if source.is_COMPANION and self.companion and not modifier.is_ADDITIONAL_ABILITIES:
+            return self.companion.modify_attribute(modifier, value)
+
+        return value
+
+    def modify_attribute(self, modifier, value):
+        for source in relations.MODIFIERS_SOURCE.records:
+            value = self.modify_attribute_by_source(source, modifier, value)
 
         return value
 
@@ -29,8 +29,10 @@ class Hero(logic_accessors.LogicAccessorsMixin,
                  'last_rare_operation_at_turn',
 
                  'force_save_required',
+                 'saved_state',
                  'last_help_on_turn',
                  'helps_in_turn',
+                 'diary_version',
                  'level',
                  'experience',
                  'money',
@@ -110,9 +112,16 @@ class Hero(logic_accessors.LogicAccessorsMixin,
 
         self.force_save_required = False
 
+        # fingerprints of columns and data sub-documents, which are stored in database
+        # None means, that hero must be saved completely
+        self.saved_state = None
+
         self.last_help_on_turn = 0
         self.helps_in_turn = 0
 
+        # version of diary in tt_diary, None if it is unknown
+        self.diary_version = None
+
         self.health = health
 
         self.level = level
@@ -362,7 +371,7 @@ class Hero(logic_accessors.LogicAccessorsMixin,
 
     def remove_companion(self):
         self.companion = None
-        self.reset_accessors_cache()
+        self.reset_accessors_cache(source=relations.MODIFIERS_SOURCE.COMPANION)
 
         while self.next_spending.is_HEAL_COMPANION:
             self.switch_spending()
@@ -382,6 +391,12 @@ class Hero(logic_accessors.LogicAccessorsMixin,
         if diary:
             tt_services.diary.cmd_push_message(self.id, message, size=conf.settings.DIARY_LOG_LENGTH)
 
+            # requests to diary are sent in order of creation, so version will be received after message is pushed
+            tt_services.diary.cmd_request_version(self.id, callback=self.set_diary_version)
+
+    def set_diary_version(self, version):
+        self.diary_version = version
+
     def add_message(self, type_, diary=False, journal=True, turn_delta=0, **kwargs):
         if not diary and not self.is_active and not self.is_premium:
             # do not process journal messages for inactive heroes (and clear them if needed)
@@ -505,7 +520,7 @@ class Hero(logic_accessors.LogicAccessorsMixin,
                     'patch_turn': None if old_info is None else old_info['actual_on_turn'],
                     'actual_on_turn': game_turn.number() if actual_guaranteed else self.saved_at_turn,
                     'ui_caching_started_at': time.mktime(self.ui_caching_started_at.timetuple()),
-                    'diary': None,  # diary version will be setupped by game:info view
+                    'diary': self.diary_version,  # if version is unknown, it will be setupped by game:info view
                     'messages': self.journal.ui_info(),
                     'position': self.position.ui_info(),
                     'bag': self.bag.ui_info(self),
@@ -578,11 +593,17 @@ class Hero(logic_accessors.LogicAccessorsMixin,
 
     @classmethod
     def reset_ui_cache(cls, account_id):
-        utils_cache.delete(cls.cached_ui_info_key_for_hero(account_id))
+        ui_cache.delete(account_id)
+
+    @classmethod
+    def continue_ui_caching_if_required(cls, account_id, ui_caching_started_at):
+        if (cls.is_ui_continue_caching_required(ui_caching_started_at) and
+                game_prototypes.GameState.is_working()):
+            amqp_environment.environment.workers.supervisor.cmd_start_hero_caching(account_id)
 
     @classmethod
     def cached_ui_info_for_hero(cls, account_id, recache_if_required, patch_turns, for_last_turn):
-        data = utils_cache.get(cls.cached_ui_info_key_for_hero(account_id))
+        data = ui_cache.load(account_id)
 
         if data is None:
             hero = logic.load_hero(account_id=account_id)
@@ -590,17 +611,16 @@ class Hero(logic_accessors.LogicAccessorsMixin,
 
         cls.modify_ui_info_with_turn(data, for_last_turn=for_last_turn)
 
-        if (recache_if_required and
-            cls.is_ui_continue_caching_required(data['ui_caching_started_at']) and
-            game_prototypes.GameState.is_working()):
-            amqp_environment.environment.workers.supervisor.cmd_start_hero_caching(account_id)
+        if recache_if_required:
+            cls.continue_ui_caching_if_required(account_id, data['ui_caching_started_at'])
 
         if patch_turns is not None and data['patch_turn'] in patch_turns:
             patch_fields = set(data['changed_fields'])
             for field in list(data.keys()):
 
                 # action always required, since it is used in game.logic
-                if field == 'action':
+                # diary version always sent to client, like it was before version was cached
+                if field in ('action', 'diary'):
                     continue
 
                 if field not in patch_fields:
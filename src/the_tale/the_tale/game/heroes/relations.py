@@ -224,6 +224,15 @@ class MODIFIERS(rels_django.DjangoEnum):
                ('CHARACTER_QUEST_PRIORITY', 83, 'приоритет заданий связанных с героем', lambda: 1.0))
 
 
+# values are the order, in which sources modify attributes
+class MODIFIERS_SOURCE(rels_django.DjangoEnum):
+    records = (('ABILITIES', 0, 'способности'),
+               ('HABIT_HONOR', 1, 'черта чести'),
+               ('HABIT_PEACEFULNESS', 2, 'черта миролюбия'),
+               ('EQUIPMENT', 3, 'экипировка'),
+               ('COMPANION', 4, 'спутник'))
+
+
 class HABIT_CHANGE_SOURCE(rels_django.DjangoEnum):
     quest_marker = rels.Column(unique=False, single_type=False)
     quest_default = rels.Column(unique=False, single_type=False)
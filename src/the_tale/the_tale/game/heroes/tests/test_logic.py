@@ -319,3 +319,237 @@ class SyncHeroExternalData(clans_helpers.ClansTestsMixin,
         self.assertEqual(self.hero.ban_state_end_at, self.account.ban_game_end_at)
         self.assertEqual(self.hero.might, 666)
         self.assertEqual(self.hero.clan_id, clan.id)
+
+
+class DumpHeroTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        account = self.accounts_factory.create_account(is_fast=True)
+
+        self.storage = game_logic_storage.LogicStorage()
+        self.storage.load_account_data(account.id)
+        self.hero = self.storage.accounts_to_heroes[account.id]
+
+    def test_restore(self):
+        self.hero.add_message('hero_common_journal_level_up', hero=self.hero, level=2)
+        self.hero.force_save_required = True
+
+        restored_hero = logic.restore_hero(logic.dump_hero(self.hero))
+
+        self.assertIsNot(restored_hero, self.hero)
+        self.assertEqual(restored_hero, self.hero)
+
+        self.assertEqual(restored_hero.journal, self.hero.journal)
+        self.assertTrue(restored_hero.force_save_required)
+        self.assertEqual(restored_hero.saved_at, self.hero.saved_at)
+        self.assertEqual(restored_hero.saved_at_turn, self.hero.saved_at_turn)
+
+    def test_restore__saved_state(self):
+        logic.save_hero(self.hero)
+
+        restored_hero = logic.restore_hero(pickle.loads(pickle.dumps(logic.dump_hero(self.hero))))
+
+        self.assertEqual(restored_hero.saved_state, self.hero.saved_state)
+
+        restored_hero.money += 100
+
+        with mock.patch('django.db.models.query.QuerySet.update') as update:
+            logic.save_hero(restored_hero)
+
+        self.assertIn('money', update.call_args[1])
+        self.assertNotIn('data', update.call_args[1])
+        self.assertNotIn('level', update.call_args[1])
+
+    def test_restore__no_database_requests(self):
+        dump = logic.dump_hero(self.hero)
+
+        with self.assertNumQueries(0):
+            logic.restore_hero(dump)
+
+
+class SaveHeroTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        account = self.accounts_factory.create_account(is_fast=True)
+
+        self.storage = game_logic_storage.LogicStorage()
+        self.storage.load_account_data(account.id)
+        self.hero = self.storage.accounts_to_heroes[account.id]
+
+    def saved_arguments(self):
+        with mock.patch('django.db.models.query.QuerySet.update') as update:
+            logic.save_hero(self.hero)
+
+        return set(update.call_args[1])
+
+    def test_first_save__full(self):
+        self.assertEqual(self.hero.saved_state, None)
+
+        self.assertEqual(self.saved_arguments(), set(logic.hero_model_arguments(self.hero, saved_at_turn=0, saved_at=None)))
+
+        self.assertNotEqual(self.hero.saved_state, None)
+
+    def test_second_save__nothing_changed(self):
+        logic.save_hero(self.hero)
+
+        self.assertFalse({'data', 'actions', 'preferences', 'money', 'level'} & self.saved_arguments())
+
+    def test_second_save__column_changed(self):
+        logic.save_hero(self.hero)
+
+        self.hero.money += 100
+
+        arguments = self.saved_arguments()
+
+        self.assertIn('money', arguments)
+        self.assertNotIn('data', arguments)
+
+    def test_second_save__data_changed(self):
+        logic.save_hero(self.hero)
+
+        self.hero.last_religion_action_at_turn += 1
+
+        arguments = self.saved_arguments()
+
+        self.assertIn('data', arguments)
+        self.assertNotIn('money', arguments)
+
+    def test_saved_state__digests(self):
+        state = logic.hero_saved_state({'name': 'name', 'gender': self.hero.gender, 'money': 100, 'data': {'bag': [1, 2]}})
+
+        self.assertEqual(state, {'name': hashlib.md5(b'name').digest(),
+                                 'gender': self.hero.gender.value,
+                                 'money': 100,
+                                 ('data', 'bag'): hashlib.md5(s11n.to_json([1, 2]).encode('utf-8')).digest()})
+
+    def test_partial_save(self):
+        logic.save_hero(self.hero)
+
+        self.hero.money += 100
+        self.hero.last_religion_action_at_turn += 1
+        self.hero.position.set_position(x=self.hero.position.x + 1, y=self.hero.position.y)
+
+        logic.save_hero(self.hero)
+
+        loaded_hero = logic.load_hero(hero_id=self.hero.id)
+
+        self.assertEqual(loaded_hero.money, self.hero.money)
+        self.assertEqual(loaded_hero.last_religion_action_at_turn, self.hero.last_religion_action_at_turn)
+        self.assertEqual(loaded_hero.position.serialize(), self.hero.position.serialize())
+        self.assertEqual(loaded_hero.bag, self.hero.bag)
+        self.assertEqual(loaded_hero.equipment, self.hero.equipment)
+        self.assertEqual(loaded_hero.utg_name, self.hero.utg_name)
+
+
+class SaveHeroesTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        self.storage = game_logic_storage.LogicStorage()
+
+        for i in range(3):
+            self.storage.load_account_data(self.accounts_factory.create_account().id)
+
+        self.heroes = sorted(self.storage.heroes.values(), key=lambda hero: hero.id)
+
+    def test_no_heroes(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(logic.save_heroes([]), 0)
+
+    def test_save(self):
+        for i, hero in enumerate(self.heroes):
+            hero.money = 100 + i
+            hero.position.set_position(x=hero.position.x + i, y=hero.position.y)
+
+        self.assertEqual(logic.save_heroes(self.heroes), 3)
+
+        for hero in self.heroes:
+            loaded_hero = logic.load_hero(hero_id=hero.id)
+
+            self.assertEqual(loaded_hero.money, hero.money)
+            self.assertEqual(loaded_hero.position.serialize(), hero.position.serialize())
+            self.assertEqual(loaded_hero.saved_at_turn, hero.saved_at_turn)
+            self.assertNotEqual(hero.saved_state, None)
+
+    def test_save__partial(self):
+        logic.save_heroes(self.heroes)
+
+        self.heroes[0].money = 666
+        self.heroes[1].last_religion_action_at_turn += 1
+
+        logic.save_heroes(self.heroes)
+
+        for hero in self.heroes:
+            loaded_hero = logic.load_hero(hero_id=hero.id)
+
+            self.assertEqual(loaded_hero.money, hero.money)
+            self.assertEqual(loaded_hero.last_religion_action_at_turn, hero.last_religion_action_at_turn)
+            self.assertEqual(loaded_hero.bag, hero.bag)
+            self.assertEqual(loaded_hero.equipment, hero.equipment)
+
+    @mock.patch('the_tale.game.heroes.conf.settings.BULK_SAVE_BATCH_SIZE', 2)
+    def test_save__batches(self):
+        with mock.patch('the_tale.game.heroes.logic._bulk_update_heroes_sql', mock.Mock(wraps=logic._bulk_update_heroes_sql)) as bulk_update_sql:
+            self.assertEqual(logic.save_heroes(self.heroes), 3)
+
+        self.assertEqual([call[0][1] for call in bulk_update_sql.call_args_list], [2, 1])
+
+    @mock.patch('the_tale.game.heroes.conf.settings.BULK_SAVE_BATCH_SIZE', 2)
+    def test_save__written_rows_number(self):
+        dump = logic.dump_hero(self.heroes[1])
+        dump['id'] = 666666
+
+        not_existed_hero = logic.restore_hero(dump)
+
+        self.assertEqual(logic.save_heroes(self.heroes + [not_existed_hero]), 3)
+
+    @mock.patch('the_tale.game.heroes.conf.settings.BULK_SAVE_BATCH_SIZE', 2)
+    def test_save__lock_order(self):
+        with mock.patch('the_tale.game.heroes.logic._lock_heroes', mock.Mock(wraps=logic._lock_heroes)) as lock_heroes:
+            logic.save_heroes(list(reversed(self.heroes)))
+
+        self.assertEqual([call[0][0] for call in lock_heroes.call_args_list],
+                         [[self.heroes[0].id, self.heroes[1].id], [self.heroes[2].id]])
+
+    def test_lock_heroes(self):
+        ids = [hero.id for hero in self.heroes]
+
+        self.assertEqual(logic._lock_heroes(list(reversed(ids)) + [666666]), ids)
+
+
+class LoadHeroesTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        self.account_1 = self.accounts_factory.create_account()
+        self.account_2 = self.accounts_factory.create_account()
+
+    def test_load_heroes_by_account_ids(self):
+        with self.assertNumQueries(2):
+            heroes = logic.load_heroes_by_account_ids([self.account_1.id, self.account_2.id])
+
+        self.assertCountEqual([hero.account_id for hero in heroes], [self.account_1.id, self.account_2.id])
+
+        for hero in heroes:
+            self.assertEqual(hero.might, 0)
+
+    def test_load_heroes_bundles_ids(self):
+        with self.assertNumQueries(1):
+            bundles_ids = logic.load_heroes_bundles_ids([self.account_1.id, self.account_2.id, 666])
+
+        self.assertEqual(bundles_ids, {self.account_1.id: logic.load_hero_bundle_id(self.account_1.id),
+                                       self.account_2.id: logic.load_hero_bundle_id(self.account_2.id)})
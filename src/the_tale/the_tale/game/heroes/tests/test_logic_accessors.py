@@ -281,3 +281,98 @@ class PoliticPowerBonusTests(HeroLogicAccessorsTestBase):
 
         with self.check_increased(self.hero.politic_power_bonus):
             self.hero.abilities.add(heroes_abilities_nonbattle.DIPLOMATIC.get_id(), level=5)
+
+
+class AttributeModifiersCacheTests(HeroLogicAccessorsTestBase):
+
+    def setUp(self):
+        super().setUp()
+        heroes_logic_accessors.ABILITIES_MODIFIERS.clear()
+        self.hero.reset_accessors_cache()
+
+    def test_cache_equal_to_chain(self):
+        with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            for modifier in relations.MODIFIERS.records:
+                self.assertEqual(self.hero.attribute_modifier(modifier),
+                                 self.hero.modify_attribute(modifier, modifier.default()))
+
+    def test_reset_source(self):
+        with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            self.hero.attribute_modifier(relations.MODIFIERS.HEALTH)
+
+            self.assertEqual(len(self.hero._cached_modifiers[relations.MODIFIERS.HEALTH]), len(relations.MODIFIERS_SOURCE.records))
+
+            self.hero.reset_accessors_cache(source=relations.MODIFIERS_SOURCE.EQUIPMENT)
+
+            self.assertEqual(len(self.hero._cached_modifiers[relations.MODIFIERS.HEALTH]), relations.MODIFIERS_SOURCE.EQUIPMENT.value)
+
+            with mock.patch('the_tale.game.heroes.abilities.AbilitiesPrototype.modify_attribute') as abilities_modify_attribute:
+                self.hero.attribute_modifier(relations.MODIFIERS.HEALTH)
+
+            self.assertEqual(abilities_modify_attribute.call_count, 0)
+
+            self.hero.reset_accessors_cache()
+
+            self.assertEqual(self.hero._cached_modifiers, {})
+
+    def test_reset_source__linguistics_restrictions(self):
+        with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            self.hero.attribute_modifier(relations.MODIFIERS.HEALTH)
+            self.hero.linguistics_restrictions_constants()
+
+            self.hero.reset_accessors_cache(source=relations.MODIFIERS_SOURCE.EQUIPMENT)
+
+        self.assertNotIn('#linguistics_restrictions', self.hero._cached_modifiers)
+
+    def test_reset_source__clouded_mind_not_changed(self):
+        with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            self.hero.attribute_modifier(relations.MODIFIERS.QUEST_MARKERS)
+            self.assertFalse(self.hero.clouded_mind)
+
+            self.hero.reset_accessors_cache(source=relations.MODIFIERS_SOURCE.COMPANION)
+
+            self.assertEqual(len(self.hero._cached_modifiers[relations.MODIFIERS.QUEST_MARKERS]), relations.MODIFIERS_SOURCE.COMPANION.value)
+
+    def test_reset_source__clouded_mind_changed(self):
+        # habits stages depend on clouded mind, which can be changed by equipment
+        def equipment_modify_attribute(equipment, modifier, value):
+            return True if modifier.is_CLOUDED_MIND else value
+
+        with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            self.hero.attribute_modifier(relations.MODIFIERS.QUEST_MARKERS)
+            self.assertFalse(self.hero.clouded_mind)
+
+            with mock.patch('the_tale.game.heroes.bag.Equipment.modify_attribute', equipment_modify_attribute):
+                self.hero.reset_accessors_cache(source=relations.MODIFIERS_SOURCE.EQUIPMENT)
+
+                self.assertEqual(len(self.hero._cached_modifiers[relations.MODIFIERS.QUEST_MARKERS]), relations.MODIFIERS_SOURCE.HABIT_HONOR.value)
+
+                self.assertTrue(self.hero.clouded_mind)
+
+    def test_abilities_modifiers_shared(self):
+        account = self.accounts_factory.create_account()
+        self.storage.load_account_data(account.id)
+        hero_2 = self.storage.accounts_to_heroes[account.id]
+
+        with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            self.hero.attribute_modifier(relations.MODIFIERS.HEALTH)
+
+            with mock.patch('the_tale.game.heroes.abilities.AbilitiesPrototype.modify_attribute') as abilities_modify_attribute:
+                hero_2.attribute_modifier(relations.MODIFIERS.HEALTH)
+
+            self.assertEqual(abilities_modify_attribute.call_count, 0)
+
+            hero_2.abilities.increment_level(heroes_abilities_battle.HIT.get_id())
+
+            self.assertEqual(len(hero_2._cached_modifiers[relations.MODIFIERS.HEALTH]), 0)
+
+            with mock.patch('the_tale.game.heroes.abilities.AbilitiesPrototype.modify_attribute', mock.Mock(return_value=1.0)) as abilities_modify_attribute:
+                hero_2.attribute_modifier(relations.MODIFIERS.HEALTH)
+
+            self.assertEqual(abilities_modify_attribute.call_count, 1)
+
+    def test_abilities_modifiers_not_shared_for_containers(self):
+        with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            self.hero.attribute_modifier(relations.MODIFIERS.QUEST_MARKERS)
+
+        self.assertNotIn(relations.MODIFIERS.QUEST_MARKERS, [modifier for _, modifier in heroes_logic_accessors.ABILITIES_MODIFIERS])
@@ -194,6 +194,23 @@ class HeroTest(personal_messages_helpers.Mixin,
 
         self.assertEqual(len(self.hero.journal), 2)
 
+    def test_push_message__diary_version(self):
+        message = messages.MessageSurrogate(turn_number=game_turn.number(),
+                                            timestamp=time.time(),
+                                            key=None,
+                                            externals=None,
+                                            message='abrakadabra')
+
+        self.assertEqual(self.hero.diary_version, None)
+
+        with mock.patch('the_tale.game.heroes.tt_services.DiaryClient.cmd_push_message'):
+            with mock.patch('the_tale.game.heroes.tt_services.DiaryClient.cmd_request_version',
+                            lambda client, account_id, callback: callback(13)):
+                self.hero.push_message(message, diary=True)
+
+        self.assertEqual(self.hero.diary_version, 13)
+        self.assertEqual(self.hero.ui_info(actual_guaranteed=True)['diary'], 13)
+
     def test_add_message__inactive_hero(self):
 
         self.hero.journal.clear()
@@ -937,7 +954,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=False))
 
-    @mock.patch('the_tale.common.utils.cache.get', get_simple_cache_data)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', get_simple_cache_data)
     def test_cached_ui_info_for_hero__continue_caching_required__cache_exists(self):
         with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_start_hero_caching') as cmd_start_hero_caching:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
@@ -946,7 +963,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(ui_info.call_count, 0)
 
     @mock.patch('the_tale.game.heroes.objects.Hero.is_ui_continue_caching_required', classmethod(lambda cls, tm: True))
-    @mock.patch('the_tale.common.utils.cache.get', lambda x: None)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: None)
     def test_cached_ui_info_for_hero__continue_caching_required__cache_not_exists(self):
         with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_start_hero_caching') as cmd_start_hero_caching:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
@@ -955,7 +972,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 1)
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=False))
 
-    @mock.patch('the_tale.common.utils.cache.get', get_simple_cache_data)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', get_simple_cache_data)
     def test_cached_ui_info_for_hero__continue_caching_required__game_stopped__cache_exists(self):
         game_prototypes.GameState.stop()
 
@@ -965,7 +982,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_count, 0)
 
-    @mock.patch('the_tale.common.utils.cache.get', lambda x: None)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: None)
     def test_cached_ui_info_for_hero__continue_caching_required__game_stopped__cache_not_exists(self):
         game_prototypes.GameState.stop()
 
@@ -975,7 +992,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=False))
 
-    @mock.patch('the_tale.common.utils.cache.get', lambda x: get_simple_cache_data(ui_caching_started_at=time.time()))
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: get_simple_cache_data(ui_caching_started_at=time.time()))
     def test_cached_ui_info_for_hero__continue_caching_not_required(self):
         with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_start_hero_caching') as cmd_start_hero_caching:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
@@ -1017,7 +1034,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=False))
 
-    @mock.patch('the_tale.common.utils.cache.get', get_simple_cache_data)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', get_simple_cache_data)
     def test_cached_ui_info_for_hero__continue_caching_required__cache_exists__recache_not_required(self):
         with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_start_hero_caching') as cmd_start_hero_caching:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
@@ -1026,7 +1043,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(ui_info.call_count, 0)
 
     @mock.patch('the_tale.game.heroes.objects.Hero.is_ui_continue_caching_required', classmethod(lambda cls, tm: True))
-    @mock.patch('the_tale.common.utils.cache.get', lambda x: None)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: None)
     def test_cached_ui_info_for_hero__continue_caching_required__cache_not_exists__recache_not_required(self):
         with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_start_hero_caching') as cmd_start_hero_caching:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
@@ -1035,7 +1052,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=False))
 
-    @mock.patch('the_tale.common.utils.cache.get', get_simple_cache_data)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', get_simple_cache_data)
     def test_cached_ui_info_for_hero__continue_caching_required__game_stopped__cache_exists__recache_not_required(self):
         game_prototypes.GameState.stop()
 
@@ -1045,7 +1062,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_count, 0)
 
-    @mock.patch('the_tale.common.utils.cache.get', lambda x: None)
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: None)
     def test_cached_ui_info_for_hero__continue_caching_required__game_stopped__cache_not_exists__recache_not_required(self):
         game_prototypes.GameState.stop()
 
@@ -1055,7 +1072,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=False))
 
-    @mock.patch('the_tale.common.utils.cache.get', lambda x: get_simple_cache_data(ui_caching_started_at=time.time()))
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: get_simple_cache_data(ui_caching_started_at=time.time()))
     def test_cached_ui_info_for_hero__continue_caching_not_required__recache_not_required(self):
         with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_start_hero_caching') as cmd_start_hero_caching:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
@@ -1063,7 +1080,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
         self.assertEqual(cmd_start_hero_caching.call_count, 0)
         self.assertEqual(ui_info.call_count, 0)
 
-    @mock.patch('the_tale.common.utils.cache.get', lambda x: {'ui_caching_started_at': time.time(),
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: {'ui_caching_started_at': time.time(),
                                                           'a': 1,
                                                           'b': 2,
                                                           'c': 3,
@@ -1079,27 +1096,40 @@ class HeroUiInfoTest(utils_testcase.TestCase):
                           'action': {'data': None},
                           'patch_turn': 666})
 
+    @mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: {'ui_caching_started_at': time.time(),
+                                                          'a': 1,
+                                                          'diary': 'diary_version',
+                                                          'patch_turn': 666,
+                                                          'action': {'data': None},
+                                                          'changed_fields': ['changed_fields', 'patch_turn']})
+    def test_cached_ui_info_for_hero__make_patch__diary_version(self):
+        data = objects.Hero.cached_ui_info_for_hero(self.hero.account_id, recache_if_required=False, patch_turns=[666], for_last_turn=False)
+        self.assertEqual(data,
+                         {'diary': 'diary_version',
+                          'action': {'data': None},
+                          'patch_turn': 666})
+
     def test_cached_ui_info_for_hero__turn_in_patch_turns(self):
         old_info = self.hero.ui_info(actual_guaranteed=True, old_info=None)
         old_info['patch_turn'] = 666
         old_info['changed_fields'].extend(field for field in old_info.keys()
-                                          if random.random() < 0.5 or field == 'action')
+                                          if random.random() < 0.5 or field in ('action', 'diary'))
 
-        with mock.patch('the_tale.common.utils.cache.get', lambda x: copy.deepcopy(old_info)):
+        with mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: copy.deepcopy(old_info)):
             data = self.hero.cached_ui_info_for_hero(account_id=self.hero.account_id,
                                                      recache_if_required=False,
                                                      patch_turns=[665, 666, 667],
                                                      for_last_turn=False)
 
         self.assertNotEqual(data['patch_turn'], None)
-        self.assertEqual(set(data.keys()) | {'changed_fields', 'action'}, set(old_info['changed_fields']))
+        self.assertEqual(set(data.keys()) | {'changed_fields', 'action', 'diary'}, set(old_info['changed_fields']))
 
     def test_cached_ui_info_for_hero__turn_not_in_patch_turns(self):
         old_info = self.hero.ui_info(actual_guaranteed=True, old_info=None)
         old_info['patch_turn'] = 664
         old_info['changed_fields'].extend(field for field in old_info.keys() if random.random() < 0.5)
 
-        with mock.patch('the_tale.common.utils.cache.get', lambda x: copy.deepcopy(old_info)):
+        with mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: copy.deepcopy(old_info)):
             data = self.hero.cached_ui_info_for_hero(account_id=self.hero.account_id, recache_if_required=False, patch_turns=[665, 666, 667], for_last_turn=False)
 
         self.assertEqual(set(data.keys()) | set(('changed_fields',)),
@@ -1112,7 +1142,7 @@ class HeroUiInfoTest(utils_testcase.TestCase):
                                       'pvp__last_turn': 'last_turn',
                                       'pvp__actual': 'actual'}
 
-        with mock.patch('the_tale.common.utils.cache.get', lambda x: copy.deepcopy(old_info)):
+        with mock.patch('the_tale.game.heroes.ui_cache.load', lambda x: copy.deepcopy(old_info)):
             data = self.hero.cached_ui_info_for_hero(account_id=self.hero.account_id,
                                                      recache_if_required=False,
                                                      patch_turns=None,
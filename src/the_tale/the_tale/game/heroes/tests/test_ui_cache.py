@@ -0,0 +1,117 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class UICacheTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.info = {'id': 1,
+                     'actual_on_turn': 10,
+                     'position': {'x': 1, 'y': 2},
+                     'messages': [[1, 'текст']],
+                     'ui_caching_started_at': 100}
+
+    def test_pack_unpack(self):
+        packed = ui_cache.pack(self.info)
+
+        self.assertTrue(isinstance(packed, str))
+        self.assertEqual(ui_cache.unpack(packed), self.info)
+
+    def test_unpack__none(self):
+        self.assertEqual(ui_cache.unpack(None), None)
+
+    def test_unpack__unknown_version(self):
+        self.assertEqual(ui_cache.unpack('hui0:' + base64.b64encode(zlib.compress(b'{}')).decode('ascii')), None)
+        self.assertEqual(ui_cache.unpack({'id': 1}), None)
+
+    def test_pack__json_serializable(self):
+        packed = ui_cache.pack(self.info)
+
+        self.assertEqual(json.loads(json.dumps(packed)), packed)
+
+    def test_is_snapshot_required(self):
+        self.assertTrue(ui_cache.is_snapshot_required(None, 10))
+
+        snapshot = ui_cache.create_snapshot(self.info, 10)
+
+        self.assertFalse(ui_cache.is_snapshot_required(snapshot, 10))
+        self.assertFalse(ui_cache.is_snapshot_required(snapshot, 10 + conf.settings.UI_CACHING_SNAPSHOT_PERIOD - 1))
+        self.assertTrue(ui_cache.is_snapshot_required(snapshot, 10 + conf.settings.UI_CACHING_SNAPSHOT_PERIOD))
+
+    def test_create_delta(self):
+        snapshot = ui_cache.create_snapshot(self.info, 10)
+
+        new_info = copy.deepcopy(self.info)
+        new_info['actual_on_turn'] = 11
+        new_info['path'] = None
+
+        self.assertEqual(ui_cache.create_delta(self.info, snapshot), {'snapshot_turn': 10,
+                                                                      'ui_caching_started_at': 100,
+                                                                      'fields': {}})
+        self.assertEqual(ui_cache.create_delta(new_info, snapshot), {'snapshot_turn': 10,
+                                                                     'ui_caching_started_at': 100,
+                                                                     'fields': {'actual_on_turn': 11,
+                                                                                'path': None}})
+
+    def test_load(self):
+        snapshot = ui_cache.create_snapshot(self.info, 10)
+
+        ui_cache.set_many({666: (ui_cache.create_delta(self.info, snapshot), snapshot)})
+
+        new_info = copy.deepcopy(self.info)
+        new_info['actual_on_turn'] = 11
+
+        ui_cache.set_many({666: (ui_cache.create_delta(new_info, snapshot), None)})
+
+        self.assertEqual(ui_cache.load(666), new_info)
+
+    def test_load__no_data(self):
+        self.assertEqual(ui_cache.load(666), None)
+
+    def test_load__wrong_snapshot(self):
+        snapshot = ui_cache.create_snapshot(self.info, 10)
+
+        ui_cache.set_many({666: (ui_cache.create_delta(self.info, snapshot), snapshot)})
+
+        new_snapshot = ui_cache.create_snapshot(self.info, 11)
+
+        ui_cache.set_many({666: (ui_cache.create_delta(self.info, new_snapshot), None)})
+
+        self.assertEqual(ui_cache.load(666), None)
+
+    def test_delete(self):
+        snapshot = ui_cache.create_snapshot(self.info, 10)
+
+        ui_cache.set_many({666: (ui_cache.create_delta(self.info, snapshot), snapshot)})
+
+        ui_cache.delete(666)
+
+        self.assertEqual(utils_cache.get(ui_cache.delta_key(666)), None)
+        self.assertEqual(utils_cache.get(ui_cache.snapshot_key(666)), None)
+
+    def test_delta_state(self):
+        self.assertEqual(ui_cache.delta_state(666), None)
+
+        snapshot = ui_cache.create_snapshot(self.info, 10)
+
+        ui_cache.set_many({666: (ui_cache.create_delta(self.info, snapshot), snapshot)})
+
+        state = ui_cache.delta_state(666)
+
+        self.assertNotEqual(state.version, None)
+        self.assertEqual(state.ui_caching_started_at, 100)
+
+        new_info = copy.deepcopy(self.info)
+        new_info['actual_on_turn'] = 11
+        new_info['ui_caching_started_at'] = 200
+
+        ui_cache.set_many({666: (ui_cache.create_delta(new_info, snapshot), None)})
+
+        new_state = ui_cache.delta_state(666)
+
+        self.assertNotEqual(new_state.version, state.version)
+        self.assertEqual(new_state.ui_caching_started_at, 200)
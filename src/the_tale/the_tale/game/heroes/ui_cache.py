@@ -0,0 +1,122 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+# hero ui info is cached as two records:
+#  - snapshot: full ui info, renewed every UI_CACHING_SNAPSHOT_PERIOD turns
+#  - delta: fields changed since snapshot, renewed every turn
+# records are packed into versioned compressed json, records of unknown versions are ignored
+# cache backend serializes values to json, so compressed data is stored as base64 string
+
+FORMAT_VERSION = 1
+
+FORMAT_HEADER = 'hui%d:' % FORMAT_VERSION
+
+
+DeltaState = collections.namedtuple('DeltaState', ('version', 'ui_caching_started_at'))
+
+
+def pack(data):
+    compressed = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return FORMAT_HEADER + base64.b64encode(compressed).decode('ascii')
+
+
+def unpack(packed):
+    if not isinstance(packed, str) or not packed.startswith(FORMAT_HEADER):
+        return None
+
+    return json.loads(zlib.decompress(base64.b64decode(packed[len(FORMAT_HEADER):])).decode('utf-8'))
+
+
+def snapshot_key(account_id):
+    return conf.settings.UI_CACHING_SNAPSHOT_KEY % account_id
+
+
+def delta_key(account_id):
+    return conf.settings.UI_CACHING_KEY % account_id
+
+
+def snapshot_timeout():
+    # snapshot must live until the last delta, based on it, expires
+    return conf.settings.UI_CACHING_TIMEOUT + conf.settings.UI_CACHING_SNAPSHOT_PERIOD * c.TURN_DELTA
+
+
+def is_snapshot_required(snapshot, turn_number):
+    return snapshot is None or snapshot['turn'] + conf.settings.UI_CACHING_SNAPSHOT_PERIOD <= turn_number
+
+
+def create_snapshot(info, turn_number):
+    return {'turn': turn_number,
+            'info': info}
+
+
+def create_delta(info, snapshot):
+    snapshot_info = snapshot['info']
+
+    # caching time is stored outside of fields, so caching can be continued without loading of snapshot
+    return {'snapshot_turn': snapshot['turn'],
+            'ui_caching_started_at': info['ui_caching_started_at'],
+            'fields': {key: value
+                       for key, value in info.items()
+                       if key not in snapshot_info or snapshot_info[key] != value}}
+
+
+def set_many(records):
+    '''
+    records: {account_id: (delta, new snapshot or None)}
+    '''
+    deltas = {}
+    snapshots = {}
+
+    for account_id, (delta, snapshot) in records.items():
+        deltas[delta_key(account_id)] = pack(delta)
+
+        if snapshot is not None:
+            snapshots[snapshot_key(account_id)] = pack(snapshot)
+
+    if snapshots:
+        utils_cache.set_many(snapshots, snapshot_timeout())
+
+    utils_cache.set_many(deltas, conf.settings.UI_CACHING_TIMEOUT)
+
+
+def load(account_id):
+    records = utils_cache.get_many([delta_key(account_id), snapshot_key(account_id)])
+
+    delta = unpack(records.get(delta_key(account_id)))
+
+    if delta is None:
+        return None
+
+    snapshot = unpack(records.get(snapshot_key(account_id)))
+
+    if snapshot is None or snapshot['turn'] != delta['snapshot_turn']:
+        return None
+
+    info = snapshot['info']
+    info.update(delta['fields'])
+
+    return info
+
+
+def delta_state(account_id):
+    '''
+    state of cached hero ui info, None if ui info is not cached
+
+    version of state is changed with every new delta
+    '''
+    packed = utils_cache.get(delta_key(account_id))
+
+    delta = unpack(packed)
+
+    if delta is None:
+        return None
+
+    return DeltaState(version=hashlib.md5(packed.encode('ascii')).hexdigest(),
+                      ui_caching_started_at=delta['ui_caching_started_at'])
+
+
+def delete(account_id):
+    utils_cache.delete_many([delta_key(account_id), snapshot_key(account_id)])
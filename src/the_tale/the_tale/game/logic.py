@@ -83,7 +83,10 @@ def _form_game_account_info(turn_number, account, is_own, client_turns=None):
                                                             for_last_turn=(not is_own))
 
     data['hero'] = hero_data
-    data['hero']['diary'] = heroes_tt_services.diary.cmd_version(account.id)
+
+    # diary version is setupped by logic worker, when hero pushes messages to diary
+    if data['hero'].get('diary') is None:
+        data['hero']['diary'] = heroes_tt_services.diary.cmd_version(account.id)
 
     data['is_old'] = (data['hero']['actual_on_turn'] < turn_number)
 
@@ -326,6 +329,61 @@ def game_info_from_1_10_to_1_9(data):
     return data
 
 
+# converters of game info to older api versions, in order of applying
+# converter is applied, if requested version is not greater, than its target version
+GAME_INFO_CONVERTERS = (('1.9', game_info_from_1_10_to_1_9),
+                        ('1.8', game_info_from_1_9_to_1_8),
+                        ('1.7', game_info_from_1_8_to_1_7),
+                        ('1.6', game_info_from_1_7_to_1_6),
+                        ('1.5', game_info_from_1_6_to_1_5),
+                        ('1.4', game_info_from_1_5_to_1_4),
+                        ('1.3', game_info_from_1_4_to_1_3),
+                        ('1.2', game_info_from_1_3_to_1_2),
+                        ('1.1', game_info_from_1_2_to_1_1),
+                        ('1.0', game_info_from_1_1_to_1_0))
+
+
+def api_version_key(api_version):
+    return tuple(int(part) for part in api_version.split('.'))
+
+
+def downgrade_game_info(data, api_version):
+    version_key = api_version_key(api_version)
+
+    for target_version, converter in GAME_INFO_CONVERTERS:
+        if api_version_key(target_version) < version_key:
+            break
+
+        data = converter(data)
+
+    return data
+
+
+def game_info_cache_key(account, is_own, api_version, client_turns, hero_cache_state):
+    '''
+    key of encoded game info response, None if response can not be cached
+
+    hero info is changed only with new record of hero ui cache,
+    so key contains version of that record (from hero_cache_state) and all other data, on which response depends
+    '''
+    account_key = None
+
+    if account is not None:
+        if hero_cache_state is None:
+            return None
+
+        account_key = (account.id, is_own, account.active_end_at.timestamp(), hero_cache_state.version)
+
+    key = (game_turn.number(),
+           prototypes.GameState.state().value,
+           map_storage.map_info.version,
+           api_version,
+           tuple(client_turns) if client_turns is not None else None,
+           account_key)
+
+    return conf.settings.INFO_CACHE_KEY % hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+
+
 def accounts_info(accounts_ids):
     accounts = {account.id: account for account in accounts_prototypes.AccountPrototype.get_list_by_id(list(accounts_ids))}
     heroes = {hero.account_id: hero for hero in heroes_logic.load_heroes_by_account_ids(list(accounts_ids))}
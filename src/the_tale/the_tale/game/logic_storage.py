@@ -14,9 +14,11 @@ class LogicStorage(object):
         self.skipped_heroes = set()
         self.bundles_to_accounts = {}
         self.ignored_bundles = set()
+        self.bundles_costs = {}
 
         self.previous_cache = {}
         self.current_cache = {}
+        self.ui_snapshots = {}
         self.cache_queue = set()
 
     def load_account_data(self, account_id):
@@ -26,6 +28,14 @@ class LogicStorage(object):
 
         return hero
 
+    def load_accounts_data(self, accounts_ids):
+        heroes = sorted(heroes_logic.load_heroes_by_account_ids(accounts_ids), key=lambda hero: hero.account_id)
+
+        for hero in heroes:
+            self._add_hero(hero)
+
+        return heroes
+
     def release_account_data(self, account_id, save_required=True):
         hero = self.accounts_to_heroes[account_id]
 
@@ -38,6 +48,8 @@ class LogicStorage(object):
         del self.heroes[hero.id]
         del self.accounts_to_heroes[account_id]
 
+        self.ui_snapshots.pop(hero.cached_ui_info_key, None)
+
         bundle_id = hero.actions.current_action.bundle_id
 
         self.bundles_to_accounts[bundle_id].remove(account_id)
@@ -61,6 +73,15 @@ class LogicStorage(object):
     def _save_hero_data(self, hero_id):
         heroes_logic.save_hero(self.heroes[hero_id])
 
+    def _save_heroes_data(self, heroes_ids, logger=None):
+        started_at = time.time()
+
+        with utils_profiler.phase('save_heroes'):
+            saved_heroes_number = heroes_logic.save_heroes([self.heroes[hero_id] for hero_id in heroes_ids])
+
+        if logger:
+            logger.info('[save_heroes] saved heroes: %d, time: %.3f' % (saved_heroes_number, time.time() - started_at))
+
     def _add_hero(self, hero):
 
         if hero.id in self.heroes:
@@ -78,6 +99,35 @@ class LogicStorage(object):
             self.bundles_to_accounts[bundle_id] = set()
         self.bundles_to_accounts[bundle_id].add(hero.account_id)
 
+    def _remove_hero(self, hero):
+        for action in hero.actions.actions_list:
+            action.set_storage(None)
+
+            if action.saved_meta_action is None:
+                continue
+
+            meta_action_uid = action.saved_meta_action.uid
+
+            if meta_action_uid not in self.meta_actions_to_actions:
+                continue
+
+            self.meta_actions_to_actions[meta_action_uid] = {action_uid
+                                                             for action_uid in self.meta_actions_to_actions[meta_action_uid]
+                                                             if action_uid[0] != hero.id}
+
+            if not self.meta_actions_to_actions[meta_action_uid]:
+                del self.meta_actions_to_actions[meta_action_uid]
+                del self.meta_actions[meta_action_uid]
+
+        del self.heroes[hero.id]
+        del self.accounts_to_heroes[hero.account_id]
+
+        bundle_id = hero.actions.current_action.bundle_id
+
+        self.bundles_to_accounts[bundle_id].remove(hero.account_id)
+        if not self.bundles_to_accounts[bundle_id]:
+            del self.bundles_to_accounts[bundle_id]
+
     def merge_bundles(self, bundles_from, bundle_into):
 
         accounts = set()
@@ -166,13 +216,22 @@ class LogicStorage(object):
         if bundle_id in self.ignored_bundles:
             return
 
+        profiler = utils_profiler.active()
+
+        started_at = time.time()
+
         with self.on_exception(logger,
                                message='LogicStorage.process_turn catch exception, while processing hero %d, try to save all bundles except %d',
                                data=(hero.id, bundle_id),
                                excluded_bundle_id=bundle_id):
 
             while True:
-                leader_action.process_turn()
+                if profiler is None:
+                    leader_action.process_turn()
+                else:
+                    action_started_at = time.perf_counter()
+                    leader_action.process_turn()
+                    profiler.register_action(leader_action.TYPE.name, time.perf_counter() - action_started_at)
 
                 # process new actions if it has been created or remove already processed actions
                 if (continue_steps_if_needed and
@@ -187,20 +246,21 @@ class LogicStorage(object):
 
             hero.process_rare_operations()
 
+        cost = time.time() - started_at
+
+        self.bundles_costs[bundle_id] = self.bundles_costs.get(bundle_id, 0) + cost
+
+        if profiler is not None:
+            profiler.register_hero(hero.id, bundle_id, cost)
+
         if leader_action.removed and leader_action.bundle_id != hero.actions.current_action.bundle_id:
             self.unmerge_bundles(account_id=hero.account_id,
                                  old_bundle_id=leader_action.bundle_id,
                                  new_bundle_id=hero.actions.current_action.bundle_id)
             self.skipped_heroes.add(hero.id)
 
-    def process_turn(self, logger=None, continue_steps_if_needed=True):
-        self.switch_caches()
-
-        timestamp = time.time()
-
-        turn_number = game_turn.number()
-
-        processed_heroes = 0
+    def _get_heroes_to_process(self, turn_number):
+        heroes = []
 
         for hero in self.heroes.values():
             if hero.actions.current_action.bundle_id in self.ignored_bundles:
@@ -212,18 +272,150 @@ class LogicStorage(object):
             if not hero.can_process_turn(turn_number):
                 continue
 
-            self.process_turn__single_hero(hero=hero, logger=logger, continue_steps_if_needed=continue_steps_if_needed)
+            heroes.append(hero)
 
-            processed_heroes += 1
+        return heroes
 
-            if conf.settings.UNLOAD_OBJECTS:
-                hero.unload_serializable_items(timestamp)
+    def process_turn(self, logger=None, continue_steps_if_needed=True):
+        self.switch_caches()
+
+        timestamp = time.time()
+
+        turn_number = game_turn.number()
+
+        heroes = self._get_heroes_to_process(turn_number)
+
+        shards = self._split_to_shards(heroes, conf.settings.PROCESS_TURN_PROCESSES)
+
+        # impacts of heroes are sent to impacts services once per turn
+        with politic_power_logic.buffered_power_impacts(logger=logger):
+            if len(shards) > 1:
+                with utils_profiler.phase('process_turn_parallel'):
+                    processed_heroes = self._process_turn__parallel(shards, timestamp=timestamp, logger=logger, continue_steps_if_needed=continue_steps_if_needed)
+            else:
+                with utils_profiler.phase('process_turn_serial'):
+                    processed_heroes = self._process_turn__serial(heroes, timestamp=timestamp, logger=logger, continue_steps_if_needed=continue_steps_if_needed)
 
         if logger:
             logger.info('[next_turn] processed heroes: %d / %d' % (processed_heroes, len(self.heroes)))
             if self.ignored_bundles:
                 logger.info('[next_turn] ignore bundles: %r' % list(self.ignored_bundles))
 
+    def _process_turn__serial(self, heroes, timestamp, logger, continue_steps_if_needed):
+        for hero in heroes:
+            self.process_turn__single_hero(hero=hero, logger=logger, continue_steps_if_needed=continue_steps_if_needed)
+
+            if conf.settings.UNLOAD_OBJECTS:
+                hero.unload_serializable_items(timestamp)
+
+        return len(heroes)
+
+    def _split_to_shards(self, heroes, shards_number):
+        bundles = {}
+
+        for hero in heroes:
+            bundles.setdefault(hero.actions.current_action.bundle_id, []).append(hero.id)
+
+        if shards_number < 2 or len(bundles) < conf.settings.PROCESS_TURN_MIN_BUNDLES_FOR_PARALLEL:
+            return [[hero.id for hero in heroes]]
+
+        shards = [[] for _ in range(min(shards_number, len(bundles)))]
+
+        # bundles are independent units of work, so distribute them between shards,
+        # starting from the biggest ones and placing every next bundle into the smallest shard
+        for bundle_heroes in sorted(bundles.values(), key=len, reverse=True):
+            min(shards, key=len).extend(bundle_heroes)
+
+        return shards
+
+    def _process_turn__parallel(self, shards, timestamp, logger, continue_steps_if_needed):
+        global _FORKED_STORAGE
+
+        # child processes must not share database connections with parent
+        django_db.connections.close_all()
+
+        _FORKED_STORAGE = self
+
+        try:
+            context = multiprocessing.get_context('fork')
+
+            with context.Pool(processes=len(shards), initializer=_initialize_turn_process) as pool:
+                results = pool.starmap(_process_turn_shard,
+                                       [(shard, logger, continue_steps_if_needed) for shard in shards])
+        finally:
+            _FORKED_STORAGE = None
+
+        processed_heroes = sum(self._merge_turn_shard_result(result) for result in results)
+
+        # heroes are replaced by merge, so unload their items only after it
+        if conf.settings.UNLOAD_OBJECTS:
+            for shard in shards:
+                for hero_id in shard:
+                    self.heroes[hero_id].unload_serializable_items(timestamp)
+
+        return processed_heroes
+
+    def process_turn_shard(self, heroes_ids, logger, continue_steps_if_needed):
+        skipped_heroes = set(self.skipped_heroes)
+        ignored_bundles = set(self.ignored_bundles)
+
+        heroes = [self.heroes[hero_id] for hero_id in heroes_ids]
+
+        # profiler is inherited from parent process, so timings of shard are collected separately and merged by parent
+        profiler = utils_profiler.active()
+
+        if profiler is not None:
+            profiler.start_turn(game_turn.number())
+
+        for hero in heroes:
+            self.process_turn__single_hero(hero=hero, logger=logger, continue_steps_if_needed=continue_steps_if_needed)
+
+        # buffer of impacts is inherited from parent process, so impacts of shard must be sent from here
+        politic_power_logic.flush_power_impacts()
+
+        tt_api_operations.wait_async_requests()
+
+        return {'heroes': [heroes_logic.dump_hero(hero)
+                           for hero in heroes
+                           if hero.actions.current_action.bundle_id not in self.ignored_bundles],
+                'skipped_heroes': self.skipped_heroes - skipped_heroes,
+                'ignored_bundles': self.ignored_bundles - ignored_bundles,
+                'bundles_costs': {bundle_id: self.bundles_costs[bundle_id]
+                                  for bundle_id in {hero.actions.current_action.bundle_id for hero in heroes}
+                                  if bundle_id in self.bundles_costs},
+                'profile': profiler.turn if profiler is not None else None}
+
+    def _merge_turn_shard_result(self, result):
+        self.ignored_bundles |= result['ignored_bundles']
+
+        for bundle_id, cost in result['bundles_costs'].items():
+            self.bundles_costs[bundle_id] = cost
+
+        profiler = utils_profiler.active()
+
+        if profiler is not None and result['profile'] is not None:
+            profiler.merge_turn(result['profile'])
+
+        # heroes of one bundle can share meta actions, so remove all of them before registering new ones
+        for hero_dump in result['heroes']:
+            self._remove_hero(self.heroes[hero_dump['id']])
+
+        for hero_dump in result['heroes']:
+            self._add_hero(heroes_logic.restore_hero(hero_dump))
+
+        self.skipped_heroes |= result['skipped_heroes']
+
+        return len(result['heroes'])
+
+    def pop_bundles_costs(self):
+        costs = [(bundle_id, self.bundles_costs.get(bundle_id, 0), sorted(accounts_ids))
+                 for bundle_id, accounts_ids in self.bundles_to_accounts.items()
+                 if bundle_id not in self.ignored_bundles]
+
+        self.bundles_costs = {}
+
+        return costs
+
     def _save_on_exception(self):
         for hero_id, hero in self.heroes.items():
             if hero.actions.current_action.bundle_id in self.ignored_bundles:
@@ -235,17 +427,16 @@ class LogicStorage(object):
                 self._save_hero_data(hero_id)
 
     def save_all(self, logger=None):
-        heroes = list(self.heroes.items())
-        heroes.sort(key=lambda x: x[0])
+        heroes_ids = [hero_id
+                      for hero_id, hero in self.heroes.items()
+                      if hero.actions.current_action.bundle_id not in self.ignored_bundles]
 
-        for hero_id, hero in heroes:
+        heroes_ids.sort()
 
-            if hero.actions.current_action.bundle_id in self.ignored_bundles:
-                continue
+        if logger:
+            logger.info('save heroes: %d' % len(heroes_ids))
 
-            if logger:
-                logger.info('save hero %d' % hero_id)
-            self._save_hero_data(hero_id)
+        self._save_heroes_data(heroes_ids, logger=logger)
 
     def _get_bundles_to_save(self):
         bundles = set()
@@ -278,6 +469,8 @@ class LogicStorage(object):
         if logger:
             logger.info('[save_changed_data] saved bundles number: %d' % len(saved_bundles))
 
+        heroes_to_save = []
+
         for hero_id, hero in self.heroes.items():
 
             bundle_id = hero.actions.current_action.bundle_id
@@ -289,23 +482,39 @@ class LogicStorage(object):
                 self.cache_queue.add(hero_id)
 
             if bundle_id in saved_bundles:
-                self._save_hero_data(hero_id)
+                heroes_to_save.append(hero_id)
 
-        cached_heroes_number = self.process_cache_queue(update_cache=True)
+        self._save_heroes_data(heroes_to_save, logger=logger)
+
+        with utils_profiler.phase('process_cache_queue'):
+            cached_heroes_number = self.process_cache_queue(update_cache=True)
 
         if logger:
             logger.info('[save_changed_data] cached heroes: %d' % cached_heroes_number)
 
     def process_cache_queue(self, update_cache=False, force_full_data=False):
         to_cache = {}
+        records = {}
+
+        turn_number = game_turn.number()
 
         for hero_id in self.cache_queue:
             hero = self.heroes[hero_id]
             cache_key = hero.cached_ui_info_key
-            to_cache[cache_key] = hero.ui_info(actual_guaranteed=True,
-                                               old_info=None if force_full_data else self.previous_cache.get(cache_key))
+            info = hero.ui_info(actual_guaranteed=True,
+                                old_info=None if force_full_data else self.previous_cache.get(cache_key))
+            to_cache[cache_key] = info
+
+            snapshot = self.ui_snapshots.get(cache_key)
+            new_snapshot = None
 
-        utils_cache.set_many(to_cache, heroes_conf.settings.UI_CACHING_TIMEOUT)
+            if force_full_data or heroes_ui_cache.is_snapshot_required(snapshot, turn_number):
+                snapshot = new_snapshot = heroes_ui_cache.create_snapshot(info, turn_number)
+                self.ui_snapshots[cache_key] = snapshot
+
+            records[hero.account_id] = (heroes_ui_cache.create_delta(info, snapshot), new_snapshot)
+
+        heroes_ui_cache.set_many(records)
 
         self.cache_queue.clear()
 
@@ -315,6 +524,11 @@ class LogicStorage(object):
         return len(to_cache)
 
     def switch_caches(self):
+        # forget snapshots of heroes, which are not cached anymore
+        self.ui_snapshots = {cache_key: snapshot
+                             for cache_key, snapshot in self.ui_snapshots.items()
+                             if cache_key in self.current_cache}
+
         self.previous_cache = self.current_cache
         self.current_cache = {}
 
@@ -331,3 +545,20 @@ class LogicStorage(object):
     def __eq__(self, other):
         return (self.heroes == other.heroes and
                 self.accounts_to_heroes == other.accounts_to_heroes)
+
+
+# storage, that processed by forked turn processes
+# it is set only while parallel turn processing is running
+_FORKED_STORAGE = None
+
+
+def _initialize_turn_process():
+    # workers connections to amqp are inherited from parent process and can not be shared
+    amqp_environment.environment.deinitialize()
+
+    # storages can be synced while turn is processed, so shard must not try to fork its own pools
+    amqp_queues_workers.mark_pool_child_process()
+
+
+def _process_turn_shard(heroes_ids, logger, continue_steps_if_needed):
+    return _FORKED_STORAGE.process_turn_shard(heroes_ids, logger=logger, continue_steps_if_needed=continue_steps_if_needed)
@@ -14,6 +14,12 @@ settings = utils_app_settings.app_settings('MAP',
 
                                            CELL_SIZE=32,
 
+                                           # directory for files with cells columns, shared between processes
+                                           # None — every process builds columns in memory
+                                           CELLS_COLUMNS_DIRECTORY=None,
+                                           # number of newest files with cells columns, which are kept in directory
+                                           CELLS_COLUMNS_FILES_NUMBER=3,
+
                                            REGION_API_VERSION='0.1',
                                            REGION_VERSIONS_API_VERSION='0.1',
 
@@ -22,3 +22,7 @@ class UnknownBuildingTypeError(MapError):
 
 class UnknownPersonRaceError(MapError):
     MSG = 'unknown person race %(race)r'
+
+
+class WrongCellsColumnsFileError(MapError):
+    MSG = 'file %(path)s does not contain cells columns'
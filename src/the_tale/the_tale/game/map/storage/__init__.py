@@ -169,6 +169,7 @@ class CellInfo:
 
 class CellsStorage(utils_storage.DependentStorage):
     __slots__ = ('_map',
+                 '_columns',
 
                  '_places_terrains',
                  '_places_cells',
@@ -176,7 +177,11 @@ class CellsStorage(utils_storage.DependentStorage):
                  '_navigators')
 
     def __init__(self):
+        # cells objects are kept, since they are source of columns and are used by everything, except path finding:
+        # nearest places, roads, buildings, map views; columns contain only attributes, which path finding needs
+        # so every process still builds its own cells objects, only columns are shared between processes
         self._map = []
+        self._columns = None
         self._places_terrains = {}
         self._places_cells = {}
 
@@ -207,6 +212,10 @@ class CellsStorage(utils_storage.DependentStorage):
         self.sync()
         return self._map
 
+    def get_columns(self):
+        self.sync()
+        return self._columns
+
     def place_terrains(self, place_id):
         self.sync()
         return self._places_terrains[place_id]
@@ -224,10 +233,37 @@ class CellsStorage(utils_storage.DependentStorage):
         self.sync_transport()
         self.sync_safety()
 
-        for risk_level in heroes_relations.RISK_LEVEL.records:
-            travel_cost = navigation_pathfinder.TravelCost(map=self._map,
-                                                           expected_battle_complexity=risk_level.expected_battle_complexity)
-            self._navigators[risk_level].sync(travel_cost)
+        self._columns = self._load_columns()
+
+        navigation_navigator.sync_navigators([(self._navigators[risk_level],
+                                               navigation_pathfinder.TravelCost(columns=self._columns,
+                                                                                expected_battle_complexity=risk_level.expected_battle_complexity))
+                                              for risk_level in heroes_relations.RISK_LEVEL.records])
+
+    def _columns_file_path(self):
+        version_hash = hashlib.md5(repr((cells_columns.FORMAT_VERSION,
+                                         map_conf.settings.WIDTH,
+                                         map_conf.settings.HEIGHT,
+                                         self.expected_version())).encode('utf-8')).hexdigest()
+
+        return os.path.join(map_conf.settings.CELLS_COLUMNS_DIRECTORY, 'cells_%s.bin' % version_hash)
+
+    def _load_columns(self):
+        if map_conf.settings.CELLS_COLUMNS_DIRECTORY is None:
+            return cells_columns.CellsColumns.from_cells(self._map)
+
+        # columns of the same map version are built once and mapped into memory of every process
+        path = self._columns_file_path()
+
+        if not os.path.exists(path):
+            cells_columns.CellsColumns.from_cells(self._map).save(path)
+
+            # files of previous versions can still be used by processes, which have not synced storage yet
+            utils_logic.remove_old_files(map_conf.settings.CELLS_COLUMNS_DIRECTORY,
+                                         'cells_*.bin',
+                                         keep=map_conf.settings.CELLS_COLUMNS_FILES_NUMBER)
+
+        return cells_columns.CellsColumns.load(path)
 
     def reset(self):
         super().reset()
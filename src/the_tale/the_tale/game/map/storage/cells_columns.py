@@ -0,0 +1,91 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+# columnar copy of cells data: one flat array for every attribute, cell index is y * width + x
+# columns can be saved to file and mapped into memory of every process, which needs them, in read only mode
+
+NO_VALUE = -1
+
+# version of file format, must be changed with every change of HEADER or COLUMNS
+# it is part of files names, so files of old formats are never loaded
+FORMAT_VERSION = 1
+
+FILE_MAGIC = b'TTCELLS%d' % FORMAT_VERSION
+
+HEADER = struct.Struct('<8sII')
+
+# order of columns in file, float columns go first to keep them aligned
+COLUMNS = (('transport', 'd'),
+           ('safety', 'd'),
+           ('terrain', 'i'),
+           ('place_id', 'i'),
+           ('nearest_place_id', 'i'))
+
+
+def _id_or_no_value(value):
+    return NO_VALUE if value is None else value
+
+
+class CellsColumns:
+    __slots__ = ('width', 'height', 'transport', 'safety', 'terrain', 'place_id', 'nearest_place_id')
+
+    def __init__(self, width, height, transport, safety, terrain, place_id, nearest_place_id):
+        self.width = width
+        self.height = height
+
+        self.transport = transport
+        self.safety = safety
+        self.terrain = terrain
+        self.place_id = place_id
+        self.nearest_place_id = nearest_place_id
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    @classmethod
+    def from_cells(cls, map):
+        cells = [cell for row in map for cell in row]
+
+        return cls(width=len(map[0]),
+                   height=len(map),
+                   transport=array.array('d', (cell.transport for cell in cells)),
+                   safety=array.array('d', (cell.safety for cell in cells)),
+                   terrain=array.array('i', (NO_VALUE if cell.terrain is None else cell.terrain.value for cell in cells)),
+                   place_id=array.array('i', (_id_or_no_value(cell.place_id) for cell in cells)),
+                   nearest_place_id=array.array('i', (_id_or_no_value(cell.nearest_place_id) for cell in cells)))
+
+    def save(self, path):
+        # write to temporary file and rename it, so other processes never see partially written file
+        tmp_path = '%s.%d.tmp' % (path, os.getpid())
+
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(FILE_MAGIC, self.width, self.height))
+
+            for name, typecode in COLUMNS:
+                f.write(array.array(typecode, getattr(self, name)).tobytes())
+
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+        magic, width, height = HEADER.unpack_from(data)
+
+        if magic != FILE_MAGIC:
+            raise map_exceptions.WrongCellsColumnsFileError(path=path)
+
+        columns = {}
+
+        offset = HEADER.size
+
+        for name, typecode in COLUMNS:
+            size = array.array(typecode).itemsize * width * height
+            columns[name] = data[offset:offset + size].cast(typecode)
+            offset += size
+
+        return cls(width=width, height=height, **columns)
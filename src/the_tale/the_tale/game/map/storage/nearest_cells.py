@@ -19,7 +19,44 @@ def skip_one(x, y, current_place, checked_place):
     return abs(current_angle - checked_angle) < SKIPPED_ANGLE
 
 
-def get_availabled_places(x, y, reset_cache=False, cache={}):
+def places_coordinates():
+    return [(place.id, place.x, place.y) for place in places_storage.places.all()]
+
+
+def calculate_availabled_places(x, y, places):
+    '''
+    places: list of (place_id, x, y)
+
+    place is not available, if there is a nearer place in the same direction (see skip_one)
+    distances and angles are calculated once for every place, and places in the same direction
+    are found by binary search in places, sorted by angle, instead of checking all pairs of places
+    '''
+    distances = [dst(x, y, place_x, place_y) for _, place_x, place_y in places]
+    angles = [math.atan2(y - place_y, x - place_x) for _, place_x, place_y in places]
+
+    order = sorted(range(len(places)), key=angles.__getitem__)
+    sorted_angles = [angles[i] for i in order]
+
+    availabled_places = []
+
+    for i, (place_id, _, _) in enumerate(places):
+        angle = angles[i]
+        distance = distances[i]
+
+        # window is wider than skipped angle, exact check is done for every place in window
+        lower = bisect.bisect_left(sorted_angles, angle - SKIPPED_ANGLE - E)
+        upper = bisect.bisect_right(sorted_angles, angle + SKIPPED_ANGLE + E)
+
+        for j in order[lower:upper]:
+            if j != i and abs(angle - angles[j]) < SKIPPED_ANGLE and distance > distances[j]:
+                break
+        else:
+            availabled_places.append((distance, place_id))
+
+    return availabled_places
+
+
+def get_availabled_places(x, y, reset_cache=False, cache={}, places=None):
 
     if django_settings.TESTS_RUNNING:
         cache.clear()
@@ -27,54 +64,46 @@ def get_availabled_places(x, y, reset_cache=False, cache={}):
     if (x, y) in cache:
         return cache[(x, y)]
 
-    places = []
+    if places is None:
+        places = places_coordinates()
 
-    for checked_place in places_storage.places.all():
-        can_be_taken = True
-        checked_dst = dst(x, y, checked_place.x, checked_place.y)
+    cache[(x, y)] = calculate_availabled_places(x, y, places)
 
-        for other_place in places_storage.places.all():
-            if checked_place.id == other_place.id:
-                continue
-
-            other_dst = dst(x, y, other_place.x, other_place.y)
-
-            if skip_one(x, y, checked_place, other_place):
-                if checked_dst > other_dst:
-                    can_be_taken = False
-                    break
+    return cache[(x, y)]
 
-        if can_be_taken:
-            places.append((checked_dst, checked_place.id))
 
-    cache[(x, y)] = places
+def places_politic_attributes():
+    return {place.id: (place.attrs.politic_radius, place.attrs.size)
+            for place in places_storage.places.all()}
 
-    return places
 
-
-def _get_dominant_place_id_by_position(x, y):
+def _get_dominant_place_id(availabled_places, places_attributes):
     nearest_place_id = None
     nearest_power = 0
 
-    for cur_dst, place_id in get_availabled_places(x, y):
+    for cur_dst, place_id in availabled_places:
 
-        place = places_storage.places[place_id]
+        politic_radius, size = places_attributes[place_id]
 
-        if cur_dst > place.attrs.politic_radius:
+        if cur_dst > politic_radius:
             continue
 
         if cur_dst < GUARANTIED_RADIUS:
-            place_power = c.PLACE_MAX_SIZE**2 + place.attrs.size
+            place_power = c.PLACE_MAX_SIZE**2 + size
         else:
-            place_power = float(place.attrs.size) / (cur_dst**2)
+            place_power = float(size) / (cur_dst**2)
 
         if nearest_power < place_power:
-            nearest_place_id = place.id
+            nearest_place_id = place_id
             nearest_power = place_power
 
     return nearest_place_id
 
 
+def _get_dominant_place_id_by_position(x, y):
+    return _get_dominant_place_id(get_availabled_places(x, y), places_politic_attributes())
+
+
 def _get_place_politic_power_on_road(road, x, y):
     if road.place_1.attrs.politic_radius + road.place_2.attrs.politic_radius == 0:
         # initial or test map
@@ -116,9 +145,13 @@ def _get_dominant_place_id_by_roads(map, x, y):
 
 
 def _update_dominant_place(map):
+    # places data are collected once for all cells
+    places = places_coordinates()
+    places_attributes = places_politic_attributes()
+
     for x in range(0, map_conf.settings.WIDTH):
         for y in range(0, map_conf.settings.HEIGHT):
-            map[y][x].dominant_place_id = _get_dominant_place_id_by_position(x, y)
+            map[y][x].dominant_place_id = _get_dominant_place_id(get_availabled_places(x, y, places=places), places_attributes)
 
     for place in places_storage.places.all():
         map[place.y][place.x].dominant_place_id = place.id
@@ -147,19 +180,24 @@ def _update_nearest_place(map, cache=[]):
     if django_settings.TESTS_RUNNING or not cache:
         cache[:] = []
 
+        places = places_coordinates()
+
         for y in range(0, map_conf.settings.HEIGHT):
             cache.append([None] * map_conf.settings.WIDTH)
 
+            # squares of distances are integers, so they are compared exactly as distances
+            row_places = [(place_id, place_x, (y - place_y)**2) for place_id, place_x, place_y in places]
+
             for x in range(0, map_conf.settings.WIDTH):
 
-                best_distance = 999999999
+                best_distance = None
 
-                for place in places_storage.places.all():
-                    distance = dst(x, y, place.x, place.y)
+                for place_id, place_x, row_distance in row_places:
+                    distance = (x - place_x)**2 + row_distance
 
-                    if distance < best_distance:
+                    if best_distance is None or distance < best_distance:
                         best_distance = distance
-                        cache[y][x] = place.id
+                        cache[y][x] = place_id
 
     for x in range(0, map_conf.settings.WIDTH):
         for y in range(0, map_conf.settings.HEIGHT):
@@ -0,0 +1,93 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class CellsColumnsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.place_1, self.place_2, self.place_3 = game_logic.create_test_map()
+
+        self.columns = map_storage.cells.get_columns()
+
+    def check_columns(self, columns):
+        self.assertEqual(columns.width, map_conf.settings.WIDTH)
+        self.assertEqual(columns.height, map_conf.settings.HEIGHT)
+
+        for y in range(map_conf.settings.HEIGHT):
+            for x in range(map_conf.settings.WIDTH):
+                cell = map_storage.cells(x, y)
+                index = columns.index(x, y)
+
+                self.assertEqual(columns.transport[index], cell.transport)
+                self.assertEqual(columns.safety[index], cell.safety)
+                self.assertEqual(columns.terrain[index], cell.terrain.value)
+                self.assertEqual(columns.nearest_place_id[index], cell.nearest_place_id)
+
+                if cell.place_id is None:
+                    self.assertEqual(columns.place_id[index], map_storage_cells_columns.NO_VALUE)
+                else:
+                    self.assertEqual(columns.place_id[index], cell.place_id)
+
+    def test_from_cells(self):
+        self.check_columns(self.columns)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cells.bin')
+
+            self.columns.save(path)
+
+            self.check_columns(map_storage_cells_columns.CellsColumns.load(path))
+
+    def test_load__wrong_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cells.bin')
+
+            with open(path, 'wb') as f:
+                f.write(b'x' * 100)
+
+            with self.assertRaises(map_exceptions.WrongCellsColumnsFileError):
+                map_storage_cells_columns.CellsColumns.load(path)
+
+    def test_storage__shared_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch('the_tale.game.map.conf.settings.CELLS_COLUMNS_DIRECTORY', directory):
+                map_storage.cells.sync(force=True)
+
+                self.assertEqual(len(os.listdir(directory)), 1)
+
+                with mock.patch('the_tale.game.map.storage.cells_columns.CellsColumns.from_cells') as from_cells:
+                    map_storage.cells.sync(force=True)
+
+                self.assertEqual(from_cells.call_count, 0)
+
+                self.check_columns(map_storage.cells.get_columns())
+
+    def test_columns_file_path__format_version(self):
+        with mock.patch('the_tale.game.map.conf.settings.CELLS_COLUMNS_DIRECTORY', '/tmp'):
+            path = map_storage.cells._columns_file_path()
+
+            self.assertEqual(path, map_storage.cells._columns_file_path())
+
+            with mock.patch('the_tale.game.map.storage.cells_columns.FORMAT_VERSION', map_storage_cells_columns.FORMAT_VERSION + 1):
+                self.assertNotEqual(path, map_storage.cells._columns_file_path())
+
+    @mock.patch('the_tale.game.map.conf.settings.CELLS_COLUMNS_FILES_NUMBER', 2)
+    def test_storage__old_files_removed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(3):
+                path = os.path.join(directory, 'cells_old_%d.bin' % i)
+
+                with open(path, 'wb') as f:
+                    f.write(b'x')
+
+                os.utime(path, (i, i))
+
+            with mock.patch('the_tale.game.map.conf.settings.CELLS_COLUMNS_DIRECTORY', directory):
+                map_storage.cells.sync(force=True)
+
+                self.assertCountEqual(os.listdir(directory), [os.path.basename(map_storage.cells._columns_file_path()),
+                                                              'cells_old_2.bin'])
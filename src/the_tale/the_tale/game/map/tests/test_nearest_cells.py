@@ -46,3 +46,43 @@ class GetPlacePoliticPowerOnRoad(utils_testcase.TestCase):
                           (self.places[0].id, 5.0),
                           (self.places[1].id, 7.5),
                           (self.places[1].id, 10.0)])
+
+
+class CalculateAvailabledPlacesTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.places = game_logic.create_test_map()
+
+    def get_availabled_places_by_pairs(self, x, y):
+        places = []
+
+        for checked_place in self.places:
+            checked_dst = map_storage_nearest_cells.dst(x, y, checked_place.x, checked_place.y)
+
+            if any(map_storage_nearest_cells.skip_one(x, y, checked_place, other_place) and
+                   checked_dst > map_storage_nearest_cells.dst(x, y, other_place.x, other_place.y)
+                   for other_place in self.places
+                   if other_place.id != checked_place.id):
+                continue
+
+            places.append((checked_dst, checked_place.id))
+
+        return places
+
+    def test_equal_to_pairs_check(self):
+        places = map_storage_nearest_cells.places_coordinates()
+
+        self.assertEqual([place_id for place_id, _, _ in places], [place.id for place in self.places])
+
+        for y in range(map_conf.settings.HEIGHT):
+            for x in range(map_conf.settings.WIDTH):
+                self.assertEqual(map_storage_nearest_cells.calculate_availabled_places(x, y, places),
+                                 self.get_availabled_places_by_pairs(x, y))
+
+    def test_nearest_place(self):
+        for y in range(map_conf.settings.HEIGHT):
+            for x in range(map_conf.settings.WIDTH):
+                nearest_place = places_storage.places[map_storage.cells(x, y).nearest_place_id]
+                self.assertEqual(map_storage_nearest_cells.dst(x, y, nearest_place.x, nearest_place.y),
+                                 min(map_storage_nearest_cells.dst(x, y, place.x, place.y) for place in self.places))
@@ -19,11 +19,13 @@ class MobsStorage(utils_storage.CachedStorage):
         self._mobs_by_uuids[item.uuid] = item
         self._types_count[item.type] = len([mob for mob in self.all() if mob.type == item.type])
         self.mobs_number = len(self.all())
+        self._choices_tables = {}
 
     def _reset_cache(self):
         self._mobs_by_uuids = {}
         self._types_count = {mob_type: 0 for mob_type in tt_beings_relations.TYPE.records}
         self.mobs_number = 0
+        self._choices_tables = {}
 
     def get_by_uuid(self, uuid):
         self.sync()
@@ -56,18 +58,27 @@ class MobsStorage(utils_storage.CachedStorage):
 
         return mobs
 
+    def _get_mobs_choices_table(self, terrain, mercenary):
+        self.sync()
+
+        key = (terrain, mercenary)
+
+        if key not in self._choices_tables:
+            # all levels are accepted here, table restricts level on choice
+            mobs = self._get_mobs_choices(level=float('inf'), terrain=terrain, mercenary=mercenary)
+            self._choices_tables[key] = utils_logic.LeveledChoices((mob, mob.level, priority) for mob, priority in mobs)
+
+        return self._choices_tables[key]
+
     def get_random_mob(self, hero, mercenary=None, is_boss=False):
         self.sync()
 
-        mobs = self._get_mobs_choices(level=hero.level,
-                                      terrain=hero.position.cell().terrain,
-                                      mercenary=mercenary)
+        mob_record = self._get_mobs_choices_table(terrain=hero.position.cell().terrain,
+                                                  mercenary=mercenary).random_value(max_level=hero.level)
 
-        if not mobs:
+        if mob_record is None:
             return None
 
-        mob_record = utils_logic.random_value_by_priority(mobs)
-
         return objects.Mob(record_id=mob_record.id,
                            level=hero.level,
                            is_boss=is_boss,
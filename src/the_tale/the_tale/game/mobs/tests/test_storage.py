@@ -82,6 +82,33 @@ class MobsStorageTests(utils_testcase.TestCase):
     def test_get_random_mob__no_mob(self):
         self.assertEqual(storage.mobs.get_random_mob(self.hero), None)
 
+    def test_get_random_mob__level(self):
+        self.hero.level = 1
+
+        with mock.patch.object(self.hero.position.cell(), 'terrain', map_relations.TERRAIN.PLANE_SAND):
+            mobs = {storage.mobs.get_random_mob(self.hero).record.id for i in range(100)}
+
+        self.assertEqual(mobs, {mob.id
+                                for mob, priority in storage.mobs._get_mobs_choices(level=1, mercenary=None, terrain=map_relations.TERRAIN.PLANE_SAND)})
+
+    def test_get_random_mob__choices_table_cached(self):
+        storage.mobs.get_random_mob(self.hero)
+
+        with mock.patch('the_tale.game.mobs.storage.MobsStorage._get_mobs_choices') as get_mobs_choices:
+            storage.mobs.get_random_mob(self.hero)
+
+        self.assertEqual(get_mobs_choices.call_count, 0)
+
+    def test_get_random_mob__choices_table_reset_on_update(self):
+        storage.mobs.get_random_mob(self.hero)
+
+        self.assertNotEqual(storage.mobs._choices_tables, {})
+
+        self.bandit.level = 2
+        logic.save_mob_record(self.bandit)
+
+        self.assertEqual(storage.mobs._choices_tables, {})
+
     def test_get_random_mob__boss(self):
         boss = storage.mobs.get_random_mob(self.hero, is_boss=True)
 
@@ -0,0 +1,17 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+settings = utils_app_settings.app_settings('NAVIGATION',
+                                           # directory for files with paths between places, shared between processes
+                                           # None — every process builds paths by itself
+                                           PATHS_DIRECTORY=None,
+                                           # number of newest files with paths, which are kept in directory
+                                           # paths of every risk level are stored in separate file
+                                           PATHS_FILES_NUMBER=15,
+
+                                           # number of forked processes, which build paths of different travel costs (risk levels)
+                                           # 1 — build all paths in current process
+                                           BUILD_PATHS_PROCESSES=1)
@@ -11,15 +11,20 @@ def distance(x_1, y_1, x_2, y_2):
 
 
 def allowed_places_pairs(max_distance_between_places):
-    for place_1 in places_storage.places.all():
-        for place_2 in places_storage.places.all():
-            if place_1.id >= place_2.id:
-                continue
+    places = sorted(places_storage.places.all(), key=lambda place: place.id)
+
+    connected_places = set()
 
+    for road in roads_storage.roads.all():
+        connected_places.add((road.place_1_id, road.place_2_id))
+        connected_places.add((road.place_2_id, road.place_1_id))
+
+    for i, place_1 in enumerate(places):
+        for place_2 in places[i + 1:]:
             min_distance = distance(place_1.x, place_1.y, place_2.x, place_2.y)
 
             if (min_distance > max_distance_between_places and
-                roads_logic.road_between_places(place_1, place_2) is None):
+                (place_1.id, place_2.id) not in connected_places):
                 continue
 
             yield (place_1, place_2)
@@ -28,17 +33,156 @@ def allowed_places_pairs(max_distance_between_places):
 def build_paths(travel_cost, places_pairs):
     paths = {}
 
+    targets = {}
+
     for place_1, place_2 in places_pairs:
-        path, cost = pathfinder.find_path_between_places(start_place=place_1,
-                                                         finish_place=place_2,
-                                                         travel_cost=travel_cost)
-        # base paths must be storen in unmutable tuples, to prevent any chance of modification of them
-        paths[(place_1.id, place_2.id)] = (tuple(path), cost)
-        paths[(place_2.id, place_1.id)] = (tuple(reversed(path)), cost)
+        targets.setdefault(place_1, []).append(place_2)
+
+    # all paths from place are found by one pass of path finder
+    for place_1, places_2 in targets.items():
+        found_paths = pathfinder.find_shortest_paths(from_x=place_1.x,
+                                                     from_y=place_1.y,
+                                                     targets=[(place_2.x, place_2.y) for place_2 in places_2],
+                                                     width=map_conf.settings.WIDTH,
+                                                     height=map_conf.settings.HEIGHT,
+                                                     travel_cost=travel_cost)
+
+        for place_2 in places_2:
+            path, cost = found_paths[(place_2.x, place_2.y)]
+
+            # base paths must be storen in unmutable tuples, to prevent any chance of modification of them
+            paths[(place_1.id, place_2.id)] = (tuple(path), cost)
+            paths[(place_2.id, place_1.id)] = (tuple(reversed(path)), cost)
 
     return paths
 
 
+def paths_file_path(travel_cost, places_pairs):
+    places = [(place_1.id, place_1.x, place_1.y, place_2.id, place_2.x, place_2.y)
+              for place_1, place_2 in places_pairs]
+
+    key = hashlib.md5(repr((map_conf.settings.WIDTH,
+                            map_conf.settings.HEIGHT,
+                            travel_cost.hash(),
+                            places)).encode('utf-8')).hexdigest()
+
+    return os.path.join(conf.settings.PATHS_DIRECTORY, 'paths_%s.json' % key)
+
+
+def save_paths(file_path, paths):
+    data = [[from_id, to_id, cells, cost]
+            for (from_id, to_id), (cells, cost) in paths.items()]
+
+    tmp_file_path = '%s.%d.tmp' % (file_path, os.getpid())
+
+    with open(tmp_file_path, 'w') as f:
+        f.write(s11n.to_json(data))
+
+    os.replace(tmp_file_path, file_path)
+
+
+def load_paths(file_path):
+    with open(file_path) as f:
+        data = s11n.from_json(f.read())
+
+    return {(from_id, to_id): (tuple(tuple(cell) for cell in cells), cost)
+            for from_id, to_id, cells, cost in data}
+
+
+def load_or_build_paths(travel_cost, places_pairs):
+    return load_or_build_many_paths([travel_cost], places_pairs, processes=1)[0]
+
+
+def load_or_build_many_paths(travel_costs, places_pairs, processes):
+    '''
+    returns list of paths for every travel cost
+
+    paths for the same travel costs and places are built once and loaded by other processes
+    paths, which are not found, are built in parallel processes
+    '''
+    paths = [None] * len(travel_costs)
+
+    files_paths = [None] * len(travel_costs)
+
+    if conf.settings.PATHS_DIRECTORY is not None:
+        for i, travel_cost in enumerate(travel_costs):
+            files_paths[i] = paths_file_path(travel_cost, places_pairs)
+
+            if os.path.exists(files_paths[i]):
+                paths[i] = load_paths(files_paths[i])
+
+    not_found = [i for i, found_paths in enumerate(paths) if found_paths is None]
+
+    for i, built_paths in zip(not_found, build_many_paths([travel_costs[i] for i in not_found], places_pairs, processes)):
+        paths[i] = built_paths
+
+        if files_paths[i] is not None:
+            save_paths(files_paths[i], built_paths)
+
+    if not_found and conf.settings.PATHS_DIRECTORY is not None:
+        # files of previous versions can still be used by processes, which have not synced navigators yet
+        utils_logic.remove_old_files(conf.settings.PATHS_DIRECTORY,
+                                     'paths_*.json',
+                                     keep=conf.settings.PATHS_FILES_NUMBER)
+
+    return paths
+
+
+def forked_building_allowed():
+    # navigators can be synced by web server processes, which must not be forked,
+    # by children of workers pools, which can not fork,
+    # and database connections must not be closed inside transaction
+    return (amqp_queues_workers.is_worker_process() and
+            not amqp_queues_workers.is_pool_child_process() and
+            not django_db.connection.in_atomic_block)
+
+
+def build_many_paths(travel_costs, places_pairs, processes):
+    global _FORKED_BUILD
+
+    if processes < 2 or len(travel_costs) < 2 or not forked_building_allowed():
+        return [build_paths(travel_cost=travel_cost, places_pairs=places_pairs) for travel_cost in travel_costs]
+
+    # child processes must not share database connections with parent
+    django_db.connections.close_all()
+
+    # data for building are inherited by forked processes, so only results are transfered between processes
+    _FORKED_BUILD = (travel_costs, places_pairs)
+
+    try:
+        context = multiprocessing.get_context('fork')
+
+        with context.Pool(processes=min(processes, len(travel_costs))) as pool:
+            return pool.map(_build_forked_paths, range(len(travel_costs)))
+    finally:
+        _FORKED_BUILD = None
+
+
+def sync_navigators(navigators):
+    '''
+    navigators: list of (navigator, travel cost)
+
+    places pairs are found once for all navigators,
+    navigators with equal travel costs share the same paths
+    '''
+    places_pairs = list(allowed_places_pairs(max_distance_between_places=MAX_DISTANCE_BETWEEN_CONNECTED_PLACES))
+
+    hashes = [travel_cost.hash() for navigator, travel_cost in navigators]
+
+    travel_costs = {}
+
+    for travel_cost_hash, (navigator, travel_cost) in zip(hashes, navigators):
+        travel_costs.setdefault(travel_cost_hash, travel_cost)
+
+    paths = dict(zip(travel_costs.keys(),
+                     load_or_build_many_paths(list(travel_costs.values()),
+                                              places_pairs,
+                                              processes=conf.settings.BUILD_PATHS_PROCESSES)))
+
+    for travel_cost_hash, (navigator, travel_cost) in zip(hashes, navigators):
+        navigator.set_paths(paths[travel_cost_hash], travel_cost)
+
+
 def get_path_between_places(from_place_id, to_place_id, paths, cost_modifiers):
     if from_place_id == to_place_id:
         place = places_storage.places[from_place_id]
@@ -75,11 +219,10 @@ class Navigator:
         self._travel_cost = None
 
     def sync(self, travel_cost):
-        places_pairs = allowed_places_pairs(max_distance_between_places=MAX_DISTANCE_BETWEEN_CONNECTED_PLACES)
-
-        self._paths = build_paths(travel_cost=travel_cost,
-                                  places_pairs=places_pairs)
+        sync_navigators([(self, travel_cost)])
 
+    def set_paths(self, paths, travel_cost):
+        self._paths = paths
         self._travel_cost = travel_cost
 
     def get_path_between_places(self, from_place_id, to_place_id, cost_modifiers):
@@ -148,3 +291,13 @@ class Navigator:
 
         path_2.append(main_path_2)
         return path_2
+
+
+# data of paths building, processed by forked processes
+# it is set only while parallel building is running
+_FORKED_BUILD = None
+
+
+def _build_forked_paths(index):
+    travel_costs, places_pairs = _FORKED_BUILD
+    return build_paths(travel_cost=travel_costs[index], places_pairs=places_pairs)
@@ -57,40 +57,28 @@ def travel_cost(cell_1, cell_2, expected_battle_complexity):
 
 
 class TravelCost:
-    __slots__ = ('_cache', '_map', 'expected_battle_complexity', 'best_cost')
+    __slots__ = ('_costs', '_width', 'expected_battle_complexity', 'best_cost')
 
-    def __init__(self, map, expected_battle_complexity):
-        self._cache = [[{} for x in range(len(map[0]))]
-                       for y in range(len(map))]
-        self._map = map
+    def __init__(self, columns, expected_battle_complexity):
+        self._width = columns.width
 
         self.expected_battle_complexity = expected_battle_complexity
 
-        best_transoport = 0
-        best_safety = 0
+        # cost of every cell calculated once, cost between cells is mean of their costs (see travel_cost)
+        self._costs = array.array('d', (cell_travel_cost(transport=transport,
+                                                         safety=safety,
+                                                         expected_battle_complexity=expected_battle_complexity)
+                                        for transport, safety in zip(columns.transport, columns.safety)))
 
-        for row in self._map:
-            for cell in row:
-                best_transoport = max(best_transoport, cell.transport)
-                best_safety = max(best_safety, cell.safety)
-
-        self.best_cost = cell_travel_cost(transport=best_transoport,
-                                          safety=best_safety,
+        self.best_cost = cell_travel_cost(transport=max(columns.transport, default=0),
+                                          safety=max(columns.safety, default=0),
                                           expected_battle_complexity=expected_battle_complexity)
 
     def get_cost(self, x_1, y_1, x_2, y_2):
-        key = (x_2, y_2)
-
-        cache = self._cache[y_1][x_1]
-
-        if key not in cache:
-            cache[key] = travel_cost(cell_1=self._map[y_1][x_1],
-                                     cell_2=self._map[y_2][x_2],
-                                     expected_battle_complexity=self.expected_battle_complexity)
+        return (self._costs[y_1 * self._width + x_1] + self._costs[y_2 * self._width + x_2]) / 2
 
-            self._cache[y_2][x_2][(x_1, y_1)] = cache[key]
-
-        return cache[key]
+    def hash(self):
+        return hashlib.md5(b'%d:' % self._width + self._costs.tobytes()).hexdigest()
 
 
 def find_path_between_places(start_place, finish_place, travel_cost, excluded_cells=()):
@@ -131,6 +119,72 @@ def find_shortest_path(from_x, from_y, to_x, to_y, width, height, travel_cost, e
                          travel_cost=travel_cost)
 
 
+def find_shortest_paths(from_x, from_y, targets, width, height, travel_cost):
+    '''
+    find shortest paths from one cell to many cells by single Dijkstra pass
+
+    returns {(to_x, to_y): (path, cost)}
+    '''
+
+    path_map = _build_paths_map(from_x=from_x,
+                                from_y=from_y,
+                                targets=targets,
+                                width=width,
+                                height=height,
+                                travel_cost=travel_cost)
+
+    paths = {}
+
+    for to_x, to_y in targets:
+        if from_x == to_x and from_y == to_y:
+            paths[(to_x, to_y)] = ([(from_x, from_y)], 0)
+            continue
+
+        paths[(to_x, to_y)] = _restore_path(from_x=from_x,
+                                            from_y=from_y,
+                                            to_x=to_x,
+                                            to_y=to_y,
+                                            path_map=path_map,
+                                            width=width,
+                                            height=height,
+                                            travel_cost=travel_cost)
+
+    return paths
+
+
+def _build_paths_map(from_x, from_y, targets, width, height, travel_cost):
+
+    path_map = [[logic.MAX_COST] * width for y in range(height)]
+
+    not_reached_targets = set(targets)
+    not_reached_targets.discard((from_x, from_y))
+
+    heap = [(0, from_x, from_y)]
+
+    path_map[from_y][from_x] = 0
+
+    while not_reached_targets:
+
+        cost, x, y = heapq.heappop(heap)
+
+        if path_map[y][x] < cost:
+            continue
+
+        not_reached_targets.discard((x, y))
+
+        for next_x, next_y in neighbours_coordinates(x, y, width, height):
+            real_cost = cost + travel_cost.get_cost(x, y, next_x, next_y)
+
+            if path_map[next_y][next_x] <= real_cost:
+                continue
+
+            heapq.heappush(heap, (real_cost, next_x, next_y))
+
+            path_map[next_y][next_x] = real_cost
+
+    return path_map
+
+
 def _build_path_map(from_x, from_y, to_x, to_y, width, height, travel_cost, excluded_cells):
 
     path_map = [[logic.MAX_COST] * width for y in range(height)]
@@ -33,8 +33,8 @@ class BuildPathsTests(utils_testcase.TestCase):
         self.place_1, self.place_2, self.place_3 = game_logic.create_test_map()
 
     def test_success(self):
-        travel_cost = navigation_pathfinder.TravelCost(map=map_storage.cells.get_map(),
-                                                       expected_battle_complexity=1.0)
+        travel_cost = navigation_pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
+                                                           expected_battle_complexity=1.0)
         paths = navigator.build_paths(travel_cost,
                                       places_pairs=[(self.place_1, self.place_2),
                                                     (self.place_1, self.place_3)])
@@ -52,8 +52,8 @@ class BuildPathsTests(utils_testcase.TestCase):
         self.assertEqual(paths[(self.place_1.id, self.place_3.id)][0], tuple(reversed(paths[(self.place_3.id, self.place_1.id)][0])))
 
     def test_start_and_end(self):
-        travel_cost = navigation_pathfinder.TravelCost(map=map_storage.cells.get_map(),
-                                                       expected_battle_complexity=1.0)
+        travel_cost = navigation_pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
+                                                           expected_battle_complexity=1.0)
         paths = navigator.build_paths(travel_cost,
                                       places_pairs=[(self.place_1, self.place_2),
                                                     (self.place_1, self.place_3),
@@ -70,6 +70,170 @@ class BuildPathsTests(utils_testcase.TestCase):
                 self.assertEqual(cells[-1], (end_place.x, end_place.y))
 
 
+class LoadOrBuildPathsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.place_1, self.place_2, self.place_3 = game_logic.create_test_map()
+
+        self.travel_cost = navigation_pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
+                                                            expected_battle_complexity=1.0)
+
+        self.places_pairs = list(navigator.allowed_places_pairs(max_distance_between_places=1000))
+
+    def test_same_as_single_searches(self):
+        paths = navigator.build_paths(self.travel_cost, places_pairs=self.places_pairs)
+
+        for place_1, place_2 in self.places_pairs:
+            cells, cost = navigation_pathfinder.find_path_between_places(start_place=place_1,
+                                                                         finish_place=place_2,
+                                                                         travel_cost=self.travel_cost)
+
+            self.assertAlmostEqual(paths[(place_1.id, place_2.id)][1], cost)
+
+    def test_no_directory(self):
+        with mock.patch('the_tale.game.navigation.navigator.save_paths') as save_paths:
+            paths = navigator.load_or_build_paths(self.travel_cost, self.places_pairs)
+
+        self.assertEqual(save_paths.call_count, 0)
+        self.assertEqual(paths, navigator.build_paths(self.travel_cost, places_pairs=self.places_pairs))
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch('the_tale.game.navigation.conf.settings.PATHS_DIRECTORY', directory):
+                paths = navigator.load_or_build_paths(self.travel_cost, self.places_pairs)
+
+                self.assertEqual(len(os.listdir(directory)), 1)
+
+                with mock.patch('the_tale.game.navigation.navigator.build_paths') as build_paths:
+                    loaded_paths = navigator.load_or_build_paths(self.travel_cost, self.places_pairs)
+
+                self.assertEqual(build_paths.call_count, 0)
+                self.assertEqual(loaded_paths, paths)
+
+                travel_cost = navigation_pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
+                                                               expected_battle_complexity=2.0)
+
+                navigator.load_or_build_paths(travel_cost, self.places_pairs)
+
+                self.assertEqual(len(os.listdir(directory)), 2)
+
+
+class LoadOrBuildManyPathsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.place_1, self.place_2, self.place_3 = game_logic.create_test_map()
+
+        self.travel_costs = [navigation_pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
+                                                              expected_battle_complexity=expected_battle_complexity)
+                             for expected_battle_complexity in (1.0, 2.0)]
+
+        self.places_pairs = list(navigator.allowed_places_pairs(max_distance_between_places=1000))
+
+    def test_same_as_single_building(self):
+        paths = navigator.load_or_build_many_paths(self.travel_costs, self.places_pairs, processes=1)
+
+        self.assertEqual(paths, [navigator.build_paths(travel_cost, places_pairs=self.places_pairs)
+                                 for travel_cost in self.travel_costs])
+
+    def test_build_many_paths__single_process(self):
+        with mock.patch('multiprocessing.get_context') as get_context:
+            paths = navigator.build_many_paths(self.travel_costs, self.places_pairs, processes=1)
+
+        self.assertEqual(get_context.call_count, 0)
+        self.assertEqual(len(paths), 2)
+
+    def test_build_many_paths__not_worker_process(self):
+        with mock.patch('multiprocessing.get_context') as get_context:
+            paths = navigator.build_many_paths(self.travel_costs, self.places_pairs, processes=2)
+
+        self.assertEqual(get_context.call_count, 0)
+        self.assertEqual(len(paths), 2)
+
+    def test_build_many_paths__in_transaction(self):
+        with mock.patch('the_tale.common.amqp_queues.workers.is_worker_process', mock.Mock(return_value=True)):
+            with django_transaction.atomic():
+                self.assertFalse(navigator.forked_building_allowed())
+
+                with mock.patch('multiprocessing.get_context') as get_context:
+                    navigator.build_many_paths(self.travel_costs, self.places_pairs, processes=2)
+
+        self.assertEqual(get_context.call_count, 0)
+
+    def test_build_many_paths__forked(self):
+        # connection of test transaction must not be closed, builders do not use database
+        with mock.patch('the_tale.game.navigation.navigator.forked_building_allowed', mock.Mock(return_value=True)):
+            with mock.patch('django.db.connections.close_all') as close_all:
+                paths = navigator.build_many_paths(self.travel_costs, self.places_pairs, processes=2)
+
+        self.assertEqual(close_all.call_count, 1)
+        self.assertEqual(navigator._FORKED_BUILD, None)
+
+        self.assertEqual(paths, [navigator.build_paths(travel_cost, places_pairs=self.places_pairs)
+                                 for travel_cost in self.travel_costs])
+
+    def test_build_forked_paths(self):
+        with mock.patch('the_tale.game.navigation.navigator._FORKED_BUILD', (self.travel_costs, self.places_pairs)):
+            paths = [navigator._build_forked_paths(i) for i in range(len(self.travel_costs))]
+
+        self.assertEqual(paths, [navigator.build_paths(travel_cost, places_pairs=self.places_pairs)
+                                 for travel_cost in self.travel_costs])
+
+    def test_directory__build_only_not_found(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch('the_tale.game.navigation.conf.settings.PATHS_DIRECTORY', directory):
+                navigator.load_or_build_paths(self.travel_costs[0], self.places_pairs)
+
+                with mock.patch('the_tale.game.navigation.navigator.build_paths', mock.Mock(return_value={})) as build_paths:
+                    navigator.load_or_build_many_paths(self.travel_costs, self.places_pairs, processes=1)
+
+                self.assertEqual(build_paths.call_args_list, [mock.call(travel_cost=self.travel_costs[1], places_pairs=self.places_pairs)])
+
+                self.assertEqual(len(os.listdir(directory)), 2)
+
+    @mock.patch('the_tale.game.navigation.conf.settings.PATHS_FILES_NUMBER', 3)
+    def test_directory__old_files_removed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(3):
+                path = os.path.join(directory, 'paths_old_%d.json' % i)
+
+                with open(path, 'w') as f:
+                    f.write('[]')
+
+                os.utime(path, (i, i))
+
+            with mock.patch('the_tale.game.navigation.conf.settings.PATHS_DIRECTORY', directory):
+                navigator.load_or_build_many_paths(self.travel_costs, self.places_pairs, processes=1)
+
+                self.assertCountEqual(os.listdir(directory),
+                                      [os.path.basename(navigator.paths_file_path(travel_cost, self.places_pairs))
+                                       for travel_cost in self.travel_costs] + ['paths_old_2.json'])
+
+
+class SyncNavigatorsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.place_1, self.place_2, self.place_3 = game_logic.create_test_map()
+
+    def test_equal_travel_costs(self):
+        navigators = [(navigator.Navigator(), navigation_pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
+                                                                               expected_battle_complexity=expected_battle_complexity))
+                      for expected_battle_complexity in (1.0, 1.0, 2.0)]
+
+        with mock.patch('the_tale.game.navigation.navigator.build_paths', mock.Mock(side_effect=lambda travel_cost, places_pairs: {})) as build_paths:
+            navigator.sync_navigators(navigators)
+
+        self.assertEqual(build_paths.call_count, 2)
+
+        self.assertIs(navigators[0][0]._paths, navigators[1][0]._paths)
+        self.assertIsNot(navigators[0][0]._paths, navigators[2][0]._paths)
+
+        for synced_navigator, travel_cost in navigators:
+            self.assertIs(synced_navigator._travel_cost, travel_cost)
+
+
 class GetPathBetweenPlacesTests(utils_testcase.TestCase):
 
     def setUp(self):
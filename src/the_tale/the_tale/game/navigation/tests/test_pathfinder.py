@@ -94,37 +94,26 @@ class TravelCostCacheTests(utils_testcase.TestCase):
         super().setUp()
         self.place_1, self.place_2, self.place_3 = game_logic.create_test_map()
 
-        self.cache = pathfinder.TravelCost(map=map_storage.cells.get_map(),
+        self.cache = pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
                                            expected_battle_complexity=1.2)
 
-    @mock.patch('the_tale.game.map.storage.CellInfo.transport', 3)
-    @mock.patch('the_tale.game.map.storage.CellInfo.safety', 4)
     def test_initialization(self):
-        map = map_storage.cells.get_map()
+        columns = map_storage.cells.get_columns()
 
-        cache = pathfinder.TravelCost(map=map,
-                                      expected_battle_complexity=1.2)
-
-        self.assertEqual(cache.expected_battle_complexity, 1.2)
-        self.assertEqual(cache.best_cost,
-                         pathfinder.cell_travel_cost(transport=3,
-                                                     safety=4,
+        self.assertEqual(self.cache.expected_battle_complexity, 1.2)
+        self.assertEqual(self.cache.best_cost,
+                         pathfinder.cell_travel_cost(transport=max(columns.transport),
+                                                     safety=max(columns.safety),
                                                      expected_battle_complexity=1.2))
-        self.assertEqual(cache._cache,
-                         [[{} for x in range(len(map[0]))]
-                          for y in range(len(map))])
+        self.assertEqual(len(self.cache._costs), columns.width * columns.height)
 
     def test_get_cost(self):
         cost = self.cache.get_cost(0, 1, 1, 1)
 
-        self.assertEqual(self.cache._cache[1][0][(1, 1)], cost)
-        self.assertEqual(self.cache._cache[1][1][(0, 1)], cost)
-
-        self.cache._cache[1][0][(1, 1)] = cost + 1
-        self.cache._cache[1][1][(0, 1)] = cost + 1
-
-        self.assertEqual(self.cache.get_cost(0, 1, 1, 1), cost + 1)
-        self.assertEqual(self.cache.get_cost(1, 1, 0, 1), cost + 1)
+        self.assertEqual(cost, pathfinder.travel_cost(map_storage.cells(0, 1),
+                                                      map_storage.cells(1, 1),
+                                                      expected_battle_complexity=1.2))
+        self.assertEqual(self.cache.get_cost(1, 1, 0, 1), cost)
 
 
 class RestorePathTests(utils_testcase.TestCase):
@@ -176,6 +165,54 @@ class BuildPathMapTests(utils_testcase.TestCase):
                           [7.5, 10.0,           logic.MAX_COST, logic.MAX_COST]])
 
 
+class FindShortestPathsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.cost_map = [[1, 1, 9, 1],
+                         [1, 5, 9, 1],
+                         [1, 1, 1, 2],
+                         [9, 9, 1, 1],
+                         [1, 1, 1, 3]]
+
+        self.travel_cost = SimpleTravelCost(map=self.cost_map)
+
+    def test_same_as_single_searches(self):
+        targets = [(3, 0), (0, 4), (3, 4), (1, 1)]
+
+        paths = pathfinder.find_shortest_paths(from_x=0,
+                                               from_y=0,
+                                               targets=targets,
+                                               width=4,
+                                               height=5,
+                                               travel_cost=self.travel_cost)
+
+        self.assertEqual(set(paths), set(targets))
+
+        for to_x, to_y in targets:
+            cells, cost = pathfinder.find_shortest_path(from_x=0,
+                                                        from_y=0,
+                                                        to_x=to_x,
+                                                        to_y=to_y,
+                                                        width=4,
+                                                        height=5,
+                                                        travel_cost=self.travel_cost,
+                                                        excluded_cells=())
+
+            self.assertEqual(paths[(to_x, to_y)], (cells, cost))
+
+    def test_start_in_targets(self):
+        paths = pathfinder.find_shortest_paths(from_x=1,
+                                               from_y=2,
+                                               targets=[(1, 2)],
+                                               width=4,
+                                               height=5,
+                                               travel_cost=self.travel_cost)
+
+        self.assertEqual(paths, {(1, 2): ([(1, 2)], 0)})
+
+
 class FindPathBetweenPlacesTests(utils_testcase.TestCase):
 
     def setUp(self):
@@ -7,4 +7,5 @@ smart_imports.all()
 settings = utils_app_settings.app_settings('POLITIC_POWER',
                                            MAX_HISTORY_LENGTH=1000,
                                            PLACE_INNER_CIRCLE_SIZE=0,
-                                           PERSON_INNER_CIRCLE_SIZE=3)
+                                           PERSON_INNER_CIRCLE_SIZE=3,
+                                           IMPACTS_BUFFER_MAX_SIZE=10000)
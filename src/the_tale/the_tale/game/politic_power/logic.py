@@ -94,6 +94,18 @@ def get_emissaries_power(emissaries_ids):
 
 
 def add_power_impacts(impacts):
+    if _IMPACTS_BUFFER is not None:
+        _IMPACTS_BUFFER.add(impacts)
+
+        if len(_IMPACTS_BUFFER) >= conf.settings.IMPACTS_BUFFER_MAX_SIZE:
+            _IMPACTS_BUFFER.flush()
+
+        return
+
+    send_power_impacts(impacts)
+
+
+def send_power_impacts(impacts):
     transaction = uuid.uuid4()
     current_turn = game_turn.number()
 
@@ -142,6 +154,79 @@ def add_power_impacts(impacts):
         game_tt_services.emissary_impacts.cmd_add_power_impacts(emissary_power)
 
 
+class ImpactsBuffer:
+    __slots__ = ('impacts', 'added', 'sent', 'flushes')
+
+    def __init__(self):
+        self.impacts = {}
+
+        self.added = 0
+        self.sent = 0
+        self.flushes = 0
+
+    def __len__(self):
+        return len(self.impacts)
+
+    def add(self, impacts):
+        for impact in impacts:
+            self.added += 1
+
+            key = (impact.type, impact.actor_type, impact.actor_id, impact.target_type, impact.target_id)
+
+            if key in self.impacts:
+                self.impacts[key].amount += impact.amount
+            else:
+                self.impacts[key] = dataclasses.replace(impact)
+
+    def flush(self):
+        if not self.impacts:
+            return
+
+        impacts = list(self.impacts.values())
+
+        self.impacts = {}
+
+        self.sent += len(impacts)
+        self.flushes += 1
+
+        send_power_impacts(impacts)
+
+
+_IMPACTS_BUFFER = None
+
+
+@contextlib.contextmanager
+def buffered_power_impacts(logger=None):
+    '''
+    impacts, added inside context, are coalesced by (type, actor, target) and sent on exit from context
+    (or earlier, when buffer becomes too big)
+    '''
+    global _IMPACTS_BUFFER
+
+    if _IMPACTS_BUFFER is not None:
+        yield
+        return
+
+    _IMPACTS_BUFFER = ImpactsBuffer()
+
+    try:
+        yield
+    finally:
+        buffer = _IMPACTS_BUFFER
+
+        _IMPACTS_BUFFER = None
+
+        buffer.flush()
+
+        if logger:
+            logger.info('[power_impacts] added: %d, sent: %d, flushes: %d' % (buffer.added, buffer.sent, buffer.flushes))
+
+
+def flush_power_impacts():
+    if _IMPACTS_BUFFER is not None:
+        _IMPACTS_BUFFER.flush()
+
+
 def get_last_power_impacts(limit,
                            storages=(game_tt_services.personal_impacts,
                                      game_tt_services.crowd_impacts),
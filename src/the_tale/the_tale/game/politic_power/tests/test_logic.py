@@ -250,6 +250,104 @@ class AddPowerImpactsTests(utils_testcase.TestCase):
         self.assertCountEqual([impact for impact in impacts if impact.type.is_FAME], fame_impacts)
 
 
+class BufferedPowerImpactsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        game_tt_services.debug_clear_service()
+
+    def impact(self, type, hero_id, person_id, amount):
+        return game_tt_services.PowerImpact.hero_2_person(type=type,
+                                                          hero_id=hero_id,
+                                                          person_id=person_id,
+                                                          amount=amount)
+
+    def test_coalesce(self):
+        with mock.patch('the_tale.game.politic_power.logic.send_power_impacts') as send_power_impacts:
+            with logic.buffered_power_impacts():
+                logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100),
+                                         self.impact(game_tt_services.IMPACT_TYPE.OUTER_CIRCLE, 1, 10, 200)])
+                logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, -30),
+                                         self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 2, 10, 400)])
+
+                self.assertEqual(send_power_impacts.call_count, 0)
+
+        self.assertEqual(send_power_impacts.call_count, 1)
+
+        self.assertCountEqual([(impact.type, impact.actor_id, impact.target_id, impact.amount)
+                               for impact in send_power_impacts.call_args[0][0]],
+                              [(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 70),
+                               (game_tt_services.IMPACT_TYPE.OUTER_CIRCLE, 1, 10, 200),
+                               (game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 2, 10, 400)])
+
+    def test_added_impacts_not_changed(self):
+        impact = self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100)
+
+        with logic.buffered_power_impacts():
+            logic.add_power_impacts([impact])
+            logic.add_power_impacts([impact])
+
+        self.assertEqual(impact.amount, 100)
+
+    def test_nested(self):
+        with mock.patch('the_tale.game.politic_power.logic.send_power_impacts') as send_power_impacts:
+            with logic.buffered_power_impacts():
+                with logic.buffered_power_impacts():
+                    logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100)])
+
+                self.assertEqual(send_power_impacts.call_count, 0)
+
+        self.assertEqual(send_power_impacts.call_count, 1)
+
+    @mock.patch('the_tale.game.politic_power.conf.settings.IMPACTS_BUFFER_MAX_SIZE', 2)
+    def test_flush_on_size(self):
+        with mock.patch('the_tale.game.politic_power.logic.send_power_impacts') as send_power_impacts:
+            with logic.buffered_power_impacts():
+                logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100),
+                                         self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100)])
+
+                self.assertEqual(send_power_impacts.call_count, 0)
+
+                logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 2, 10, 100)])
+
+                self.assertEqual(send_power_impacts.call_count, 1)
+
+                logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 3, 10, 100)])
+
+        self.assertEqual(send_power_impacts.call_count, 2)
+
+    def test_flush_power_impacts(self):
+        with mock.patch('the_tale.game.politic_power.logic.send_power_impacts') as send_power_impacts:
+            logic.flush_power_impacts()
+
+            with logic.buffered_power_impacts():
+                logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100)])
+                logic.flush_power_impacts()
+
+                self.assertEqual(send_power_impacts.call_count, 1)
+
+        self.assertEqual(send_power_impacts.call_count, 1)
+
+    def test_metrics(self):
+        logger = mock.Mock()
+
+        with logic.buffered_power_impacts(logger=logger):
+            logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100),
+                                     self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100)])
+
+        logger.info.assert_called_once_with('[power_impacts] added: 2, sent: 1, flushes: 1')
+
+    def test_sent_to_services(self):
+        with logic.buffered_power_impacts():
+            logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 100)])
+            logic.add_power_impacts([self.impact(game_tt_services.IMPACT_TYPE.INNER_CIRCLE, 1, 10, 50)])
+
+        loaded_impacts = game_tt_services.personal_impacts.cmd_get_last_power_impacts(limit=100)
+
+        self.assertEqual([(impact.actor_id, impact.target_id, impact.amount) for impact in loaded_impacts],
+                         [(1, 10, 150)])
+
+
 class GetLastPowerImpactsTests(utils_testcase.TestCase):
 
     def setUp(self):
@@ -10,4 +10,13 @@ APP_DIR = os.path.abspath(os.path.dirname(__file__))
 settings = utils_app_settings.app_settings('QUESTS',
                                            WRITERS_DIRECTORY=os.path.join(APP_DIR, 'fixtures', 'writers'),
                                            MAX_QUEST_GENERATION_RETRIES=100,
+
+                                           # number of processes, which generate quests, 1 — generate in worker process
+                                           GENERATOR_PROCESSES=1,
+                                           # attempts to generate quest for one request of hero
+                                           GENERATOR_MAX_ATTEMPTS=10,
+                                           # seconds, after which generation in pool is considered lost
+                                           GENERATOR_TIMEOUT=60,
+                                           GENERATOR_METRICS_REPORT_PERIOD=60,
+
                                            INTERFERED_PERSONS_LIVE_TIME=24 * 60 * 60)
@@ -212,12 +212,10 @@ def setup_person(kb, person):
 
 
 def setup_persons(kb, hero_info):
-    for person in persons_storage.persons.all():
+    places_ids = [f_place.externals['id'] for f_place in kb.filter(questgen_facts.Place)]
 
-        if uids.place(person.place.id) not in kb:
-            continue
-
-        setup_person(kb, person)
+    for person_id in storage.world.persons_in_places(places_ids):
+        setup_person(kb, persons_storage.persons[person_id])
 
 
 def setup_social_connections(kb):
@@ -226,9 +224,7 @@ def setup_social_connections(kb):
                      if f_person.externals['type'] == game_relations.ACTOR.PERSON.value}
 
     for person_id, person_uid in persons_in_kb.items():
-        person = persons_storage.persons[person_id]
-
-        for connection_type, connected_person_id in persons_storage.social_connections.get_person_connections(person):
+        for connection_type, connected_person_id in storage.world.person_connections(person_id):
             if connected_person_id not in persons_in_kb:
                 continue
             kb += fact_social_connection(connection_type, person_uid, persons_in_kb[connected_person_id])
@@ -284,9 +280,9 @@ def get_knowledge_base(hero_info, without_restrictions=False):  # pylint: disabl
 
     if not without_restrictions:
 
-        for person in persons_storage.persons.all():
-            if person.place.id == hero_info.position_place_id and person.id in hero_info.interfered_persons:
-                kb += questgen_facts.NotFirstInitiator(person=uids.person(person.id))
+        for person_id in storage.world.persons_in_places([hero_info.position_place_id]):
+            if person_id in hero_info.interfered_persons:
+                kb += questgen_facts.NotFirstInitiator(person=uids.person(person_id))
 
     kb.validate_consistency(WORLD_RESTRICTIONS)
 
@@ -0,0 +1,62 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class WorldKnowledgeStorage(utils_storage.DependentStorage):
+    '''
+    hero independent data for knowledge bases of quests,
+    rebuilt only when persons or their social connections changed
+    '''
+    __slots__ = ('_persons_order',
+                 '_persons_by_place',
+                 '_connections')
+
+    def __init__(self):
+        super().__init__()
+
+        self._persons_order = {}
+        self._persons_by_place = {}
+        self._connections = {}
+
+    def expected_version(self):
+        return (persons_storage.persons.version,
+                persons_storage.social_connections.version)
+
+    def reset(self):
+        super().reset()
+
+        self._persons_order = {}
+        self._persons_by_place = {}
+        self._connections = {}
+
+    def recalculate(self):
+        for i, person in enumerate(persons_storage.persons.all()):
+            self._persons_order[person.id] = i
+
+            self._persons_by_place.setdefault(person.place_id, []).append(person.id)
+
+            connections = persons_storage.social_connections.get_person_connections(person)
+
+            if connections:
+                self._connections[person.id] = tuple(connections)
+
+    def persons_in_places(self, places_ids):
+        self.sync()
+
+        persons_ids = [person_id
+                       for place_id in places_ids
+                       for person_id in self._persons_by_place.get(place_id, ())]
+
+        # keep order of persons storage, so knowledge base does not depend on order of places
+        persons_ids.sort(key=self._persons_order.__getitem__)
+
+        return persons_ids
+
+    def person_connections(self, person_id):
+        self.sync()
+        return self._connections.get(person_id, ())
+
+
+world = WorldKnowledgeStorage()
@@ -0,0 +1,61 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class WorldKnowledgeStorageTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.place_1, self.place_2, self.place_3 = game_logic.create_test_map()
+
+        self.storage = storage.WorldKnowledgeStorage()
+
+    def test_initialize(self):
+        self.assertEqual(self.storage._persons_order, {})
+        self.assertEqual(self.storage._persons_by_place, {})
+        self.assertEqual(self.storage._connections, {})
+
+    def test_persons_in_places(self):
+        self.assertEqual(self.storage.persons_in_places([self.place_1.id, self.place_3.id]),
+                         [person.id
+                          for person in persons_storage.persons.all()
+                          if person.place_id in (self.place_1.id, self.place_3.id)])
+
+    def test_persons_in_places__order(self):
+        self.assertEqual(self.storage.persons_in_places([self.place_3.id, self.place_1.id]),
+                         self.storage.persons_in_places([self.place_1.id, self.place_3.id]))
+
+    def test_persons_in_places__no_places(self):
+        self.assertEqual(self.storage.persons_in_places([]), [])
+
+    def test_person_connections(self):
+        person_1 = self.place_1.persons[0]
+        person_2 = self.place_2.persons[0]
+
+        self.assertEqual(self.storage.person_connections(person_1.id), ())
+
+        connection_type = persons_relations.SOCIAL_CONNECTION_TYPE.random()
+
+        persons_logic.create_social_connection(connection_type, person_1, person_2)
+
+        self.assertEqual(self.storage.person_connections(person_1.id), ((connection_type, person_2.id),))
+        self.assertEqual(self.storage.person_connections(person_2.id), ((connection_type, person_1.id),))
+
+    def test_recalculate_only_on_changes(self):
+        self.storage.persons_in_places([self.place_1.id])
+
+        with mock.patch('the_tale.game.quests.storage.WorldKnowledgeStorage.recalculate') as recalculate:
+            self.storage.persons_in_places([self.place_1.id])
+            self.storage.person_connections(self.place_1.persons[0].id)
+
+        self.assertEqual(recalculate.call_count, 0)
+
+        persons_storage.persons.update_version()
+
+        with mock.patch('the_tale.game.quests.storage.WorldKnowledgeStorage.recalculate') as recalculate:
+            self.storage.persons_in_places([self.place_1.id])
+
+        self.assertEqual(recalculate.call_count, 1)
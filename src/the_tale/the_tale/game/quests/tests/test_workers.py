@@ -184,3 +184,135 @@ class QuestsGeneratorWorkerTests(clans_helpers.ClansTestsMixin,
 
         self.assertEqual(self.worker.requests_heroes_infos,
                          {})
+
+    def request_quest(self, hero):
+        self.worker.process_request_quest(hero.account_id,
+                                          hero_info=logic.create_hero_info(hero).serialize(),
+                                          emissary_id=None,
+                                          place_id=None,
+                                          person_id=None,
+                                          person_action=None)
+
+    @mock.patch('the_tale.game.quests.conf.settings.GENERATOR_MAX_ATTEMPTS', 2)
+    def test_generate_quest__attempts_limit(self):
+        self.request_quest(self.hero_1)
+
+        with mock.patch('the_tale.game.quests.workers.quests_generator.create_knowledge_base', mock.Mock(return_value=None)):
+            self.worker.generate_quest()
+
+            self.assertEqual(self.worker.requests_query, collections.deque([self.account_1.id]))
+            self.assertEqual(self.worker.requests_attempts, {self.account_1.id: 1})
+
+            self.worker.generate_quest()
+
+        self.assertEqual(self.worker.requests_query, collections.deque())
+        self.assertEqual(self.worker.requests_heroes_infos, {})
+        self.assertEqual(self.worker.requests_attempts, {})
+        self.assertEqual(self.worker.metrics['not_generated'], 2)
+        self.assertEqual(self.worker.metrics['dropped'], 1)
+
+    def test_generate_quest__exception(self):
+        self.request_quest(self.hero_1)
+
+        with mock.patch('the_tale.game.quests.workers.quests_generator.create_knowledge_base', mock.Mock(side_effect=Exception)):
+            self.worker.generate_quest()
+
+        self.assertEqual(self.worker.requests_query, collections.deque())
+        self.assertEqual(self.worker.requests_heroes_infos, {})
+        self.assertEqual(self.worker.metrics['errors'], 1)
+
+    @mock.patch('the_tale.game.quests.workers.quests_generator._GENERATOR_LOGGER', mock.Mock())
+    def test_pool(self):
+        results = []
+
+        def apply_async(function, arguments):
+            result = mock.Mock(ready=mock.Mock(return_value=True), get=mock.Mock(return_value=function(*arguments)))
+            results.append(result)
+            return result
+
+        self.worker.pool = mock.Mock(apply_async=apply_async)
+
+        self.request_quest(self.hero_1)
+        self.request_quest(self.hero_2)
+
+        with mock.patch('the_tale.game.quests.conf.settings.GENERATOR_PROCESSES', 2):
+            self.worker.start_quests_generation()
+
+        self.assertEqual(set(self.worker.generations), {self.account_1.id, self.account_2.id})
+        self.assertEqual(self.worker.requests_query, collections.deque())
+
+        # repeated request during generation is not queued
+        self.request_quest(self.hero_1)
+
+        self.assertEqual(self.worker.requests_query, collections.deque())
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_setup_quest') as cmd_setup_quest:
+            self.worker.collect_generated_quests()
+
+        self.assertEqual(self.worker.generations, {})
+        self.assertEqual(self.worker.requests_heroes_infos, {})
+        self.assertCountEqual([call[0][0] for call in cmd_setup_quest.call_args_list], [self.account_1.id, self.account_2.id])
+        self.assertEqual(self.worker.metrics['generated'], 2)
+        self.assertEqual(len(self.worker.metrics['latencies']), 2)
+
+    def test_pool__not_generated__newer_request(self):
+        quest_data = {'info': logic.create_hero_info(self.hero_1),
+                      'emissary_id': None,
+                      'place_id': None,
+                      'person_id': None,
+                      'person_action': None}
+
+        self.worker.generations[self.account_1.id] = (quest_data, mock.Mock(ready=mock.Mock(return_value=True),
+                                                                            get=mock.Mock(return_value=None)),
+                                                    time.time())
+
+        self.hero_1.level = 666
+        self.request_quest(self.hero_1)
+
+        self.worker.collect_generated_quests()
+
+        self.assertEqual(self.worker.requests_query, collections.deque([self.account_1.id]))
+        self.assertEqual(self.worker.requests_heroes_infos[self.account_1.id]['info'].level, 666)
+
+    @mock.patch('the_tale.game.quests.conf.settings.GENERATOR_TIMEOUT', 10)
+    def test_pool__timeout(self):
+        quest_data = {'info': logic.create_hero_info(self.hero_1),
+                      'emissary_id': None,
+                      'place_id': None,
+                      'person_id': None,
+                      'person_action': None}
+
+        self.worker.generations[self.account_1.id] = (quest_data, mock.Mock(ready=mock.Mock(return_value=False)), time.time() - 11)
+        self.worker.generations[self.account_2.id] = (quest_data, mock.Mock(ready=mock.Mock(return_value=False)), time.time() - 9)
+
+        self.request_quest(self.hero_1)
+
+        self.worker.collect_generated_quests()
+
+        self.assertEqual(set(self.worker.generations), {self.account_2.id})
+        self.assertEqual(self.worker.requests_heroes_infos, {})
+        self.assertEqual(self.worker.metrics['errors'], 1)
+
+        # new requests of hero are processed after timeout
+        self.request_quest(self.hero_1)
+
+        self.assertEqual(self.worker.requests_query, collections.deque([self.account_1.id]))
+
+    @mock.patch('the_tale.common.amqp_queues.workers._POOL_CHILD_PROCESS', False)
+    @mock.patch('the_tale.game.quests.workers.quests_generator._GENERATOR_LOGGER', None)
+    def test_initialize_generator_process(self):
+        quests_workers_quests_generator._initialize_generator_process(self.worker.logger.name)
+
+        self.assertTrue(amqp_queues_workers.is_pool_child_process())
+        self.assertEqual(quests_workers_quests_generator._GENERATOR_LOGGER.name, self.worker.logger.name)
+
+    def test_report_metrics(self):
+        self.worker.metrics['generated'] = 2
+        self.worker.metrics['latencies'] = [1, 3]
+
+        with mock.patch.object(self.worker, 'logger') as logger:
+            self.worker.report_metrics()
+
+        self.assertEqual(logger.info.call_args[0][1:], (0, 0, 2, 0, 0, 0, 2, 3))
+        self.assertEqual(self.worker.metrics['generated'], 0)
+        self.assertEqual(self.worker.metrics['latencies'], [])
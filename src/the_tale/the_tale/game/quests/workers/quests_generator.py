@@ -4,6 +4,48 @@ import smart_imports
 smart_imports.all()
 
 
+def deserialize_request(hero_info, emissary_id, place_id, person_id, person_action):
+    return {'info': logic.HeroQuestInfo.deserialize(hero_info),
+            'emissary_id': emissary_id,
+            'place_id': place_id,
+            'person_id': person_id,
+            'person_action': relations.PERSON_ACTION(person_action) if person_action is not None else None}
+
+
+def serialize_request(quest_data):
+    return {'hero_info': quest_data['info'].serialize(),
+            'emissary_id': quest_data['emissary_id'],
+            'place_id': quest_data['place_id'],
+            'person_id': quest_data['person_id'],
+            'person_action': quest_data['person_action'].value if quest_data['person_action'] else None}
+
+
+def create_knowledge_base(quest_data, logger):
+    hero_info = quest_data['info']
+    emissary_id = quest_data['emissary_id']
+    place_id = quest_data['place_id']
+    person_id = quest_data['person_id']
+    person_action = quest_data['person_action']
+
+    if place_id is not None:
+        return logic.create_random_quest_for_place(hero_info=hero_info,
+                                                   place=places_storage.places[place_id],
+                                                   person_action=person_action,
+                                                   logger=logger)
+    if person_id is not None:
+        return logic.create_random_quest_for_person(hero_info=hero_info,
+                                                    person=persons_storage.persons[person_id],
+                                                    person_action=person_action,
+                                                    logger=logger)
+    if emissary_id is not None:
+        return logic.create_random_quest_for_emissary(hero_info=hero_info,
+                                                      emissary=emissaries_storage.emissaries[emissary_id],
+                                                      person_action=person_action,
+                                                      logger=logger)
+
+    return logic.create_random_quest_for_hero(hero_info, logger=logger)
+
+
 class Worker(utils_workers.BaseWorker):
     GET_CMD_TIMEOUT = 0.1
     NO_CMD_TIMEOUT = 0.1
@@ -18,12 +60,45 @@ class Worker(utils_workers.BaseWorker):
 
         self.requests_query = collections.deque()
         self.requests_heroes_infos = {}
+        self.requests_attempts = {}
+        self.requests_times = {}
+
+        # account_id -> (quest_data, async result of generation in pool, time of generation start)
+        self.generations = {}
+
+        self.pool = None
+
+        if conf.settings.GENERATOR_PROCESSES > 1:
+            # child processes must not share database connections with parent
+            django_db.connections.close_all()
+
+            context = multiprocessing.get_context('fork')
+
+            self.pool = context.Pool(processes=conf.settings.GENERATOR_PROCESSES,
+                                     initializer=_initialize_generator_process,
+                                     initargs=(self.logger.name,))
+
+        self.reset_metrics()
 
         self.logger.info('QUEST GENERATOR INITIALIZED')
 
+    def on_stop(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
     def process_no_cmd(self):
-        if self.initialized:
+        if not self.initialized:
+            return
+
+        if self.pool is None:
             self.generate_quest()
+        else:
+            self.collect_generated_quests()
+            self.start_quests_generation()
+
+        if self.metrics_reported_at + conf.settings.GENERATOR_METRICS_REPORT_PERIOD < time.time():
+            self.report_metrics()
 
     def cmd_request_quest(self, account_id, hero_info, emissary_id, place_id, person_id, person_action):
         self.send_cmd('request_quest', {'account_id': account_id,
@@ -34,68 +109,181 @@ class Worker(utils_workers.BaseWorker):
                                         'person_action': person_action.value if person_action else None})
 
     def process_request_quest(self, account_id, hero_info, emissary_id, place_id, person_id, person_action):
-        self.requests_heroes_infos[account_id] = {'info': logic.HeroQuestInfo.deserialize(hero_info),
-                                                  'emissary_id': emissary_id,
-                                                  'place_id': place_id,
-                                                  'person_id': person_id,
-                                                  'person_action': relations.PERSON_ACTION(person_action)
-                                                                   if person_action is not None else None}
-
-        if account_id not in self.requests_query:
-            self.requests_query.append(account_id)
+        # heroes repeat requests every turn, so only the last request of hero is stored
+        self.requests_heroes_infos[account_id] = deserialize_request(hero_info=hero_info,
+                                                                     emissary_id=emissary_id,
+                                                                     place_id=place_id,
+                                                                     person_id=person_id,
+                                                                     person_action=person_action)
 
-    def generate_quest(self):
-        if not self.requests_query:
-            return
+        if account_id not in self.requests_times:
+            self.requests_times[account_id] = time.time()
 
+        # request of hero, which quest is generating now, will be used only if generation fails
+        if account_id not in self.requests_query and account_id not in self.generations:
+            self.requests_query.append(account_id)
+
+    def pop_request(self):
         account_id = self.requests_query.popleft()
 
         quest_data = self.requests_heroes_infos.pop(account_id)
 
-        hero_info = quest_data['info']
-        emissary_id = quest_data['emissary_id']
-        place_id = quest_data['place_id']
-        person_id = quest_data['person_id']
-        person_action = quest_data['person_action']
+        self.logger.info('try to generate quest for hero %s: emissary_id=%s, person_action=%s',
+                         account_id, quest_data['emissary_id'], quest_data['person_action'])
 
-        try:
+        return account_id, quest_data
+
+    def generate_quest(self):
+        if not self.requests_query:
+            return
 
-            self.logger.info('try to generate quest for hero %s: emissary_id=%s, person_action=%s',
-                             account_id, emissary_id, person_action)
-
-            if place_id is not None:
-                knowledge_base = logic.create_random_quest_for_place(hero_info=hero_info,
-                                                                     place=places_storage.places[place_id],
-                                                                     person_action=person_action,
-                                                                     logger=self.logger)
-            elif person_id is not None:
-                knowledge_base = logic.create_random_quest_for_person(hero_info=hero_info,
-                                                                      person=persons_storage.persons[person_id],
-                                                                      person_action=person_action,
-                                                                      logger=self.logger)
-            elif emissary_id is not None:
-                knowledge_base = logic.create_random_quest_for_emissary(hero_info=hero_info,
-                                                                        emissary=emissaries_storage.emissaries[emissary_id],
-                                                                        person_action=person_action,
-                                                                        logger=self.logger)
-            else:
-                knowledge_base = logic.create_random_quest_for_hero(hero_info, logger=self.logger)
+        account_id, quest_data = self.pop_request()
 
+        try:
+            knowledge_base = create_knowledge_base(quest_data, logger=self.logger)
         except Exception:
-            self.logger.error('exception in quest generation')
-            self.logger.error('Exception',
-                              exc_info=sys.exc_info(),
-                              extra={})
-            self.logger.error('continue processing')
+            self.quest_generation_failed(account_id)
             return
 
         if knowledge_base is None:
-            self.logger.info('can not generate quest for hero %s: emissary_id=%s, person_action=%s (push request back to queue)',
-                             account_id, emissary_id, person_action)
+            self.quest_not_generated(account_id, quest_data)
+            return
 
-            self.requests_query.append(account_id)
-            self.requests_heroes_infos[account_id] = quest_data
+        self.quest_generated(account_id, knowledge_base.serialize())
+
+    def start_quests_generation(self):
+        while self.requests_query and len(self.generations) < conf.settings.GENERATOR_PROCESSES:
+            account_id, quest_data = self.pop_request()
+
+            self.generations[account_id] = (quest_data,
+                                            self.pool.apply_async(_generate_quest, (serialize_request(quest_data),)),
+                                            time.time())
 
+    def collect_generated_quests(self):
+        for account_id, (quest_data, result, started_at) in list(self.generations.items()):
+            if not result.ready():
+                # result of generation is lost, if child process has died, so generation is dropped after timeout
+                # and hero will request quest again
+                if started_at + conf.settings.GENERATOR_TIMEOUT < time.time():
+                    del self.generations[account_id]
+                    self.quest_generation_timeout(account_id, quest_data)
+                continue
+
+            del self.generations[account_id]
+
+            try:
+                knowledge_base_data = result.get()
+            except Exception:
+                self.quest_generation_failed(account_id)
+                continue
+
+            if knowledge_base_data is None:
+                self.quest_not_generated(account_id, quest_data)
+                continue
+
+            self.quest_generated(account_id, knowledge_base_data)
+
+    def quest_generated(self, account_id, knowledge_base_data):
+        # quest will be setupped, so newer requests of hero are not needed
+        self.requests_heroes_infos.pop(account_id, None)
+        self.requests_attempts.pop(account_id, None)
+
+        self.metrics['generated'] += 1
+        self.metrics['latencies'].append(time.time() - self.requests_times.pop(account_id, time.time()))
+
+        amqp_environment.environment.workers.supervisor.cmd_setup_quest(account_id, knowledge_base_data)
+
+    def quest_generation_failed(self, account_id):
+        self.logger.error('exception in quest generation')
+        self.logger.error('Exception',
+                          exc_info=sys.exc_info(),
+                          extra={})
+        self.logger.error('continue processing')
+
+        self.metrics['errors'] += 1
+
+        self.forget_request(account_id)
+
+    def quest_generation_timeout(self, account_id, quest_data):
+        self.logger.error('quest generation timeout for hero %s: emissary_id=%s, person_action=%s (drop request)',
+                          account_id, quest_data['emissary_id'], quest_data['person_action'])
+
+        self.metrics['errors'] += 1
+
+        self.forget_request(account_id)
+
+    def quest_not_generated(self, account_id, quest_data):
+        self.metrics['not_generated'] += 1
+
+        self.requests_attempts[account_id] = self.requests_attempts.get(account_id, 0) + 1
+
+        if self.requests_attempts[account_id] >= conf.settings.GENERATOR_MAX_ATTEMPTS:
+            self.logger.warn('can not generate quest for hero %s: emissary_id=%s, person_action=%s (attempts limit reached, drop request)',
+                             account_id, quest_data['emissary_id'], quest_data['person_action'])
+            self.metrics['dropped'] += 1
+            self.forget_request(account_id)
             return
 
-        amqp_environment.environment.workers.supervisor.cmd_setup_quest(account_id, knowledge_base.serialize())
+        self.logger.info('can not generate quest for hero %s: emissary_id=%s, person_action=%s (push request back to queue)',
+                         account_id, quest_data['emissary_id'], quest_data['person_action'])
+
+        # newer request of hero, received while quest was generating, has priority
+        if account_id not in self.requests_heroes_infos:
+            self.requests_heroes_infos[account_id] = quest_data
+
+        self.requests_query.append(account_id)
+
+    def forget_request(self, account_id):
+        self.requests_heroes_infos.pop(account_id, None)
+        self.requests_attempts.pop(account_id, None)
+        self.requests_times.pop(account_id, None)
+
+    def reset_metrics(self):
+        self.metrics = {'generated': 0,
+                        'not_generated': 0,
+                        'errors': 0,
+                        'dropped': 0,
+                        'latencies': []}
+        self.metrics_reported_at = time.time()
+
+    def report_metrics(self):
+        latencies = self.metrics['latencies']
+
+        self.logger.info('[metrics] queue: %d, in progress: %d, generated: %d, not generated: %d, errors: %d, dropped: %d, latency mean: %.3f, max: %.3f',
+                         len(self.requests_query),
+                         len(self.generations),
+                         self.metrics['generated'],
+                         self.metrics['not_generated'],
+                         self.metrics['errors'],
+                         self.metrics['dropped'],
+                         sum(latencies) / len(latencies) if latencies else 0,
+                         max(latencies, default=0))
+
+        self.reset_metrics()
+
+
+_GENERATOR_LOGGER = None
+
+
+def _initialize_generator_process(logger_name):
+    global _GENERATOR_LOGGER
+
+    # workers connections to amqp are inherited from parent process and can not be shared
+    amqp_environment.environment.deinitialize()
+
+    # storages are synced before generation, so generator must not try to fork its own pools
+    amqp_queues_workers.mark_pool_child_process()
+
+    _GENERATOR_LOGGER = logging.getLogger(logger_name)
+
+
+def _generate_quest(serialized_quest_data):
+    # settings and storages of forked process are not refreshed by worker loop
+    utils_storage.sync_all()
+
+    knowledge_base = create_knowledge_base(deserialize_request(**serialized_quest_data), logger=_GENERATOR_LOGGER)
+
+    if knowledge_base is None:
+        return None
+
+    return knowledge_base.serialize()
@@ -86,6 +86,26 @@ class FormGameInfoTests(pvp_helpers.PvPTestsMixin, utils_testcase.TestCase):
         self.assertEqual(cached_ui_info_for_hero.call_args, mock.call(account_id=self.account_1.id, recache_if_required=True, patch_turns=None, for_last_turn=False))
         self.assertEqual(ui_info.call_count, 0)
 
+    def test_diary_version__cached(self):
+        with mock.patch('the_tale.game.heroes.objects.Hero.cached_ui_info_for_hero',
+                        mock.Mock(return_value={'actual_on_turn': 0,
+                                                'action': {},
+                                                'diary': 'diary_version'})):
+            with mock.patch('the_tale.game.heroes.tt_services.diary.cmd_version') as cmd_version:
+                data = logic.form_game_info(self.account_1, is_own=True)
+
+        self.assertEqual(data['account']['hero']['diary'], 'diary_version')
+        self.assertEqual(cmd_version.call_count, 0)
+
+    def test_diary_version__not_cached(self):
+        for hero_data in ({'actual_on_turn': 0, 'action': {}, 'diary': None},
+                          {'actual_on_turn': 0, 'action': {}}):
+            with mock.patch('the_tale.game.heroes.objects.Hero.cached_ui_info_for_hero', mock.Mock(return_value=hero_data)):
+                with mock.patch('the_tale.game.heroes.tt_services.diary.cmd_version', mock.Mock(return_value='diary_version')):
+                    data = logic.form_game_info(self.account_1, is_own=True)
+
+            self.assertEqual(data['account']['hero']['diary'], 'diary_version')
+
     def create_not_own_ui_info(self, hero, enemy_id=None):
         pvp_data = None
 
@@ -226,6 +246,60 @@ class FormGameInfoTests(pvp_helpers.PvPTestsMixin, utils_testcase.TestCase):
         self.assertFalse('pvp__last_turn' in data['enemy']['hero']['action']['data']['pvp'])
 
 
+class GameInfoResponseCacheTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        logic.create_test_map()
+
+        self.account = self.accounts_factory.create_account()
+
+    def test_downgrade_game_info(self):
+        data = logic.form_game_info(self.account, is_own=True)
+
+        self.assertEqual(logic.downgrade_game_info(copy.deepcopy(data), conf.settings.INFO_API_VERSION), data)
+
+        expected_data = logic.game_info_from_1_10_to_1_9(copy.deepcopy(data))
+        expected_data = logic.game_info_from_1_9_to_1_8(expected_data)
+
+        self.assertEqual(logic.downgrade_game_info(copy.deepcopy(data), '1.8'), expected_data)
+
+    def test_downgrade_game_info__all_converters(self):
+        converters = [mock.Mock(side_effect=lambda data: data) for _ in logic.GAME_INFO_CONVERTERS]
+
+        with mock.patch('the_tale.game.logic.GAME_INFO_CONVERTERS',
+                        [(version, converter) for (version, _), converter in zip(logic.GAME_INFO_CONVERTERS, converters)]):
+            logic.downgrade_game_info({}, '1.0')
+
+        self.assertTrue(all(converter.call_count == 1 for converter in converters))
+
+    def test_cache_key__no_account(self):
+        key = logic.game_info_cache_key(account=None, is_own=False, api_version='1.10', client_turns=None, hero_cache_state=None)
+
+        self.assertNotEqual(key, None)
+        self.assertEqual(key, logic.game_info_cache_key(account=None, is_own=False, api_version='1.10', client_turns=None, hero_cache_state=None))
+        self.assertNotEqual(key, logic.game_info_cache_key(account=None, is_own=False, api_version='1.9', client_turns=None, hero_cache_state=None))
+
+        game_turn.increment()
+
+        self.assertNotEqual(key, logic.game_info_cache_key(account=None, is_own=False, api_version='1.10', client_turns=None, hero_cache_state=None))
+
+    def test_cache_key__hero_not_cached(self):
+        self.assertEqual(logic.game_info_cache_key(account=self.account, is_own=True, api_version='1.10', client_turns=None, hero_cache_state=None), None)
+
+    def test_cache_key__hero_cache_changed(self):
+        state_1 = heroes_ui_cache.DeltaState(version='version_1', ui_caching_started_at=0)
+        state_2 = heroes_ui_cache.DeltaState(version='version_2', ui_caching_started_at=0)
+
+        key = logic.game_info_cache_key(account=self.account, is_own=True, api_version='1.10', client_turns=None, hero_cache_state=state_1)
+
+        self.assertNotEqual(key, None)
+        self.assertNotEqual(key, logic.game_info_cache_key(account=self.account, is_own=False, api_version='1.10', client_turns=None, hero_cache_state=state_1))
+        self.assertNotEqual(key, logic.game_info_cache_key(account=self.account, is_own=True, api_version='1.10', client_turns=[1], hero_cache_state=state_1))
+        self.assertNotEqual(key, logic.game_info_cache_key(account=self.account, is_own=True, api_version='1.10', client_turns=None, hero_cache_state=state_2))
+
+
 class HighlevelStepTests(utils_testcase.TestCase):
 
     def setUp(self):
@@ -67,6 +67,17 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.assertEqual(storage.bundles_to_accounts, {self.hero_1.actions.current_action.bundle_id: set([self.account_1.id]),
                                                        self.hero_2.actions.current_action.bundle_id: set([self.account_2.id])})
 
+    def test_load_accounts_data(self):
+        storage = logic_storage.LogicStorage()
+
+        heroes = storage.load_accounts_data([self.account_2.id, self.account_1.id])
+
+        self.assertEqual([hero.id for hero in heroes], [self.hero_1.id, self.hero_2.id])
+        self.assertEqual(set(storage.heroes), {self.hero_1.id, self.hero_2.id})
+        self.assertEqual(set(storage.accounts_to_heroes), {self.account_1.id, self.account_2.id})
+        self.assertEqual(storage.bundles_to_accounts, {self.hero_1.actions.current_action.bundle_id: {self.account_1.id},
+                                                       self.hero_2.actions.current_action.bundle_id: {self.account_2.id}})
+
     def test_load_account_data_with_meta_action(self):
         bundle_id = 666
 
@@ -140,6 +151,14 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.assertEqual(self.hero_1.health, heroes_logic.load_hero(hero_id=self.hero_1.id).health)
         self.assertEqual(self.hero_2.health, heroes_logic.load_hero(hero_id=self.hero_2.id).health)
 
+    def test_save_all__ignored_bundles(self):
+        self.storage.ignored_bundles.add(self.bundle_1_id)
+
+        with mock.patch('the_tale.game.heroes.logic.save_heroes', mock.Mock(return_value=1)) as save_heroes:
+            self.storage.save_all()
+
+        self.assertEqual(save_heroes.call_args, mock.call([self.hero_2]))
+
     def test_save_hero_data_with_meta_action(self):
         bundle_id = 666
 
@@ -187,6 +206,51 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.assertCountEqual(list(self.storage.current_cache.keys()), (self.hero_1.cached_ui_info_key, self.hero_2.cached_ui_info_key))
         self.assertEqual(self.storage.cache_queue, set())
 
+    def test_process_cache_queue__snapshots(self):
+        self.storage.cache_queue.add(self.hero_1.id)
+
+        with mock.patch('the_tale.game.heroes.ui_cache.set_many') as set_many:
+            self.storage.process_cache_queue(update_cache=True)
+
+        delta, snapshot = set_many.call_args[0][0][self.hero_1.account_id]
+
+        self.assertEqual(snapshot['turn'], game_turn.number())
+        self.assertEqual(delta, {'snapshot_turn': game_turn.number(), 'fields': {}})
+
+        game_turn.increment()
+
+        self.storage.cache_queue.add(self.hero_1.id)
+
+        with mock.patch('the_tale.game.heroes.ui_cache.set_many') as set_many:
+            self.storage.process_cache_queue(update_cache=True)
+
+        delta, new_snapshot = set_many.call_args[0][0][self.hero_1.account_id]
+
+        self.assertEqual(new_snapshot, None)
+        self.assertEqual(delta['snapshot_turn'], snapshot['turn'])
+        self.assertEqual(delta['fields']['actual_on_turn'], game_turn.number())
+
+    def test_process_cache_queue__load(self):
+        self.storage.cache_queue.add(self.hero_1.id)
+        self.storage.process_cache_queue(update_cache=True)
+
+        info = heroes_ui_cache.load(self.hero_1.account_id)
+
+        self.assertEqual(info['id'], self.hero_1.id)
+        self.assertEqual(info['actual_on_turn'], game_turn.number())
+
+    def test_switch_caches__forget_snapshots(self):
+        self.storage.cache_queue.add(self.hero_1.id)
+        self.storage.process_cache_queue(update_cache=True)
+
+        self.storage.switch_caches()
+
+        self.assertEqual(set(self.storage.ui_snapshots), {self.hero_1.cached_ui_info_key})
+
+        self.storage.switch_caches()
+
+        self.assertEqual(self.storage.ui_snapshots, {})
+
     def test_process_cache_queue__without_update(self):
         self.assertEqual(self.storage.cache_queue, set())
 
@@ -230,10 +294,10 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.storage.process_turn()
         self.assertEqual(self.storage.skipped_heroes, set())
 
-        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
             self.storage.save_changed_data()
 
-        self.assertEqual(save_hero_data.call_count, 2)
+        self.assertEqual(len(save_heroes_data.call_args[0][0]), 2)
 
     @mock.patch('the_tale.game.heroes.conf.settings.DUMP_CACHED_HEROES', True)
     def test_process_turn__switch_caches(self):
@@ -310,10 +374,10 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.storage.process_turn()
         self.assertEqual(self.storage.skipped_heroes, set())
 
-        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
             self.storage.save_changed_data()
 
-        self.assertEqual(save_hero_data.call_count, 1)  # save only game_settings.SAVED_UNCACHED_HEROES_FRACTION bundles number
+        self.assertEqual(len(save_heroes_data.call_args[0][0]), 1)  # save only game_settings.SAVED_UNCACHED_HEROES_FRACTION bundles number
 
     def test_process_turn__process_created_action(self):
 
@@ -344,10 +408,10 @@ class LogicStorageTests(utils_testcase.TestCase):
 
         self.assertEqual(action_process_turn.call_count, 1)
 
-        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
             self.storage.save_changed_data()
 
-        self.assertEqual(save_hero_data.call_count, 2)
+        self.assertEqual(len(save_heroes_data.call_args[0][0]), 2)
 
     @mock.patch('the_tale.game.heroes.conf.settings.DUMP_CACHED_HEROES', False)
     def test_process_turn_with_skipped_hero__without_cache_dump(self):
@@ -359,10 +423,10 @@ class LogicStorageTests(utils_testcase.TestCase):
 
         self.assertEqual(action_process_turn.call_count, 1)
 
-        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
             self.storage.save_changed_data()
 
-        self.assertEqual(save_hero_data.call_count, 1)
+        self.assertEqual(len(save_heroes_data.call_args[0][0]), 1)
 
     @mock.patch('the_tale.game.heroes.objects.Hero.can_process_turn', lambda self, turn: True)
     def test_process_turn__can_process_turn(self):
@@ -393,6 +457,204 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.assertEqual(_save_on_exception.call_count, 1)
         self.assertEqual(_save_on_exception.call_args, mock.call())
 
+    def test_split_to_shards__single_process(self):
+        shards = self.storage._split_to_shards([self.hero_1, self.hero_2], shards_number=1)
+        self.assertEqual(shards, [[self.hero_1.id, self.hero_2.id]])
+
+    @mock.patch('the_tale.game.conf.settings.PROCESS_TURN_MIN_BUNDLES_FOR_PARALLEL', 3)
+    def test_split_to_shards__not_enough_bundles(self):
+        shards = self.storage._split_to_shards([self.hero_1, self.hero_2], shards_number=2)
+        self.assertEqual(shards, [[self.hero_1.id, self.hero_2.id]])
+
+    @mock.patch('the_tale.game.conf.settings.PROCESS_TURN_MIN_BUNDLES_FOR_PARALLEL', 0)
+    def test_split_to_shards(self):
+        shards = self.storage._split_to_shards([self.hero_1, self.hero_2], shards_number=3)
+        self.assertCountEqual(shards, [[self.hero_1.id], [self.hero_2.id]])
+
+    @mock.patch('the_tale.game.conf.settings.PROCESS_TURN_MIN_BUNDLES_FOR_PARALLEL', 0)
+    def test_split_to_shards__bundles_not_splitted(self):
+        account_3 = self.accounts_factory.create_account()
+        self.storage.load_account_data(account_3.id)
+        hero_3 = self.storage.accounts_to_heroes[account_3.id]
+
+        self.storage.merge_bundles([hero_3.actions.current_action.bundle_id], self.bundle_1_id)
+        hero_3.actions.current_action.bundle_id = self.bundle_1_id
+
+        shards = self.storage._split_to_shards([self.hero_1, self.hero_2, hero_3], shards_number=2)
+
+        self.assertCountEqual(shards, [[self.hero_1.id, hero_3.id], [self.hero_2.id]])
+
+    @mock.patch('the_tale.game.conf.settings.PROCESS_TURN_PROCESSES', 2)
+    @mock.patch('the_tale.game.conf.settings.PROCESS_TURN_MIN_BUNDLES_FOR_PARALLEL', 0)
+    def test_process_turn__parallel(self):
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._process_turn__parallel', mock.Mock(return_value=2)) as process_turn__parallel:
+            self.storage.process_turn()
+
+        self.assertEqual(process_turn__parallel.call_count, 1)
+        self.assertCountEqual(process_turn__parallel.call_args[0][0], [[self.hero_1.id], [self.hero_2.id]])
+
+    @mock.patch('the_tale.game.conf.settings.PROCESS_TURN_PROCESSES', 2)
+    @mock.patch('the_tale.game.conf.settings.PROCESS_TURN_MIN_BUNDLES_FOR_PARALLEL', 0)
+    @mock.patch('the_tale.game.conf.settings.UNLOAD_OBJECTS', True)
+    def test_process_turn__parallel__forked(self):
+        account_3 = self.accounts_factory.create_account()
+        self.storage.load_account_data(account_3.id)
+        hero_3 = self.storage.accounts_to_heroes[account_3.id]
+        bundle_3_id = hero_3.actions.current_action.bundle_id
+
+        bundle_id = 666
+
+        meta_action_battle = actions_meta_actions.ArenaPvP1x1.create(self.storage, self.hero_1, self.hero_2)
+
+        actions_prototypes.ActionMetaProxyPrototype.create(hero=self.hero_1, _bundle_id=bundle_id, meta_action=meta_action_battle)
+        actions_prototypes.ActionMetaProxyPrototype.create(hero=self.hero_2, _bundle_id=bundle_id, meta_action=meta_action_battle)
+
+        self.storage.merge_bundles([self.bundle_1_id, self.bundle_2_id], bundle_id)
+
+        def process_turn(action):
+            if action.hero.id == hero_3.id:
+                raise Exception('error')
+
+        # connection of test transaction must not be closed, and heroes are not saved by shards
+        with mock.patch('django.db.connections.close_all'), \
+                mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', process_turn), \
+                mock.patch('the_tale.game.logic_storage.LogicStorage._save_on_exception'), \
+                mock.patch('the_tale.game.heroes.objects.Hero.unload_serializable_items', create=True) as unload_serializable_items, \
+                mock.patch('django.conf.settings.TESTS_RUNNING', False):
+            self.storage.process_turn()
+
+        self.assertEqual(unload_serializable_items.call_count, 3)
+
+        self.assertEqual(self.storage.ignored_bundles, {bundle_3_id})
+
+        hero_1 = self.storage.heroes[self.hero_1.id]
+        hero_2 = self.storage.heroes[self.hero_2.id]
+
+        self.assertIsNot(hero_1, self.hero_1)
+        self.assertIsNot(hero_2, self.hero_2)
+        self.assertIs(self.storage.heroes[hero_3.id], hero_3)
+
+        self.assertIs(self.storage.accounts_to_heroes[self.account_1.id], hero_1)
+        self.assertIs(self.storage.accounts_to_heroes[self.account_2.id], hero_2)
+
+        self.assertEqual(len(self.storage.meta_actions), 1)
+        self.assertEqual(len(self.storage.meta_actions_to_actions[meta_action_battle.uid]), 2)
+        self.assertIsNot(self.storage.meta_actions[meta_action_battle.uid], meta_action_battle)
+        self.assertIs(hero_1.actions.current_action.meta_action, hero_2.actions.current_action.meta_action)
+
+        self.assertEqual(self.storage.bundles_to_accounts, {bundle_id: {self.account_1.id, self.account_2.id},
+                                                            bundle_3_id: {account_3.id}})
+
+        self.assertEqual(set(self.storage.bundles_costs), {bundle_id, bundle_3_id})
+
+    @mock.patch('the_tale.common.amqp_queues.workers._POOL_CHILD_PROCESS', False)
+    @mock.patch('the_tale.common.amqp_queues.workers._WORKER_PROCESS', True)
+    def test_initialize_turn_process(self):
+        travel_costs = [navigation_pathfinder.TravelCost(columns=map_storage.cells.get_columns(),
+                                                         expected_battle_complexity=expected_battle_complexity)
+                        for expected_battle_complexity in (1.0, 2.0)]
+
+        places_pairs = list(navigation_navigator.allowed_places_pairs(max_distance_between_places=1000))
+
+        # test transaction is hidden, to check only marks of process
+        with mock.patch('django.db.connection', mock.Mock(in_atomic_block=False)):
+            self.assertTrue(navigation_navigator.forked_building_allowed())
+
+            logic_storage._initialize_turn_process()
+
+            self.assertTrue(amqp_queues_workers.is_pool_child_process())
+            self.assertFalse(navigation_navigator.forked_building_allowed())
+
+            with mock.patch('multiprocessing.get_context') as get_context:
+                paths = navigation_navigator.build_many_paths(travel_costs, places_pairs, processes=2)
+
+        self.assertEqual(get_context.call_count, 0)
+        self.assertEqual(len(paths), 2)
+
+    def test_process_turn_shard(self):
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn') as action_process_turn:
+            result = self.storage.process_turn_shard([self.hero_1.id], logger=None, continue_steps_if_needed=True)
+
+        self.assertEqual(action_process_turn.call_count, 1)
+
+        self.assertEqual([hero_dump['id'] for hero_dump in result['heroes']], [self.hero_1.id])
+        self.assertEqual(result['skipped_heroes'], set())
+        self.assertEqual(result['ignored_bundles'], set())
+
+    def test_process_turn_shard__exception(self):
+        def process_turn_raise_exception(action):
+            raise Exception('error')
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', process_turn_raise_exception):
+            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_on_exception'):
+                with mock.patch('django.conf.settings.TESTS_RUNNING', False):
+                    result = self.storage.process_turn_shard([self.hero_1.id, self.hero_2.id], logger=None, continue_steps_if_needed=True)
+
+        self.assertEqual(result['heroes'], [])
+        self.assertEqual(result['ignored_bundles'], {self.bundle_1_id, self.bundle_2_id})
+
+    def test_merge_turn_shard_result(self):
+        result = self.storage.process_turn_shard([self.hero_1.id], logger=None, continue_steps_if_needed=True)
+
+        result['skipped_heroes'] = {self.hero_1.id}
+        result['ignored_bundles'] = {666}
+
+        old_hero_1 = self.hero_1
+
+        self.assertEqual(self.storage._merge_turn_shard_result(result), 1)
+
+        hero_1 = self.storage.heroes[self.hero_1.id]
+
+        self.assertIsNot(hero_1, old_hero_1)
+        self.assertEqual(hero_1, old_hero_1)
+        self.assertIs(self.storage.accounts_to_heroes[self.account_1.id], hero_1)
+        self.assertIs(hero_1.actions.current_action.storage, self.storage)
+
+        self.assertEqual(self.storage.bundles_to_accounts, {self.bundle_1_id: {self.account_1.id},
+                                                            self.bundle_2_id: {self.account_2.id}})
+
+        self.assertEqual(self.storage.skipped_heroes, {self.hero_1.id})
+        self.assertEqual(self.storage.ignored_bundles, {666})
+
+    def test_merge_turn_shard_result__meta_actions(self):
+        bundle_id = 666
+
+        meta_action_battle = actions_meta_actions.ArenaPvP1x1.create(self.storage, self.hero_1, self.hero_2)
+
+        actions_prototypes.ActionMetaProxyPrototype.create(hero=self.hero_1, _bundle_id=bundle_id, meta_action=meta_action_battle)
+        actions_prototypes.ActionMetaProxyPrototype.create(hero=self.hero_2, _bundle_id=bundle_id, meta_action=meta_action_battle)
+
+        self.storage.merge_bundles([self.bundle_1_id, self.bundle_2_id], bundle_id)
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn'):
+            result = self.storage.process_turn_shard([self.hero_1.id, self.hero_2.id], logger=None, continue_steps_if_needed=True)
+
+        self.storage._merge_turn_shard_result(result)
+
+        hero_1 = self.storage.heroes[self.hero_1.id]
+        hero_2 = self.storage.heroes[self.hero_2.id]
+
+        self.assertEqual(len(self.storage.meta_actions), 1)
+        self.assertEqual(len(self.storage.meta_actions_to_actions[meta_action_battle.uid]), 2)
+        self.assertIsNot(self.storage.meta_actions[meta_action_battle.uid], meta_action_battle)
+        self.assertIs(hero_1.actions.current_action.meta_action, hero_2.actions.current_action.meta_action)
+
+        self.assertEqual(self.storage.bundles_to_accounts, {bundle_id: {self.account_1.id, self.account_2.id}})
+
+    def test_process_turn__bundles_costs(self):
+        self.storage.process_turn()
+
+        self.assertEqual(set(self.storage.bundles_costs), {self.bundle_1_id, self.bundle_2_id})
+
+    def test_pop_bundles_costs(self):
+        self.storage.bundles_costs = {self.bundle_1_id: 0.5}
+        self.storage.ignored_bundles.add(666)
+        self.storage.bundles_to_accounts[666] = {666}
+
+        self.assertCountEqual(self.storage.pop_bundles_costs(), [(self.bundle_1_id, 0.5, [self.account_1.id]),
+                                                                 (self.bundle_2_id, 0, [self.account_2.id])])
+        self.assertEqual(self.storage.bundles_costs, {})
+
     @mock.patch('the_tale.game.conf.settings.SAVE_ON_EXCEPTION_TIMEOUT', 0)
     def test_save_on_exception(self):
         # hero 1 not saved due to one bundle with hero 3
@@ -457,7 +719,7 @@ class LogicStorageTests(utils_testcase.TestCase):
     def test_save_changed_data(self):
         self.storage.process_turn()
 
-        with mock.patch('the_tale.common.utils.cache.set_many') as set_many:
+        with mock.patch('the_tale.game.heroes.ui_cache.set_many') as set_many:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
                 self.storage.save_changed_data()
 
@@ -472,7 +734,7 @@ class LogicStorageTests(utils_testcase.TestCase):
 
         def ui_info(hero, **kwargs):
             calls.append(kwargs)
-            return {'hero': hero.id}
+            return {'hero': hero.id, 'ui_caching_started_at': 0}
 
         with mock.patch('the_tale.game.heroes.objects.Hero.ui_info', ui_info):
             self.storage.save_changed_data()
@@ -481,8 +743,8 @@ class LogicStorageTests(utils_testcase.TestCase):
 
         self.assertCountEqual(calls, [{'actual_guaranteed': True, 'old_info': None},
                                       {'actual_guaranteed': True, 'old_info': None},
-                                      {'actual_guaranteed': True, 'old_info': {'hero': self.hero_1.id}},
-                                      {'actual_guaranteed': True, 'old_info': {'hero': self.hero_2.id}}])
+                                      {'actual_guaranteed': True, 'old_info': {'hero': self.hero_1.id, 'ui_caching_started_at': 0}},
+                                      {'actual_guaranteed': True, 'old_info': {'hero': self.hero_2.id, 'ui_caching_started_at': 0}}])
 
     def test_save_changed_data__old_info(self):
         self.storage.process_turn()
@@ -490,7 +752,7 @@ class LogicStorageTests(utils_testcase.TestCase):
 
         self.storage.process_turn()
 
-        with mock.patch('the_tale.common.utils.cache.set_many') as set_many:
+        with mock.patch('the_tale.game.heroes.ui_cache.set_many') as set_many:
             with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
                 self.storage.save_changed_data()
 
@@ -506,13 +768,13 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.assertEqual(len(self.storage.heroes), 2)
 
         with mock.patch('the_tale.game.logic_storage.LogicStorage._get_bundles_to_save', lambda x: [self.bundle_2_id]):
-            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
-                with mock.patch('the_tale.game.heroes.objects.Hero.ui_info', mock.Mock(return_value={})) as ui_info:
+            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
+                with mock.patch('the_tale.game.heroes.objects.Hero.ui_info', mock.Mock(return_value={'ui_caching_started_at': 0})) as ui_info:
                     self.storage.save_changed_data()
 
         self.assertEqual(ui_info.call_count, 2)  # cache all heroes, since they are new
         self.assertEqual(ui_info.call_args_list, [mock.call(actual_guaranteed=True, old_info=None), mock.call(actual_guaranteed=True, old_info=None)])
-        self.assertEqual(save_hero_data.call_args, mock.call(self.hero_2.id))
+        self.assertEqual(save_heroes_data.call_args[0][0], [self.hero_2.id])
 
     def test_save_changed_data__with_unsaved_bundles__without_dump(self):
         self.storage.process_turn()
@@ -522,13 +784,13 @@ class LogicStorageTests(utils_testcase.TestCase):
         self.hero_2.ui_caching_started_at = datetime.datetime.fromtimestamp(0)
 
         with mock.patch('the_tale.game.logic_storage.LogicStorage._get_bundles_to_save', lambda x: [self.bundle_2_id]):
-            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
-                with mock.patch('the_tale.game.heroes.objects.Hero.ui_info', mock.Mock(return_value={})) as ui_info:
+            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
+                with mock.patch('the_tale.game.heroes.objects.Hero.ui_info', mock.Mock(return_value={'ui_caching_started_at': 0})) as ui_info:
                     self.storage.save_changed_data()
 
         self.assertEqual(ui_info.call_count, 1)  # cache only first hero
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=True, old_info=None))
-        self.assertEqual(save_hero_data.call_args, mock.call(self.hero_2.id))
+        self.assertEqual(save_heroes_data.call_args[0][0], [self.hero_2.id])
 
     def test_remove_action__from_middle(self):
         actions_prototypes.ActionReligionCeremonyPrototype.create(hero=self.hero_1)
@@ -697,13 +959,13 @@ class LogicStorageTests(utils_testcase.TestCase):
 
         self.storage.process_turn()
 
-        with mock.patch('the_tale.common.utils.cache.set_many') as set_many:
-            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+        with mock.patch('the_tale.game.heroes.ui_cache.set_many') as set_many:
+            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
                 with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
                     self.storage.save_changed_data()
 
         self.assertEqual(set_many.call_count, 1)
-        self.assertEqual(save_hero_data.call_count, 3)
+        self.assertEqual(len(save_heroes_data.call_args[0][0]), 3)
         self.assertEqual(ui_info.call_count, 2)
         self.assertEqual(ui_info.call_args_list, [mock.call(actual_guaranteed=True, old_info=None), mock.call(actual_guaranteed=True, old_info=None)])
 
@@ -734,13 +996,13 @@ class LogicStorageTests(utils_testcase.TestCase):
 
         self.storage.process_turn()
 
-        with mock.patch('the_tale.common.utils.cache.set_many') as set_many:
-            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+        with mock.patch('the_tale.game.heroes.ui_cache.set_many') as set_many:
+            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_heroes_data') as save_heroes_data:
                 with mock.patch('the_tale.game.heroes.objects.Hero.ui_info') as ui_info:
                     self.storage.save_changed_data()
 
         self.assertEqual(set_many.call_count, 1)
-        self.assertEqual(save_hero_data.call_count, 2)
+        self.assertEqual(len(save_heroes_data.call_args[0][0]), 2)
         self.assertEqual(ui_info.call_count, 1)
         self.assertEqual(ui_info.call_args, mock.call(actual_guaranteed=True, old_info=None))
 
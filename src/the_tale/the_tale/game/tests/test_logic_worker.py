@@ -37,6 +37,13 @@ class LogicWorkerTests(utils_testcase.TestCase):
         self.worker.process_start_hero_caching(self.account.id)
         self.assertTrue(self.worker.storage.heroes[self.hero.id].ui_caching_started_at > current_time)
 
+    def test_process_register_accounts(self):
+        account_2 = self.accounts_factory.create_account()
+
+        self.worker.process_register_accounts([self.account.id, account_2.id])
+
+        self.assertEqual(set(self.worker.storage.accounts_to_heroes), {self.account.id, account_2.id})
+
     def test_process_next_turn(self):
 
         game_turn.increment()
@@ -44,10 +51,11 @@ class LogicWorkerTests(utils_testcase.TestCase):
         self.worker.process_register_account(self.account.id)
 
         with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_account_release_required') as release_required_counter:
-            with mock.patch('the_tale.game.heroes.logic.save_hero') as save_counter:
+            with mock.patch('the_tale.game.heroes.logic.save_heroes', mock.Mock(return_value=1)) as save_counter:
                 self.worker.process_next_turn(game_turn.number())
 
         self.assertEqual(save_counter.call_count, 1)
+        self.assertEqual([hero.id for hero in save_counter.call_args[0][0]], [self.hero.id])
         self.assertEqual(release_required_counter.call_count, 0)
 
     def test_process_next_turn_with_skipped_hero(self):
@@ -60,14 +68,34 @@ class LogicWorkerTests(utils_testcase.TestCase):
 
         with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn') as action_process_turn:
             with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_account_release_required') as release_required_counter:
-                with mock.patch('the_tale.game.heroes.logic.save_hero') as save_counter:
+                with mock.patch('the_tale.game.heroes.logic.save_heroes', mock.Mock(return_value=1)) as save_counter:
                     with mock.patch('the_tale.game.conf.settings.SAVED_UNCACHED_HEROES_FRACTION', 0):
                         self.worker.process_next_turn(game_turn.number())
 
         self.assertEqual(action_process_turn.call_count, 0)
-        self.assertEqual(save_counter.call_count, 1)
+        self.assertEqual([hero.id for hero in save_counter.call_args[0][0]], [self.hero.id])
         self.assertEqual(release_required_counter.call_count, 1)
 
+    @mock.patch('the_tale.game.conf.settings.LOGIC_BUNDLES_COSTS_REPORT_PERIOD', 1)
+    def test_process_next_turn__report_bundles_costs(self):
+
+        game_turn.increment()
+
+        self.worker.process_register_account(self.account.id)
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_bundles_costs') as cmd_bundles_costs:
+            self.worker.process_next_turn(game_turn.number())
+
+        self.assertEqual(cmd_bundles_costs.call_count, 1)
+
+        worker_id, costs = cmd_bundles_costs.call_args[0]
+
+        self.assertEqual(worker_id, 'logic')
+        self.assertEqual([(bundle_id, accounts_ids) for bundle_id, cost, accounts_ids in costs],
+                         [(self.hero.actions.current_action.bundle_id, [self.account.id])])
+
+        self.assertEqual(self.worker.storage.bundles_costs, {})
+
     def test_process_update_hero_with_account_data(self):
         self.worker.process_register_account(self.account.id)
 
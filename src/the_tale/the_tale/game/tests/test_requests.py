@@ -39,6 +39,8 @@ class GamePageRequestTests(RequestTestsBase):
         self.check_redirect(django_reverse('game:'), django_reverse('game:pvp:'))
 
 
+# cached responses are shared between tests, so response cache is disabled, where it is not tested directly
+@mock.patch('the_tale.game.logic.game_info_cache_key', mock.Mock(return_value=None))
 class InfoRequestTests(RequestTestsBase):
 
     def test_unlogined(self):
@@ -94,6 +96,35 @@ class InfoRequestTests(RequestTestsBase):
                                     patch_turns=[1, 2, 3, 4],
                                     for_last_turn=False)])
 
+    def test_cached_response(self):
+        self.request_logout()
+
+        with mock.patch('the_tale.game.logic.game_info_cache_key', mock.Mock(return_value='test_game_info_%s' % uuid.uuid4().hex)):
+            response = self.client.get(self.game_info_url_no_id)
+
+            with mock.patch('the_tale.game.logic.form_game_info') as form_game_info:
+                cached_response = self.client.get(self.game_info_url_no_id)
+
+        self.assertEqual(form_game_info.call_count, 0)
+
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response['Content-Type'], response['Content-Type'])
+
+        self.check_ajax_ok(cached_response)
+
+    def test_cached_response__own_hero_caching(self):
+        hero_cache_state = heroes_ui_cache.DeltaState(version='version', ui_caching_started_at=0)
+
+        with mock.patch('the_tale.game.logic.game_info_cache_key', mock.Mock(return_value='test_game_info_%s' % uuid.uuid4().hex)), \
+                mock.patch('the_tale.game.heroes.ui_cache.delta_state', mock.Mock(return_value=hero_cache_state)):
+            self.check_ajax_ok(self.client.get(self.game_info_url_1))
+
+            with mock.patch('the_tale.game.heroes.objects.Hero.continue_ui_caching_if_required') as continue_ui_caching_if_required:
+                self.check_ajax_ok(self.client.get(self.game_info_url_1))
+                self.check_ajax_ok(self.client.get(self.game_info_url_2))
+
+        self.assertEqual(continue_ui_caching_if_required.call_args_list, [mock.call(self.account_1.id, 0)])
+
 
 class NewsAlertsTests(utils_testcase.TestCase):
 
@@ -25,6 +25,17 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
 
         self.worker.logger = mock.Mock()
 
+    def logic_owner(self, account_id):
+        return self.worker.logic_ring.get_node(heroes_logic.load_hero_bundle_id(account_id=account_id))
+
+    def logic_accounts_number(self, accounts_owners):
+        numbers = {logic_worker_name: 0 for logic_worker_name in self.worker.logic_workers}
+
+        for logic_worker_name in accounts_owners.values():
+            numbers[logic_worker_name] += 1
+
+        return numbers
+
     def test_1_initialization(self):
         PostponedTaskPrototype.create(postponed_tasks_postponed_tasks.FakePostponedInternalTask())
 
@@ -37,12 +48,33 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
 
         self.assertEqual(self.worker.tasks, {})
         self.assertEqual(self.worker.accounts_for_tasks, {})
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1', self.account_2.id: 'logic_2'})
+        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: self.logic_owner(self.account_1.id),
+                                                       self.account_2.id: self.logic_owner(self.account_2.id)})
         self.assertEqual(self.worker.accounts_queues, {})
         self.assertTrue(self.worker.initialized)
         self.assertFalse(self.worker.wait_next_turn_answer)
         self.assertTrue(prototypes.GameState.is_working())
 
+    def test_initialization__accounts_batches(self):
+        account_3 = self.accounts_factory.create_account()
+
+        with mock.patch('the_tale.game.conf.settings.SUPERVISOR_REGISTER_ACCOUNTS_BATCH_SIZE', 2):
+            with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as cmd_register_accounts:
+                with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_account') as cmd_register_account:
+                    self.worker.initialize()
+
+        self.assertEqual(cmd_register_account.call_count, 0)
+
+        registered_accounts = [account_id
+                               for call in cmd_register_accounts.call_args_list
+                               for account_id in call[0][0]]
+
+        self.assertCountEqual(registered_accounts, [self.account_1.id, self.account_2.id, account_3.id])
+
+        self.assertEqual(self.worker.accounts_owners, {account_id: self.logic_owner(account_id)
+                                                       for account_id in (self.account_1.id, self.account_2.id, account_3.id)})
+        self.assertEqual(self.worker.logic_accounts_number, self.logic_accounts_number(self.worker.accounts_owners))
+
     def test_register_task(self):
         self.worker.initialize()
 
@@ -72,7 +104,10 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
                                                        self.account_2.id: [('start_hero_caching', {'account_id': self.account_2.id})]})
 
         self.worker.process_account_released(self.account_2.id)
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1', self.account_2.id: 'logic_1'})
+
+        logic_worker_name = self.logic_owner(min(self.account_1.id, self.account_2.id))
+
+        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: logic_worker_name, self.account_2.id: logic_worker_name})
 
         self.assertEqual(len(self.worker.tasks), 0)
 
@@ -128,7 +163,7 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
         self.assertEqual(set(self.worker.accounts_for_tasks.keys()), set([self.account_1.id, self.account_2.id]))
         self.assertEqual(list(self.worker.tasks.values())[0].captured_members, set())
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: None, self.account_2.id: None, account_3.id: 'logic_1'})
+        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: None, self.account_2.id: None, account_3.id: self.logic_owner(account_3.id)})
 
     def test_register_account_in_task(self):
         self.worker.initialize()
@@ -161,7 +196,9 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
         self.assertEqual(list(self.worker.tasks.values()), [])
         self.assertEqual(models.SupervisorTask.objects.all().count(), 0)
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1', self.account_2.id: 'logic_1'})
+        logic_worker_name = self.logic_owner(min(self.account_1.id, self.account_2.id))
+
+        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: logic_worker_name, self.account_2.id: logic_worker_name})
 
     def mark_removed(self, account):
         accounts_models.Account.objects.filter(id=account.id).update(removed_at=datetime.datetime.now())
@@ -205,12 +242,11 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
 
         self.assertEqual(register_account_counter.call_count, 3)
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1',
-                                                       self.account_2.id: 'logic_2',
-                                                       account_3.id: 'logic_1',
-                                                       account_4.id: 'logic_2',
-                                                       account_5.id: 'logic_1'})
-        self.assertEqual(self.worker.logic_accounts_number, {'logic_1': 3, 'logic_2': 2})
+        accounts_owners = {account_id: self.logic_owner(account_id)
+                           for account_id in (self.account_1.id, self.account_2.id, account_3.id, account_4.id, account_5.id)}
+
+        self.assertEqual(self.worker.accounts_owners, accounts_owners)
+        self.assertEqual(self.worker.logic_accounts_number, self.logic_accounts_number(accounts_owners))
 
     def test_register_accounts_on_initialization(self):
         account_3 = self.accounts_factory.create_account()
@@ -219,12 +255,11 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
 
         self.worker.initialize()
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1',
-                                                       self.account_2.id: 'logic_2',
-                                                       account_3.id: 'logic_1',
-                                                       account_4.id: 'logic_2',
-                                                       account_5.id: 'logic_1'})
-        self.assertEqual(self.worker.logic_accounts_number, {'logic_1': 3, 'logic_2': 2})
+        accounts_owners = {account_id: self.logic_owner(account_id)
+                           for account_id in (self.account_1.id, self.account_2.id, account_3.id, account_4.id, account_5.id)}
+
+        self.assertEqual(self.worker.accounts_owners, accounts_owners)
+        self.assertEqual(self.worker.logic_accounts_number, self.logic_accounts_number(accounts_owners))
 
     def test_register_accounts_on_initialization__removed_account(self):
         account_3 = self.accounts_factory.create_account()
@@ -235,11 +270,11 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
 
         self.worker.initialize()
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1',
-                                                       self.account_2.id: 'logic_2',
-                                                       account_3.id: 'logic_1',
-                                                       account_5.id: 'logic_2'})
-        self.assertEqual(self.worker.logic_accounts_number, {'logic_1': 2, 'logic_2': 2})
+        accounts_owners = {account_id: self.logic_owner(account_id)
+                           for account_id in (self.account_1.id, self.account_2.id, account_3.id, account_5.id)}
+
+        self.assertEqual(self.worker.accounts_owners, accounts_owners)
+        self.assertEqual(self.worker.logic_accounts_number, self.logic_accounts_number(accounts_owners))
 
     def test_register_accounts_on_initialization__multiple_accounts_bandles(self):
         account_3 = self.accounts_factory.create_account()
@@ -263,13 +298,17 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
 
         self.worker.initialize()
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1',
-                                                       self.account_2.id: 'logic_2',
-                                                       account_3.id: 'logic_2',
-                                                       account_4.id: 'logic_2',
-                                                       account_5.id: 'logic_1',
-                                                       account_6.id: 'logic_2'})
-        self.assertEqual(self.worker.logic_accounts_number, {'logic_1': 2, 'logic_2': 4})
+        bundle_owner = self.logic_owner(self.account_2.id)
+
+        accounts_owners = {self.account_1.id: self.logic_owner(self.account_1.id),
+                           self.account_2.id: bundle_owner,
+                           account_3.id: bundle_owner,
+                           account_4.id: bundle_owner,
+                           account_5.id: self.logic_owner(account_5.id),
+                           account_6.id: bundle_owner}
+
+        self.assertEqual(self.worker.accounts_owners, accounts_owners)
+        self.assertEqual(self.worker.logic_accounts_number, self.logic_accounts_number(accounts_owners))
 
     def test_register_accounts_on_initialization__multiple_accounts_bandles__removed_accounts(self):
         account_3 = self.accounts_factory.create_account()
@@ -295,12 +334,156 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
 
         self.worker.initialize()
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1',
-                                                       self.account_2.id: 'logic_2',
-                                                       account_3.id: 'logic_2',
-                                                       account_5.id: 'logic_1',
-                                                       account_6.id: 'logic_2'})
-        self.assertEqual(self.worker.logic_accounts_number, {'logic_1': 2, 'logic_2': 3})
+        bundle_owner = self.logic_owner(self.account_2.id)
+
+        accounts_owners = {self.account_1.id: self.logic_owner(self.account_1.id),
+                           self.account_2.id: bundle_owner,
+                           account_3.id: bundle_owner,
+                           account_5.id: self.logic_owner(account_5.id),
+                           account_6.id: bundle_owner}
+
+        self.assertEqual(self.worker.accounts_owners, accounts_owners)
+        self.assertEqual(self.worker.logic_accounts_number, self.logic_accounts_number(accounts_owners))
+
+    @mock.patch('the_tale.game.conf.settings.LOGIC_WORKERS_NUMBER', 4)
+    def test_initialize__logic_workers_number(self):
+        amqp_environment.environment.deinitialize()
+        amqp_environment.environment.initialize()
+
+        self.worker = amqp_environment.environment.workers.supervisor
+
+        self.worker.initialize()
+
+        self.assertEqual(set(self.worker.logic_workers), {'logic_1', 'logic_2', 'logic_3', 'logic_4'})
+        self.assertEqual(self.worker.logic_ring.nodes(), {'logic_1', 'logic_2', 'logic_3', 'logic_4'})
+
+    def test_choose_logic_worker_to_dispatch(self):
+        self.worker.initialize()
+
+        account_3 = self.accounts_factory.create_account()
+
+        with self.assertNumQueries(1):
+            logic_worker_name = self.worker.choose_logic_worker_to_dispatch(account_3.id)
+
+        self.assertEqual(logic_worker_name, self.logic_owner(account_3.id))
+
+    def test_choose_logic_worker_to_dispatch__override(self):
+        self.worker.initialize()
+
+        account_3 = self.accounts_factory.create_account()
+
+        other_logic_worker_name = [name for name in self.worker.logic_workers if name != self.logic_owner(account_3.id)][0]
+
+        self.worker.bundles_owners_overrides[heroes_logic.load_hero_bundle_id(account_id=account_3.id)] = other_logic_worker_name
+
+        self.assertEqual(self.worker.choose_logic_worker_to_dispatch(account_3.id), other_logic_worker_name)
+
+    def prepair_rebalancing(self):
+        self.worker.initialize()
+
+        self.worker.accounts_owners = {1: 'logic_1', 2: 'logic_1', 3: 'logic_1', 4: 'logic_2'}
+
+        self.worker.logic_bundles_costs = {'logic_1': [(1, 5.0, [1]), (2, 1.0, [2]), (3, 1.0, [3])],
+                                           'logic_2': [(4, 1.0, [4])]}
+
+    def test_rebalance_logic_workers(self):
+        self.prepair_rebalancing()
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.send_release_account_cmd') as send_release_account_cmd:
+            moved_bundles = self.worker.rebalance_logic_workers()
+
+        # bundle 1 is too expensive to move, bundle 2 and 3 cover the difference
+        self.assertEqual(moved_bundles, [2, 3])
+        self.assertEqual(send_release_account_cmd.call_args_list, [mock.call(2), mock.call(3)])
+        self.assertEqual(self.worker.bundles_owners_overrides, {2: 'logic_2', 3: 'logic_2'})
+        self.assertEqual(self.worker.accounts_overridden_bundles, {2: 2, 3: 3})
+        self.assertEqual(self.worker.logic_bundles_costs, {'logic_1': [], 'logic_2': []})
+
+    def test_rebalance_logic_workers__override_kept_after_release(self):
+        self.prepair_rebalancing()
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_account'):
+            self.worker.rebalance_logic_workers()
+
+        self.assertEqual(self.worker.bundles_owners_overrides, {2: 'logic_2', 3: 'logic_2'})
+
+    def test_rebalance_logic_workers__idle_bundles(self):
+        self.prepair_rebalancing()
+
+        self.worker.accounts_owners.update({5: 'logic_1', 6: 'logic_1'})
+
+        self.worker.logic_bundles_costs = {'logic_1': [(1, 5.0, [1]), (5, 0.0, [5]), (2, 2.0, [2]), (6, 0.0, [6]), (3, 1.0, [3])],
+                                           'logic_2': [(4, 2.0, [4])]}
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.send_release_account_cmd') as send_release_account_cmd:
+            moved_bundles = self.worker.rebalance_logic_workers()
+
+        # bundles 2 and 3 cover the difference, idle bundles are not moved
+        self.assertEqual(moved_bundles, [2, 3])
+        self.assertEqual(send_release_account_cmd.call_args_list, [mock.call(2), mock.call(3)])
+
+    def test_rebalance_logic_workers__only_idle_bundles_can_be_moved(self):
+        self.prepair_rebalancing()
+
+        self.worker.accounts_owners.update({5: 'logic_1', 6: 'logic_1'})
+
+        self.worker.logic_bundles_costs = {'logic_1': [(1, 5.0, [1]), (5, 0.0, [5]), (6, 0.0, [6])],
+                                           'logic_2': [(4, 1.0, [4])]}
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.send_release_account_cmd') as send_release_account_cmd:
+            self.assertEqual(self.worker.rebalance_logic_workers(), [])
+
+        self.assertEqual(send_release_account_cmd.call_count, 0)
+
+    def test_rebalance_logic_workers__balanced(self):
+        self.prepair_rebalancing()
+
+        self.worker.logic_bundles_costs['logic_2'] = [(4, 6.0, [4])]
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.send_release_account_cmd') as send_release_account_cmd:
+            self.assertEqual(self.worker.rebalance_logic_workers(), [])
+
+        self.assertEqual(send_release_account_cmd.call_count, 0)
+        self.assertEqual(self.worker.bundles_owners_overrides, {})
+
+    def test_rebalance_logic_workers__not_all_costs_received(self):
+        self.prepair_rebalancing()
+
+        self.worker.logic_bundles_costs['logic_2'] = []
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.send_release_account_cmd') as send_release_account_cmd:
+            self.assertEqual(self.worker.rebalance_logic_workers(), [])
+
+        self.assertEqual(send_release_account_cmd.call_count, 0)
+
+    def test_rebalance_logic_workers__skip_multiple_accounts_bundles(self):
+        self.prepair_rebalancing()
+
+        self.worker.logic_bundles_costs['logic_1'] = [(1, 5.0, [1]), (2, 2.0, [2, 3])]
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.send_release_account_cmd') as send_release_account_cmd:
+            self.assertEqual(self.worker.rebalance_logic_workers(), [])
+
+        self.assertEqual(send_release_account_cmd.call_count, 0)
+
+    def test_rebalance_logic_workers__skip_accounts_in_tasks(self):
+        self.prepair_rebalancing()
+
+        self.worker.accounts_for_tasks[2] = 666
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.send_release_account_cmd') as send_release_account_cmd:
+            self.assertEqual(self.worker.rebalance_logic_workers(), [3])
+
+        self.assertEqual(send_release_account_cmd.call_args_list, [mock.call(3)])
+
+    def test_process_bundles_costs(self):
+        self.worker.initialize()
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.rebalance_logic_workers') as rebalance_logic_workers:
+            self.worker.process_bundles_costs('logic_1', [[1, 0.5, [1]]])
+
+        self.assertEqual(rebalance_logic_workers.call_count, 1)
+        self.assertEqual(self.worker.logic_bundles_costs['logic_1'], [[1, 0.5, [1]]])
 
     def test_register_accounts__double_register(self):
         self.worker.initialize()
@@ -354,7 +537,6 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
     def test_send_register_accounts_cmds__register_order(self):
         self.worker.initialize()
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1', self.account_2.id: 'logic_2'})
         self.worker.send_release_account_cmd(self.account_1.id)
         self.worker.send_release_account_cmd(self.account_2.id)
 
@@ -378,19 +560,29 @@ class SupervisorWorkerTests(utils_testcase.TestCase):
     def test_send_release_account_cmd(self):
         self.worker.initialize()
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1', self.account_2.id: 'logic_2'})
+        logic_worker_name = self.logic_owner(self.account_1.id)
 
         with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_account') as cmd_release_account:
             self.worker.send_release_account_cmd(self.account_2.id)
 
         self.assertEqual(cmd_release_account.call_args_list, [mock.call(self.account_2.id)])
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1', self.account_2.id: None})
+        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: logic_worker_name, self.account_2.id: None})
 
-    def test_send_release_account_cmd__second_try(self):
+    def test_send_release_account_cmd__overridden_bundle(self):
         self.worker.initialize()
 
-        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'logic_1', self.account_2.id: 'logic_2'})
+        self.worker.bundles_owners_overrides = {666: 'logic_2', 777: 'logic_2'}
+        self.worker.accounts_overridden_bundles = {self.account_1.id: 666, self.account_2.id: 777}
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_account'):
+            self.worker.send_release_account_cmd(self.account_2.id)
+
+        self.assertEqual(self.worker.bundles_owners_overrides, {666: 'logic_2'})
+        self.assertEqual(self.worker.accounts_overridden_bundles, {self.account_1.id: 666})
+
+    def test_send_release_account_cmd__second_try(self):
+        self.worker.initialize()
 
         with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_account') as cmd_release_account:
             self.worker.send_release_account_cmd(self.account_2.id)
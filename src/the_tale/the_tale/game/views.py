@@ -81,39 +81,34 @@ def api_info(context):
     if account is None and context.account.is_authenticated:
         account = context.account
 
-    data = logic.form_game_info(account=account,
-                                is_own=False if account is None else (context.account.id == account.id),
-                                client_turns=context.client_turns)
-
-    if context.api_version in ('1.9', '1.8', '1.7', '1.6', '1.5', '1.4', '1.3', '1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_10_to_1_9(data)
+    is_own = False if account is None else (context.account.id == account.id)
 
-    if context.api_version in ('1.8', '1.7', '1.6', '1.5', '1.4', '1.3', '1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_9_to_1_8(data)
+    hero_cache_state = None if account is None else heroes_ui_cache.delta_state(account.id)
 
-    if context.api_version in ('1.7', '1.6', '1.5', '1.4', '1.3', '1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_8_to_1_7(data)
+    cache_key = logic.game_info_cache_key(account=account,
+                                          is_own=is_own,
+                                          api_version=context.api_version,
+                                          client_turns=context.client_turns,
+                                          hero_cache_state=hero_cache_state)
 
-    if context.api_version in ('1.6', '1.5', '1.4', '1.3', '1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_7_to_1_6(data)
+    if cache_key is not None:
+        body = utils_cache.get(cache_key)
 
-    if context.api_version in ('1.5', '1.4', '1.3', '1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_6_to_1_5(data)
+        if body is not None:
+            # caching of own hero is continued, like on forming of game info
+            if is_own:
+                heroes_objects.Hero.continue_ui_caching_if_required(account.id, hero_cache_state.ui_caching_started_at)
 
-    if context.api_version in ('1.4', '1.3', '1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_5_to_1_4(data)
+            return utils_views.String(text=body, http_mimetype='application/json')
 
-    if context.api_version in ('1.3', '1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_4_to_1_3(data)
-
-    if context.api_version in ('1.2', '1.1', '1.0'):
-        data = logic.game_info_from_1_3_to_1_2(data)
+    data = logic.form_game_info(account=account,
+                                is_own=is_own,
+                                client_turns=context.client_turns)
 
-    if context.api_version in ('1.1', '1.0'):
-        data = logic.game_info_from_1_2_to_1_1(data)
+    # data of enemy is not versioned by key, so pvp responses are not cached
+    cache_allowed = (cache_key is not None and data.get('mode') != 'pvp')
 
-    if context.api_version == '1.0':
-        data = logic.game_info_from_1_1_to_1_0(data)
+    data = logic.downgrade_game_info(data, context.api_version)
 
     ###################################################
     # code for test paths
@@ -149,7 +144,16 @@ def api_info(context):
     #          map_storage.cells(*cells[-1]).travel_cost(heroes_relations.RISK_LEVEL.NORMAL.expected_battle_complexity)) / 2
     # print(s - delta)
 
-    return utils_views.AjaxOk(content=data)
+    response = utils_views.AjaxOk(content=data)
+
+    if not cache_allowed:
+        return response
+
+    body = s11n.to_json(response.wrap(data))
+
+    utils_cache.set(cache_key, body, conf.settings.INFO_CACHE_TIMEOUT)
+
+    return utils_views.String(text=body, http_mimetype='application/json')
 
 
 @utils_api.Processor(versions=(conf.settings.DIARY_API_VERSION,))
@@ -8,6 +8,10 @@ class LogicException(Exception):
     pass
 
 
+def workers_names():
+    return ['logic_%d' % number for number in range(1, conf.settings.LOGIC_WORKERS_NUMBER + 1)]
+
+
 class Worker(utils_workers.BaseWorker):
     GET_CMD_TIMEOUT = 10
     STOP_SIGNAL_REQUIRED = False
@@ -32,6 +36,13 @@ class Worker(utils_workers.BaseWorker):
         self.queue = []
         self.worker_id = worker_id
 
+        self.profiler = None
+
+        if conf.settings.LOGIC_PROFILER_ENABLED:
+            self.profiler = utils_profiler.Profiler(slowest_heroes_number=conf.settings.LOGIC_PROFILER_SLOWEST_HEROES_NUMBER)
+
+        utils_profiler.activate(self.profiler)
+
         self.logger.info('GAME INITIALIZED')
 
         amqp_environment.environment.workers.supervisor.cmd_answer('initialize', self.worker_id)
@@ -49,8 +60,18 @@ class Worker(utils_workers.BaseWorker):
         if game_turn.number() != self.turn_number:
             raise LogicException('dessinchonization: workers turn number (%d) not equal to saved turn number (%d)' % (self.turn_number, game_turn.number()))
 
-        self.storage.process_turn(logger=self.logger)
-        self.storage.save_changed_data(logger=self.logger)
+        if self.profiler:
+            self.profiler.start_turn(self.turn_number)
+
+        with utils_profiler.phase('next_turn'):
+            with utils_profiler.phase('process_turn'):
+                self.storage.process_turn(logger=self.logger)
+
+            with utils_profiler.phase('save_changed_data'):
+                self.storage.save_changed_data(logger=self.logger)
+
+        if self.profiler:
+            self.finish_profiled_turn()
 
         for hero_id in self.storage.skipped_heroes:
             hero = self.storage.heroes[hero_id]
@@ -60,11 +81,25 @@ class Worker(utils_workers.BaseWorker):
 
         amqp_environment.environment.workers.supervisor.cmd_answer('next_turn', self.worker_id)
 
+        if self.turn_number % conf.settings.LOGIC_BUNDLES_COSTS_REPORT_PERIOD == 0:
+            amqp_environment.environment.workers.supervisor.cmd_bundles_costs(self.worker_id, self.storage.pop_bundles_costs())
+
         if conf.settings.COLLECT_GARBAGE and self.turn_number % conf.settings.COLLECT_GARBAGE_PERIOD == 0:
             self.logger.info('GC: start')
             gc.collect()
             self.logger.info('GC: end')
 
+    def finish_profiled_turn(self):
+        turn = self.profiler.finish_turn(main_phase='next_turn')
+
+        if turn.total_time('next_turn') > conf.settings.TURN_DELAY:
+            self.logger.warn('[profiler] turn %d processed in %.3f seconds, that is longer than turn delay',
+                             turn.turn_number, turn.total_time('next_turn'))
+            self.profiler.log_turn(self.logger, turn)
+
+        if self.turn_number % conf.settings.LOGIC_PROFILER_REPORT_PERIOD == 0:
+            self.profiler.report(self.logger)
+
     def release_account(self, account_id):
         if account_id not in self.storage.accounts_to_heroes:
             amqp_environment.environment.workers.supervisor.cmd_account_released(account_id)
@@ -100,6 +135,16 @@ class Worker(utils_workers.BaseWorker):
     def process_register_account(self, account_id):
         self.storage.load_account_data(account_id)
 
+    def cmd_register_accounts(self, accounts_ids):
+        return self.send_cmd('register_accounts', {'accounts_ids': accounts_ids})
+
+    def process_register_accounts(self, accounts_ids):
+        started_at = time.time()
+
+        heroes = self.storage.load_accounts_data(accounts_ids)
+
+        self.logger.info('[register_accounts] loaded heroes: %d, time: %.3f' % (len(heroes), time.time() - started_at))
+
     def cmd_release_account(self, account_id):
         return self.send_cmd('release_account', {'account_id': account_id})
 
@@ -33,9 +33,11 @@ class Worker(utils_workers.BaseWorker):
 
         PostponedTaskPrototype.reset_all()
 
-        self.logic_workers = {worker.name: worker
-                              for worker in (amqp_environment.environment.workers.logic_1,
-                                             amqp_environment.environment.workers.logic_2)}
+        self.logic_workers = {worker_name: getattr(amqp_environment.environment.workers, worker_name)
+                              for worker_name in logic.workers_names()}
+
+        self.logic_ring = utils_hash_ring.HashRing(nodes=sorted(self.logic_workers.keys()),
+                                                   replicas=conf.settings.LOGIC_WORKERS_RING_REPLICAS)
 
         self.logger.info('initialize logic')
 
@@ -50,6 +52,10 @@ class Worker(utils_workers.BaseWorker):
         self.accounts_owners = {}
         self.accounts_queues = {}
         self.logic_accounts_number = {logic_worker_name: 0 for logic_worker_name in self.logic_workers.keys()}
+        self.logic_bundles_costs = {logic_worker_name: [] for logic_worker_name in self.logic_workers.keys()}
+        self.bundles_owners_overrides = {}
+        # account_id -> id of bundle, moved by rebalancing
+        self.accounts_overridden_bundles = {}
 
         for task_model in models.SupervisorTask.objects.filter(state=relations.SUPERVISOR_TASK_STATE.WAITING).iterator():
             task = prototypes.SupervisorTaskPrototype(task_model)
@@ -57,8 +63,15 @@ class Worker(utils_workers.BaseWorker):
 
         self.logger.info('distribute accounts')
 
-        for account_id in accounts_models.Account.objects.filter(removed_at=None).order_by('id').values_list('id', flat=True).iterator():
-            self.register_account(account_id, check_removed_state=False)
+        accounts_ids = accounts_models.Account.objects.filter(removed_at=None).order_by('id').values_list('id', flat=True).iterator()
+
+        while True:
+            accounts_batch = list(itertools.islice(accounts_ids, conf.settings.SUPERVISOR_REGISTER_ACCOUNTS_BATCH_SIZE))
+
+            if not accounts_batch:
+                break
+
+            self.register_accounts_batch(accounts_batch)
 
         self.initialized = True
         self.wait_next_turn_answer = False
@@ -84,23 +97,70 @@ class Worker(utils_workers.BaseWorker):
                 self.send_release_account_cmd(account_id)
 
     def choose_logic_worker_to_dispatch(self, account_id):
+        return self.choose_logic_worker_for_bundle(heroes_logic.load_hero_bundle_id(account_id=account_id))
 
-        hero = heroes_logic.load_hero(account_id=account_id)
-
-        bundle_id = hero.actions.current_action.bundle_id
+    def choose_logic_worker_for_bundle(self, bundle_id):
 
         if self.accounts_owners.get(bundle_id) in self.logic_workers:
             return self.accounts_owners[bundle_id]
 
-        lowest_number = 999999999999
-        chosen_worker = None
+        # bundles, moved by rebalancing, stay on their new workers
+        if self.bundles_owners_overrides.get(bundle_id) in self.logic_workers:
+            return self.bundles_owners_overrides[bundle_id]
+
+        return self.logic_ring.get_node(bundle_id)
+
+    def rebalance_logic_workers(self):
+        workers_costs = {logic_worker_name: sum(cost for bundle_id, cost, accounts_ids in bundles_costs)
+                         for logic_worker_name, bundles_costs in self.logic_bundles_costs.items()}
+
+        if len(workers_costs) < 2 or not all(self.logic_bundles_costs.values()):
+            return []
+
+        hottest_worker = max(sorted(workers_costs), key=workers_costs.get)
+        coldest_worker = min(sorted(workers_costs), key=workers_costs.get)
+
+        if workers_costs[hottest_worker] <= workers_costs[coldest_worker] * conf.settings.LOGIC_REBALANCE_COSTS_RATIO:
+            return []
+
+        cost_to_move = (workers_costs[hottest_worker] - workers_costs[coldest_worker]) / 2
+
+        moved_bundles = []
+
+        for bundle_id, cost, accounts_ids in sorted(self.logic_bundles_costs[hottest_worker], key=lambda record: -record[1]):
+
+            if len(moved_bundles) >= conf.settings.LOGIC_REBALANCE_MAX_MOVED_BUNDLES or cost_to_move <= 0:
+                break
+
+            # moving of idle bundles does not change load of workers
+            if cost <= 0 or cost > cost_to_move:
+                continue
+
+            # move only solo heroes, since bundles of several heroes are created for short time (e.g. for pvp)
+            if len(accounts_ids) != 1:
+                continue
+
+            account_id = accounts_ids[0]
+
+            if self.accounts_owners.get(account_id) != hottest_worker or account_id in self.accounts_for_tasks:
+                continue
+
+            self.send_release_account_cmd(account_id)
+
+            self.bundles_owners_overrides[bundle_id] = coldest_worker
+            self.accounts_overridden_bundles[account_id] = bundle_id
+
+            moved_bundles.append(bundle_id)
 
-        for logic_name in sorted(self.logic_accounts_number.keys()):
-            if self.logic_accounts_number[logic_name] < lowest_number:
-                lowest_number = self.logic_accounts_number[logic_name]
-                chosen_worker = logic_name
+            cost_to_move -= cost
 
-        return chosen_worker
+        # wait fresh costs from both workers before next rebalancing
+        self.logic_bundles_costs[hottest_worker] = []
+        self.logic_bundles_costs[coldest_worker] = []
+
+        self.logger.info('rebalance logic workers: move %d bundles from %s to %s', len(moved_bundles), hottest_worker, coldest_worker)
+
+        return moved_bundles
 
     def register_account(self, account_id, check_removed_state=True):
 
@@ -144,6 +204,38 @@ class Worker(utils_workers.BaseWorker):
 
         self.send_register_accounts_cmds([account_id], logic_worker_name)
 
+    def register_accounts_batch(self, accounts_ids):
+        # register not removed accounts on supervisor initialization:
+        # bundles ids are read by one query and every logic worker loads its heroes by one command
+        self.logger.info('register accounts batch: %d accounts, from %s to %s', len(accounts_ids), accounts_ids[0], accounts_ids[-1])
+
+        bundles_ids = heroes_logic.load_heroes_bundles_ids(accounts_ids)
+
+        workers_accounts = {}
+
+        for account_id in accounts_ids:
+            if account_id in self.accounts_for_tasks:
+                self.register_account(account_id, check_removed_state=False)
+                continue
+
+            if self.accounts_owners.get(account_id) is not None:
+                raise exceptions.DublicateAccountRegistration(account_id=account_id, owner=self.accounts_owners[account_id])
+
+            logic_worker_name = self.choose_logic_worker_for_bundle(bundles_ids.get(account_id))
+
+            # next accounts of batch can be placed in bundle of this account
+            self.accounts_owners[account_id] = logic_worker_name
+
+            workers_accounts.setdefault(logic_worker_name, []).append(account_id)
+
+        for logic_worker_name, worker_accounts_ids in sorted(workers_accounts.items()):
+            for account_id in worker_accounts_ids:
+                self.logic_accounts_number[logic_worker_name] += 1
+
+            self.logic_workers[logic_worker_name].cmd_register_accounts(worker_accounts_ids)
+
+            self.send_delayed_cmds(worker_accounts_ids)
+
     def send_register_accounts_cmds(self, accounts_ids, logic_worker_name):
         accounts_ids = sorted(accounts_ids)
 
@@ -154,6 +246,9 @@ class Worker(utils_workers.BaseWorker):
 
             self.logic_workers[logic_worker_name].cmd_register_account(account_id)
 
+        self.send_delayed_cmds(accounts_ids)
+
+    def send_delayed_cmds(self, accounts_ids):
         # send delayed commands, only after all accounts will be registered
         # sice some actions (for example, text generation) may need all bundle of heroes
         for account_id in accounts_ids:
@@ -163,6 +258,12 @@ class Worker(utils_workers.BaseWorker):
                 del self.accounts_queues[account_id]
 
     def send_release_account_cmd(self, account_id):
+        # only bundles of single account are moved, so override is not needed after release of its account
+        overridden_bundle_id = self.accounts_overridden_bundles.pop(account_id, None)
+
+        if overridden_bundle_id is not None:
+            del self.bundles_owners_overrides[overridden_bundle_id]
+
         account_owner = self.accounts_owners.get(account_id)
 
         if account_owner is not None:
@@ -307,6 +408,14 @@ class Worker(utils_workers.BaseWorker):
         self.dispatch_logic_cmd(account_id, 'setup_quest', {'account_id': account_id,
                                                             'knowledge_base': knowledge_base})
 
+    def cmd_bundles_costs(self, worker_id, costs):
+        return self.send_cmd('bundles_costs', {'worker_id': worker_id,
+                                               'costs': costs})
+
+    def process_bundles_costs(self, worker_id, costs):
+        self.logic_bundles_costs[worker_id] = costs
+        self.rebalance_logic_workers()
+
     def cmd_add_task(self, task_id):
         return self.send_cmd('add_task', {'task_id': task_id})
 
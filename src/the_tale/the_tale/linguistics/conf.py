@@ -15,6 +15,8 @@ settings = utils_app_settings.app_settings('LINGUISTICS_SETTINGS',
 
                                            MAX_RENDER_TEXT_RETRIES=3,
 
+                                           VARIABLES_CACHE_SIZE=10000,
+
                                            EXAMPLES_URL=django_reverse_lazy('forum:threads:show', args=[3917]),
                                            RULES_URL=django_reverse_lazy('forum:threads:show', args=[3868]),
 
@@ -34,6 +34,76 @@ def get_word_restrictions(external, word_form):
     return ((external, restrictions.get(relations.WORD_HAS_PLURAL_FORM.HAS)), )
 
 
+def _construct_variable(name, value):
+    word_form, variable_restrictions = lexicon_relations.VARIABLE(name).type.constructor(value)
+
+    restrictions = [(name, restriction_id) for restriction_id in variable_restrictions]
+    restrictions.extend(get_word_restrictions(name, word_form))
+
+    return word_form, tuple(restrictions)
+
+
+# variables of these types depend only on their values, so results of their construction can be reused
+CACHED_VARIABLES_TYPES = frozenset((lexicon_relations.VARIABLE_TYPE.NUMBER,
+                                    lexicon_relations.VARIABLE_TYPE.TEXT,
+                                    lexicon_relations.VARIABLE_TYPE.COINS))
+
+
+class VariablesCache:
+    '''
+    caches constructed variables, which do not depend on game objects:
+    - values of numbers, texts and coins, while restrictions are not changed
+    - date and time of game, while turn and restrictions are not changed
+    '''
+    __slots__ = ('_values', '_values_version', '_turn_variables', '_turn_version')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._values = {}
+        self._values_version = None
+
+        self._turn_variables = ()
+        self._turn_version = None
+
+    def construct(self, name, value):
+        variable = lexicon_relations.VARIABLE(name)
+
+        if variable.type not in CACHED_VARIABLES_TYPES or not isinstance(value, (int, float, str)):
+            return _construct_variable(name, value)
+
+        restrictions_version = storage.restrictions.version
+
+        if self._values_version != restrictions_version or len(self._values) >= conf.settings.VARIABLES_CACHE_SIZE:
+            self._values = {}
+            self._values_version = restrictions_version
+
+        # 1, 1.0 and True are equal as keys of dict, but can be constructed differently
+        key = (name, type(value), value)
+
+        if key not in self._values:
+            self._values[key] = _construct_variable(name, value)
+
+        return self._values[key]
+
+    def turn_variables(self):
+        turn = game_turn.number()
+
+        version = (turn, storage.restrictions.version)
+
+        if self._turn_version != version:
+            self._turn_variables = tuple((name, _construct_variable(name, value))
+                                         for name, value in ((lexicon_relations.VARIABLE.DATE.value, game_turn.linguistics_date(turn)),
+                                                             (lexicon_relations.VARIABLE.TIME.value, game_turn.linguistics_time(turn))))
+            self._turn_version = version
+
+        return self._turn_variables
+
+
+variables_cache = VariablesCache()
+
+
 def _process_arguments(args, lexicon_key=None):
     externals = {}
     restrictions = set()
@@ -47,22 +117,20 @@ def _process_arguments(args, lexicon_key=None):
         additional_args.update({'{}.{}'.format(name, subname): subvariable
                                 for subname, subvariable in object.linguistics_variables()})
 
-    variables = itertools.chain(args.items(),
-                                additional_args.items(),
-                                ((lexicon_relations.VARIABLE.DATE.value, game_turn.linguistics_date()),
-                                 (lexicon_relations.VARIABLE.TIME.value, game_turn.linguistics_time()),))
-
-    for k, v in variables:
+    for k, v in itertools.chain(args.items(), additional_args.items()):
         if v is None:
             logger.warn('unknown variable %s, for key %s, for variables %s', k, lexicon_key, args)
             word_form = lexicon_dictionary.noun(['потерянная переменная'] * 12, 'од,ср')
-            variable_restrictions = set()
+            variable_restrictions = get_word_restrictions(k, word_form)
         else:
-            word_form, variable_restrictions = lexicon_relations.VARIABLE(k).type.constructor(v)
+            word_form, variable_restrictions = variables_cache.construct(k, v)
+
+        externals[k] = word_form
+        restrictions.update(variable_restrictions)
 
+    for k, (word_form, variable_restrictions) in variables_cache.turn_variables():
         externals[k] = word_form
-        restrictions.update((k, restriction_id) for restriction_id in variable_restrictions)
-        restrictions.update(get_word_restrictions(k, word_form))
+        restrictions.update(variable_restrictions)
 
     return externals, frozenset(restrictions)
 
@@ -35,6 +35,52 @@ class GameDictionaryStorage(BaseGameDictionaryStorage):
         return prototypes.WordPrototype._db_filter(state=relations.WORD_STATE.IN_GAME).values_list('forms', flat=True)
 
 
+class GameLexicon(utg_lexicon.Lexicon):
+    '''
+    lexicon with templates of every key grouped by their restrictions,
+    so candidates are choosen by checking every distinct set of restrictions once, not every template
+    '''
+    __slots__ = ('_index',)
+
+    def __init__(self):
+        super().__init__()
+        self._index = {}
+
+    def add_template(self, key, template, restrictions=frozenset()):
+        super().add_template(key, template, restrictions=restrictions)
+        self._index.pop(key, None)
+
+    def _build_index(self, key):
+        groups = {}
+
+        for template, template_restrictions in self._data.get(key, ()):
+            groups.setdefault(template_restrictions, []).append(template)
+
+        unrestricted = tuple(groups.pop(frozenset(), ()))
+
+        self._index[key] = (unrestricted,
+                            tuple((template_restrictions, tuple(templates))
+                                  for template_restrictions, templates in groups.items()))
+
+        return self._index[key]
+
+    def get_templates(self, key, restrictions):
+        if key not in self._index:
+            self._build_index(key)
+
+        unrestricted, restricted = self._index[key]
+
+        templates = [template
+                     for template_restrictions, group in restricted
+                     if template_restrictions.issubset(restrictions)
+                     for template in group]
+
+        if not templates:
+            return unrestricted
+
+        return unrestricted + tuple(templates)
+
+
 class GameLexiconDictionaryStorage(utils_storage.SingleStorage):
     SETTINGS_KEY = 'game lexicon change time'
     EXCEPTION = exceptions.LexiconStorageError
@@ -45,7 +91,7 @@ class GameLexiconDictionaryStorage(utils_storage.SingleStorage):
                                                        errors_status=relations.TEMPLATE_ERRORS_STATUS.NO_ERRORS).values_list('key', 'data')
 
     def _construct_zero_item(self):
-        return utg_lexicon.Lexicon()
+        return GameLexicon()
 
     def refresh(self):
         self.clear()
@@ -541,6 +541,75 @@ class LogicTests(utils_testcase.TestCase):
         self.assertEqual(logic.get_word_restrictions('x', plural_noun), (('x', restrictions.get(relations.WORD_HAS_PLURAL_FORM.HAS)),))
 
 
+class VariablesCacheTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        self.cache = logic.VariablesCache()
+
+    def test_construct__cached_types(self):
+        with mock.patch('the_tale.linguistics.logic._construct_variable', mock.Mock(return_value=('form', ()))) as construct_variable:
+            self.assertEqual(self.cache.construct('coins', 100), ('form', ()))
+            self.assertEqual(self.cache.construct('coins', 100), ('form', ()))
+            self.cache.construct('coins', 200)
+            self.cache.construct('level', 100)
+
+        self.assertEqual(construct_variable.call_count, 3)
+
+    def test_construct__equal_values_of_different_types(self):
+        with mock.patch('the_tale.linguistics.logic._construct_variable', mock.Mock(return_value=('form', ()))) as construct_variable:
+            self.cache.construct('coins', 1)
+            self.cache.construct('coins', 1.0)
+            self.cache.construct('coins', True)
+            self.cache.construct('coins', 1.0)
+
+        self.assertEqual(construct_variable.call_count, 3)
+
+    def test_construct__not_cached_types(self):
+        hero_mock = mock.Mock()
+
+        with mock.patch('the_tale.linguistics.logic._construct_variable', mock.Mock(return_value=('form', ()))) as construct_variable:
+            self.cache.construct('hero', hero_mock)
+            self.cache.construct('hero', hero_mock)
+
+        self.assertEqual(construct_variable.call_count, 2)
+
+    def test_construct__restrictions_changed(self):
+        with mock.patch('the_tale.linguistics.logic._construct_variable', mock.Mock(return_value=('form', ()))) as construct_variable:
+            self.cache.construct('coins', 100)
+
+            storage.restrictions.update_version()
+
+            self.cache.construct('coins', 100)
+
+        self.assertEqual(construct_variable.call_count, 2)
+
+    @mock.patch('the_tale.linguistics.conf.settings.VARIABLES_CACHE_SIZE', 2)
+    def test_construct__size_limit(self):
+        for i in range(3):
+            self.cache.construct('coins', i)
+
+        self.assertEqual(len(self.cache._values), 1)
+
+    def test_construct__result(self):
+        self.assertEqual(self.cache.construct('coins', 100), logic._construct_variable('coins', 100))
+
+    def test_turn_variables(self):
+        variables = self.cache.turn_variables()
+
+        self.assertEqual([name for name, variable in variables],
+                         [lexicon_relations.VARIABLE.DATE.value, lexicon_relations.VARIABLE.TIME.value])
+
+        self.assertIs(self.cache.turn_variables(), variables)
+
+        game_turn.increment()
+
+        self.assertIsNot(self.cache.turn_variables(), variables)
+
+
 class GiveRewardForTemplateTests(utils_testcase.TestCase):
 
     def setUp(self):
@@ -119,3 +119,45 @@ class RestrictionsStorageTests(utils_testcase.TestCase):
 
         self.assertEqual(storage.restrictions.get_restrictions(restrictions.GROUP.RACE), [restriction_1, restriction_3])
         self.assertEqual(storage.restrictions.get_restrictions(restrictions.GROUP.GENDER), [restriction_2])
+
+
+class GameLexiconTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.lexicon = storage.GameLexicon()
+
+        self.key = lexicon_keys.LEXICON_KEY.HERO_COMMON_JOURNAL_LEVEL_UP
+
+        self.lexicon.add_template(self.key, 'template_1')
+        self.lexicon.add_template(self.key, 'template_2', restrictions=frozenset([('hero', 1)]))
+        self.lexicon.add_template(self.key, 'template_3', restrictions=frozenset([('hero', 1), ('hero', 2)]))
+        self.lexicon.add_template(self.key, 'template_4', restrictions=frozenset([('hero', 1)]))
+
+    def check_templates(self, restrictions):
+        self.assertCountEqual(self.lexicon.get_templates(self.key, restrictions),
+                              utg_lexicon.Lexicon.get_templates(self.lexicon, self.key, restrictions))
+
+    def test_get_templates(self):
+        self.assertCountEqual(self.lexicon.get_templates(self.key, frozenset()), ['template_1'])
+        self.assertCountEqual(self.lexicon.get_templates(self.key, frozenset([('hero', 1)])), ['template_1', 'template_2', 'template_4'])
+        self.assertCountEqual(self.lexicon.get_templates(self.key, frozenset([('hero', 1), ('hero', 2), ('hero', 3)])),
+                              ['template_1', 'template_2', 'template_3', 'template_4'])
+
+    def test_get_templates__same_as_base_lexicon(self):
+        for restrictions in (frozenset(),
+                             frozenset([('hero', 1)]),
+                             frozenset([('hero', 2)]),
+                             frozenset([('hero', 1), ('hero', 2)])):
+            self.check_templates(restrictions)
+
+    def test_get_templates__unknown_key(self):
+        self.assertEqual(self.lexicon.get_templates(lexicon_keys.LEXICON_KEY.HERO_COMMON_JOURNAL_RETURN_CHILD_GIFT, frozenset()), ())
+
+    def test_add_template__index_reset(self):
+        self.lexicon.get_templates(self.key, frozenset())
+
+        self.lexicon.add_template(self.key, 'template_5')
+
+        self.assertCountEqual(self.lexicon.get_templates(self.key, frozenset()), ['template_1', 'template_5'])
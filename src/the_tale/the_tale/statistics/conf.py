@@ -6,4 +6,6 @@ smart_imports.all()
 
 settings = utils_app_settings.app_settings('STATISTICS',
                                            START_DATE=datetime.datetime(year=2012, month=6, day=27),
-                                           PAYMENTS_START_DATE=datetime.datetime(year=2013, month=8, day=1))
+                                           PAYMENTS_START_DATE=datetime.datetime(year=2013, month=8, day=1),
+                                           RECORDS_BATCH_SIZE=1000,
+                                           COMPLETE_PROCESSES=4)
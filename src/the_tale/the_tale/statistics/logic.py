@@ -0,0 +1,61 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+def split_metrics(metrics_classes):
+    '''
+    returns groups of independent metrics (grouped by source) and list of combinations,
+    which must be completed after all groups, since they are calculated from stored records
+    '''
+    groups = {}
+    combinations = []
+
+    for MetricClass in metrics_classes:
+        if issubclass(MetricClass, statistics_metrics_base.BaseCombination):
+            combinations.append(MetricClass)
+            continue
+
+        key = MetricClass.SOURCE if MetricClass.SOURCE is not None else MetricClass.TYPE
+
+        groups.setdefault(key, []).append(MetricClass)
+
+    return list(groups.values()), combinations
+
+
+def complete_metrics_group(metrics_classes, logger=None):
+    try:
+        for MetricClass in metrics_classes:
+            if logger:
+                logger.info('calculate %s' % MetricClass.TYPE)
+
+            metric = MetricClass()
+            metric.initialize()
+            metric.complete_values()
+
+    finally:
+        statistics_metrics_sources.reset()
+
+
+def complete_metrics(metrics_classes, processes, logger=None):
+    groups, combinations = split_metrics(metrics_classes)
+
+    if processes > 1 and len(groups) > 1:
+        # child processes must not share database connections with parent
+        django_db.connections.close_all()
+
+        context = multiprocessing.get_context('fork')
+
+        with context.Pool(processes=min(processes, len(groups))) as pool:
+            pool.starmap(_complete_metrics_group, [(group, logger.name if logger else None) for group in groups])
+
+    else:
+        for group in groups:
+            complete_metrics_group(group, logger=logger)
+
+    complete_metrics_group(combinations, logger=logger)
+
+
+def _complete_metrics_group(metrics_classes, logger_name):
+    complete_metrics_group(metrics_classes, logger=logging.getLogger(logger_name) if logger_name else None)
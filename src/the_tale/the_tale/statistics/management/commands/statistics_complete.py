@@ -165,6 +165,7 @@ class Command(utilities_base.Command):
         parser.add_argument('-f', '--force-clear', action='store_true', dest='force-clear', help='force clear all metrics')
         parser.add_argument('-l', '--log', action='store_true', dest='verbose', help='print log')
         parser.add_argument('-r', '--recalculate-last', action='store_true', dest='recalculate-last', help='recalculate last day')
+        parser.add_argument('-p', '--processes', action='store', type=int, dest='processes', default=conf.settings.COMPLETE_PROCESSES, help='number of processes for independent metrics')
 
     def _handle(self, *args, **options):
 
@@ -183,13 +184,9 @@ class Command(utilities_base.Command):
                     self.logger.info('clear %s' % MetricClass.TYPE)
                 MetricClass.clear()
 
-        for i, MetricClass in enumerate(METRICS):
-            metric = MetricClass()
-            if verbose:
-                self.logger.info('[%3d] calculate %s' % (i, metric.TYPE))
-
-            metric.initialize()
-            metric.complete_values()
+        logic.complete_metrics(METRICS,
+                               processes=options['processes'],
+                               logger=self.logger if verbose else None)
 
         models.FullStatistics.objects.all().delete()
         models.FullStatistics.objects.create(data=prototypes.RecordPrototype.get_js_data())
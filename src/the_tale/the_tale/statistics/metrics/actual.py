@@ -21,6 +21,7 @@ class ActiveBase(base.BaseMetric):
 
 class Premiums(ActiveBase):
     TYPE = relations.RECORD_TYPE.PREMIUMS
+    SOURCE = 'premiums'
 
     def get_actual_value(self, date):
         premiums_ids = set(accounts_prototypes.AccountPrototype._db_filter(self.db_date_gte('premium_end_at', date=date)).values_list('id', flat=True))
@@ -68,6 +69,7 @@ class PremiumPercents(base.BasePercentsCombination):
 
 class InfinitPremiums(ActiveBase):
     TYPE = relations.RECORD_TYPE.INFINIT_PREMIUMS
+    SOURCE = 'premiums'
 
     def get_actual_value(self, date):
         return self.get_invoice_infinit_intervals_count(date)
@@ -86,6 +88,7 @@ class InfinitPremiums(ActiveBase):
 
 
 class ActiveAccountsBase(ActiveBase):
+    SOURCE = 'active_accounts'
     DAYS = NotImplemented
 
     def get_actual_value(self, date):
@@ -117,6 +120,7 @@ class MAU(ActiveAccountsBase):
 
 
 class ActiveOlderBase(ActiveBase):
+    SOURCE = 'active_accounts'
     DAYS = NotImplemented
 
     def get_actual_value(self, date):
@@ -4,10 +4,20 @@ import smart_imports
 smart_imports.all()
 
 
+def as_datetime(date):
+    if isinstance(date, datetime.datetime):
+        return date
+
+    return datetime.datetime.combine(date, datetime.time())
+
+
 class BaseMetric(object):
     TYPE = NotImplemented
     FULL_CLEAR_RECUIRED = False
 
+    # metrics with the same source are completed in the same process, so they can share loaded data
+    SOURCE = None
+
     def __init__(self):
         self.values_completed = False
         self.last_datetime = None
@@ -39,9 +49,19 @@ class BaseMetric(object):
                                                  value_int=value if self.TYPE.value_type.is_INT else None,
                                                  value_float=value if self.TYPE.value_type.is_FLOAT else None)
 
+    def store_values(self, values):
+        prototypes.RecordPrototype.create_many(type=self.TYPE, values=values)
+
     def get_value(self, date):
         raise NotImplementedError()
 
+    def get_values(self, dates):
+        '''
+        dates are sorted in ascending order
+        metrics override this method to calculate values for the whole interval by loading data once
+        '''
+        return [self.get_value(date) for date in dates]
+
     def _get_interval(self):
         return (self.free_date, datetime.datetime.now().date())
 
@@ -49,8 +69,10 @@ class BaseMetric(object):
         if self.values_completed:
             raise exceptions.ValuesCompletedError()
 
-        for date in utils_logic.days_range(*self._get_interval()):
-            self.store_value(date, self.get_value(date))
+        dates = list(utils_logic.days_range(*self._get_interval()))
+
+        self.store_values(list(zip(dates, self.get_values(dates))))
+
         self.values_completed = True
 
     def db_date_gt(self, field, date=None):
@@ -98,6 +120,22 @@ class BaseMetric(object):
             date = self.free_date
         return self.db_date_interval(field, date=date, days=0)
 
+    def date_interval(self, days, date=None):
+        '''
+        python analogue of db_date_interval: returns (lower, upper) bounds, both excluded
+        '''
+        if date is None:
+            date = self.free_date
+
+        date = as_datetime(date)
+
+        if days > 0:
+            return (date, date + datetime.timedelta(days=days))
+        elif days < 0:
+            return (date + datetime.timedelta(days=1 + days), date + datetime.timedelta(days=1))
+        else:
+            return (date, date + datetime.timedelta(days=1))
+
 
 class BaseCombination(BaseMetric):
     TYPE = None
@@ -115,14 +153,18 @@ class BaseCombination(BaseMetric):
                                                          date__gt=self.last_date).order_by('date').values_list('date', 'value_float')
             sources.append(data)
 
+        values = []
+
         for source_record in zip(*sources):
 
-            dates, values = zip(*source_record)
+            dates, sources_values = zip(*source_record)
 
             if list(dates) != [dates[0]] * len(dates):
                 raise exceptions.UnequalDatesError()
 
-            self.store_value(dates[0], self.get_combined_value(*values))
+            values.append((dates[0], self.get_combined_value(*sources_values)))
+
+        self.store_values(values)
 
 
 class BasePercentsCombination(BaseCombination):
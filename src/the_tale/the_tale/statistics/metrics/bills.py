@@ -7,11 +7,11 @@ smart_imports.all()
 class Bills(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.BILLS
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'bills'
 
     def initialize(self):
         super(Bills, self).initialize()
-        bills_dates = bills_models.Bill.objects.all().values_list('created_at', flat=True)
-        self.bills_dates = collections.Counter(date.date() for date in bills_dates)
+        self.bills_dates = sources.daily_counts(bills_models.Bill.objects.all())
 
     def get_value(self, date):
         return self.bills_dates.get(date, 0)
@@ -20,6 +20,7 @@ class Bills(base.BaseMetric):
 class BillsInMonth(Bills):
     TYPE = relations.RECORD_TYPE.BILLS_IN_MONTH
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'bills'
 
     def get_value(self, date):
         return sum(self.bills_dates.get(date - datetime.timedelta(days=i), 0) for i in range(30))
@@ -28,6 +29,7 @@ class BillsInMonth(Bills):
 class BillsTotal(base.BaseMetric):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.BILLS_TOTAL
+    SOURCE = 'bills'
 
     def initialize(self):
         super(BillsTotal, self).initialize()
@@ -36,8 +38,7 @@ class BillsTotal(base.BaseMetric):
 
         count = query.filter(self.db_date_lt('created_at')).count()
 
-        bills_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        bills_count = collections.Counter(date.date() for date in bills_dates)
+        bills_count = sources.daily_counts(query.filter(self.db_date_gte('created_at')))
 
         self.counts = {}
         for date in utils_logic.days_range(*self._get_interval()):
@@ -51,11 +52,11 @@ class BillsTotal(base.BaseMetric):
 class Votes(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.BILLS_VOTES
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'bills'
 
     def initialize(self):
         super(Votes, self).initialize()
-        votes_dates = bills_models.Vote.objects.all().values_list('created_at', flat=True)
-        self.votes_dates = collections.Counter(date.date() for date in votes_dates)
+        self.votes_dates = sources.daily_counts(bills_models.Vote.objects.all())
 
     def get_value(self, date):
         return self.votes_dates.get(date, 0)
@@ -64,6 +65,7 @@ class Votes(base.BaseMetric):
 class VotesInMonth(Votes):
     TYPE = relations.RECORD_TYPE.BILLS_VOTES_IN_MONTH
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'bills'
 
     def get_value(self, date):
         return sum(self.votes_dates.get(date - datetime.timedelta(days=i), 0) for i in range(30))
@@ -72,6 +74,7 @@ class VotesInMonth(Votes):
 class VotesTotal(base.BaseMetric):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.BILLS_VOTES_TOTAL
+    SOURCE = 'bills'
 
     def initialize(self):
         super(VotesTotal, self).initialize()
@@ -80,8 +83,7 @@ class VotesTotal(base.BaseMetric):
 
         count = query.filter(self.db_date_lt('created_at')).count()
 
-        votes_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        votes_count = collections.Counter(date.date() for date in votes_dates)
+        votes_count = sources.daily_counts(query.filter(self.db_date_gte('created_at')))
 
         self.counts = {}
         for date in utils_logic.days_range(*self._get_interval()):
@@ -7,11 +7,11 @@ smart_imports.all()
 class Posts(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.FOLCLOR_POSTS
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'folclor'
 
     def initialize(self):
         super(Posts, self).initialize()
-        posts_dates = blogs_models.Post.objects.all().values_list('created_at', flat=True)
-        self.posts_dates = collections.Counter(date.date() for date in posts_dates)
+        self.posts_dates = sources.daily_counts(blogs_models.Post.objects.all())
 
     def get_value(self, date):
         return self.posts_dates.get(date, 0)
@@ -20,6 +20,7 @@ class Posts(base.BaseMetric):
 class PostsInMonth(Posts):
     TYPE = relations.RECORD_TYPE.FOLCLOR_POSTS_IN_MONTH
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'folclor'
 
     def get_value(self, date):
         return sum(self.posts_dates.get(date - datetime.timedelta(days=i), 0) for i in range(30))
@@ -28,6 +29,7 @@ class PostsInMonth(Posts):
 class PostsTotal(base.BaseMetric):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.FOLCLOR_POSTS_TOTAL
+    SOURCE = 'folclor'
 
     def initialize(self):
         super(PostsTotal, self).initialize()
@@ -36,8 +38,7 @@ class PostsTotal(base.BaseMetric):
 
         count = query.filter(self.db_date_lt('created_at')).count()
 
-        posts_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        posts_count = collections.Counter(date.date() for date in posts_dates)
+        posts_count = sources.daily_counts(query.filter(self.db_date_gte('created_at')))
 
         self.counts = {}
         for date in utils_logic.days_range(*self._get_interval()):
@@ -51,11 +52,11 @@ class PostsTotal(base.BaseMetric):
 class Votes(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.FOLCLOR_VOTES
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'folclor'
 
     def initialize(self):
         super(Votes, self).initialize()
-        votes_dates = blogs_models.Vote.objects.all().values_list('created_at', flat=True)
-        self.votes_dates = collections.Counter(date.date() for date in votes_dates)
+        self.votes_dates = sources.daily_counts(blogs_models.Vote.objects.all())
 
     def get_value(self, date):
         return self.votes_dates.get(date, 0)
@@ -64,6 +65,7 @@ class Votes(base.BaseMetric):
 class VotesInMonth(Votes):
     TYPE = relations.RECORD_TYPE.FOLCLOR_VOTES_IN_MONTH
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'folclor'
 
     def get_value(self, date):
         return sum(self.votes_dates.get(date - datetime.timedelta(days=i), 0) for i in range(30))
@@ -72,6 +74,7 @@ class VotesInMonth(Votes):
 class VotesTotal(base.BaseMetric):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.FOLCLOR_VOTES_TOTAL
+    SOURCE = 'folclor'
 
     def initialize(self):
         super(VotesTotal, self).initialize()
@@ -80,8 +83,7 @@ class VotesTotal(base.BaseMetric):
 
         count = query.filter(self.db_date_lt('created_at')).count()
 
-        votes_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        votes_count = collections.Counter(date.date() for date in votes_dates)
+        votes_count = sources.daily_counts(query.filter(self.db_date_gte('created_at')))
 
         self.counts = {}
         for date in utils_logic.days_range(*self._get_interval()):
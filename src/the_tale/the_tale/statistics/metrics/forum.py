@@ -7,11 +7,11 @@ smart_imports.all()
 class Posts(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.FORUM_POSTS
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'forum'
 
     def initialize(self):
         super(Posts, self).initialize()
-        posts_dates = forum_models.Post.objects.all().values_list('created_at', flat=True)
-        self.posts_dates = collections.Counter(date.date() for date in posts_dates)
+        self.posts_dates = sources.daily_counts(forum_models.Post.objects.all())
 
     def get_value(self, date):
         return self.posts_dates.get(date, 0)
@@ -20,6 +20,7 @@ class Posts(base.BaseMetric):
 class PostsInMonth(Posts):
     TYPE = relations.RECORD_TYPE.FORUM_POSTS_IN_MONTH
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'forum'
 
     def get_value(self, date):
         return sum(self.posts_dates.get(date - datetime.timedelta(days=i), 0) for i in range(30))
@@ -28,6 +29,7 @@ class PostsInMonth(Posts):
 class PostsTotal(base.BaseMetric):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.FORUM_POSTS_TOTAL
+    SOURCE = 'forum'
 
     def initialize(self):
         super(PostsTotal, self).initialize()
@@ -36,8 +38,7 @@ class PostsTotal(base.BaseMetric):
 
         count = query.filter(self.db_date_lt('created_at')).count()
 
-        posts_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        posts_count = collections.Counter(date.date() for date in posts_dates)
+        posts_count = sources.daily_counts(query.filter(self.db_date_gte('created_at')))
 
         self.counts = {}
         for date in utils_logic.days_range(*self._get_interval()):
@@ -51,11 +52,11 @@ class PostsTotal(base.BaseMetric):
 class Threads(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.FORUM_THREADS
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'forum'
 
     def initialize(self):
         super(Threads, self).initialize()
-        threads_dates = forum_models.Thread.objects.all().values_list('created_at', flat=True)
-        self.threads_dates = collections.Counter(date.date() for date in threads_dates)
+        self.threads_dates = sources.daily_counts(forum_models.Thread.objects.all())
 
     def get_value(self, date):
         return self.threads_dates.get(date, 0)
@@ -64,6 +65,7 @@ class Threads(base.BaseMetric):
 class ThreadsInMonth(Threads):
     TYPE = relations.RECORD_TYPE.FORUM_THREADS_IN_MONTH
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'forum'
 
     def get_value(self, date):
         return sum(self.threads_dates.get(date - datetime.timedelta(days=i), 0) for i in range(30))
@@ -72,6 +74,7 @@ class ThreadsInMonth(Threads):
 class ThreadsTotal(base.BaseMetric):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.FORUM_THREADS_TOTAL
+    SOURCE = 'forum'
 
     def initialize(self):
         super(ThreadsTotal, self).initialize()
@@ -80,8 +83,7 @@ class ThreadsTotal(base.BaseMetric):
 
         count = query.filter(self.db_date_lt('created_at')).count()
 
-        threads_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        threads_count = collections.Counter(date.date() for date in threads_dates)
+        threads_count = sources.daily_counts(query.filter(self.db_date_gte('created_at')))
 
         self.counts = {}
         for date in utils_logic.days_range(*self._get_interval()):
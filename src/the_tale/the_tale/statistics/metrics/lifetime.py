@@ -4,18 +4,25 @@ import smart_imports
 smart_imports.all()
 
 
+def accounts_by_days(dates, date_interval):
+    accounts = sources.accounts()
+
+    for date in dates:
+        yield date, [(active_end_at, created_at)
+                     for created_at, account_id, active_end_at, referral_of_id in accounts.select(*date_interval(date=date, days=0))]
+
+
 class AliveAfterBase(base.BaseMetric):
     TYPE = None
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'accounts'
     DAYS = NotImplemented
 
-    def get_value(self, date):
-        query = accounts_prototypes.AccountPrototype._db_filter(self.db_date_day('created_at', date),
-                                                                is_fast=False,
-                                                                is_bot=False)
-        return len([True
-                    for active_end_at, created_at in query.values_list('active_end_at', 'created_at')
-                    if (active_end_at - created_at - datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT)).days >= self.DAYS])
+    def get_values(self, dates):
+        return [len([True
+                     for active_end_at, created_at in accounts
+                     if (active_end_at - created_at - datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT)).days >= self.DAYS])
+                for date, accounts in accounts_by_days(dates, self.date_interval)]
 
     def _get_interval(self):
         return (self.free_date, (datetime.datetime.now() - datetime.timedelta(days=self.DAYS)).date())
@@ -59,14 +66,14 @@ class AliveAfter0(AliveAfterBase):
 class Lifetime(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.LIFETIME
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'accounts'
 
-    def get_value(self, date):
-        query = accounts_prototypes.AccountPrototype._db_filter(self.db_date_day('created_at', date=date),
-                                                                is_fast=False,
-                                                                is_bot=False)
+    def get_values(self, dates):
+        return [self.get_lifetime(accounts) for date, accounts in accounts_by_days(dates, self.date_interval)]
 
+    def get_lifetime(self, accounts):
         lifetimes = [active_end_at - created_at - datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT - 1)
-                     for active_end_at, created_at in query.values_list('active_end_at', 'created_at')]
+                     for active_end_at, created_at in accounts]
 
         # filter «strange» lifetimes
         lifetimes = [lifetime for lifetime in lifetimes if lifetime > datetime.timedelta(seconds=0)]
@@ -81,13 +88,14 @@ class Lifetime(base.BaseMetric):
 class LifetimePercent(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.LIFETIME_PERCENT
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'accounts'
+
+    def get_values(self, dates):
+        return [self.get_lifetime_percent(date, accounts) for date, accounts in accounts_by_days(dates, self.date_interval)]
 
-    def get_value(self, date):
-        query = accounts_prototypes.AccountPrototype._db_filter(self.db_date_day('created_at', date=date),
-                                                                is_fast=False,
-                                                                is_bot=False)
+    def get_lifetime_percent(self, date, accounts):
         lifetimes = [active_end_at - created_at - datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT)
-                     for active_end_at, created_at in query.values_list('active_end_at', 'created_at')]
+                     for active_end_at, created_at in accounts]
 
         if not lifetimes:
             return 0
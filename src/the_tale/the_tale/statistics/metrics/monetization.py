@@ -4,11 +4,12 @@ import smart_imports
 smart_imports.all()
 
 
-ACCEPTED_INVOICE_FILTER = django_models.Q(state=bank_relations.INVOICE_STATE.CONFIRMED) | django_models.Q(state=bank_relations.INVOICE_STATE.FORCED)
+ACCEPTED_INVOICE_FILTER = sources.ACCEPTED_INVOICE_FILTER
 
 
 class Payers(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.PAYERS
+    SOURCE = 'xsolla_invoices'
     PREFETCH_DELTA = datetime.timedelta(days=1)
 
     def initialize(self):
@@ -42,6 +43,7 @@ class PayersInMonth(Payers):
 
 class Income(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.INCOME
+    SOURCE = 'xsolla_invoices'
     PREFETCH_DELTA = datetime.timedelta(days=1)
 
     def initialize(self):
@@ -69,6 +71,7 @@ class IncomeInMonth(Income):
 
 class IncomeTotal(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.INCOME_TOTAL
+    SOURCE = 'xsolla_invoices'
 
     def initialize(self):
         super(IncomeTotal, self).initialize()
@@ -126,64 +129,82 @@ class ARPUInMonth(base.BaseFractionCombination):
 class DaysBeforePayment(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.DAYS_BEFORE_PAYMENT
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'xsolla_invoices'
     PERIOD = 30
 
-    def get_value(self, date):
-        query = accounts_prototypes.AccountPrototype._db_filter(is_fast=False, is_bot=False)
+    def get_values(self, dates):
+        first_payments = {}
+        payments_numbers = collections.Counter()
+
+        for created_at, recipient_id, amount in sources.xsolla_invoices().records:
+            first_payments.setdefault(recipient_id, created_at)
+            payments_numbers[recipient_id] += 1
+
+        accounts = sources.accounts()
 
         # do not use accounts registered before payments turn on
-        query = query.filter(self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                             self.db_date_gte('created_at', date=conf.settings.PAYMENTS_START_DATE.date()))
-        accounts = dict(query.values_list('id', 'created_at'))
+        payments_start_date = base.as_datetime(conf.settings.PAYMENTS_START_DATE.date())
 
-        invoices = list(bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                                    sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                                    currency=bank_relations.CURRENCY_TYPE.PREMIUM,
-                                                                    recipient_id__in=list(accounts.keys())).values_list('created_at', 'recipient_id'))
+        values = []
 
-        account_ids = [id_ for created_at, id_ in invoices]
+        for date in dates:
+            lower, upper = self.date_interval(date=date, days=-self.PERIOD)
 
-        if not account_ids:
-            return 0
+            total_time = datetime.timedelta(seconds=0)
+            payments_number = 0
 
-        delays = {account_id: min([(created_at - accounts[account_id])
-                                   for created_at, id_ in invoices
-                                   if id_ == account_id])
-                  for account_id in account_ids}
+            for created_at, account_id, active_end_at, referral_of_id in accounts.select(max(lower, payments_start_date), upper):
+                if account_id not in first_payments:
+                    continue
 
-        total_time = functools.reduce(lambda s, v: s + v, list(delays.values()), datetime.timedelta(seconds=0))
+                total_time += first_payments[account_id] - created_at
+                payments_number += payments_numbers[account_id]
 
-        days = float(total_time.total_seconds()) / len(account_ids) / (24 * 60 * 60)
+            if not payments_number:
+                values.append(0)
+                continue
 
-        return days
+            values.append(float(total_time.total_seconds()) / payments_number / (24 * 60 * 60))
+
+        return values
 
 
 class ARPNU(base.BaseMetric):
     TYPE = None
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'xsolla_invoices'
     DAYS = NotImplemented
     PERIOD = 30
 
-    def get_value(self, date):
-        query = accounts_prototypes.AccountPrototype._db_filter(self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                                                is_fast=False,
-                                                                is_bot=False)
-        accounts = list(query.values_list('id', 'created_at'))
-
-        if not accounts:
-            return 0
-
-        total_income = 0
-        for account_id, created_at in accounts:
-            income = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                                 self.db_date_interval('created_at', date=created_at, days=self.DAYS),
-                                                                 sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                                 currency=bank_relations.CURRENCY_TYPE.PREMIUM,
-                                                                 recipient_id=account_id).aggregate(income=django_models.Sum('amount'))['income']
-            if income is not None:
-                total_income += income
-
-        return float(total_income) / len(accounts)
+    def get_values(self, dates):
+        invoices = sources.xsolla_invoices_by_recipients()
+
+        accounts = sources.accounts()
+
+        # income of account does not depend on date, so it is calculated only once
+        incomes = {}
+
+        values = []
+
+        for date in dates:
+            accounts_records = accounts.select(*self.date_interval(date=date, days=-self.PERIOD))
+
+            if not accounts_records:
+                values.append(0)
+                continue
+
+            total_income = 0
+
+            for created_at, account_id, active_end_at, referral_of_id in accounts_records:
+                if account_id not in incomes:
+                    incomes[account_id] = sum(amount
+                                              for invoice_created_at, amount in invoices[account_id].select(*self.date_interval(date=created_at, days=self.DAYS))) if account_id in invoices else 0
+
+                total_income += incomes[account_id]
+
+            values.append(float(total_income) / len(accounts_records))
+
+        return values
 
     def _get_interval(self):
         return (self.free_date, (datetime.datetime.now() - datetime.timedelta(days=self.DAYS)).date())
@@ -207,48 +228,58 @@ class ARPNU3Month(ARPNU):
 class LTV(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.LTV
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'xsolla_invoices'
     PERIOD = 7
 
-    def get_value(self, date):
-        query = accounts_prototypes.AccountPrototype._db_filter(self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                                                is_fast=False,
-                                                                is_bot=False)
-        accounts_ids = list(query.values_list('id', flat=True))
+    def get_values(self, dates):
+        invoices = sources.xsolla_invoices_by_recipients()
+
+        incomes = {recipient_id: sum(amount for created_at, amount in records.records)
+                   for recipient_id, records in invoices.items()}
+
+        accounts = sources.accounts()
+
+        values = []
+
+        for date in dates:
+            accounts_records = accounts.select(*self.date_interval(date=date, days=-self.PERIOD))
 
-        if not accounts_ids:
-            return 0
+            payers_incomes = [incomes[account_id]
+                              for created_at, account_id, active_end_at, referral_of_id in accounts_records
+                              if account_id in incomes]
 
-        total_income = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                                   sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                                   currency=bank_relations.CURRENCY_TYPE.PREMIUM,
-                                                                   recipient_id__in=accounts_ids).aggregate(income=django_models.Sum('amount'))['income']
+            if not payers_incomes:
+                values.append(0)
+                continue
 
-        if total_income is None:
-            return 0
+            values.append(float(sum(payers_incomes)) / len(accounts_records))
 
-        return float(total_income) / len(accounts_ids)
+        return values
 
 
 class IncomeFromGroupsBase(base.BaseMetric):
     TYPE = None
+    SOURCE = 'xsolla_invoices'
     PERIOD = 30
 
     @classmethod
     def filter_recipients(cls, ids):
         raise NotImplementedError
 
-    def get_value(self, date):
-        invoices = list(bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                                    self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                                                    sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                                    currency=bank_relations.CURRENCY_TYPE.PREMIUM).values_list('recipient_id', 'amount'))
+    def get_values(self, dates):
+        invoices = sources.xsolla_invoices()
+
+        # recipients are filtered by their own properties, so all of them can be filtered at once
+        recipients = set(self.filter_recipients({recipient_id for created_at, recipient_id, amount in invoices.records}))
 
-        if not invoices:
-            return 0
+        values = []
 
-        recipients = set(self.filter_recipients(next(zip(*invoices))))
+        for date in dates:
+            values.append(sum([amount
+                               for created_at, recipient_id, amount in invoices.select(*self.date_interval(date=date, days=-self.PERIOD))
+                               if recipient_id in recipients], 0))
 
-        return sum([amount for recipient_id, amount in invoices if recipient_id in recipients], 0)
+        return values
 
 
 class IncomeFromForum(IncomeFromGroupsBase):
@@ -285,23 +316,34 @@ class IncomeFromSingles(IncomeFromGroupsBase):
 
 class IncomeFromGoodsBase(base.BaseMetric):
     TYPE = None
+    SOURCE = 'game_logic_invoices'
     GROUP_PREFIX = NotImplemented
     PERIOD = 30
 
     def selector(self):
         return django_models.Q(operation_uid__contains=self.GROUP_PREFIX)
 
-    def get_value(self, date):
-        income = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                             self.selector(),
-                                                             self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                                             sender_type=bank_relations.ENTITY_TYPE.GAME_LOGIC,
-                                                             currency=bank_relations.CURRENCY_TYPE.PREMIUM).aggregate(income=django_models.Sum('amount'))['income']
+    def match(self, operation_uid):
+        # python analogue of selector
+        return self.GROUP_PREFIX in operation_uid
 
-        if income is None:
-            return 0
+    def get_values(self, dates):
+        invoices = sources.game_logic_invoices()
+
+        values = []
+
+        for date in dates:
+            amounts = [amount
+                       for created_at, operation_uid, amount in invoices.select(*self.date_interval(date=date, days=-self.PERIOD))
+                       if self.match(operation_uid)]
+
+            if not amounts:
+                values.append(0)
+                continue
+
+            values.append(-sum(amounts))
 
-        return -income
+        return values
 
 
 class IncomeFromGoodsPremium(IncomeFromGoodsBase):
@@ -370,15 +412,45 @@ class IncomeFromGoodsOther(IncomeFromGoodsBase):
                  django_models.Q(operation_uid__contains='<%s' % IncomeFromGoodsMarketCommission.GROUP_PREFIX) |
                  django_models.Q(operation_uid__contains='<%s' % IncomeFromTransferMoneyCommission.GROUP_PREFIX))
 
+    def match(self, operation_uid):
+        return not any('<%s' % MetricClass.GROUP_PREFIX in operation_uid
+                       for MetricClass in (IncomeFromGoodsPremium,
+                                           IncomeFromGoodsEnergy,
+                                           IncomeFromGoodsChest,
+                                           IncomeFromGoodsPeferences,
+                                           IncomeFromGoodsPreferencesReset,
+                                           IncomeFromGoodsHabits,
+                                           IncomeFromGoodsAbilities,
+                                           IncomeFromGoodsClans,
+                                           IncomeFromGoodsMarketCommission,
+                                           IncomeFromTransferMoneyCommission))
+
 
 class PU(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.PU
+    SOURCE = 'xsolla_invoices'
 
-    def get_value(self, date):
-        return bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                           self.db_date_lte('created_at', date=date),
-                                                           sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                           currency=bank_relations.CURRENCY_TYPE.PREMIUM).values_list('recipient_id').order_by('recipient_id').distinct().count()
+    def get_values(self, dates):
+        invoices = sources.xsolla_invoices()
+
+        recipients = set()
+
+        position = 0
+
+        values = []
+
+        for date in dates:
+            lower, upper = self.date_interval(date=date, days=0)
+
+            end = invoices.position_before(upper)
+
+            recipients.update(recipient_id for created_at, recipient_id, amount in invoices.records[position:end])
+
+            position = max(position, end)
+
+            values.append(len(recipients))
+
+        return values
 
 
 class PUPercents(base.BasePercentsCombination):
@@ -387,23 +459,39 @@ class PUPercents(base.BasePercentsCombination):
                relations.RECORD_TYPE.REGISTRATIONS_TOTAL]
 
 
-class IncomeGroupBase(base.BaseMetric):
-    TYPE = None
-    BORDERS = NotImplemented
+def accounts_incomes_by_dates(dates, date_interval):
+    '''
+    yields incomes of accounts, accumulated to the end of every date
+    '''
+    invoices = sources.xsolla_invoices()
 
-    def get_value(self, date):
-        incomes = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                              self.db_date_lte('created_at', date=date),
-                                                              sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                              currency=bank_relations.CURRENCY_TYPE.PREMIUM).values_list('recipient_id', 'amount')
+    accounts_incomes = {}
+
+    position = 0
+
+    for date in dates:
+        lower, upper = date_interval(date=date, days=0)
 
-        accounts_incomes = {}
-        for recipient_id, amount in incomes:
+        end = invoices.position_before(upper)
+
+        for created_at, recipient_id, amount in invoices.records[position:end]:
             accounts_incomes[recipient_id] = accounts_incomes.get(recipient_id, 0) + amount
 
-        return len([True
-                    for amount in accounts_incomes.values()
-                    if self.BORDERS[0] < amount <= self.BORDERS[1]])
+        position = max(position, end)
+
+        yield accounts_incomes
+
+
+class IncomeGroupBase(base.BaseMetric):
+    TYPE = None
+    SOURCE = 'xsolla_invoices'
+    BORDERS = NotImplemented
+
+    def get_values(self, dates):
+        return [len([True
+                     for amount in accounts_incomes.values()
+                     if self.BORDERS[0] < amount <= self.BORDERS[1]])
+                for accounts_incomes in accounts_incomes_by_dates(dates, self.date_interval)]
 
 
 class IncomeGroup0_500(IncomeGroupBase):
@@ -463,21 +551,14 @@ class IncomeGroup10000Percents(base.BasePercentsCombination):
 
 class IncomeGroupIncomeBase(base.BaseMetric):
     TYPE = None
+    SOURCE = 'xsolla_invoices'
     BORDERS = NotImplemented
 
-    def get_value(self, date):
-        incomes = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                              self.db_date_lte('created_at', date=date),
-                                                              sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                              currency=bank_relations.CURRENCY_TYPE.PREMIUM).values_list('recipient_id', 'amount')
-
-        accounts_incomes = {}
-        for recipient_id, amount in incomes:
-            accounts_incomes[recipient_id] = accounts_incomes.get(recipient_id, 0) + amount
-
-        return sum([amount
-                    for amount in accounts_incomes.values()
-                    if self.BORDERS[0] < amount <= self.BORDERS[1]], 0)
+    def get_values(self, dates):
+        return [sum([amount
+                     for amount in accounts_incomes.values()
+                     if self.BORDERS[0] < amount <= self.BORDERS[1]], 0)
+                for accounts_incomes in accounts_incomes_by_dates(dates, self.date_interval)]
 
 
 class IncomeGroupIncome0_500(IncomeGroupIncomeBase):
@@ -538,18 +619,15 @@ class IncomeGroupIncome10000Percents(base.BasePercentsCombination):
 class Revenue(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.REVENUE
     FULL_CLEAR_RECUIRED = True  # change to False after v0.3.18
+    SOURCE = 'xsolla_invoices'
     DAYS = None
     PERIOD = 30
 
-    def get_value(self, date):
-        income = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                             self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                                             sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
-                                                             currency=bank_relations.CURRENCY_TYPE.PREMIUM).aggregate(income=django_models.Sum('amount'))['income']
-        if income is None:
-            return 0
+    def get_values(self, dates):
+        invoices = sources.xsolla_invoices()
 
-        return income
+        return [sum([amount for created_at, recipient_id, amount in invoices.select(*self.date_interval(date=date, days=-self.PERIOD))], 0)
+                for date in dates]
 
 
 _FORUM_GROUPS = [relations.RECORD_TYPE.INCOME_FROM_FORUM,
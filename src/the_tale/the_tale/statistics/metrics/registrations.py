@@ -7,11 +7,11 @@ smart_imports.all()
 class RegistrationsCompleted(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.REGISTRATIONS_COMPLETED
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'accounts'
 
     def initialize(self):
         super(RegistrationsCompleted, self).initialize()
-        registrations_dates = accounts_prototypes.AccountPrototype._db_filter(is_fast=False, is_bot=False).values_list('created_at', flat=True)
-        self.registrations_count = collections.Counter(date.date() for date in registrations_dates)
+        self.registrations_count = collections.Counter(created_at.date() for created_at, account_id, active_end_at, referral_of_id in sources.accounts().records)
 
     def get_value(self, date):
         return self.registrations_count.get(date, 0)
@@ -28,16 +28,19 @@ class RegistrationsCompletedInMonth(RegistrationsCompleted):
 class AccountsTotal(base.BaseMetric):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.REGISTRATIONS_TOTAL
+    SOURCE = 'accounts'
 
     def initialize(self):
         super(AccountsTotal, self).initialize()
 
-        query = accounts_prototypes.AccountPrototype._db_filter(is_fast=False, is_bot=False)
+        accounts = sources.accounts()
 
-        count = query.filter(self.db_date_lt('created_at')).count()
+        free_datetime = base.as_datetime(self.free_date)
 
-        registrations_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        registrations_count = collections.Counter(date.date() for date in registrations_dates)
+        count = accounts.position_before(free_datetime)
+
+        registrations_count = collections.Counter(created_at.date()
+                                                  for created_at, account_id, active_end_at, referral_of_id in accounts.select(free_datetime, datetime.datetime.max))
 
         self.counts = {}
         for date in utils_logic.days_range(*self._get_interval()):
@@ -51,6 +54,7 @@ class AccountsTotal(base.BaseMetric):
 class RegistrationsTries(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.REGISTRATIONS_TRIES
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'accounts'
 
     def initialize(self):
         super(RegistrationsTries, self).initialize()
@@ -89,14 +93,20 @@ class RegistrationsCompletedPercentsInMonth(RegistrationsCompletedPercents):
                relations.RECORD_TYPE.REGISTRATIONS_TRIES_IN_MONTH]
 
 
+def referrals_count():
+    return collections.Counter(created_at.date()
+                               for created_at, account_id, active_end_at, referral_of_id in sources.accounts().records
+                               if referral_of_id is not None)
+
+
 class Referrals(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.REFERRALS
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'accounts'
 
     def initialize(self):
         super(Referrals, self).initialize()
-        referrals_dates = accounts_prototypes.AccountPrototype._db_filter(is_fast=False, is_bot=False).exclude(referral_of=None).values_list('created_at', flat=True)
-        self.referrals_count = collections.Counter(date.date() for date in referrals_dates)
+        self.referrals_count = referrals_count()
 
     def get_value(self, date):
         return self.referrals_count.get(date, 0)
@@ -113,17 +123,17 @@ class ReferralsInMonth(Referrals):
 class ReferralsTotal(base.BaseMetric):
     TYPE = relations.RECORD_TYPE.REFERRALS_TOTAL
     FULL_CLEAR_RECUIRED = True
+    SOURCE = 'accounts'
 
     def initialize(self):
         super(ReferralsTotal, self).initialize()
-        referrals_dates = accounts_prototypes.AccountPrototype._db_filter(is_fast=False, is_bot=False).exclude(referral_of=None).values_list('created_at', flat=True)
-        referrals_count = collections.Counter(date.date() for date in referrals_dates)
+        counts_by_dates = referrals_count()
 
         self.counts = {}
 
         count = 0
         for date in utils_logic.days_range(*self._get_interval()):
-            count += referrals_count.get(date, 0)
+            count += counts_by_dates.get(date, 0)
             self.counts[date] = count
 
     def get_value(self, date):
@@ -0,0 +1,102 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+# data of source tables, loaded once and shared between metrics, completed in the same process
+
+ACCEPTED_INVOICE_FILTER = django_models.Q(state=bank_relations.INVOICE_STATE.CONFIRMED) | django_models.Q(state=bank_relations.INVOICE_STATE.FORCED)
+
+_CACHE = {}
+
+
+def cached(loader):
+
+    @functools.wraps(loader)
+    def wrapper():
+        if loader.__name__ not in _CACHE:
+            _CACHE[loader.__name__] = loader()
+
+        return _CACHE[loader.__name__]
+
+    return wrapper
+
+
+def reset():
+    _CACHE.clear()
+
+
+class Records:
+    '''
+    records, sorted by time (the first element of record)
+    '''
+    __slots__ = ('records', 'times')
+
+    def __init__(self, records):
+        self.records = records
+        self.times = [record[0] for record in records]
+
+    def __len__(self):
+        return len(self.records)
+
+    def position_before(self, upper):
+        return bisect.bisect_left(self.times, upper)
+
+    def select(self, lower, upper):
+        '''
+        records in interval, both bounds are excluded
+        '''
+        return self.records[bisect.bisect_right(self.times, lower):bisect.bisect_left(self.times, upper)]
+
+    def select_before(self, upper):
+        return self.records[:self.position_before(upper)]
+
+
+def daily_counts(query, field='created_at'):
+    rows = query.order_by().annotate(day=django_functions.TruncDate(field)).values('day').annotate(count=django_models.Count('id')).values_list('day', 'count')
+    return collections.Counter(dict(rows))
+
+
+@cached
+def accounts():
+    '''
+    (created_at, id, active_end_at, referral_of_id) of real accounts
+    '''
+    query = accounts_prototypes.AccountPrototype._db_filter(is_fast=False, is_bot=False)
+    return Records(list(query.order_by('created_at').values_list('created_at', 'id', 'active_end_at', 'referral_of_id')))
+
+
+@cached
+def xsolla_invoices():
+    '''
+    (created_at, recipient_id, amount) of accepted payments
+    '''
+    query = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
+                                                        sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
+                                                        currency=bank_relations.CURRENCY_TYPE.PREMIUM)
+    return Records(list(query.order_by('created_at').values_list('created_at', 'recipient_id', 'amount')))
+
+
+@cached
+def xsolla_invoices_by_recipients():
+    '''
+    recipient_id -> Records((created_at, amount))
+    '''
+    invoices = {}
+
+    for created_at, recipient_id, amount in xsolla_invoices().records:
+        invoices.setdefault(recipient_id, []).append((created_at, amount))
+
+    return {recipient_id: Records(records) for recipient_id, records in invoices.items()}
+
+
+@cached
+def game_logic_invoices():
+    '''
+    (created_at, operation_uid, amount) of accepted purchases in game
+    '''
+    query = bank_prototypes.InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
+                                                        sender_type=bank_relations.ENTITY_TYPE.GAME_LOGIC,
+                                                        currency=bank_relations.CURRENCY_TYPE.PREMIUM)
+    return Records(list(query.order_by('created_at').values_list('created_at', 'operation_uid', 'amount')))
@@ -11,7 +11,7 @@ class RecordPrototype(utils_prototypes.BasePrototype):
     _get_by = ()
 
     @classmethod
-    def create(cls, type, date, value_int=None, value_float=None):
+    def _normalize_values(cls, type, value_int, value_float):
 
         if value_int is None and value_float is None:
             raise exceptions.ValueNotSpecifiedError()
@@ -26,6 +26,13 @@ class RecordPrototype(utils_prototypes.BasePrototype):
                 raise exceptions.ValueNotSpecifiedForTypeError(type=type)
             value_float = float(value_int)
 
+        return value_int, value_float
+
+    @classmethod
+    def create(cls, type, date, value_int=None, value_float=None):
+
+        value_int, value_float = cls._normalize_values(type, value_int, value_float)
+
         model = cls._model_class.objects.create(date=date,
                                                 type=type,
                                                 value_int=value_int,
@@ -33,6 +40,25 @@ class RecordPrototype(utils_prototypes.BasePrototype):
 
         return cls(model=model)
 
+    @classmethod
+    def create_many(cls, type, values):
+        '''
+        values: [(date, value)], value is interpreted according to value type of record
+        '''
+
+        records = []
+
+        for date, value in values:
+            value_int, value_float = cls._normalize_values(type,
+                                                           value_int=value if type.value_type.is_INT else None,
+                                                           value_float=value if type.value_type.is_FLOAT else None)
+            records.append(cls._model_class(date=date,
+                                            type=type,
+                                            value_int=value_int,
+                                            value_float=value_float))
+
+        cls._model_class.objects.bulk_create(records, batch_size=conf.settings.RECORDS_BATCH_SIZE)
+
     @classmethod
     def remove_by_type(cls, type):
         cls._db_filter(type=type).delete()
@@ -0,0 +1,44 @@
+
+import smart_imports
+
+smart_imports.all()
+
+
+class SplitMetricsTests(utils_testcase.TestCase):
+
+    def test_split(self):
+        groups, combinations = logic.split_metrics([statistics_metrics_forum.Posts,
+                                                    statistics_metrics_bills.Bills,
+                                                    statistics_metrics_forum.PostsPerThreadInMonth,
+                                                    statistics_metrics_forum.Threads,
+                                                    statistics_metrics_lifetime.Lifetime,
+                                                    statistics_metrics_lifetime.AliveAfterDay])
+
+        self.assertEqual(groups, [[statistics_metrics_forum.Posts, statistics_metrics_forum.Threads],
+                                  [statistics_metrics_bills.Bills],
+                                  [statistics_metrics_lifetime.Lifetime, statistics_metrics_lifetime.AliveAfterDay]])
+
+        self.assertEqual(combinations, [statistics_metrics_forum.PostsPerThreadInMonth])
+
+    def test_split__no_source(self):
+        groups, combinations = logic.split_metrics([helpers.TestMetric])
+
+        self.assertEqual(groups, [[helpers.TestMetric]])
+        self.assertEqual(combinations, [])
+
+
+class CompleteMetricsTests(utils_testcase.TestCase):
+
+    def test_complete_metrics(self):
+        with mock.patch('the_tale.statistics.metrics.base.BaseMetric._get_interval',
+                        lambda self: (datetime.date(year=6, month=6, day=6), datetime.date(year=6, month=6, day=9))):
+            logic.complete_metrics([helpers.TestMetric], processes=1)
+
+        self.assertEqual(prototypes.RecordPrototype._db_filter(type=helpers.TestMetric.TYPE).count(), 3)
+
+    def test_complete_metrics__sources_reset(self):
+        statistics_metrics_sources._CACHE['accounts'] = mock.Mock()
+
+        logic.complete_metrics([], processes=1)
+
+        self.assertEqual(statistics_metrics_sources._CACHE, {})
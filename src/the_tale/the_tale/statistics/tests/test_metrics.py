@@ -56,13 +56,23 @@ class BaseMetricsTests(utils_testcase.TestCase):
     @mock.patch('the_tale.statistics.metrics.base.BaseMetric._get_interval',
                 lambda self: (datetime.datetime(year=6, month=6, day=6, hour=6), datetime.datetime(year=6, month=6, day=9, hour=6)))
     def test_complete_values(self):
-        with mock.patch('the_tale.statistics.metrics.base.BaseMetric.store_value') as store_value:
+        with mock.patch('the_tale.statistics.metrics.base.BaseMetric.store_values') as store_values:
             self.metric.complete_values()
 
-        self.assertEqual(store_value.call_args_list,
-                         [mock.call(datetime.date(year=6, month=6, day=6), 1),
-                          mock.call(datetime.date(year=6, month=6, day=7), 2),
-                          mock.call(datetime.date(year=6, month=6, day=8), 3)])
+        self.assertEqual(store_values.call_args_list,
+                         [mock.call([(datetime.date(year=6, month=6, day=6), 1),
+                                     (datetime.date(year=6, month=6, day=7), 2),
+                                     (datetime.date(year=6, month=6, day=8), 3)])])
+
+    def test_store_values(self):
+        self.metric.store_values([(datetime.datetime(year=6, month=6, day=6), 1),
+                                  (datetime.datetime(year=6, month=6, day=7), 2)])
+
+        self.assertEqual(prototypes.RecordPrototype.select(type=helpers.TestMetric.TYPE,
+                                                           date_from=datetime.datetime(year=6, month=6, day=1),
+                                                           date_to=datetime.datetime(year=6, month=6, day=10)),
+                         [(datetime.datetime(year=6, month=6, day=6), 1),
+                          (datetime.datetime(year=6, month=6, day=7), 2)])
 
     def test_complete_values__block_second_time(self):
         self.metric.complete_values()
@@ -126,3 +136,312 @@ class BaseMetricsTests(utils_testcase.TestCase):
         with mock.patch('the_tale.statistics.metrics.base.BaseMetric.db_date_interval') as db_date_interval:
             self.metric.db_date_day('x', date=self.date)
         self.assertEqual(db_date_interval.call_args_list, [mock.call('x', date=self.date, days=0)])
+
+    def test_date_interval(self):
+        free_datetime = datetime.datetime.combine(self.metric.free_date, datetime.time())
+
+        self.assertEqual(self.metric.date_interval(days=10),
+                         (free_datetime, free_datetime + datetime.timedelta(days=10)))
+        self.assertEqual(self.metric.date_interval(days=-10),
+                         (free_datetime + datetime.timedelta(days=-9), free_datetime + datetime.timedelta(days=1)))
+        self.assertEqual(self.metric.date_interval(days=0),
+                         (free_datetime, free_datetime + datetime.timedelta(days=1)))
+
+    def test_date_interval__with_date(self):
+        self.assertEqual(self.metric.date_interval(days=-10, date=self.date),
+                         (self.date + datetime.timedelta(days=-9), self.date + datetime.timedelta(days=1)))
+
+
+class RecordsTests(utils_testcase.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.records = statistics_metrics_sources.Records([(datetime.datetime(year=6, month=6, day=day), day) for day in (1, 2, 2, 5)])
+
+    def test_select(self):
+        self.assertEqual(self.records.select(datetime.datetime(year=6, month=6, day=1), datetime.datetime(year=6, month=6, day=5)),
+                         [(datetime.datetime(year=6, month=6, day=2), 2),
+                          (datetime.datetime(year=6, month=6, day=2), 2)])
+
+        self.assertEqual(self.records.select(datetime.datetime(year=6, month=6, day=5), datetime.datetime(year=6, month=6, day=10)), [])
+
+    def test_select_before(self):
+        self.assertEqual(self.records.select_before(datetime.datetime(year=6, month=6, day=2)),
+                         [(datetime.datetime(year=6, month=6, day=1), 1)])
+
+
+class MetricsValuesTests(utils_testcase.TestCase):
+    '''
+    values of metrics, calculated from loaded sources, must be equal to values of old per-date queries
+    '''
+
+    BASE = datetime.datetime(year=2020, month=3, day=10)
+
+    def setUp(self):
+        super().setUp()
+
+        game_logic.create_test_map()
+
+        statistics_metrics_sources.reset()
+        self.addCleanup(statistics_metrics_sources.reset)
+
+        timeout = datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT)
+
+        # (created_at, lifetime) of accounts on bounds of days
+        accounts_data = [(self.BASE, datetime.timedelta(days=1)),
+                         (self.BASE - datetime.timedelta(seconds=1), datetime.timedelta(seconds=0)),
+                         (self.BASE + datetime.timedelta(seconds=1), datetime.timedelta(days=7) - datetime.timedelta(seconds=1)),
+                         (self.BASE + datetime.timedelta(days=1) - datetime.timedelta(seconds=1), datetime.timedelta(days=30)),
+                         (self.BASE + datetime.timedelta(hours=12), -datetime.timedelta(hours=1)),
+                         (self.BASE + datetime.timedelta(days=7), datetime.timedelta(days=90)),
+                         (self.BASE - datetime.timedelta(days=29), datetime.timedelta(days=2))]
+
+        self.accounts = []
+
+        for created_at, lifetime in accounts_data:
+            account = self.accounts_factory.create_account()
+            accounts_models.Account.objects.filter(id=account.id).update(created_at=created_at,
+                                                                         active_end_at=created_at + timeout + lifetime)
+            self.accounts.append((account.id, created_at))
+
+        fast_account = self.accounts_factory.create_account(is_fast=True)
+        accounts_models.Account.objects.filter(id=fast_account.id).update(created_at=self.BASE + datetime.timedelta(days=1))
+
+        (account_1_id, account_1_created_at), (account_2_id, _), (account_3_id, _), (account_4_id, account_4_created_at) = self.accounts[:4]
+        account_6_id, account_6_created_at = self.accounts[5]
+
+        # incomes of accounts cross borders of income groups
+        self.create_invoice(account_1_id, account_1_created_at, 100)
+        self.create_invoice(account_1_id, account_1_created_at + datetime.timedelta(days=7) - datetime.timedelta(seconds=1), 450)
+        self.create_invoice(account_1_id, account_1_created_at + datetime.timedelta(days=7), 600)
+        self.create_invoice(account_3_id, self.BASE + datetime.timedelta(days=1), 500)
+        self.create_invoice(account_3_id, self.BASE + datetime.timedelta(days=30), 2000)
+        self.create_invoice(account_4_id, account_4_created_at + datetime.timedelta(days=30), 10000)
+        self.create_invoice(account_6_id, account_6_created_at + datetime.timedelta(days=1) - datetime.timedelta(seconds=1), 1)
+        self.create_invoice(fast_account.id, self.BASE + datetime.timedelta(days=2), 300)
+
+        # not accepted and not xsolla invoices
+        self.create_invoice(account_2_id, self.BASE + datetime.timedelta(days=2), 999, force=False)
+        self.create_invoice(account_2_id, self.BASE + datetime.timedelta(days=1), 777, sender_type=bank_relations.ENTITY_TYPE.GAME_LOGIC)
+
+        self.dates = list(utils_logic.days_range((self.BASE - datetime.timedelta(days=2)).date(),
+                                                 (self.BASE + datetime.timedelta(days=45)).date()))
+
+    def create_invoice(self, recipient_id, created_at, amount, force=True, sender_type=bank_relations.ENTITY_TYPE.XSOLLA):
+        invoice = bank_prototypes.InvoicePrototype.create(recipient_type=bank_relations.ENTITY_TYPE.GAME_ACCOUNT,
+                                                          recipient_id=recipient_id,
+                                                          sender_type=sender_type,
+                                                          sender_id=0,
+                                                          currency=bank_relations.CURRENCY_TYPE.PREMIUM,
+                                                          amount=amount,
+                                                          description_for_sender='test invoice',
+                                                          description_for_recipient='test invoice',
+                                                          operation_uid='test-operation-uid',
+                                                          force=force)
+        bank_models.Invoice.objects.filter(id=invoice.id).update(created_at=created_at)
+
+    def accounts_query(self, *filters):
+        return accounts_prototypes.AccountPrototype._db_filter(*filters, is_fast=False, is_bot=False)
+
+    def invoices_query(self, *filters, **kwargs):
+        return bank_prototypes.InvoicePrototype._db_filter(statistics_metrics_sources.ACCEPTED_INVOICE_FILTER,
+                                                           *filters,
+                                                           sender_type=bank_relations.ENTITY_TYPE.XSOLLA,
+                                                           currency=bank_relations.CURRENCY_TYPE.PREMIUM,
+                                                           **kwargs)
+
+    def accounts_incomes(self, metric, date):
+        accounts_incomes = {}
+
+        for recipient_id, amount in self.invoices_query(metric.db_date_lte('created_at', date=date)).values_list('recipient_id', 'amount'):
+            accounts_incomes[recipient_id] = accounts_incomes.get(recipient_id, 0) + amount
+
+        return accounts_incomes
+
+    def check_values(self, MetricClass, get_value):
+        statistics_metrics_sources.reset()
+
+        metric = MetricClass()
+
+        self.assertEqual(metric.get_values(self.dates), [get_value(metric, date) for date in self.dates])
+
+    def test_arpnu(self):
+
+        def get_value(metric, date):
+            accounts = list(self.accounts_query(metric.db_date_interval('created_at', date=date, days=-metric.PERIOD)).values_list('id', 'created_at'))
+
+            if not accounts:
+                return 0
+
+            total_income = 0
+
+            for account_id, created_at in accounts:
+                income = self.invoices_query(metric.db_date_interval('created_at', date=created_at, days=metric.DAYS),
+                                             recipient_id=account_id).aggregate(income=django_models.Sum('amount'))['income']
+                if income is not None:
+                    total_income += income
+
+            return float(total_income) / len(accounts)
+
+        for MetricClass in (statistics_metrics_monetization.ARPNUWeek,
+                            statistics_metrics_monetization.ARPNUMonth,
+                            statistics_metrics_monetization.ARPNU3Month):
+            self.check_values(MetricClass, get_value)
+
+    def test_ltv(self):
+
+        def get_value(metric, date):
+            accounts_ids = list(self.accounts_query(metric.db_date_interval('created_at', date=date, days=-metric.PERIOD)).values_list('id', flat=True))
+
+            if not accounts_ids:
+                return 0
+
+            total_income = self.invoices_query(recipient_id__in=accounts_ids).aggregate(income=django_models.Sum('amount'))['income']
+
+            if total_income is None:
+                return 0
+
+            return float(total_income) / len(accounts_ids)
+
+        self.check_values(statistics_metrics_monetization.LTV, get_value)
+
+    def check_days_before_payment(self):
+
+        def get_value(metric, date):
+            query = self.accounts_query(metric.db_date_interval('created_at', date=date, days=-metric.PERIOD),
+                                        metric.db_date_gte('created_at', date=statistics_conf.settings.PAYMENTS_START_DATE.date()))
+            accounts = dict(query.values_list('id', 'created_at'))
+
+            invoices = list(self.invoices_query(recipient_id__in=list(accounts.keys())).values_list('created_at', 'recipient_id'))
+
+            accounts_ids = [recipient_id for created_at, recipient_id in invoices]
+
+            if not accounts_ids:
+                return 0
+
+            delays = {account_id: min(created_at - accounts[account_id]
+                                      for created_at, recipient_id in invoices
+                                      if recipient_id == account_id)
+                      for account_id in accounts_ids}
+
+            total_time = functools.reduce(lambda s, v: s + v, delays.values(), datetime.timedelta(seconds=0))
+
+            return float(total_time.total_seconds()) / len(accounts_ids) / (24 * 60 * 60)
+
+        self.check_values(statistics_metrics_monetization.DaysBeforePayment, get_value)
+
+    def test_days_before_payment(self):
+        self.check_days_before_payment()
+
+    def test_days_before_payment__payments_start_date(self):
+        with mock.patch('the_tale.statistics.conf.settings.PAYMENTS_START_DATE', self.BASE):
+            self.check_days_before_payment()
+
+    def test_pu(self):
+
+        def get_value(metric, date):
+            return self.invoices_query(metric.db_date_lte('created_at', date=date)).values_list('recipient_id').order_by('recipient_id').distinct().count()
+
+        self.check_values(statistics_metrics_monetization.PU, get_value)
+
+    def test_income_groups(self):
+
+        def get_value(metric, date):
+            return len([True
+                        for amount in self.accounts_incomes(metric, date).values()
+                        if metric.BORDERS[0] < amount <= metric.BORDERS[1]])
+
+        for MetricClass in (statistics_metrics_monetization.IncomeGroup0_500,
+                            statistics_metrics_monetization.IncomeGroup500_1000,
+                            statistics_metrics_monetization.IncomeGroup1000_2500,
+                            statistics_metrics_monetization.IncomeGroup2500_10000,
+                            statistics_metrics_monetization.IncomeGroup10000):
+            self.check_values(MetricClass, get_value)
+
+    def test_income_groups_incomes(self):
+
+        def get_value(metric, date):
+            return sum([amount
+                        for amount in self.accounts_incomes(metric, date).values()
+                        if metric.BORDERS[0] < amount <= metric.BORDERS[1]], 0)
+
+        for MetricClass in (statistics_metrics_monetization.IncomeGroupIncome0_500,
+                            statistics_metrics_monetization.IncomeGroupIncome500_1000,
+                            statistics_metrics_monetization.IncomeGroupIncome1000_2500,
+                            statistics_metrics_monetization.IncomeGroupIncome2500_10000,
+                            statistics_metrics_monetization.IncomeGroupIncome10000):
+            self.check_values(MetricClass, get_value)
+
+    def test_revenue(self):
+
+        def get_value(metric, date):
+            income = self.invoices_query(metric.db_date_interval('created_at', date=date, days=-metric.PERIOD)).aggregate(income=django_models.Sum('amount'))['income']
+            return income if income is not None else 0
+
+        self.check_values(statistics_metrics_monetization.Revenue, get_value)
+
+    def accounts_lifetimes(self, metric, date, delta):
+        return [active_end_at - created_at - delta
+                for active_end_at, created_at in self.accounts_query(metric.db_date_day('created_at', date=date)).values_list('active_end_at', 'created_at')]
+
+    def test_alive_after(self):
+
+        def get_value(metric, date):
+            timeout = datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT)
+            return len([True for lifetime in self.accounts_lifetimes(metric, date, timeout) if lifetime.days >= metric.DAYS])
+
+        for MetricClass in (statistics_metrics_lifetime.AliveAfter0,
+                            statistics_metrics_lifetime.AliveAfterDay,
+                            statistics_metrics_lifetime.AliveAfterWeek,
+                            statistics_metrics_lifetime.AliveAfterMonth,
+                            statistics_metrics_lifetime.AliveAfter3Month):
+            self.check_values(MetricClass, get_value)
+
+    def test_lifetime(self):
+
+        def get_value(metric, date):
+            timeout = datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT - 1)
+            lifetimes = [lifetime for lifetime in self.accounts_lifetimes(metric, date, timeout) if lifetime > datetime.timedelta(seconds=0)]
+
+            if not lifetimes:
+                return 0
+
+            total_time = functools.reduce(lambda s, v: s + v, lifetimes, datetime.timedelta(seconds=0))
+            return float(total_time.total_seconds() / (24 * 60 * 60)) / len(lifetimes)
+
+        self.check_values(statistics_metrics_lifetime.Lifetime, get_value)
+
+    def test_lifetime_percent(self):
+
+        def get_value(metric, date):
+            timeout = datetime.timedelta(seconds=accounts_conf.settings.ACTIVE_STATE_TIMEOUT)
+            lifetimes = self.accounts_lifetimes(metric, date, timeout)
+
+            if not lifetimes:
+                return 0
+
+            total_time = functools.reduce(lambda s, v: s + v, lifetimes, datetime.timedelta(seconds=0))
+            lifetime = float(total_time.total_seconds()) / len(lifetimes)
+            maximum = (datetime.datetime.now().date() - date).total_seconds()
+            return lifetime / maximum * 100
+
+        self.check_values(statistics_metrics_lifetime.LifetimePercent, get_value)
+
+    def test_accounts_total(self):
+        for last_datetime in (self.BASE - datetime.timedelta(days=1),
+                              self.BASE,
+                              self.BASE + datetime.timedelta(days=1)):
+            statistics_metrics_sources.reset()
+
+            with mock.patch('the_tale.statistics.metrics.base.BaseMetric._last_datetime', lambda self: last_datetime):
+                metric = statistics_metrics_registrations.AccountsTotal()
+                metric.initialize()
+
+            count = self.accounts_query(metric.db_date_lt('created_at')).count()
+
+            registrations_count = collections.Counter(created_at.date()
+                                                      for created_at in self.accounts_query(metric.db_date_gte('created_at')).values_list('created_at', flat=True))
+
+            for date in utils_logic.days_range(metric.free_date, (self.BASE + datetime.timedelta(days=45)).date()):
+                count += registrations_count.get(date, 0)
+                self.assertEqual(metric.get_value(date), count)
@@ -25,6 +25,16 @@ class PrototypeTests(utils_testcase.TestCase):
         self.assertEqual(record.value_int, 666)
         self.assertEqual(record.value_float, 666.6)
 
+    def test_create_many(self):
+
+        with self.check_delta(prototypes.RecordPrototype._db_count, 2):
+            prototypes.RecordPrototype.create_many(type=relations.RECORD_TYPE.TEST_FLOAT,
+                                                   values=[(self.date, 666.6),
+                                                           (self.date + self.timedelta, 1.5)])
+
+        self.assertEqual(list(prototypes.RecordPrototype._db_all().order_by('date').values_list('value_int', 'value_float')),
+                         [(666, 666.6), (1, 1.5)])
+
     def test_create__values_not_specified(self):
         self.assertRaises(exceptions.ValueNotSpecifiedError, prototypes.RecordPrototype.create, type=relations.RECORD_TYPE.TEST_INT, date=self.date)
 
@@ -77,6 +77,25 @@ async def rollback_transaction(message, **kwargs):
     return bank_pb2.RollbackTransactionResponse()
 
 
+@handlers.protobuf_api(bank_pb2.ChangeBalancesRequest)
+async def change_balances(message, **kwargs):
+    logger = log.ContextLogger()
+
+    try:
+        transaction_id = await operations.change_balances(operations=[protobuf.to_operation(operation)
+                                                                      for operation in message.operations],
+                                                          restrictions=protobuf.to_restrictions(message.restrictions),
+                                                          logger=logger)
+
+    except exceptions.NoOperationsInTransaction as e:
+        raise tt_exceptions.ApiError(code='bank.change_balances.no_operations_specified', message=str(e))
+
+    except exceptions.BalanceChangeExceededRestrictions as e:
+        raise tt_exceptions.ApiError(code='bank.change_balances.restrictions_exceeded', message=str(e))
+
+    return bank_pb2.ChangeBalancesResponse(transaction_id=transaction_id)
+
+
 @handlers.protobuf_api(bank_pb2.DebugClearServiceRequest)
 async def debug_clear_service(message, **kwargs):
     await operations.clean_database()
@@ -176,6 +176,99 @@ async def _save_operation(execute, transaction_id, operation, logger):
                 operation.description)
 
 
+async def change_balances(operations, restrictions, logger):
+
+    if not operations:
+        raise exceptions.NoOperationsInTransaction()
+
+    arguments = {'operations': operations,
+                 'restrictions': restrictions,
+                 'logger': logger}
+
+    return await db.transaction(_change_balances, arguments)
+
+
+def _group_changes(operations):
+    changes = {}
+
+    for operation in operations:
+        key = (operation.account_id, operation.currency)
+        changes[key] = changes.get(key, 0) + operation.amount
+
+    # balances are locked in the same order by all requests, so concurrent requests can not deadlock
+    return sorted(changes.items())
+
+
+async def _change_balances(execute, arguments):
+    operations = arguments['operations']
+    restrictions = arguments['restrictions']
+    logger = arguments['logger']
+
+    changes = _group_changes(operations)
+
+    accounts_ids = [account_id for (account_id, currency), amount in changes]
+    currencies = [currency for (account_id, currency), amount in changes]
+
+    results = await execute('''INSERT INTO transactions (state, lifetime, data, created_at, updated_at)
+                               VALUES (%(state)s, %(lifetime)s, %(data)s, NOW(), NOW())
+                               RETURNING id''',
+                            {'state': relations.TRANSACTION_STATE.COMMITED.value,
+                             'data': PGJson({'restrictions': restrictions.serialize()}),
+                             'lifetime': datetime.timedelta(seconds=0)})
+
+    transaction_id = results[0]['id']
+
+    logger.info('try to change balances in transaction %s', transaction_id)
+
+    await execute('''INSERT INTO accounts (account, currency, amount, created_at, updated_at)
+                     SELECT account, currency, 0, NOW(), NOW()
+                     FROM unnest(%(accounts_ids)s, %(currencies)s) AS changes(account, currency)
+                     ORDER BY account, currency
+                     ON CONFLICT DO NOTHING''',
+                  {'accounts_ids': accounts_ids,
+                   'currencies': currencies})
+
+    results = await execute('''SELECT accounts.account, accounts.currency, accounts.amount
+                               FROM accounts
+                               JOIN unnest(%(accounts_ids)s, %(currencies)s) AS changes(account, currency)
+                                 ON accounts.account = changes.account AND accounts.currency = changes.currency
+                               ORDER BY accounts.account, accounts.currency
+                               FOR UPDATE OF accounts''',
+                            {'accounts_ids': accounts_ids,
+                             'currencies': currencies})
+
+    balances = {(row['account'], row['currency']): row['amount'] for row in results}
+
+    new_balances = [_validate_amount(balances[key] + amount, restrictions) for key, amount in changes]
+
+    await execute('''UPDATE accounts
+                     SET amount=changes.amount,
+                         updated_at=NOW()
+                     FROM unnest(%(accounts_ids)s, %(currencies)s, %(amounts)s) AS changes(account, currency, amount)
+                     WHERE accounts.account = changes.account AND accounts.currency = changes.currency''',
+                  {'accounts_ids': accounts_ids,
+                   'currencies': currencies,
+                   'amounts': new_balances})
+
+    for ((account_id, currency), amount), new_balance in zip(changes, new_balances):
+        _log_balance_changed(logger, account_id, currency, amount, new_balance, tag='bulk change')
+
+    await execute('''INSERT INTO operations (transaction, account, currency, amount, type, description, created_at)
+                     SELECT %(transaction)s, account, currency, amount, type, description, NOW()
+                     FROM unnest(%(accounts_ids)s, %(currencies)s, %(amounts)s, %(types)s::text[], %(descriptions)s::text[])
+                          AS operations(account, currency, amount, type, description)''',
+                  {'transaction': transaction_id,
+                   'accounts_ids': [operation.account_id for operation in operations],
+                   'currencies': [operation.currency for operation in operations],
+                   'amounts': [operation.amount for operation in operations],
+                   'types': [operation.type for operation in operations],
+                   'descriptions': [operation.description for operation in operations]})
+
+    logger.info('balances changed in transaction %s, operations: %s', transaction_id, len(operations))
+
+    return transaction_id
+
+
 async def rollback_transaction(transaction_id, logger):
     arguments = {'transaction_id': transaction_id,
                  'logger': logger}
@@ -28,6 +28,7 @@ def register_routers(app):
 
     app.router.add_post('/accounts/balances', handlers.accounts_balances)
     app.router.add_post('/accounts/history', handlers.account_history)
+    app.router.add_post('/accounts/change-balances', handlers.change_balances)
 
     app.router.add_post('/transactions/start', handlers.start_transaction)
     app.router.add_post('/transactions/commit', handlers.commit_transaction)
@@ -204,6 +204,54 @@ class StartTransactionTests(Base):
         self.assertEqual(results[0]['data']['restrictions'], restrictions_data)
 
 
+class ChangeBalancesTests(Base):
+
+    @test_utils.unittest_run_loop
+    async def test_no_operations(self):
+        request = await self.client.post('/accounts/change-balances', data=bank_pb2.ChangeBalancesRequest(operations=[]).SerializeToString())
+        await self.check_error(request, error='bank.change_balances.no_operations_specified')
+
+    @test_utils.unittest_run_loop
+    async def test_changed(self):
+        await helpers.call_change_balance(account_id=666, currency=1, amount=1000)
+
+        request = await self.client.post('/accounts/change-balances', data=bank_pb2.ChangeBalancesRequest(operations=TEST_OPERATIONS).SerializeToString())
+        answer = await self.check_success(request, bank_pb2.ChangeBalancesResponse)
+
+        results = await db.sql('SELECT * FROM transactions WHERE id=%(id)s', {'id': answer.transaction_id})
+
+        self.assertEqual(results[0]['state'], relations.TRANSACTION_STATE.COMMITED.value)
+
+        await self.check_balances(accounts_ids={666, 667},
+                                  expected_balances={666: {1: 500}, 667: {1: 200}})
+
+    @test_utils.unittest_run_loop
+    async def test_small_balance(self):
+        request = await self.client.post('/accounts/change-balances', data=bank_pb2.ChangeBalancesRequest(operations=TEST_OPERATIONS).SerializeToString())
+        await self.check_error(request, error='bank.change_balances.restrictions_exceeded')
+
+        results = await db.sql('SELECT * FROM transactions')
+        self.assertEqual(results, [])
+
+        await self.check_balances(accounts_ids={666, 667},
+                                  expected_balances={666: {}, 667: {}})
+
+    @test_utils.unittest_run_loop
+    async def test_restrictions(self):
+        restrictions = s11n.to_json({'hard_minimum': None,
+                                     'hard_maximum': None,
+                                     'soft_minimum': None,
+                                     'soft_maximum': None})
+
+        request = await self.client.post('/accounts/change-balances',
+                                         data=bank_pb2.ChangeBalancesRequest(operations=TEST_OPERATIONS,
+                                                                             restrictions=restrictions).SerializeToString())
+        await self.check_success(request, bank_pb2.ChangeBalancesResponse)
+
+        await self.check_balances(accounts_ids={666, 667},
+                                  expected_balances={666: {1: -500}, 667: {1: 200}})
+
+
 class RollbackTransactionTests(Base):
 
     @test_utils.unittest_run_loop
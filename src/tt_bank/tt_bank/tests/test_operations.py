@@ -450,6 +450,104 @@ class ChangeBalanceTests(Base):
             await helpers.call_change_balance(account_id=666, currency=2, amount=-10)
 
 
+class ChangeBalancesTests(Base):
+
+    async def load_operations(self):
+        return sorted(await load_operations(), key=lambda operation: operation.type)
+
+    @test_utils.unittest_run_loop
+    async def test_no_operations(self):
+        with self.assertRaises(exceptions.NoOperationsInTransaction):
+            await operations.change_balances(operations=[],
+                                             restrictions=objects.Restrictions(),
+                                             logger=helpers.TEST_LOGGER)
+
+    @test_utils.unittest_run_loop
+    async def test_changed(self):
+        await helpers.call_change_balance(account_id=666, currency=1, amount=1000)
+
+        transaction_id = await operations.change_balances(operations=TEST_OPERATIONS,
+                                                          restrictions=objects.Restrictions(),
+                                                          logger=helpers.TEST_LOGGER)
+
+        results = await db.sql('SELECT * FROM transactions WHERE id=%(id)s', {'id': transaction_id})
+
+        self.assertEqual(results[0]['state'], relations.TRANSACTION_STATE.COMMITED.value)
+
+        results = await db.sql('SELECT transaction FROM operations')
+
+        for row in results:
+            self.assertEqual(transaction_id, row['transaction'])
+
+        self.assertEqual(TEST_OPERATIONS, await self.load_operations())
+
+        await self.check_balances(accounts_ids={666, 667},
+                                  expected_balances={666: {1: 500}, 667: {1: 200}})
+
+    @test_utils.unittest_run_loop
+    async def test_multiple_currencies(self):
+        await helpers.call_change_balance(account_id=666, currency=2, amount=10)
+
+        test_operations = [objects.Operation(account_id=666, currency=1, amount=100, type='x.1', description='y.1'),
+                           objects.Operation(account_id=666, currency=2, amount=-3, type='x.2', description='y.2'),
+                           objects.Operation(account_id=667, currency=2, amount=7, type='x.3', description='y.3')]
+
+        await operations.change_balances(operations=test_operations,
+                                         restrictions=objects.Restrictions(),
+                                         logger=helpers.TEST_LOGGER)
+
+        await self.check_balances(accounts_ids={666, 667},
+                                  expected_balances={666: {1: 100, 2: 7}, 667: {2: 7}})
+
+    @test_utils.unittest_run_loop
+    async def test_restrictions_exceeded(self):
+        await helpers.call_change_balance(account_id=666, currency=1, amount=1000)
+
+        test_operations = [objects.Operation(account_id=666, currency=1, amount=-100, type='x.1', description='y.1'),
+                           objects.Operation(account_id=667, currency=1, amount=-1, type='x.2', description='y.2')]
+
+        with self.assertRaises(exceptions.BalanceChangeExceededRestrictions):
+            await operations.change_balances(operations=test_operations,
+                                             restrictions=objects.Restrictions(),
+                                             logger=helpers.TEST_LOGGER)
+
+        results = await db.sql('SELECT * FROM transactions')
+        self.assertEqual(results, [])
+
+        self.assertEqual(await load_operations(), [])
+
+        await self.check_balances(accounts_ids={666, 667},
+                                  expected_balances={666: {1: 1000}, 667: {}})
+
+    @test_utils.unittest_run_loop
+    async def test_restrictions_applied_to_sum_of_changes(self):
+        await helpers.call_change_balance(account_id=666, currency=1, amount=1000)
+
+        test_operations = [objects.Operation(account_id=666, currency=1, amount=-1500, type='x.1', description='y.1'),
+                           objects.Operation(account_id=666, currency=1, amount=1000, type='x.2', description='y.2')]
+
+        await operations.change_balances(operations=test_operations,
+                                         restrictions=objects.Restrictions(soft_maximum=400),
+                                         logger=helpers.TEST_LOGGER)
+
+        await self.check_balance(account_id=666, expected_balance={1: 400})
+
+        self.assertEqual(test_operations, await self.load_operations())
+
+    @test_utils.unittest_run_loop
+    async def test_not_affects_hanged_transactions(self):
+        await helpers.call_change_balance(account_id=666, currency=1, amount=1000)
+
+        await operations.change_balances(operations=TEST_OPERATIONS,
+                                         restrictions=objects.Restrictions(),
+                                         logger=helpers.TEST_LOGGER)
+
+        await operations.rollback_hanged_transactions()
+
+        await self.check_balances(accounts_ids={666, 667},
+                                  expected_balances={666: {1: 500}, 667: {1: 200}})
+
+
 class RollbackTransactionTests(Base):
 
     @test_utils.unittest_run_loop
@@ -44,66 +44,106 @@ async def add_impacts(impacts,
 async def _add_impacts(execute, arguments):
     # order of executed queries and sorting of items in quiries
     # required to prevent blocking with add_impacts and scale_impacts functions
+    #
+    # every table is updated by single query, so rows of batch are aggregated by unique keys of tables,
+    # because ON CONFLICT DO UPDATE can not change the same row twice in one query
 
     impacts = list(arguments['impacts'])
 
+    if not impacts:
+        return
+
     if arguments['log_single_impacts']:
-        for impact in impacts:
-            await _add_impact(execute, impact)
+        await _add_single_impacts(execute, impacts)
 
     if arguments['log_actors_impacts']:
-        impacts.sort(key=lambda impact: (impact.actor.type, impact.actor.id, impact.target.type, impact.target.id))
-
-        for impact in impacts:
-            await _add_actor_impact(execute, impact)
+        await _add_actors_impacts(execute, impacts)
 
     if arguments['log_target_impacts']:
-        impacts.sort(key=lambda impact: (impact.target.type, impact.target.id))
+        await _add_targets_impacts(execute, impacts)
 
-        for impact in impacts:
-            await _add_target_impact(execute, impact)
 
+def _aggregate_impacts(impacts, key):
+    aggregated = {}
 
-async def _add_impact(execute, impact):
-    sql = '''INSERT INTO impacts (actor_type, actor, target_type, target, amount, transaction, created_at_turn, created_at)
-             VALUES (%(actor_type)s, %(actor)s, %(target_type)s, %(target)s, %(amount)s, %(transaction)s, %(turn)s, NOW())'''
+    for impact in impacts:
+        impact_key = key(impact)
+
+        if impact_key in aggregated:
+            amount, turn = aggregated[impact_key]
+            aggregated[impact_key] = (amount + impact.amount, max(turn, impact.turn))
+        else:
+            aggregated[impact_key] = (impact.amount, impact.turn)
 
-    await execute(sql, {'actor_type': impact.actor.type,
-                        'actor': impact.actor.id,
-                        'target_type': impact.target.type,
-                        'target': impact.target.id,
-                        'amount': impact.amount,
-                        'transaction': impact.transaction,
-                        'turn': impact.turn})
+    return sorted(aggregated.items())
 
 
-async def _add_actor_impact(execute, impact):
+async def _add_single_impacts(execute, impacts):
+    sql = '''INSERT INTO impacts (actor_type, actor, target_type, target, amount, transaction, created_at_turn, created_at)
+             SELECT actor_type, actor, target_type, target, amount, transaction, turn, NOW()
+             FROM unnest(%(actors_types)s::integer[],
+                         %(actors)s::bigint[],
+                         %(targets_types)s::integer[],
+                         %(targets)s::bigint[],
+                         %(amounts)s::bigint[],
+                         %(transactions)s::uuid[],
+                         %(turns)s::bigint[]) AS data (actor_type, actor, target_type, target, amount, transaction, turn)'''
+
+    await execute(sql, {'actors_types': [impact.actor.type for impact in impacts],
+                        'actors': [impact.actor.id for impact in impacts],
+                        'targets_types': [impact.target.type for impact in impacts],
+                        'targets': [impact.target.id for impact in impacts],
+                        'amounts': [impact.amount for impact in impacts],
+                        'transactions': [str(impact.transaction) for impact in impacts],
+                        'turns': [impact.turn for impact in impacts]})
+
+
+async def _add_actors_impacts(execute, impacts):
+    rows = _aggregate_impacts(impacts,
+                              key=lambda impact: (impact.actor.type, impact.actor.id, impact.target.type, impact.target.id))
+
     sql = '''INSERT INTO actors_impacts (actor_type, actor, target_type, target, amount, created_at, updated_at, updated_at_turn)
-             VALUES (%(actor_type)s, %(actor)s, %(target_type)s, %(target)s, %(amount)s, NOW(), NOW(), %(turn)s)
+             SELECT actor_type, actor, target_type, target, amount, NOW(), NOW(), turn
+             FROM unnest(%(actors_types)s::integer[],
+                         %(actors)s::bigint[],
+                         %(targets_types)s::integer[],
+                         %(targets)s::bigint[],
+                         %(amounts)s::bigint[],
+                         %(turns)s::bigint[]) WITH ORDINALITY AS data (actor_type, actor, target_type, target, amount, turn, position)
+             ORDER BY position
              ON CONFLICT (actor_type, actor, target_type, target) DO UPDATE
-             SET amount = actors_impacts.amount + %(amount)s,
+             SET amount = actors_impacts.amount + EXCLUDED.amount,
                  updated_at = GREATEST(actors_impacts.updated_at, NOW()),
-                 updated_at_turn = GREATEST(actors_impacts.updated_at_turn, %(turn)s)'''
+                 updated_at_turn = GREATEST(actors_impacts.updated_at_turn, EXCLUDED.updated_at_turn)'''
+
+    await execute(sql, {'actors_types': [key[0] for key, _ in rows],
+                        'actors': [key[1] for key, _ in rows],
+                        'targets_types': [key[2] for key, _ in rows],
+                        'targets': [key[3] for key, _ in rows],
+                        'amounts': [amount for _, (amount, turn) in rows],
+                        'turns': [turn for _, (amount, turn) in rows]})
+
 
-    await execute(sql, {'actor_type': impact.actor.type,
-                        'actor': impact.actor.id,
-                        'target_type': impact.target.type,
-                        'target': impact.target.id,
-                        'amount': impact.amount,
-                        'turn': impact.turn})
+async def _add_targets_impacts(execute, impacts):
+    rows = _aggregate_impacts(impacts,
+                              key=lambda impact: (impact.target.type, impact.target.id))
 
-async def _add_target_impact(execute, impact):
     sql = '''INSERT INTO targets_impacts (target_type, target, amount, created_at, updated_at, updated_at_turn)
-             VALUES (%(target_type)s, %(target)s, %(amount)s, NOW(), NOW(), %(turn)s)
+             SELECT target_type, target, amount, NOW(), NOW(), turn
+             FROM unnest(%(targets_types)s::integer[],
+                         %(targets)s::bigint[],
+                         %(amounts)s::bigint[],
+                         %(turns)s::bigint[]) WITH ORDINALITY AS data (target_type, target, amount, turn, position)
+             ORDER BY position
              ON CONFLICT (target_type, target) DO UPDATE
-             SET amount = targets_impacts.amount + %(amount)s,
+             SET amount = targets_impacts.amount + EXCLUDED.amount,
                  updated_at = GREATEST(targets_impacts.updated_at, NOW()),
-                 updated_at_turn = GREATEST(targets_impacts.updated_at_turn, %(turn)s)'''
+                 updated_at_turn = GREATEST(targets_impacts.updated_at_turn, EXCLUDED.updated_at_turn)'''
 
-    await execute(sql, {'target_type': impact.target.type,
-                        'target': impact.target.id,
-                        'amount': impact.amount,
-                        'turn': impact.turn})
+    await execute(sql, {'targets_types': [key[0] for key, _ in rows],
+                        'targets': [key[1] for key, _ in rows],
+                        'amounts': [amount for _, (amount, turn) in rows],
+                        'turns': [turn for _, (amount, turn) in rows]})
 
 
 async def last_impacts(limit):
@@ -165,6 +165,38 @@ class AddImpactsTests(helpers.BaseTests):
                                                  turn=max(impacts[1].turn, impacts[5].turn, impacts[6].turn, impacts[7].turn),
                                                  time=results[0]['updated_at'].replace(tzinfo=None))]
 
+    @test_utils.unittest_run_loop
+    async def test_queries_number(self):
+        impacts = [helpers.test_impact(actor_type=1, actor_id=i % 3, target_type=100, target_id=i % 5, amount=i)
+                   for i in range(100)]
+
+        queries = []
+
+        async def callback(execute, arguments):
+            async def counted_execute(command, arguments=None):
+                queries.append(command)
+                return await execute(command, arguments)
+
+            await operations._add_impacts(counted_execute, arguments)
+
+        await db.transaction(callback, {'impacts': impacts,
+                                        'log_single_impacts': True,
+                                        'log_actors_impacts': True,
+                                        'log_target_impacts': True})
+
+        self.assertEqual(len(queries), 3)
+
+        results = await db.sql('SELECT * FROM impacts')
+        self.assertEqual(len(results), 100)
+
+        results = await db.sql('SELECT * FROM actors_impacts')
+        self.assertEqual(len(results), 15)
+        self.assertEqual(sum(row['amount'] for row in results), sum(range(100)))
+
+        results = await db.sql('SELECT * FROM targets_impacts')
+        self.assertEqual(len(results), 5)
+        self.assertEqual(sum(row['amount'] for row in results), sum(range(100)))
+
     @test_utils.unittest_run_loop
     async def test_concurrent_updates(self):
         impacts_bundles = []
@@ -717,6 +749,38 @@ class ScaleImpactsTests(helpers.BaseTests):
         await self.check_scale(target_types=[2], scale=0.5)
         await self.check_scale(target_types=[2], scale=10)
 
+    @test_utils.unittest_run_loop
+    async def test_queries_number(self):
+        impacts = [helpers.test_impact(actor_type=1, actor_id=i % 3, target_type=100, target_id=i % 5, amount=i)
+                   for i in range(100)]
+
+        queries = []
+
+        async def callback(execute, arguments):
+            async def counted_execute(command, arguments=None):
+                queries.append(command)
+                return await execute(command, arguments)
+
+            await operations._add_impacts(counted_execute, arguments)
+
+        await db.transaction(callback, {'impacts': impacts,
+                                        'log_single_impacts': True,
+                                        'log_actors_impacts': True,
+                                        'log_target_impacts': True})
+
+        self.assertEqual(len(queries), 3)
+
+        results = await db.sql('SELECT * FROM impacts')
+        self.assertEqual(len(results), 100)
+
+        results = await db.sql('SELECT * FROM actors_impacts')
+        self.assertEqual(len(results), 15)
+        self.assertEqual(sum(row['amount'] for row in results), sum(range(100)))
+
+        results = await db.sql('SELECT * FROM targets_impacts')
+        self.assertEqual(len(results), 5)
+        self.assertEqual(sum(row['amount'] for row in results), sum(range(100)))
+
     @test_utils.unittest_run_loop
     async def test_concurrent_updates(self):
         impacts_bundles = []
@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\nbank.proto\x12\x04\x62\x61nk\"d\n\tOperation\x12\x12\n\naccount_id\x18\x01 \x01(\r\x12\x10\n\x08\x63urrency\x18\x02 \x01(\x05\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x05\x12\x0c\n\x04type\x18\x04 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\"Z\n\rHistoryRecord\x12\x12\n\ncreated_at\x18\x01 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x02 \x01(\x05\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x05\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\"h\n\x08\x42\x61lances\x12,\n\x07\x61mounts\x18\x01 \x03(\x0b\x32\x1b.bank.Balances.AmountsEntry\x1a.\n\x0c\x41mountsEntry\x12\x0b\n\x03key\x18\x01 \x01(\x05\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"/\n\x17\x41\x63\x63ountsBalancesRequest\x12\x14\n\x0c\x61\x63\x63ounts_ids\x18\x01 \x03(\r\"\x9b\x01\n\x18\x41\x63\x63ountsBalancesResponse\x12>\n\x08\x62\x61lances\x18\x01 \x03(\x0b\x32,.bank.AccountsBalancesResponse.BalancesEntry\x1a?\n\rBalancesEntry\x12\x0b\n\x03key\x18\x01 \x01(\r\x12\x1d\n\x05value\x18\x02 \x01(\x0b\x32\x0e.bank.Balances:\x02\x38\x01\"+\n\x15\x41\x63\x63ountHistoryRequest\x12\x12\n\naccount_id\x18\x01 \x01(\r\">\n\x16\x41\x63\x63ountHistoryResponse\x12$\n\x07history\x18\x01 \x03(\x0b\x32\x13.bank.HistoryRecord\"z\n\x17StartTransactionRequest\x12#\n\noperations\x18\x01 \x03(\x0b\x32\x0f.bank.Operation\x12\x10\n\x08lifetime\x18\x02 \x01(\x01\x12\x12\n\nautocommit\x18\x03 \x01(\x08\x12\x14\n\x0crestrictions\x18\x04 \x01(\t\"2\n\x18StartTransactionResponse\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x04\"2\n\x18\x43ommitTransactionRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x04\"\x1b\n\x19\x43ommitTransactionResponse\"4\n\x1aRollbackTransactionRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x04\"\x1d\n\x1bRollbackTransactionResponse\"\x1a\n\x18\x44\x65\x62ugClearServiceRequest\"\x1b\n\x19\x44\x65\x62ugClearServiceResponseb\x06proto3'
+  serialized_pb=b'\n\nbank.proto\x12\x04\x62\x61nk\"d\n\tOperation\x12\x12\n\naccount_id\x18\x01 \x01(\r\x12\x10\n\x08\x63urrency\x18\x02 \x01(\x05\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x05\x12\x0c\n\x04type\x18\x04 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\"Z\n\rHistoryRecord\x12\x12\n\ncreated_at\x18\x01 \x01(\x01\x12\x10\n\x08\x63urrency\x18\x02 \x01(\x05\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x05\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\"h\n\x08\x42\x61lances\x12,\n\x07\x61mounts\x18\x01 \x03(\x0b\x32\x1b.bank.Balances.AmountsEntry\x1a.\n\x0c\x41mountsEntry\x12\x0b\n\x03key\x18\x01 \x01(\x05\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"/\n\x17\x41\x63\x63ountsBalancesRequest\x12\x14\n\x0c\x61\x63\x63ounts_ids\x18\x01 \x03(\r\"\x9b\x01\n\x18\x41\x63\x63ountsBalancesResponse\x12>\n\x08\x62\x61lances\x18\x01 \x03(\x0b\x32,.bank.AccountsBalancesResponse.BalancesEntry\x1a?\n\rBalancesEntry\x12\x0b\n\x03key\x18\x01 \x01(\r\x12\x1d\n\x05value\x18\x02 \x01(\x0b\x32\x0e.bank.Balances:\x02\x38\x01\"+\n\x15\x41\x63\x63ountHistoryRequest\x12\x12\n\naccount_id\x18\x01 \x01(\r\">\n\x16\x41\x63\x63ountHistoryResponse\x12$\n\x07history\x18\x01 \x03(\x0b\x32\x13.bank.HistoryRecord\"z\n\x17StartTransactionRequest\x12#\n\noperations\x18\x01 \x03(\x0b\x32\x0f.bank.Operation\x12\x10\n\x08lifetime\x18\x02 \x01(\x01\x12\x12\n\nautocommit\x18\x03 \x01(\x08\x12\x14\n\x0crestrictions\x18\x04 \x01(\t\"2\n\x18StartTransactionResponse\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x04\"2\n\x18\x43ommitTransactionRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x04\"\x1b\n\x19\x43ommitTransactionResponse\"4\n\x1aRollbackTransactionRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x04\"\x1d\n\x1bRollbackTransactionResponse\"R\n\x15\x43hangeBalancesRequest\x12#\n\noperations\x18\x01 \x03(\x0b\x32\x0f.bank.Operation\x12\x14\n\x0crestrictions\x18\x02 \x01(\t\"0\n\x16\x43hangeBalancesResponse\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x04\"\x1a\n\x18\x44\x65\x62ugClearServiceRequest\"\x1b\n\x19\x44\x65\x62ugClearServiceResponseb\x06proto3'
 )
 
 
@@ -573,6 +573,77 @@ _ROLLBACKTRANSACTIONRESPONSE = _descriptor.Descriptor(
 )
 
 
+_CHANGEBALANCESREQUEST = _descriptor.Descriptor(
+  name='ChangeBalancesRequest',
+  full_name='bank.ChangeBalancesRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='operations', full_name='bank.ChangeBalancesRequest.operations', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='restrictions', full_name='bank.ChangeBalancesRequest.restrictions', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=978,
+  serialized_end=1060,
+)
+
+
+_CHANGEBALANCESRESPONSE = _descriptor.Descriptor(
+  name='ChangeBalancesResponse',
+  full_name='bank.ChangeBalancesResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='transaction_id', full_name='bank.ChangeBalancesResponse.transaction_id', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1062,
+  serialized_end=1110,
+)
+
+
 _DEBUGCLEARSERVICEREQUEST = _descriptor.Descriptor(
   name='DebugClearServiceRequest',
   full_name='bank.DebugClearServiceRequest',
@@ -593,8 +664,8 @@ _DEBUGCLEARSERVICEREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=978,
-  serialized_end=1004,
+  serialized_start=1112,
+  serialized_end=1138,
 )
 
 
@@ -618,8 +689,8 @@ _DEBUGCLEARSERVICERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1006,
-  serialized_end=1033,
+  serialized_start=1140,
+  serialized_end=1167,
 )
 
 _BALANCES_AMOUNTSENTRY.containing_type = _BALANCES
@@ -629,6 +700,7 @@ _ACCOUNTSBALANCESRESPONSE_BALANCESENTRY.containing_type = _ACCOUNTSBALANCESRESPO
 _ACCOUNTSBALANCESRESPONSE.fields_by_name['balances'].message_type = _ACCOUNTSBALANCESRESPONSE_BALANCESENTRY
 _ACCOUNTHISTORYRESPONSE.fields_by_name['history'].message_type = _HISTORYRECORD
 _STARTTRANSACTIONREQUEST.fields_by_name['operations'].message_type = _OPERATION
+_CHANGEBALANCESREQUEST.fields_by_name['operations'].message_type = _OPERATION
 DESCRIPTOR.message_types_by_name['Operation'] = _OPERATION
 DESCRIPTOR.message_types_by_name['HistoryRecord'] = _HISTORYRECORD
 DESCRIPTOR.message_types_by_name['Balances'] = _BALANCES
@@ -642,6 +714,8 @@ DESCRIPTOR.message_types_by_name['CommitTransactionRequest'] = _COMMITTRANSACTIO
 DESCRIPTOR.message_types_by_name['CommitTransactionResponse'] = _COMMITTRANSACTIONRESPONSE
 DESCRIPTOR.message_types_by_name['RollbackTransactionRequest'] = _ROLLBACKTRANSACTIONREQUEST
 DESCRIPTOR.message_types_by_name['RollbackTransactionResponse'] = _ROLLBACKTRANSACTIONRESPONSE
+DESCRIPTOR.message_types_by_name['ChangeBalancesRequest'] = _CHANGEBALANCESREQUEST
+DESCRIPTOR.message_types_by_name['ChangeBalancesResponse'] = _CHANGEBALANCESRESPONSE
 DESCRIPTOR.message_types_by_name['DebugClearServiceRequest'] = _DEBUGCLEARSERVICEREQUEST
 DESCRIPTOR.message_types_by_name['DebugClearServiceResponse'] = _DEBUGCLEARSERVICERESPONSE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
@@ -753,6 +827,20 @@ RollbackTransactionResponse = _reflection.GeneratedProtocolMessageType('Rollback
   })
 _sym_db.RegisterMessage(RollbackTransactionResponse)
 
+ChangeBalancesRequest = _reflection.GeneratedProtocolMessageType('ChangeBalancesRequest', (_message.Message,), {
+  'DESCRIPTOR' : _CHANGEBALANCESREQUEST,
+  '__module__' : 'bank_pb2'
+  # @@protoc_insertion_point(class_scope:bank.ChangeBalancesRequest)
+  })
+_sym_db.RegisterMessage(ChangeBalancesRequest)
+
+ChangeBalancesResponse = _reflection.GeneratedProtocolMessageType('ChangeBalancesResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CHANGEBALANCESRESPONSE,
+  '__module__' : 'bank_pb2'
+  # @@protoc_insertion_point(class_scope:bank.ChangeBalancesResponse)
+  })
+_sym_db.RegisterMessage(ChangeBalancesResponse)
+
 DebugClearServiceRequest = _reflection.GeneratedProtocolMessageType('DebugClearServiceRequest', (_message.Message,), {
   'DESCRIPTOR' : _DEBUGCLEARSERVICEREQUEST,
   '__module__' : 'bank_pb2'